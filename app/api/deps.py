@@ -1,19 +1,56 @@
-from typing import Generator
+from typing import AsyncGenerator, AsyncIterator, Generator, Iterator
+
+from contextlib import asynccontextmanager, contextmanager
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import crud, models, settings
 from app.core import security
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal, SessionLocal, get_async_engine, get_session
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_PREFIX}/login/access-token")
 
 
-def get_db() -> Generator[Session, None, None]:
+@asynccontextmanager
+async def get_db_context() -> AsyncIterator[Session | AsyncSession]:
     """
-    A generator function that creates a new database session.
+    A context manager that creates a new database session of the `DATABASE_BACKEND`.
+
+    Yields:
+        Session | AsyncSession: A new database session.
+    """
+    db = get_session()
+    try:
+        yield db
+    finally:
+        if isinstance(db, AsyncSession):
+            await db.close()
+        else:
+            db.close()
+
+
+async def get_db() -> AsyncGenerator[Session | AsyncSession, None]:
+    """
+    A generator function that creates a new database session of the `DATABASE_BACKEND`.
+
+    With the "async" backend, the relationships of the objects returned by the `crud` methods
+    must be loaded explicitly. Routes that lazy load relationships depend on `get_sync_db`.
+
+    Yields:
+        Session | AsyncSession: A new database session.
+    """
+    async with get_db_context() as db:
+        yield db
+
+
+@contextmanager
+def get_sync_db_context() -> Iterator[Session]:
+    """
+    A context manager that creates a new database session, for the startup, the background jobs
+    and the background tasks, which lazy load relationships.
 
     Yields:
         Session: A new database session.
@@ -25,6 +62,31 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_sync_db() -> Generator[Session, None, None]:
+    """
+    A generator function that creates a new database session.
+
+    Yields:
+        Session: A new database session.
+    """
+    with get_sync_db_context() as db:
+        yield db
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    A generator function that creates a new async database session.
+
+    The session can be passed to the `crud` methods, but the relationships of the objects they
+    return must be loaded explicitly.
+
+    Yields:
+        AsyncSession: A new async database session.
+    """
+    async with AsyncSessionLocal(bind=get_async_engine()) as db:
+        yield db
+
+
 async def get_current_user_id(token: str = Depends(reusable_oauth2)) -> str:
     """
     Get the user id from the access token.
@@ -39,14 +101,14 @@ async def get_current_user_id(token: str = Depends(reusable_oauth2)) -> str:
 
 
 async def get_current_user(
-    db: Session = Depends(get_db),
+    db: Session | AsyncSession = Depends(get_db),
     user_id: str = Depends(get_current_user_id),
 ) -> models.User:
     """
     Get the user from the access token.
 
     Args:
-        db (Session): The database session.
+        db (Session | AsyncSession): The database session.
         user_id (str): The user id.
 
     Returns:
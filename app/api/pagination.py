@@ -0,0 +1,121 @@
+from typing import Any
+
+from collections.abc import AsyncIterator, Awaitable, Callable, Collection
+
+import orjson
+from fastapi import HTTPException, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlmodel import SQLModel
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def get_fields(fields: str | None, read_class: type[SQLModel]) -> list[str] | None:
+    """
+    Parse the `fields` query parameter of a list endpoint.
+
+    Args:
+        fields (str | None): Comma separated names of the fields to return.
+        read_class (type[SQLModel]): The model returned by the endpoint.
+
+    Returns:
+        list[str] | None: The field names, or None to return all the fields.
+
+    Raises:
+        HTTPException: If a field is not a field of `read_class`.
+    """
+    if not fields:
+        return None
+    field_names = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown_fields = [field for field in field_names if field not in read_class.__fields__]
+    if unknown_fields:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown fields: {', '.join(unknown_fields)}",
+        )
+    return field_names
+
+
+def project(obj: Any, fields: Collection[str]) -> dict[str, Any]:
+    """
+    Get the given fields of an object, as a dict.
+
+    Args:
+        obj (Any): The object.
+        fields (Collection[str]): The names of the fields.
+
+    Returns:
+        dict[str, Any]: The fields and their values.
+    """
+    return {field: getattr(obj, field) for field in fields}
+
+
+def set_next_cursor(response: Response, next_cursor: str | None) -> Response:
+    """
+    Set the cursor of the next page in the `X-Next-Cursor` header of a response.
+
+    Args:
+        response (Response): The response.
+        next_cursor (str | None): The cursor, or None if there is no next page.
+
+    Returns:
+        Response: The response.
+    """
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
+
+
+def projected_response(rows: list[dict[str, Any]], next_cursor: str | None) -> ORJSONResponse:
+    """
+    Return projected rows, serialized with orjson, without validating them against a model.
+
+    Args:
+        rows (list[dict[str, Any]]): The projected rows.
+        next_cursor (str | None): The cursor of the next page.
+
+    Returns:
+        ORJSONResponse: The response.
+    """
+    response = ORJSONResponse(rows)
+    set_next_cursor(response=response, next_cursor=next_cursor)
+    return response
+
+
+async def iter_pages(
+    get_page: Callable[..., Awaitable[tuple[list[Any], str | None]]], **kwargs: Any
+) -> AsyncIterator[list[Any]]:
+    """
+    Walk all the pages of a keyset paginated `get_page` crud method.
+
+    Args:
+        get_page (Callable): The `get_page` method.
+        kwargs (Any): Keyword arguments for `get_page`.
+
+    Yields:
+        list[Any]: The rows of each page.
+    """
+    cursor = None
+    while True:
+        rows, cursor = await get_page(cursor=cursor, **kwargs)
+        yield rows
+        if cursor is None:
+            return
+
+
+def ndjson_response(rows: AsyncIterator[dict[str, Any]]) -> StreamingResponse:
+    """
+    Stream rows as newline delimited JSON, one row per line.
+
+    Args:
+        rows (AsyncIterator[dict[str, Any]]): The rows to stream.
+
+    Returns:
+        StreamingResponse: The response.
+    """
+
+    async def iter_lines() -> AsyncIterator[bytes]:
+        async for row in rows:
+            yield orjson.dumps(row) + b"\n"
+
+    return StreamingResponse(iter_lines(), media_type="application/x-ndjson")
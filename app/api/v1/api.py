@@ -1,9 +1,22 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 
 from app import models, settings
-from app.api.v1.endpoints import criteria, filter, login, source, users, video
+from app.api import deps
+from app.api.v1.endpoints import (
+    criteria,
+    fetch_history,
+    filter,
+    login,
+    profiles,
+    source,
+    users,
+    video,
+    websub,
+)
+from app.services.rate_limit import get_upstream_statuses
 
-api_router = APIRouter()
+api_router = APIRouter(default_response_class=ORJSONResponse)
 
 api_router.include_router(login.router, tags=["login"])
 api_router.include_router(users.router, prefix="/user", tags=["Users"])
@@ -11,6 +24,9 @@ api_router.include_router(video.router, prefix="/video", tags=["Videos"])
 api_router.include_router(filter.router, tags=["Filters"])
 api_router.include_router(criteria.router, tags=["Criterias"])
 api_router.include_router(source.router, prefix="/source", tags=["Sources"])
+api_router.include_router(websub.router, prefix="/websub", tags=["WebSub"])
+api_router.include_router(fetch_history.router, prefix="/fetch-history", tags=["Fetch History"])
+api_router.include_router(profiles.router, prefix="/profiles", tags=["Profiles"])
 
 
 @api_router.get("/", response_model=models.HealthCheck, tags=["status"])
@@ -26,3 +42,16 @@ async def health_check() -> dict[str, str]:
         "version": "unknown",  # TODO: get version from pyproject.toml
         "description": settings.PROJECT_DESCRIPTION,
     }
+
+
+@api_router.get("/upstreams", response_model=list[models.UpstreamStatus], tags=["status"])
+async def upstream_statuses(
+    _: models.User = Depends(deps.get_current_active_superuser),
+) -> list[models.UpstreamStatus]:
+    """
+    Current rate limits and circuit breaker states of the upstream services.
+
+    Returns:
+        list[models.UpstreamStatus]: The upstream statuses.
+    """
+    return get_upstream_statuses()
@@ -64,7 +64,7 @@ async def get(
     if _criteria:
         if (
             crud.user.is_superuser(user_=current_user)
-            or _criteria.filter.created_by == current_user.id
+            or (await crud.filter.get(db=db, id=_criteria.filter_id)).created_by == current_user.id
         ):
             return _criteria
 
@@ -100,7 +100,7 @@ async def update(
     if _criteria:
         if (
             crud.user.is_superuser(user_=current_user)
-            or _criteria.filter.created_by == current_user.id
+            or (await crud.filter.get(db=db, id=_criteria.filter_id)).created_by == current_user.id
         ):
             try:
                 return await model_crud.update(db=db, obj_in=obj_in, id=id)
@@ -138,7 +138,7 @@ async def delete(
     if _criteria:
         if (
             crud.user.is_superuser(user_=current_user)
-            or _criteria.filter.created_by == current_user.id
+            or (await crud.filter.get(db=db, id=_criteria.filter_id)).created_by == current_user.id
         ):
             return await model_crud.remove(id=id, db=db)
 
@@ -0,0 +1,54 @@
+import datetime
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+
+from app import crud, models
+from app.api import deps
+
+router = APIRouter()
+
+
+@router.get("/costs", response_model=list[models.SourceFetchCost])
+async def get_source_costs(
+    *,
+    db: Session = Depends(deps.get_db),
+    days: int = Query(default=7, ge=1),
+    limit: int = Query(default=100, ge=1, le=1000),
+    _: models.User = Depends(deps.get_current_active_superuser),
+) -> list[models.SourceFetchCost]:
+    """
+    Rank sources by the cumulative time spent fetching them.
+
+    Args:
+        db (Session): database session.
+        days (int): Only include fetches of the last `days` days.
+        limit (int): The maximum number of sources to return.
+
+    Returns:
+        list[models.SourceFetchCost]: The sources' fetch costs, most expensive first.
+    """
+    since = datetime.datetime.utcnow() - datetime.timedelta(days=days)
+    return await crud.fetch_history.get_source_costs(db=db, since=since, limit=limit)
+
+
+@router.get("/source/{source_id}", response_model=list[models.FetchHistoryRead])
+async def get_source_history(
+    *,
+    db: Session = Depends(deps.get_db),
+    source_id: str,
+    limit: int = Query(default=100, ge=1, le=1000),
+    _: models.User = Depends(deps.get_current_active_superuser),
+) -> list[models.FetchHistory]:
+    """
+    Get the most recent fetches of a source.
+
+    Args:
+        db (Session): database session.
+        source_id (str): The source's id.
+        limit (int): The maximum number of fetches to return.
+
+    Returns:
+        list[models.FetchHistory]: The fetches, newest first.
+    """
+    return await crud.fetch_history.get_source_history(db=db, source_id=source_id, limit=limit)
@@ -146,7 +146,7 @@ async def delete(
 @router.put("/filter/{id}/feed", response_class=HTMLResponse)
 async def build_filter_rss(
     id: str,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_sync_db),
     _: models.User = Depends(deps.get_current_active_superuser),
 ) -> Response:
     """
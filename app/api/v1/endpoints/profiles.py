@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app import models
+from app.api import deps
+from app.core.profiling import ProfileNotFoundError, get_profile_file, get_profiles
+
+router = APIRouter()
+
+
+@router.get("/", response_model=list[models.ProfileInfo])
+async def list_profiles(
+    _: models.User = Depends(deps.get_current_active_superuser),
+) -> list[models.ProfileInfo]:
+    """
+    List the saved profiles of slow requests and background tasks, newest first.
+
+    Returns:
+        list[models.ProfileInfo]: The saved profiles.
+    """
+    return get_profiles()
+
+
+@router.get("/{profile_id}", response_class=FileResponse)
+async def download_profile(
+    profile_id: str,
+    _: models.User = Depends(deps.get_current_active_superuser),
+) -> FileResponse:
+    """
+    Download a profile as folded stacks, for flamegraph.pl, inferno or speedscope.
+
+    Args:
+        profile_id (str): The profile id.
+
+    Returns:
+        FileResponse: The .folded file.
+
+    Raises:
+        HTTPException: if the profile does not exist.
+    """
+    try:
+        profile_file = get_profile_file(profile_id=profile_id)
+    except ProfileNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+    return FileResponse(profile_file, media_type="text/plain", filename=profile_file.name)
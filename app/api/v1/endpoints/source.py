@@ -1,8 +1,20 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from typing import Any
+
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 
-from app import crud, models
+from app import crud, models, settings
 from app.api import deps
+from app.api.pagination import (
+    get_fields,
+    iter_pages,
+    ndjson_response,
+    projected_response,
+    set_next_cursor,
+)
 from app.services.fetch import FetchCanceledError, fetch_all_sources, fetch_source
 
 router = APIRouter()
@@ -13,6 +25,53 @@ ModelUpdateClass = models.SourceUpdate
 model_crud = crud.source
 
 
+STATS_FIELDS = {"videos_count", "latest_released_at", "last_fetched_at"}
+
+
+async def get_source_reads(
+    db: Session, sources: list[ModelClass], with_stats: bool = True
+) -> list[ModelReadClass]:
+    """
+    Get the sources to return, with the aggregates of their videos and fetches.
+
+    Args:
+        db (Session): database session.
+        sources (list[ModelClass]): The sources.
+        with_stats (bool): Whether to query the stats. Defaults to True.
+
+    Returns:
+        list[ModelReadClass]: The sources, with their stats.
+    """
+    stats = (
+        await model_crud.get_stats(db=db, source_ids=[source.id for source in sources])
+        if with_stats
+        else {}
+    )
+    return [
+        ModelReadClass.from_source(source=source, stats=stats.get(source.id)) for source in sources
+    ]
+
+
+async def get_source_dicts(
+    db: Session, sources: list[ModelClass], fields: list[str]
+) -> list[dict[str, Any]]:
+    """
+    Get the given fields of the sources to return.
+
+    Args:
+        db (Session): database session.
+        sources (list[ModelClass]): The sources.
+        fields (list[str]): The fields to return.
+
+    Returns:
+        list[dict[str, Any]]: The sources' fields. The stats are only queried if requested.
+    """
+    source_reads = await get_source_reads(
+        db=db, sources=sources, with_stats=not STATS_FIELDS.isdisjoint(fields)
+    )
+    return [source_read.dict(include=set(fields)) for source_read in source_reads]
+
+
 @router.post("/", response_model=ModelReadClass, status_code=status.HTTP_201_CREATED)
 async def create_source_from_url(
     *,
@@ -20,7 +79,7 @@ async def create_source_from_url(
     obj_in: ModelCreateClass,
     background_tasks: BackgroundTasks,
     current_active_user: models.User = Depends(deps.get_current_active_user),
-) -> ModelClass:
+) -> ModelReadClass:
     """
     Create a new source.
 
@@ -31,7 +90,7 @@ async def create_source_from_url(
         current_active_user (models.User): current active user.
 
     Returns:
-        ModelClass: Created object.
+        ModelReadClass: Created object.
 
     Raises:
         HTTPException: if object already exists.
@@ -51,7 +110,42 @@ async def create_source_from_url(
         id=source.id,
         db=db,
     )
-    return source
+    return (await get_source_reads(db=db, sources=[source]))[0]
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export(
+    *,
+    db: Session = Depends(deps.get_db),
+    fields: str | None = None,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> StreamingResponse:
+    """
+    Export the sources as newline delimited JSON, newest first.
+
+    The sources are read in keyset paginated batches while the response is streamed.
+
+    Args:
+        db (Session): database session.
+        fields (str | None): Comma separated fields to export. Defaults to all the fields.
+        current_user (models.User): Current active user.
+
+    Returns:
+        StreamingResponse: One JSON object per line, per source.
+    """
+    field_names = get_fields(fields=fields, read_class=ModelReadClass) or list(
+        ModelReadClass.__fields__
+    )
+    filters = {} if crud.user.is_superuser(user_=current_user) else {"created_by": current_user.id}
+
+    async def iter_rows() -> AsyncIterator[dict[str, Any]]:
+        async for sources in iter_pages(
+            model_crud.get_page, db=db, limit=settings.API_EXPORT_BATCH_SIZE, **filters
+        ):
+            for row in await get_source_dicts(db=db, sources=sources, fields=field_names):
+                yield row
+
+    return ndjson_response(rows=iter_rows())
 
 
 @router.get("/{id}", response_model=ModelReadClass)
@@ -60,7 +154,7 @@ async def get(
     db: Session = Depends(deps.get_db),
     id: str,
     current_user: models.User = Depends(deps.get_current_active_user),
-) -> ModelClass:
+) -> ModelReadClass:
     """
     Retrieve a source by id.
 
@@ -70,7 +164,7 @@ async def get(
         current_user (Any): authenticated user.
 
     Returns:
-        ModelClass: Retrieved object.
+        ModelReadClass: Retrieved object.
 
     Raises:
         HTTPException: if object does not exist.
@@ -78,8 +172,10 @@ async def get(
     """
     source = await model_crud.get_or_none(id=id, db=db)
     if source:
-        if crud.user.is_superuser(user_=current_user) or source in current_user.sources:
-            return source
+        if crud.user.is_superuser(user_=current_user) or source.id in (
+            await crud.user.get_source_ids(db=db, user_id=current_user.id)
+        ):
+            return (await get_source_reads(db=db, sources=[source]))[0]
 
     elif crud.user.is_superuser(user_=current_user):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Source not found")
@@ -90,27 +186,50 @@ async def get(
 async def get_multi(
     *,
     db: Session = Depends(deps.get_db),
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(default=100, ge=1),
+    cursor: str | None = None,
+    fields: str | None = None,
     current_user: models.User = Depends(deps.get_current_active_user),
-) -> list[ModelClass]:
+) -> list[ModelReadClass] | Response:
     """
-    Retrieve sources.
+    Retrieve sources, newest first.
+
+    The cursor of the next page is returned in the `X-Next-Cursor` header, and is passed
+    back as `cursor` to get that page.
 
     Args:
         db (Session): database session.
+        response (Response): The response, to set the next page cursor on.
         skip (int): Number of sources to skip. Defaults to 0.
         limit (int): Number of sources to return. Defaults to 100.
+        cursor (str | None): The cursor of the page to return. Defaults to the first page.
+        fields (str | None): Comma separated fields to return. Defaults to all the fields.
         current_user (models.User): Current active user.
 
     Returns:
-        list[ModelClass]: List of objects.
+        list[ModelReadClass] | Response: List of objects, or of their `fields` if given.
+
+    Raises:
+        HTTPException: if the cursor is invalid.
     """
-    return (
-        await model_crud.get_multi(db=db, skip=skip, limit=limit)
-        if crud.user.is_superuser(user_=current_user)
-        else await model_crud.get_multi(db=db, created_by=current_user.id, skip=skip, limit=limit)
-    )
+    field_names = get_fields(fields=fields, read_class=ModelReadClass)
+    filters = {} if crud.user.is_superuser(user_=current_user) else {"created_by": current_user.id}
+    try:
+        sources, next_cursor = await model_crud.get_page(
+            db=db, cursor=cursor, skip=skip, limit=limit, **filters
+        )
+    except crud.InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    if field_names is not None:
+        return projected_response(
+            rows=await get_source_dicts(db=db, sources=sources, fields=field_names),
+            next_cursor=next_cursor,
+        )
+    set_next_cursor(response=response, next_cursor=next_cursor)
+    return await get_source_reads(db=db, sources=sources)
 
 
 @router.get("/{id}/videos", response_model=list[models.VideoRead])
@@ -138,8 +257,10 @@ async def get_videos_from_source(
         HTTPException: if user is not superuser and object does not belong to user.
     """
     source = await crud.source.get(db=db, id=id)
-    if crud.user.is_superuser(user_=current_user) or source in current_user.sources:
-        return source.videos
+    if crud.user.is_superuser(user_=current_user) or source.id in (
+        await crud.user.get_source_ids(db=db, user_id=current_user.id)
+    ):
+        return await crud.source.get_videos(db=db, source_id=id, skip=skip, limit=limit)
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
 
 
@@ -150,7 +271,7 @@ async def update(
     id: str,
     obj_in: ModelUpdateClass,
     current_user: models.User = Depends(deps.get_current_active_user),
-) -> ModelClass:
+) -> ModelReadClass:
     """
     Update an source.
 
@@ -161,15 +282,18 @@ async def update(
         current_user (Any): authenticated user.
 
     Returns:
-        ModelClass: Updated object.
+        ModelReadClass: Updated object.
 
     Raises:
         HTTPException: if object not found.
     """
     source = await model_crud.get_or_none(id=id, db=db)
     if source:
-        if crud.user.is_superuser(user_=current_user) or source in current_user.sources:
-            return await model_crud.update(db=db, obj_in=obj_in, id=id)
+        if crud.user.is_superuser(user_=current_user) or source.id in (
+            await crud.user.get_source_ids(db=db, user_id=current_user.id)
+        ):
+            source = await model_crud.update(db=db, obj_in=obj_in, id=id)
+            return (await get_source_reads(db=db, sources=[source]))[0]
 
     elif crud.user.is_superuser(user_=current_user):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Source not found")
@@ -200,7 +324,9 @@ async def delete(
 
     source = await model_crud.get_or_none(id=id, db=db)
     if source:
-        if crud.user.is_superuser(user_=current_user) or source in current_user.sources:
+        if crud.user.is_superuser(user_=current_user) or source.id in (
+            await crud.user.get_source_ids(db=db, user_id=current_user.id)
+        ):
             return await model_crud.remove(id=id, db=db)
 
     elif crud.user.is_superuser(user_=current_user):
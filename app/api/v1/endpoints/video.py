@@ -1,8 +1,21 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from typing import Any, Literal
+
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 
-from app import crud, logger, models
+from app import crud, logger, models, settings
 from app.api import deps
+from app.api.pagination import (
+    get_fields,
+    iter_pages,
+    ndjson_response,
+    project,
+    projected_response,
+    set_next_cursor,
+)
 from app.services.fetch import fetch_all_videos, fetch_video, refresh_all_videos
 
 router = APIRouter()
@@ -11,6 +24,77 @@ ModelReadClass = models.VideoRead
 ModelCreateClass = models.VideoCreate
 ModelUpdateClass = models.VideoUpdate
 model_crud = crud.video
+OrderBy = Literal["created_at", "released_at"]
+
+
+@router.get("/search", response_model=list[ModelReadClass])
+async def search(
+    *,
+    db: Session = Depends(deps.get_db),
+    q: str,
+    source_id: str | None = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> list[ModelClass]:
+    """
+    Search videos by title, description and uploader.
+
+    Args:
+        db (Session): database session.
+        q (str): The words and "quoted phrases" that the videos must all contain.
+        source_id (str | None): Only search the videos of this source.
+        limit (int): Number of videos to return. Defaults to 50.
+        current_user (models.User): Current active user.
+
+    Returns:
+        list[ModelClass]: The matching videos, best matches first.
+    """
+    source_ids = [source_id] if source_id else None
+    if not crud.user.is_superuser(user_=current_user):
+        user_source_ids = await crud.user.get_source_ids(db=db, user_id=current_user.id)
+        source_ids = [id for id in source_ids or user_source_ids if id in user_source_ids]
+    return await model_crud.search(db=db, query=q, source_ids=source_ids, limit=limit)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export(
+    *,
+    db: Session = Depends(deps.get_db),
+    order_by: OrderBy = "created_at",
+    fields: str | None = None,
+    _: models.User = Depends(deps.get_current_active_superuser),
+) -> StreamingResponse:
+    """
+    Export all the videos as newline delimited JSON, newest first.
+
+    The videos are read in keyset paginated batches while the response is streamed, so the
+    whole library is never held in memory.
+
+    Args:
+        db (Session): database session.
+        order_by (OrderBy): The field to order the videos by. Defaults to "created_at".
+        fields (str | None): Comma separated fields to export. Defaults to all the fields.
+        _ (models.User): Current active superuser.
+
+    Returns:
+        StreamingResponse: One JSON object per line, per video.
+    """
+    field_names = get_fields(fields=fields, read_class=ModelReadClass) or list(
+        ModelReadClass.__fields__
+    )
+
+    async def iter_rows() -> AsyncIterator[dict[str, Any]]:
+        async for videos in iter_pages(
+            model_crud.get_page,
+            db=db,
+            order_by=order_by,
+            limit=settings.API_EXPORT_BATCH_SIZE,
+            fields=field_names,
+        ):
+            for video in videos:
+                yield project(obj=video, fields=field_names)
+
+    return ndjson_response(rows=iter_rows())
 
 
 @router.get("/{id}", response_model=ModelReadClass)
@@ -49,27 +133,58 @@ async def get(
 async def get_multi(
     *,
     db: Session = Depends(deps.get_db),
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(default=100, ge=1),
+    cursor: str | None = None,
+    order_by: OrderBy = "created_at",
+    fields: str | None = None,
     current_user: models.User = Depends(deps.get_current_active_superuser),
-) -> list[ModelClass]:
+) -> list[ModelClass] | Response:
     """
-    Retrieve items.
+    Retrieve items, newest first.
+
+    The cursor of the next page is returned in the `X-Next-Cursor` header, and is passed
+    back as `cursor` to get that page.
 
     Args:
         db (Session): database session.
+        response (Response): The response, to set the next page cursor on.
         skip (int): Number of videos to skip. Defaults to 0.
         limit (int): Number of videos to return. Defaults to 100.
+        cursor (str | None): The cursor of the page to return. Defaults to the first page.
+        order_by (OrderBy): The field to order the videos by. Defaults to "created_at".
+        fields (str | None): Comma separated fields to return. Defaults to all the fields.
         current_user (models.User): Current active user.
 
     Returns:
-        list[ModelClass]: List of objects.
+        list[ModelClass] | Response: List of objects, or of their `fields` if given.
+
+    Raises:
+        HTTPException: if the cursor is invalid.
     """
-    return (
-        await model_crud.get_multi(db=db, skip=skip, limit=limit)
-        if crud.user.is_superuser(user_=current_user)
-        else await model_crud.get_multi(db=db, created_by=current_user.id, skip=skip, limit=limit)
-    )
+    field_names = get_fields(fields=fields, read_class=ModelReadClass)
+    filters = {} if crud.user.is_superuser(user_=current_user) else {"created_by": current_user.id}
+    try:
+        videos, next_cursor = await model_crud.get_page(
+            db=db,
+            order_by=order_by,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            fields=field_names,
+            **filters,
+        )
+    except crud.InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    if field_names is not None:
+        return projected_response(
+            rows=[project(obj=video, fields=field_names) for video in videos],
+            next_cursor=next_cursor,
+        )
+    set_next_cursor(response=response, next_cursor=next_cursor)
+    return videos
 
 
 @router.put("/{id}/fetch", response_model=models.VideoRead)
@@ -0,0 +1,93 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse, Response
+from sqlmodel import Session
+
+from app import logger
+from app.api import deps
+from app.services.fetch import fetch_source
+from app.services.websub import (
+    WebSubVerificationError,
+    handle_websub_notification,
+    verify_websub_intent,
+)
+
+router = APIRouter()
+
+
+async def fetch_source_in_background(id: str) -> None:
+    """
+    Fetch a source with its own database session, as the session of the request is closed
+    before the background task runs.
+
+    Args:
+        id (str): The source id.
+    """
+    with deps.get_sync_db_context() as db:
+        await fetch_source(id=id, db=db)
+
+
+@router.get("/youtube", response_class=PlainTextResponse)
+async def verify_youtube_websub(
+    *,
+    db: Session = Depends(deps.get_sync_db),
+    hub_mode: str = Query(alias="hub.mode"),
+    hub_topic: str = Query(alias="hub.topic"),
+    hub_challenge: str = Query(alias="hub.challenge"),
+    hub_lease_seconds: int | None = Query(default=None, alias="hub.lease_seconds"),
+) -> str:
+    """
+    Verification of intent from the WebSub hub.
+
+    Args:
+        db (Session): database session.
+        hub_mode (str): "subscribe" or "unsubscribe".
+        hub_topic (str): The topic url being verified.
+        hub_challenge (str): The challenge to echo back.
+        hub_lease_seconds (int | None): The lease granted by the hub.
+
+    Returns:
+        str: The challenge.
+
+    Raises:
+        HTTPException: if the topic does not match a requested subscription.
+    """
+    try:
+        return await verify_websub_intent(
+            db=db,
+            mode=hub_mode,
+            topic=hub_topic,
+            challenge=hub_challenge,
+            lease_seconds=hub_lease_seconds,
+        )
+    except WebSubVerificationError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+
+
+@router.post("/youtube", status_code=status.HTTP_204_NO_CONTENT)
+async def youtube_websub_notification(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(deps.get_sync_db),
+) -> Response:
+    """
+    Content distribution from the WebSub hub. Fetches every source with new videos.
+
+    The hub retries notifications that are not acknowledged, so invalid notifications are
+    still acknowledged and only logged.
+
+    Args:
+        request (Request): The request.
+        background_tasks (BackgroundTasks): The background tasks.
+        db (Session): database session.
+
+    Returns:
+        Response: An empty response.
+    """
+    body = await request.body()
+    sources = await handle_websub_notification(
+        db=db, body=body, signature=request.headers.get("X-Hub-Signature")
+    )
+    for source in sources:
+        logger.info(f"WebSub notification received for Source(id='{source.id}').")
+        background_tasks.add_task(fetch_source_in_background, id=source.id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,18 +1,25 @@
 import datetime
+from collections.abc import Awaitable, Callable
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response, status
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi_utils.tasks import repeat_every
-from sqlmodel import Session
 
 from app import crud, logger, settings
 from app.api import deps
 from app.api.v1.api import api_router
-from app.core import notify
+from app.core import metrics, notify
+from app.core.outbox import outbox
+from app.core.profiling import profile_request, profile_task
 from app.db.backup import backup_database
 from app.db.init_db import init_initial_data
+from app.db.maintenance import compact_database
 from app.paths import FEEDS_PATH, STATIC_PATH
-from app.services.fetch import fetch_all_sources
+from app.services.archive import archive_old_videos
+from app.services.fetch import fetch_all_sources, refresh_all_videos
+from app.services.video import warm_ydl_pool
+from app.services.websub import renew_websub_subscriptions
 from app.views.router import views_router
 
 # Initialize FastAPI App
@@ -31,36 +38,91 @@ app.mount("/feed", StaticFiles(directory=FEEDS_PATH), name="feed")
 app.mount("/static", StaticFiles(directory=STATIC_PATH))
 
 
+@app.middleware("http")
+async def count_request_db_queries(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """
+    Records the number of database queries executed by each request, by endpoint.
+    """
+    counter = [0]
+    token = metrics.request_db_queries.set(counter)
+    try:
+        response = await call_next(request)
+    finally:
+        metrics.request_db_queries.reset(token)
+    endpoint = request.scope.get("endpoint")
+    metrics.DB_QUERIES_PER_REQUEST.observe(
+        counter[0], endpoint=getattr(endpoint, "__name__", "unknown")
+    )
+    return response
+
+
+if settings.PROFILING_ENABLED:
+    app.middleware("http")(profile_request)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Exposes the application metrics in the Prometheus text format.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return PlainTextResponse(
+        metrics.registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.on_event("startup")  # type: ignore
-async def on_startup(db: Session = next(deps.get_db())) -> None:
+async def on_startup() -> None:
     """
     Event handler that gets called when the application starts.
     Logs application start and creates database and tables if they do not exist.
-
-    Args:
-        db (Session): Database session.
     """
     logger.info("--- Start FastAPI ---")
     logger.debug("Starting FastAPI App...")
-    if settings.NOTIFY_ON_START:
-        total_users = await crud.user.count(db=db)
-        total_sources = await crud.source.count(db=db)
-        total_videos = await crud.video.count(db=db)
-
-        await notify.notify(
-            text=(
-                f"{settings.PROJECT_NAME}('{settings.ENV_NAME}') started.\n\n"
-                f"Total Users: {total_users}\n"
-                f"Total Sources: {total_sources}\n"
-                f"Total Videos: {total_videos}\n"
+    with deps.get_sync_db_context() as db:
+        if settings.NOTIFY_ON_START:
+            total_users = await crud.user.count(db=db)
+            total_sources = await crud.source.count(db=db)
+            total_videos = await crud.video.count(db=db)
+
+            await notify.notify(
+                text=(
+                    f"{settings.PROJECT_NAME}('{settings.ENV_NAME}') started.\n\n"
+                    f"Total Users: {total_users}\n"
+                    f"Total Sources: {total_sources}\n"
+                    f"Total Videos: {total_videos}\n"
+                )
             )
-        )
 
-    await init_initial_data(db=db)
+        await init_initial_data(db=db)
+
+    if settings.YTDLP_POOL_ENABLED:
+        warm_ydl_pool()
+
+
+@app.on_event("startup")  # type: ignore
+@repeat_every(seconds=settings.NOTIFY_OUTBOX_FLUSH_INTERVAL_SECONDS)
+async def repeating_flush_notification_outbox() -> None:  # pragma: no cover
+    """
+    Sends digests of the queued notifications.
+    """
+    await outbox.flush()
+
+
+@app.on_event("shutdown")  # type: ignore
+async def on_shutdown_flush_notification_outbox() -> None:  # pragma: no cover
+    """
+    Sends the queued notifications before shutting down.
+    """
+    await outbox.flush(force=True)
 
 
 @app.on_event("startup")  # type: ignore
 @repeat_every(seconds=settings.REFRESH_SOURCES_INTERVAL_MINUTES * 60, wait_first=True)
+@profile_task(name="fetch_all_sources")
 async def repeating_fetch_all_sources() -> None:  # pragma: no cover
     """
     Fetches all Sources from yt-dlp.
@@ -90,31 +152,60 @@ async def repeating_fetch_all_sources() -> None:  # pragma: no cover
             print("repeating_fetch_all_sources() is paused from 8-9am, 10-12pm, 1-2pm, 3-4pm")
 
         logger.debug("Repeating fetch of All Sources...")
-        db: Session = next(deps.get_db())
-        fetch_results = await fetch_all_sources(db=db)
+        with deps.get_sync_db_context() as db:
+            fetch_results = await fetch_all_sources(db=db)
         logger.success(f"Completed refreshing {fetch_results.sources} Sources from yt-dlp.")
 
 
-# @app.on_event("startup")  # type: ignore
-# @repeat_every(seconds=settings.REFRESH_VIDEOS_INTERVAL_MINUTES * 60, wait_first=True)
-# async def repeating_refresh_videos() -> None:  # pragma: no cover
-#     """
-#     Refreshes all Videos that meet criteria with updated data from yt-dlp.
-#     """
-#     logger.debug("Repeating refresh of Videos...")
-#     db: Session = next(deps.get_db())
-#     refreshed_videos = await refresh_all_videos(db=db)
-#     logger.success(f"Completed refreshing {len(refreshed_videos)} Videos from yt-dlp.")
+@app.on_event("startup")  # type: ignore
+@repeat_every(seconds=60 * 60)  # 1 hour
+async def repeating_renew_websub_subscriptions() -> None:  # pragma: no cover
+    """
+    Subscribes/renews WebSub subscriptions for Youtube channel Sources.
+    """
+    if not settings.YOUTUBE_WEBSUB_ENABLED:
+        return
+    with deps.get_sync_db_context() as db:
+        await renew_websub_subscriptions(db=db)
 
 
 @app.on_event("startup")  # type: ignore
-@repeat_every(seconds=60 * 60 * 12, wait_first=True)  # 12 hours
-async def repeating_backup_db() -> None:  # pragma: no cover
+@repeat_every(seconds=settings.REFRESH_VIDEOS_INTERVAL_MINUTES * 60, wait_first=True)
+@profile_task(name="refresh_all_videos")
+async def repeating_refresh_videos() -> None:  # pragma: no cover
     """
     Refreshes all Videos that meet criteria with updated data from yt-dlp.
     """
-    db: Session = next(deps.get_db())
-    await backup_database(db=db)
+    if not settings.REFRESH_VIDEOS_ENABLED:
+        return
+    logger.debug("Repeating refresh of Videos...")
+    with deps.get_sync_db_context() as db:
+        refreshed_videos = await refresh_all_videos(db=db)
+    logger.success(f"Completed refreshing {len(refreshed_videos)} Videos from yt-dlp.")
+
+
+@app.on_event("startup")  # type: ignore
+@repeat_every(seconds=settings.DB_BACKUP_INTERVAL_HOURS * 60 * 60, wait_first=True)
+@profile_task(name="backup_database")
+async def repeating_backup_db() -> None:  # pragma: no cover
+    """
+    Backs up the database and prunes old backups.
+    """
+    with deps.get_sync_db_context() as db:
+        await backup_database(db=db)
+
+
+@app.on_event("startup")  # type: ignore
+@repeat_every(seconds=settings.DB_COMPACT_INTERVAL_HOURS * 60 * 60, wait_first=True)
+@profile_task(name="compact_database")
+async def repeating_compact_db() -> None:  # pragma: no cover
+    """
+    Archives old videos, then analyzes and vacuums the database.
+    """
+    if settings.VIDEO_ARCHIVE_ENABLED:
+        with deps.get_sync_db_context() as db:
+            await archive_old_videos(db=db)
+    await compact_database()
 
 
 # @app.on_event("startup")  # type: ignore
@@ -0,0 +1,52 @@
+"""
+Compression of large text values stored in the database.
+"""
+
+import zlib
+from enum import Enum
+
+import zstandard
+
+
+class Compression(Enum):
+    NONE = "none"
+    ZLIB = "zlib"
+    ZSTD = "zstd"
+
+
+def compress_text(text: str, compression: Compression, level: int = 10) -> bytes:
+    """
+    Compress a text.
+
+    Args:
+        text (str): The text.
+        compression (Compression): The compression algorithm.
+        level (int): The compression level. zlib levels are capped at 9.
+
+    Returns:
+        bytes: The compressed text.
+    """
+    data = text.encode("utf8")
+    if compression == Compression.ZLIB:
+        return zlib.compress(data, level=min(level, 9))
+    if compression == Compression.ZSTD:
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return data
+
+
+def decompress_text(data: bytes, compression: Compression) -> str:
+    """
+    Decompress a text compressed by `compress_text`.
+
+    Args:
+        data (bytes): The compressed text.
+        compression (Compression): The compression algorithm.
+
+    Returns:
+        str: The text.
+    """
+    if compression == Compression.ZLIB:
+        data = zlib.decompress(data)
+    elif compression == Compression.ZSTD:
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return data.decode("utf8")
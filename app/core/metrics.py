@@ -0,0 +1,468 @@
+"""
+Minimal Prometheus-style metrics.
+
+Counters, gauges and histograms are kept in-process and rendered in the Prometheus text
+exposition format by the `/metrics` endpoint.
+"""
+
+from typing import Any
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Engine
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+SIZE_BUCKETS = (1_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+
+LabelValues = tuple[str, ...]
+
+
+def escape_label_value(value: str) -> str:
+    """
+    Escape a label value for the Prometheus text exposition format.
+
+    Args:
+        value (str): The label value.
+
+    Returns:
+        str: The escaped label value.
+    """
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labelnames: tuple[str, ...], values: LabelValues, **extra: str) -> str:
+    """
+    Format the labels of a sample, eg. `{handler="YoutubeHandler",outcome="ok"}`.
+
+    Args:
+        labelnames (tuple[str, ...]): The names of the metric's labels.
+        values (LabelValues): The values of the metric's labels.
+        extra (str): Extra labels, such as the `le` label of histogram buckets.
+
+    Returns:
+        str: The formatted labels, or an empty string if there are no labels.
+    """
+    pairs = [*zip(labelnames, values), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in pairs) + "}"
+
+
+def format_value(value: float) -> str:
+    """
+    Format a sample value, as an integer when possible.
+
+    Args:
+        value (float): The sample value.
+
+    Returns:
+        str: The formatted value.
+    """
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric(ABC):
+    """
+    Base class of the metrics, which registers them in the `registry`.
+    """
+
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def get_label_values(self, labels: dict[str, Any]) -> LabelValues:
+        """
+        Get the values of the metric's labels, in the order of its label names.
+
+        Args:
+            labels (dict[str, Any]): The labels, by name.
+
+        Returns:
+            LabelValues: The label values.
+
+        Raises:
+            ValueError: If the labels are not the metric's labels.
+        """
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def render_samples(self) -> list[str]:
+        """
+        Render the metric's samples.
+
+        Returns:
+            list[str]: One line per sample.
+        """
+
+    def render(self) -> str:
+        """
+        Render the metric, with its `HELP` and `TYPE` lines.
+
+        Returns:
+            str: The rendered metric.
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        lines.extend(self.render_samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """
+    A value that only goes up, such as a number of errors.
+    """
+
+    TYPE = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name=name, documentation=documentation, labelnames=labelnames)
+        self.values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """
+        Increment the value.
+
+        Args:
+            amount (float): The amount to add.
+            labels (Any): The labels of the value.
+        """
+        key = self.get_label_values(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels: Any) -> float:
+        """
+        Get the value.
+
+        Args:
+            labels (Any): The labels of the value.
+
+        Returns:
+            float: The value, or 0 if it was never set.
+        """
+        return self.values.get(self.get_label_values(labels), 0)
+
+    def render_samples(self) -> list[str]:
+        """
+        Render one sample per set of label values.
+
+        Returns:
+            list[str]: One line per sample.
+        """
+        with self._lock:
+            values = dict(self.values)
+        return [
+            f"{self.name}{format_labels(self.labelnames, key)} {format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Gauge(Counter):
+    """
+    A value that goes up and down, such as a number of active streams.
+    """
+
+    TYPE = "gauge"
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        """
+        Decrement the value.
+
+        Args:
+            amount (float): The amount to subtract.
+            labels (Any): The labels of the value.
+        """
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        """
+        Set the value.
+
+        Args:
+            value (float): The new value.
+            labels (Any): The labels of the value.
+        """
+        key = self.get_label_values(labels)
+        with self._lock:
+            self.values[key] = value
+
+
+class Histogram(Metric):
+    """
+    Counts of observed values, such as durations, in cumulative buckets.
+    """
+
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name=name, documentation=documentation, labelnames=labelnames)
+        self.buckets = (*sorted(buckets), float("inf"))
+        self.counts: dict[LabelValues, list[int]] = {}
+        self.sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """
+        Observe a value.
+
+        Args:
+            value (float): The observed value.
+            labels (Any): The labels of the value.
+        """
+        key = self.get_label_values(labels)
+        with self._lock:
+            counts = self.counts.setdefault(key, [0] * len(self.buckets))
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    counts[index] += 1
+            self.sums[key] = self.sums.get(key, 0) + value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """
+        Observe the duration of the block in seconds.
+
+        Args:
+            labels (Any): The labels of the observation.
+
+        Yields:
+            None: While the block runs.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def get_count(self, **labels: Any) -> int:
+        """
+        Get the number of observed values.
+
+        Args:
+            labels (Any): The labels of the observations.
+
+        Returns:
+            int: The number of observations.
+        """
+        counts = self.counts.get(self.get_label_values(labels))
+        return counts[-1] if counts else 0
+
+    def get_sum(self, **labels: Any) -> float:
+        """
+        Get the sum of the observed values.
+
+        Args:
+            labels (Any): The labels of the observations.
+
+        Returns:
+            float: The sum of the observations.
+        """
+        return self.sums.get(self.get_label_values(labels), 0)
+
+    def render_samples(self) -> list[str]:
+        """
+        Render the buckets, sum and count of each set of label values.
+
+        Returns:
+            list[str]: One line per sample.
+        """
+        with self._lock:
+            counts = {key: list(value) for key, value in self.counts.items()}
+            sums = dict(self.sums)
+        lines = []
+        for key, bucket_counts in sorted(counts.items()):
+            for upper_bound, count in zip(self.buckets, bucket_counts):
+                labels = format_labels(self.labelnames, key, le=format_value(upper_bound))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {format_value(sums[key])}")
+            lines.append(f"{self.name}_count{labels} {bucket_counts[-1]}")
+        return lines
+
+
+class Registry:
+    """
+    The metrics rendered by the `/metrics` endpoint.
+    """
+
+    def __init__(self) -> None:
+        self.metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> None:
+        """
+        Register a metric.
+
+        Args:
+            metric (Metric): The metric.
+
+        Raises:
+            ValueError: If a metric with the same name is already registered.
+        """
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered.")
+        self.metrics[metric.name] = metric
+
+    def render(self) -> str:
+        """
+        Render all the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The rendered metrics.
+        """
+        return "\n".join(metric.render() for metric in self.metrics.values()) + "\n"
+
+
+registry = Registry()
+
+# Fetch
+FETCH_SOURCE_DURATION = Histogram(
+    "tubecast_fetch_source_duration_seconds",
+    "Duration of fetch_source, by handler and outcome.",
+    labelnames=("handler", "outcome"),
+)
+
+# yt-dlp
+YTDLP_EXTRACT_DURATION = Histogram(
+    "tubecast_ytdlp_extract_duration_seconds",
+    "Latency of yt-dlp info extraction, by upstream.",
+    labelnames=("upstream",),
+)
+YTDLP_EXTRACT_ERRORS = Counter(
+    "tubecast_ytdlp_extract_errors_total",
+    "yt-dlp extraction errors, by upstream and error class.",
+    labelnames=("upstream", "error"),
+)
+
+# Feeds
+FEED_BUILD_DURATION = Histogram(
+    "tubecast_feed_build_duration_seconds",
+    "Duration of building a .rss feed file, by feed kind.",
+    labelnames=("kind",),
+)
+FEED_SIZE = Histogram(
+    "tubecast_feed_size_bytes",
+    "Size of built .rss feed files, by feed kind.",
+    labelnames=("kind",),
+    buckets=SIZE_BUCKETS,
+)
+
+# Media
+MEDIA_RESOLVE_DURATION = Histogram(
+    "tubecast_media_resolve_duration_seconds",
+    "Latency of resolving a video's media_url, by cache hit or refresh.",
+    labelnames=("cache",),
+)
+
+# Reverse Proxy
+PROXY_BYTES = Counter("tubecast_proxy_bytes_total", "Bytes streamed by the reverse proxy.")
+PROXY_ACTIVE_STREAMS = Gauge(
+    "tubecast_proxy_active_streams", "Reverse proxy streams currently being served."
+)
+
+# Database
+DB_QUERIES = Counter("tubecast_db_queries_total", "Database queries executed.")
+DB_QUERIES_PER_REQUEST = Histogram(
+    "tubecast_http_request_db_queries",
+    "Database queries executed per HTTP request, by endpoint.",
+    labelnames=("endpoint",),
+    buckets=COUNT_BUCKETS,
+)
+
+# Query counter of the current request. A mutable list is used so the count is shared with
+# the tasks and threads the request runs in, which get a copy of the context.
+request_db_queries: ContextVar[list[int] | None] = ContextVar("request_db_queries", default=None)
+
+
+@dataclass
+class FetchCost:
+    """
+    Time and data spent fetching a source, split by where the time went.
+    `db_seconds` also counts the queries made while building the feeds.
+    """
+
+    ytdlp_seconds: float = 0
+    db_seconds: float = 0
+    feed_seconds: float = 0
+    entries: int = 0
+    bytes_extracted: int = 0
+    skipped: bool = False
+
+
+# Cost of the source fetch that is currently running, see `app.services.fetch.fetch_source`.
+fetch_cost: ContextVar[FetchCost | None] = ContextVar("fetch_cost", default=None)
+
+
+@contextmanager
+def track_fetch_cost(phase: str) -> Iterator[None]:
+    """
+    Add the duration of the block to a phase of the current fetch's cost, if any.
+
+    Args:
+        phase (str): The FetchCost attribute, ie. "ytdlp_seconds".
+
+    Yields:
+        None: While the block runs.
+    """
+    cost = fetch_cost.get()
+    if cost is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(cost, phase, getattr(cost, phase) + time.perf_counter() - start)
+
+
+@sa.event.listens_for(Engine, "before_cursor_execute")  # type: ignore
+def count_db_query(conn: Any, *args: Any) -> None:  # pylint: disable=unused-argument
+    """
+    Count a query, in total and for the current request, and start timing it for the current
+    fetch.
+
+    Args:
+        conn (Any): The connection executing the query.
+        args (Any): The other arguments of the event.
+    """
+    DB_QUERIES.inc()
+    counter = request_db_queries.get()
+    if counter is not None:
+        counter[0] += 1
+    if fetch_cost.get() is not None:
+        conn.info["query_start_time"] = time.perf_counter()
+
+
+@sa.event.listens_for(Engine, "after_cursor_execute")  # type: ignore
+def time_db_query(conn: Any, *args: Any) -> None:  # pylint: disable=unused-argument
+    """
+    Add the duration of a query to the current fetch's cost, if any.
+
+    Args:
+        conn (Any): The connection that executed the query.
+        args (Any): The other arguments of the event.
+    """
+    cost = fetch_cost.get()
+    query_start_time = conn.info.pop("query_start_time", None)
+    if cost is not None and query_start_time is not None:
+        cost.db_seconds += time.perf_counter() - query_start_time
@@ -3,6 +3,7 @@ from typing import Any
 from pathlib import Path
 
 import emails
+from emails.backend.smtp import SMTPBackend  # type: ignore
 from emails.template import JinjaTemplate  # type: ignore
 from loguru import logger as _logger
 from telegram import Bot
@@ -17,6 +18,43 @@ settings = _Settings()
 logger = _logger.bind(name="logger")
 logger.add(paths.LOG_FILE, level=settings.LOG_LEVEL, rotation="10 MB")
 
+# Reused clients, created on first use
+_telegram_bots: dict[str, Bot] = {}
+_smtp_backends: dict[tuple[tuple[str, Any], ...], SMTPBackend] = {}
+
+
+def get_telegram_bot(token: str) -> Bot:
+    """
+    Get the shared Telegram Bot for a token.
+
+    Args:
+        token (str): The Telegram API token.
+
+    Returns:
+        Bot: The Telegram Bot.
+    """
+    if token not in _telegram_bots:
+        _telegram_bots[token] = Bot(token=token)
+    return _telegram_bots[token]
+
+
+def get_smtp_backend(smtp_options: dict[str, Any]) -> SMTPBackend:
+    """
+    Get the shared SMTP backend for a set of SMTP options. The backend keeps its
+    connection open between emails and reconnects if the server disconnects.
+
+    Args:
+        smtp_options (dict[str, Any]): The SMTP options.
+
+    Returns:
+        SMTPBackend: The SMTP backend.
+    """
+    smtp_options = {key: value for key, value in smtp_options.items() if value is not None}
+    backend_key = tuple(sorted(smtp_options.items()))
+    if backend_key not in _smtp_backends:
+        _smtp_backends[backend_key] = SMTPBackend(**smtp_options)
+    return _smtp_backends[backend_key]
+
 
 async def notify(
     text: str, telegram: bool = True, email: bool = settings.EMAILS_ENABLED
@@ -63,7 +101,7 @@ async def send_telegram_message(text: str) -> Any:
         logger.warning("TELEGRAM_API_TOKEN or TELEGRAM_CHAT_ID config variables are not set.")
         return None
 
-    bot = Bot(token=settings.TELEGRAM_API_TOKEN)
+    bot = get_telegram_bot(token=settings.TELEGRAM_API_TOKEN)
 
     try:
         return await bot.send_message(chat_id=settings.TELEGRAM_CHAT_ID, text=text)
@@ -120,7 +158,9 @@ def send_email(
         environment = {}
 
     # Send the email
-    response = message.send(to=email_to, render=environment, smtp=smtp_options)
+    response = message.send(
+        to=email_to, render=environment, smtp=get_smtp_backend(smtp_options=smtp_options)
+    )
     logger.info(f"send email result: {response}")
     return response
 
@@ -0,0 +1,237 @@
+"""
+Non-blocking notification outbox.
+
+`queue_notification` only appends the message to a persistent backlog (a JSON-lines file),
+so it never waits on Telegram or SMTP. A background job calls `outbox.flush()`, which
+batches each channel's pending messages into a single digest, collapses repeated
+messages, and sends at most one digest per channel every `NOTIFY_*_MIN_INTERVAL_SECONDS`.
+Messages that fail to send stay in the backlog and are retried on the next flush.
+"""
+
+from typing import Any
+
+import asyncio
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from loguru import logger as _logger
+
+from app import paths
+from app.core.notify import notify, send_email, send_telegram_message
+from app.core.uuid import generate_uuid_random
+from app.models.settings import Settings as _Settings
+
+settings = _Settings()
+
+logger = _logger.bind(name="logger")
+
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+
+
+@dataclass
+class OutboxMessage:
+    channel: str
+    text: str
+    group: str
+    created_at: float = field(default_factory=time.time)
+    id: str = field(default_factory=generate_uuid_random)
+
+
+def get_message_group(text: str) -> str:
+    """
+    Get the digest group for a message, ie. the error type at the start of the message.
+
+    Args:
+        text (str): The message text.
+
+    Returns:
+        str: The group.
+    """
+    first_line = text.strip().splitlines()[0] if text.strip() else ""
+    return first_line.split(":", 1)[0][:80]
+
+
+def build_digest(messages: list[OutboxMessage]) -> str:
+    """
+    Build a digest from a channel's pending messages. Repeated groups are collapsed into
+    a single entry with a count and their first message.
+
+    Args:
+        messages (list[OutboxMessage]): The pending messages.
+
+    Returns:
+        str: The digest text.
+    """
+    if len(messages) == 1:
+        return messages[0].text
+
+    groups: dict[str, list[OutboxMessage]] = {}
+    for message in messages:
+        groups.setdefault(message.group, []).append(message)
+
+    sections = [f"{settings.PROJECT_NAME}: {len(messages)} notifications"]
+    for group_messages in groups.values():
+        first = group_messages[0].text.strip()
+        if len(group_messages) == 1:
+            sections.append(first)
+        else:
+            sections.append(f"[{len(group_messages)}x] {first}")
+    return "\n\n".join(sections)
+
+
+class NotificationOutbox:
+    """
+    Persistent, batching notification outbox.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.pending: list[OutboxMessage] = []
+        self.last_sent_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = asyncio.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """
+        Load the backlog from disk.
+        """
+        if not self.path.exists():
+            return
+        messages = []
+        for line in self.path.read_text(encoding="utf8").splitlines():
+            try:
+                messages.append(OutboxMessage(**json.loads(line)))
+            except (json.JSONDecodeError, TypeError):
+                logger.warning(f"Skipping invalid notification outbox line: {line=}")
+        with self._lock:
+            self.pending = messages
+
+    def save(self) -> None:
+        """
+        Rewrite the backlog on disk with the pending messages.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with self._lock:
+            lines = [json.dumps(asdict(message)) for message in self.pending]
+        tmp_path.write_text("".join(f"{line}\n" for line in lines), encoding="utf8")
+        tmp_path.replace(self.path)
+
+    def enqueue(self, message: OutboxMessage) -> None:
+        """
+        Add a message to the backlog.
+
+        Args:
+            message (OutboxMessage): The message.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self.pending.append(message)
+            with self.path.open("a", encoding="utf8") as file:
+                file.write(f"{json.dumps(asdict(message))}\n")
+
+    def get_min_interval(self, channel: str) -> int:
+        if channel == "email":
+            return settings.NOTIFY_EMAIL_MIN_INTERVAL_SECONDS
+        return settings.NOTIFY_TELEGRAM_MIN_INTERVAL_SECONDS
+
+    def is_rate_limited(self, channel: str) -> bool:
+        last_sent_at = self.last_sent_at.get(channel)
+        if last_sent_at is None:
+            return False
+        return time.time() - last_sent_at < self.get_min_interval(channel=channel)
+
+    async def send(self, channel: str, text: str) -> None:
+        """
+        Send a digest on a channel. Email is sent in a thread, as SMTP is blocking.
+
+        Args:
+            channel (str): "telegram" or "email".
+            text (str): The digest text.
+        """
+        if channel == "telegram":
+            await send_telegram_message(text=text[:TELEGRAM_MAX_MESSAGE_LENGTH])
+        else:
+            await asyncio.to_thread(
+                send_email,
+                email_to=settings.NOTIFY_EMAIL_TO,
+                subject_template="Server Notification",
+                html_template=text.replace("\n", "<br>"),
+                environment={"name": f"{settings.PROJECT_NAME}"},
+            )
+
+    async def flush(self, force: bool = False) -> int:
+        """
+        Send a digest of the pending messages for every channel that is not rate limited.
+
+        Args:
+            force (bool): Ignore the per-channel rate limits.
+
+        Returns:
+            int: The number of messages sent.
+        """
+        async with self._flush_lock:
+            with self._lock:
+                channels = sorted({message.channel for message in self.pending})
+
+            sent_ids: set[str] = set()
+            for channel in channels:
+                if not force and self.is_rate_limited(channel=channel):
+                    continue
+                with self._lock:
+                    messages = [message for message in self.pending if message.channel == channel]
+                messages = messages[: settings.NOTIFY_DIGEST_MAX_MESSAGES]
+
+                try:
+                    await self.send(channel=channel, text=build_digest(messages=messages))
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.error(f"Could not send {channel} notification digest. {e=}")
+                    continue
+
+                self.last_sent_at[channel] = time.time()
+                sent_ids.update(message.id for message in messages)
+
+            if sent_ids:
+                with self._lock:
+                    self.pending = [
+                        message for message in self.pending if message.id not in sent_ids
+                    ]
+                self.save()
+            return len(sent_ids)
+
+
+outbox = NotificationOutbox(path=paths.NOTIFY_OUTBOX_FILE)
+
+
+async def queue_notification(
+    text: str,
+    telegram: bool = True,
+    email: bool = settings.EMAILS_ENABLED,
+    group: str | None = None,
+) -> dict[str, Any]:
+    """
+    Queue a notification in the outbox without waiting for it to be sent.
+    Sends immediately if the outbox is disabled.
+
+    Args:
+        text (str): The notification text.
+        telegram (bool): Whether to send the notification via Telegram. Defaults to True.
+        email (bool): Whether to send the notification via email.
+        group (str | None): The digest group. Defaults to the message's error type.
+
+    Returns:
+        dict[str, Any]: The response from the notification types APIs, if sent immediately.
+    """
+    if not settings.NOTIFY_OUTBOX_ENABLED:
+        return await notify(text=text, telegram=telegram, email=email)
+
+    group = group or get_message_group(text=text)
+    if telegram and settings.NOTIFY_TELEGRAM_ENABLED:
+        outbox.enqueue(OutboxMessage(channel="telegram", text=text, group=group))
+    if email and settings.NOTIFY_EMAIL_ENABLED:
+        outbox.enqueue(OutboxMessage(channel="email", text=text, group=group))
+    return {}
@@ -0,0 +1,279 @@
+"""
+Opt-in profiling of slow requests and background tasks.
+
+While a request or task is profiled, a sampler thread records the call stack of the event
+loop thread every `PROFILING_INTERVAL_MS`. If the request or task took longer than
+`PROFILING_SLOW_THRESHOLD_MS`, the samples are saved to `PROFILES_PATH` in the folded
+stack format used by flamegraph.pl, inferno and speedscope.
+
+Profiling is disabled by default. When disabled, the middleware is not installed and
+`profile_task` calls the wrapped coroutine directly.
+"""
+
+from types import FrameType
+from typing import Any, ParamSpec, TypeVar
+
+import functools
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+
+from fastapi import Request, Response
+from loguru import logger as _logger
+
+from app.core.uuid import generate_uuid_random
+from app.models.server import ProfileInfo
+from app.models.settings import Settings as _Settings
+from app.paths import BASE_PATH, PROFILES_PATH
+
+settings = _Settings()
+
+logger = _logger.bind(name="logger")
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# Only one profile is recorded at a time, as samples of the shared event loop thread can
+# not be attributed to one of several concurrent requests.
+_profile_lock = threading.Lock()
+
+
+class ProfileNotFoundError(Exception):
+    pass
+
+
+def get_frame_name(frame: FrameType) -> str:
+    """
+    Get the flamegraph name of a stack frame, ie. "fetch_source (app/services/fetch.py:129)".
+
+    Args:
+        frame (FrameType): The frame.
+
+    Returns:
+        str: The frame name.
+    """
+    code = frame.f_code
+    filename = code.co_filename
+    try:
+        filename = str(Path(filename).relative_to(BASE_PATH.parent))
+    except ValueError:
+        pass
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+def get_folded_stack(frame: FrameType | None) -> str:
+    """
+    Get the folded representation of a call stack, from the outermost frame to `frame`.
+
+    Args:
+        frame (FrameType | None): The innermost frame.
+
+    Returns:
+        str: The frame names joined by ";".
+    """
+    names = []
+    while frame is not None:
+        names.append(get_frame_name(frame=frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """
+    Samples the call stack of a thread at a fixed interval.
+    """
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiling-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # pylint: disable=protected-access
+            if frame is not None:
+                self.samples[get_folded_stack(frame=frame)] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._thread.join()
+
+    def get_folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def get_profile_paths(profile_id: str) -> tuple[Path, Path]:
+    """
+    Get the metadata and folded stacks file paths of a profile.
+
+    Args:
+        profile_id (str): The profile id.
+
+    Returns:
+        tuple[Path, Path]: The .json metadata path and the .folded samples path.
+
+    Raises:
+        ProfileNotFoundError: If the profile id is invalid.
+    """
+    if not re.fullmatch(r"[A-Za-z0-9_-]+", profile_id):
+        raise ProfileNotFoundError(f"Invalid profile id. {profile_id=}")
+    return PROFILES_PATH / f"{profile_id}.json", PROFILES_PATH / f"{profile_id}.folded"
+
+
+def prune_profiles() -> None:
+    """
+    Delete the oldest profiles above `PROFILING_MAX_PROFILES`.
+    """
+    profiles = get_profiles()
+    for profile in profiles[settings.PROFILING_MAX_PROFILES :]:
+        for path in get_profile_paths(profile_id=profile.id):
+            path.unlink(missing_ok=True)
+
+
+def save_profile(kind: str, name: str, duration: float, sampler: StackSampler) -> ProfileInfo:
+    """
+    Save the samples of a profiled request or task.
+
+    Args:
+        kind (str): "request" or "task".
+        name (str): The request path or task name.
+        duration (float): The duration in seconds.
+        sampler (StackSampler): The sampler that recorded the profile.
+
+    Returns:
+        ProfileInfo: The saved profile.
+    """
+    created_at = datetime.utcnow()
+    profile = ProfileInfo(
+        id=f"{created_at:%Y%m%d%H%M%S}_{generate_uuid_random()}",
+        kind=kind,
+        name=name,
+        duration_ms=round(duration * 1000, 1),
+        samples=sum(sampler.samples.values()),
+        created_at=created_at,
+    )
+    PROFILES_PATH.mkdir(parents=True, exist_ok=True)
+    metadata_path, folded_path = get_profile_paths(profile_id=profile.id)
+    folded_path.write_text(sampler.get_folded(), encoding="utf8")
+    metadata_path.write_text(profile.json(), encoding="utf8")
+    prune_profiles()
+
+    logger.info(f"Saved profile of slow {kind} '{name}' ({profile.duration_ms}ms). {profile.id=}")
+    return profile
+
+
+def get_profiles() -> list[ProfileInfo]:
+    """
+    Get the saved profiles, newest first.
+
+    Returns:
+        list[ProfileInfo]: The saved profiles.
+    """
+    profiles = []
+    for metadata_path in PROFILES_PATH.glob("*.json"):
+        try:
+            profiles.append(ProfileInfo(**json.loads(metadata_path.read_text(encoding="utf8"))))
+        except (json.JSONDecodeError, ValueError, TypeError):
+            logger.warning(f"Skipping invalid profile metadata. {metadata_path=}")
+    return sorted(profiles, key=lambda profile: profile.created_at, reverse=True)
+
+
+def get_profile_file(profile_id: str) -> Path:
+    """
+    Get the folded stacks file of a saved profile.
+
+    Args:
+        profile_id (str): The profile id.
+
+    Returns:
+        Path: The .folded file.
+
+    Raises:
+        ProfileNotFoundError: If the profile does not exist.
+    """
+    _, folded_path = get_profile_paths(profile_id=profile_id)
+    if not folded_path.exists():
+        raise ProfileNotFoundError(f"Profile not found. {profile_id=}")
+    return folded_path
+
+
+@asynccontextmanager
+async def profile(kind: str, name: str) -> AsyncIterator[None]:
+    """
+    Profile the block, saving the profile if it is slower than `PROFILING_SLOW_THRESHOLD_MS`.
+
+    Only a `PROFILING_SAMPLE_RATE` fraction of calls are profiled, and calls made while
+    another profile is being recorded are not profiled.
+
+    Args:
+        kind (str): "request" or "task".
+        name (str): The request path or task name.
+    """
+    if random.random() >= settings.PROFILING_SAMPLE_RATE or not _profile_lock.acquire(
+        blocking=False
+    ):
+        yield
+        return
+
+    sampler = StackSampler(
+        thread_id=threading.get_ident(), interval=settings.PROFILING_INTERVAL_MS / 1000
+    )
+    start = time.perf_counter()
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        duration = time.perf_counter() - start
+        _profile_lock.release()
+        if duration * 1000 >= settings.PROFILING_SLOW_THRESHOLD_MS and sampler.samples:
+            save_profile(kind=kind, name=name, duration=duration, sampler=sampler)
+
+
+async def profile_request(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """
+    HTTP middleware that profiles requests.
+    """
+    async with profile(kind="request", name=f"{request.method} {request.url.path}"):
+        return await call_next(request)
+
+
+def profile_task(
+    name: str,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Coroutine[Any, Any, T]]]:
+    """
+    Decorator that profiles a background task, if profiling is enabled.
+
+    Args:
+        name (str): The task name.
+
+    Returns:
+        Callable: The decorator.
+    """
+
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Coroutine[Any, Any, T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            if not settings.PROFILING_ENABLED:
+                return await func(*args, **kwargs)
+            async with profile(kind="task", name=name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,4 +1,5 @@
 import re
+from collections.abc import AsyncIterator
 
 import httpx
 from fastapi import HTTPException, status
@@ -7,6 +8,7 @@ from fastapi.responses import StreamingResponse
 from starlette.background import BackgroundTask
 
 from app import logger, settings
+from app.core import metrics
 
 
 class Http403ForbiddenError(Exception):
@@ -57,13 +59,32 @@ async def reverse_proxy(url: str, request: Request) -> StreamingResponse:
 
     # Stream Response
     return StreamingResponse(
-        rp_response.aiter_raw(),
+        count_streamed_bytes(stream=rp_response.aiter_raw()),
         status_code=rp_response.status_code,
         headers=rp_response.headers,
         background=BackgroundTask(rp_response.aclose),
     )
 
 
+async def count_streamed_bytes(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Pass through a reverse proxy stream, recording the streamed bytes and active streams.
+
+    Args:
+        stream (AsyncIterator[bytes]): The upstream response stream.
+
+    Yields:
+        bytes: The stream's chunks.
+    """
+    metrics.PROXY_ACTIVE_STREAMS.inc()
+    try:
+        async for chunk in stream:
+            metrics.PROXY_BYTES.inc(len(chunk))
+            yield chunk
+    finally:
+        metrics.PROXY_ACTIVE_STREAMS.dec()
+
+
 async def build_reverse_proxy_request(
     client: httpx.AsyncClient, url: str | httpx.URL, method: str
 ) -> httpx.Request:
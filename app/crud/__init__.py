@@ -1,6 +1,9 @@
+from .archived_video import *
 from .criteria import *
 from .exceptions import *
+from .fetch_history import *
 from .filter import *
 from .source import *
 from .user import *
 from .video import *
+from .websub import *
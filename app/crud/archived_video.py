@@ -0,0 +1,28 @@
+from sqlmodel import Session, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import models
+from app.db.session import run_sync
+
+from .base import BaseCRUD
+
+
+class ArchivedVideoCRUD(
+    BaseCRUD[models.ArchivedVideo, models.ArchivedVideoCreate, models.ArchivedVideoUpdate]
+):
+    async def get_existing_ids(self, db: Session | AsyncSession, ids: list[str]) -> set[str]:
+        """
+        Get which of the given video ids are archived.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            ids (list[str]): The video ids.
+
+        Returns:
+            set[str]: The ids of the archived videos.
+        """
+        statement = select(models.ArchivedVideo.id).where(col(models.ArchivedVideo.id).in_(ids))
+        return await run_sync(db, lambda session: set(session.exec(statement).all()))
+
+
+archived_video = ArchivedVideoCRUD(models.ArchivedVideo)
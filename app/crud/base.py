@@ -1,19 +1,102 @@
 from typing import Any, Generic, TypeVar
 
+import base64
+import binascii
+import datetime
+from collections.abc import Collection, Sequence
+
+import orjson
+from sqlalchemy import DateTime, and_, or_
 from sqlalchemy import select as sa_select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.sql.elements import BinaryExpression
+from sqlalchemy.orm import InstrumentedAttribute, load_only
+from sqlalchemy.sql.elements import BinaryExpression, ColumnElement
 from sqlalchemy.sql.expression import func
 from sqlmodel import Session, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.crud.exceptions import DeleteError, RecordAlreadyExistsError, RecordNotFoundError
+from app.crud.exceptions import (
+    DeleteError,
+    InvalidCursorError,
+    RecordAlreadyExistsError,
+    RecordNotFoundError,
+)
+from app.db.session import run_sync
 
 ModelType = TypeVar("ModelType", bound=SQLModel)
 ModelCreateType = TypeVar("ModelCreateType", bound=SQLModel)
 ModelUpdateType = TypeVar("ModelUpdateType", bound=SQLModel)
 
 
+def encode_cursor(value: Any, id: str) -> str:
+    """
+    Encode the position of a row in a keyset ordering into an opaque cursor.
+
+    Args:
+        value: The row's value of the ordering column.
+        id: The row's id.
+
+    Returns:
+        The url-safe cursor.
+    """
+    return base64.urlsafe_b64encode(orjson.dumps([value, id])).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, column: InstrumentedAttribute) -> tuple[Any, str]:
+    """
+    Decode a cursor made by `encode_cursor`.
+
+    Args:
+        cursor: The cursor.
+        column: The ordering column, used to restore the type of the value.
+
+    Returns:
+        The value of the ordering column, and the id, of the last row of the previous page.
+
+    Raises:
+        InvalidCursorError: If the cursor can not be decoded.
+    """
+    try:
+        value, id = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if value is not None and isinstance(column.type, DateTime):
+            value = datetime.datetime.fromisoformat(value)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError) as exc:
+        raise InvalidCursorError(f"Invalid cursor {cursor!r}") from exc
+    if not isinstance(id, str):
+        raise InvalidCursorError(f"Invalid cursor {cursor!r}")
+    return value, id
+
+
+def after_cursor(
+    column: InstrumentedAttribute, id_column: InstrumentedAttribute, value: Any, id: str
+) -> ColumnElement[Any]:
+    """
+    Filter for the rows after a position, in descending `(column, id)` order.
+
+    Rows with a NULL `column` come last, as they do in SQLite's descending order.
+
+    Args:
+        column: The ordering column.
+        id_column: The id column, which breaks the ties of the ordering column.
+        value: The value of the ordering column at the position.
+        id: The id at the position.
+
+    Returns:
+        The filter clause.
+    """
+    if value is None:
+        return and_(column.is_(None), id_column < id)
+    return or_(column < value, and_(column == value, id_column < id), column.is_(None))
+
+
 class BaseCRUD(Generic[ModelType, ModelCreateType, ModelUpdateType]):
+    """
+    Generic CRUD operations for a model.
+
+    Every method accepts either a `Session` or an `AsyncSession`. The ORM code runs with
+    `run_sync`, so that it does not block the event loop on the async backend.
+    """
+
     def __init__(self, model: type[ModelType]) -> None:
         """
         Initialize the CRUD object.
@@ -23,25 +106,37 @@ class BaseCRUD(Generic[ModelType, ModelCreateType, ModelUpdateType]):
         """
         self.model = model
 
-    async def get_all(self, db: Session) -> list[ModelType]:
+    async def get_all(self, db: Session | AsyncSession) -> list[ModelType]:
         """
         Get all records for the model.
 
         Args:
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
 
         Returns:
             A list of all records, or None if there are none.
         """
         statement = select(self.model)
-        return db.exec(statement).all() or []
+        return await run_sync(db, lambda session: session.exec(statement).all() or [])
+
+    def _get(self, session: Session, *args: BinaryExpression[Any], **kwargs: Any) -> ModelType:
+        statement = select(self.model).filter(*args).filter_by(**kwargs)
 
-    async def get(self, *args: BinaryExpression[Any], db: Session, **kwargs: Any) -> ModelType:
+        result = session.exec(statement).first()
+        if result is None:
+            raise RecordNotFoundError(
+                f"{self.model.__name__}({args=} {kwargs=}) not found in database"
+            )
+        return result
+
+    async def get(
+        self, *args: BinaryExpression[Any], db: Session | AsyncSession, **kwargs: Any
+    ) -> ModelType:
         """
         Get a record by its primary key(s).
 
         Args:
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             args: Binary expressions to filter by.
             kwargs: Keyword arguments to filter by.
 
@@ -51,23 +146,16 @@ class BaseCRUD(Generic[ModelType, ModelCreateType, ModelUpdateType]):
         Raises:
             RecordNotFoundError: If no matching record is found.
         """
-        statement = select(self.model).filter(*args).filter_by(**kwargs)
-
-        result = db.exec(statement).first()
-        if result is None:
-            raise RecordNotFoundError(
-                f"{self.model.__name__}({args=} {kwargs=}) not found in database"
-            )
-        return result
+        return await run_sync(db, self._get, *args, **kwargs)
 
     async def get_or_none(
-        self, db: Session, *args: BinaryExpression[Any], **kwargs: Any
+        self, db: Session | AsyncSession, *args: BinaryExpression[Any], **kwargs: Any
     ) -> ModelType | None:
         """
         Get a record by its primary key(s), or return None if no matching record is found.
 
         Args:
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             args: Binary expressions to filter by.
             kwargs: Keyword arguments to filter by.
 
@@ -83,7 +171,7 @@ class BaseCRUD(Generic[ModelType, ModelCreateType, ModelUpdateType]):
     async def get_multi(
         self,
         *args: BinaryExpression[Any],
-        db: Session,
+        db: Session | AsyncSession,
         skip: int = 0,
         limit: int = 100,
         **kwargs: Any,
@@ -92,7 +180,7 @@ class BaseCRUD(Generic[ModelType, ModelCreateType, ModelUpdateType]):
         Retrieve multiple rows from the database that match the given criteria.
 
         Args:
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             skip: The number of rows to skip.
             limit: The maximum number of rows to return.
             args: Binary expressions used to filter the rows to be retrieved.
@@ -103,14 +191,78 @@ class BaseCRUD(Generic[ModelType, ModelCreateType, ModelUpdateType]):
         """
 
         statement = select(self.model).filter(*args).filter_by(**kwargs).offset(skip).limit(limit)
-        return db.exec(statement).fetchmany()
+        return await run_sync(db, lambda session: session.exec(statement).fetchmany())
 
-    async def create(self, db: Session, *, obj_in: ModelCreateType, **kwargs: Any) -> ModelType:
+    async def get_page(
+        self,
+        *args: BinaryExpression[Any],
+        db: Session | AsyncSession,
+        order_by: str = "created_at",
+        cursor: str | None = None,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Collection[str] | None = None,
+        options: Sequence[Any] = (),
+        **kwargs: Any,
+    ) -> tuple[list[ModelType], str | None]:
+        """
+        Retrieve a page of rows, newest first, using keyset pagination.
+
+        The rows are ordered by `(order_by, id)`, descending. Each page continues after the
+        `cursor` returned with the previous one, so that walking every page reads each row once,
+        instead of skipping over the rows of all the previous pages.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            order_by: The column to order the rows by.
+            cursor: The cursor returned with the previous page, or None for the first page.
+            skip: The number of rows to skip, after the cursor.
+            limit: The maximum number of rows to return.
+            fields: Only load these columns, with the id and `order_by` columns.
+                Loads all the columns if None.
+            options: Loader options for the statement, e.g. `selectinload()`.
+            args: Binary expressions used to filter the rows to be retrieved.
+            kwargs: Keyword arguments used to filter the rows to be retrieved.
+
+        Returns:
+            The rows, and the cursor of the next page, or None if this is the last page.
+
+        Raises:
+            InvalidCursorError: If the cursor can not be decoded.
+        """
+        order_column = getattr(self.model, order_by)
+        id_column = getattr(self.model, "id")
+        statement = select(self.model).filter(*args).filter_by(**kwargs)
+        if cursor is not None:
+            value, id = decode_cursor(cursor=cursor, column=order_column)
+            statement = statement.filter(
+                after_cursor(column=order_column, id_column=id_column, value=value, id=id)
+            )
+        if fields is not None:
+            columns = self.model.__table__.columns.keys()  # type: ignore
+            load_fields = {order_by, *(field for field in fields if field in columns)}
+            options = [load_only(*(getattr(self.model, f) for f in load_fields)), *options]
+        statement = (
+            statement.options(*options)
+            .order_by(order_column.desc(), id_column.desc())
+            .offset(skip)
+            .limit(limit + 1)
+        )
+
+        rows = await run_sync(db, lambda session: session.exec(statement).all())
+        if len(rows) <= limit:
+            return rows, None
+        last_row = rows[limit - 1]
+        return rows[:limit], encode_cursor(value=getattr(last_row, order_by), id=last_row.id)
+
+    async def create(
+        self, db: Session | AsyncSession, *, obj_in: ModelCreateType, **kwargs: Any
+    ) -> ModelType:
         """
         Create a new record.
 
         Args:
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             obj_in: The object to create.
 
         Returns:
@@ -121,19 +273,22 @@ class BaseCRUD(Generic[ModelType, ModelCreateType, ModelUpdateType]):
         """
         out_obj = self.model(**{**obj_in.dict(), **kwargs})
 
-        db.add(out_obj)
-        try:
-            db.commit()
-        except IntegrityError as exc:
-            raise RecordAlreadyExistsError(
-                f"{self.model.__name__}({obj_in=}) already exists in database"
-            ) from exc
-        db.refresh(out_obj)
-        return out_obj
+        def _create(session: Session) -> ModelType:
+            session.add(out_obj)
+            try:
+                session.commit()
+            except IntegrityError as exc:
+                raise RecordAlreadyExistsError(
+                    f"{self.model.__name__}({obj_in=}) already exists in database"
+                ) from exc
+            session.refresh(out_obj)
+            return out_obj
+
+        return await run_sync(db, _create)
 
     async def update(
         self,
-        db: Session,
+        db: Session | AsyncSession,
         *args: BinaryExpression[Any],
         obj_in: ModelUpdateType,
         exclude_none: bool = True,
@@ -146,7 +301,7 @@ class BaseCRUD(Generic[ModelType, ModelCreateType, ModelUpdateType]):
         Args:
             obj_in (ModelUpdateType): The updated object.
             args (BinaryExpression): Binary expressions to filter by.
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             exclude_none (bool): Whether to exclude None values from the update.
             exclude_unset (bool): Whether to exclude unset values from the update.
             kwargs (Any): Keyword arguments to filter by.
@@ -159,44 +314,55 @@ class BaseCRUD(Generic[ModelType, ModelCreateType, ModelUpdateType]):
         """
         if not args and not kwargs:
             raise ValueError("crud.base.update() Must provide at least one filter")
-        db_obj = await self.get(db=db, *args, **kwargs)
-
+        db_obj = await self.get(*args, db=db, **kwargs)
         obj_in_values = obj_in.dict(exclude_unset=exclude_unset, exclude_none=exclude_none)
-        db_obj_values = db_obj.dict()
-        for obj_in_key, obj_in_value in obj_in_values.items():
-            if obj_in_value != db_obj_values[obj_in_key]:
-                setattr(db_obj, obj_in_key, obj_in_value)
 
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        def _update(session: Session) -> ModelType:
+            db_obj_values = db_obj.dict()
+            for obj_in_key, obj_in_value in obj_in_values.items():
+                if obj_in_value != db_obj_values[obj_in_key]:
+                    setattr(db_obj, obj_in_key, obj_in_value)
+
+            session.commit()
+            session.refresh(db_obj)
+            return db_obj
 
-    async def remove(self, db: Session, *args: BinaryExpression[Any], **kwargs: Any) -> None:
+        return await run_sync(db, _update)
+
+    async def remove(
+        self, db: Session | AsyncSession, *args: BinaryExpression[Any], **kwargs: Any
+    ) -> None:
         """
         Delete a record.
 
         Args:
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             args: Binary expressions to filter by.
             kwargs: Keyword arguments to filter by.
 
         Raises:
             DeleteError: If an error occurs while deleting the record.
         """
-        db_obj = await self.get(db=db, *args, **kwargs)
-        try:
-            db.delete(db_obj)
-            db.refresh(db_obj)
-            db.commit()
-        except Exception as exc:
-            raise DeleteError("Error while deleting") from exc
+        db_obj = await self.get(*args, db=db, **kwargs)
 
-    async def count(self, db: Session, *args: BinaryExpression[Any], **kwargs: Any) -> Any:
+        def _remove(session: Session) -> None:
+            try:
+                session.delete(db_obj)
+                session.refresh(db_obj)
+                session.commit()
+            except Exception as exc:
+                raise DeleteError("Error while deleting") from exc
+
+        await run_sync(db, _remove)
+
+    async def count(
+        self, db: Session | AsyncSession, *args: BinaryExpression[Any], **kwargs: Any
+    ) -> Any:
         """
         Get the total count of records for the model.
 
         Args:
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             args: Binary expressions to filter by.
             kwargs: Keyword arguments to filter by.
 
@@ -205,5 +371,4 @@ class BaseCRUD(Generic[ModelType, ModelCreateType, ModelUpdateType]):
         """
 
         query = sa_select(func.count()).select_from(self.model).filter(*args).filter_by(**kwargs)
-        result = db.execute(query).scalar()
-        return result
+        return await run_sync(db, lambda session: session.execute(query).scalar())
@@ -2,6 +2,7 @@ from typing import Any
 
 from sqlalchemy.sql.elements import BinaryExpression
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import models
 from app.models.criteria import CriteriaField
@@ -11,13 +12,13 @@ from .base import BaseCRUD
 
 class CriteriaCRUD(BaseCRUD[models.Criteria, models.CriteriaCreate, models.CriteriaUpdate]):
     async def create(
-        self, db: Session, *, obj_in: models.CriteriaCreate, **kwargs: Any
+        self, db: Session | AsyncSession, *, obj_in: models.CriteriaCreate, **kwargs: Any
     ) -> models.Criteria:
         """
         Create a new record.
 
         Args:
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             obj_in: The object to create.
 
         Returns:
@@ -42,7 +43,7 @@ class CriteriaCRUD(BaseCRUD[models.Criteria, models.CriteriaCreate, models.Crite
 
     async def update(
         self,
-        db: Session,
+        db: Session | AsyncSession,
         *args: BinaryExpression[Any],
         obj_in: models.CriteriaUpdate,
         exclude_none: bool = True,
@@ -55,7 +56,7 @@ class CriteriaCRUD(BaseCRUD[models.Criteria, models.CriteriaCreate, models.Crite
         Args:
             obj_in (models.CriteriaCreate): The updated object.
             args (BinaryExpression): Binary expressions to filter by.
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             exclude_none (bool): Whether to exclude None values from the update.
             exclude_unset (bool): Whether to exclude unset values from the update.
             kwargs (Any): Keyword arguments to filter by.
@@ -22,3 +22,10 @@ class DeleteError(Exception):
     Exception raised when there is an error deleting a record from the database
     (e.g. record is referenced by other records).
     """
+
+
+class InvalidCursorError(ValueError):
+    """
+    Exception raised when a pagination cursor can not be decoded
+    (e.g. it was altered, or made for another ordering).
+    """
@@ -0,0 +1,124 @@
+from typing import cast
+
+import datetime
+
+from sqlalchemy import case, delete, func
+from sqlalchemy.engine import CursorResult
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import models
+from app.db.session import run_sync
+
+from .base import BaseCRUD
+
+
+class FetchHistoryCRUD(
+    BaseCRUD[models.FetchHistory, models.FetchHistoryCreate, models.FetchHistoryUpdate]
+):
+    async def get_source_history(
+        self, db: Session | AsyncSession, source_id: str, limit: int = 100
+    ) -> list[models.FetchHistory]:
+        """
+        Get the most recent fetches of a source.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            source_id (str): The source's id.
+            limit (int): The maximum number of fetches to return.
+
+        Returns:
+            list[models.FetchHistory]: The fetches, newest first.
+        """
+        statement = (
+            select(models.FetchHistory)
+            .where(models.FetchHistory.source_id == source_id)
+            .order_by(models.FetchHistory.started_at.desc())  # type: ignore
+            .limit(limit)
+        )
+        return await run_sync(db, lambda session: session.exec(statement).all())
+
+    async def get_source_costs(
+        self, db: Session | AsyncSession, since: datetime.datetime | None = None, limit: int = 100
+    ) -> list[models.SourceFetchCost]:
+        """
+        Rank sources by the cumulative time spent fetching them.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            since (datetime.datetime | None): Only include fetches started after this time.
+            limit (int): The maximum number of sources to return.
+
+        Returns:
+            list[models.SourceFetchCost]: The sources' fetch costs, most expensive first.
+        """
+        history = models.FetchHistory
+        total_seconds = func.sum(history.duration_seconds)
+        statement = (
+            select(  # type: ignore
+                history.source_id,
+                models.Source.name,
+                models.Source.handler,
+                func.count(history.id),
+                func.sum(case((history.error.is_not(None), 1), else_=0)),  # type: ignore
+                total_seconds,
+                func.avg(history.duration_seconds),
+                func.sum(history.ytdlp_seconds),
+                func.sum(history.db_seconds),
+                func.sum(history.feed_seconds),
+                func.sum(history.entries),
+                func.sum(history.bytes_extracted),
+                func.sum(history.added_videos),
+                func.max(history.started_at),
+            )
+            .join(models.Source, models.Source.id == history.source_id)
+            .group_by(history.source_id)
+            .order_by(total_seconds.desc())
+            .limit(limit)
+        )
+        if since is not None:
+            statement = statement.where(history.started_at >= since)
+
+        rows = await run_sync(db, lambda session: session.exec(statement).all())
+        return [
+            models.SourceFetchCost(
+                source_id=row[0],
+                source_name=row[1],
+                handler=row[2],
+                fetches=row[3],
+                errors=row[4],
+                total_seconds=row[5],
+                avg_seconds=row[6],
+                ytdlp_seconds=row[7],
+                db_seconds=row[8],
+                feed_seconds=row[9],
+                entries=row[10],
+                bytes_extracted=row[11],
+                added_videos=row[12],
+                last_fetched_at=row[13],
+            )
+            for row in rows
+        ]
+
+    async def remove_older_than(self, db: Session | AsyncSession, before: datetime.datetime) -> int:
+        """
+        Delete fetches that started before a given time.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            before (datetime.datetime): The cutoff time.
+
+        Returns:
+            int: The number of deleted fetches.
+        """
+        statement = delete(models.FetchHistory).where(models.FetchHistory.started_at < before)
+
+        def _remove_older_than(session: Session) -> int:
+            result = cast(CursorResult, session.execute(statement))
+            session.commit()
+            return int(result.rowcount)
+
+        return await run_sync(db, _remove_older_than)
+
+
+fetch_history = FetchHistoryCRUD(models.FetchHistory)
@@ -3,13 +3,19 @@ from typing import Any
 import random
 
 from loguru import logger as _logger
+from sqlalchemy import select as sa_select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql.elements import BinaryExpression
-from sqlmodel import Session
+from sqlmodel import Session, col, desc, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import crud, handlers, models
 from app.crud.base import BaseCRUD
+from app.db.session import run_sync
 from app.models.criteria import CriteriaField, CriteriaOperator, CriteriaUnitOfMeasure
-from app.services.feed import build_source_rss_files, delete_rss_file
+from app.services.feed import build_source_rss_files, delete_rss_file, load_video_descriptions
 from app.services.logo import DARK_COLORS
 from app.services.source import (
     create_source_logo,
@@ -24,7 +30,7 @@ logger = _logger.bind(name="logger")
 class SourceCRUD(BaseCRUD[models.Source, models.SourceCreate, models.SourceUpdate]):
     async def update(
         self,
-        db: Session,
+        db: Session | AsyncSession,
         *args: BinaryExpression[Any],
         obj_in: models.SourceUpdate,
         exclude_none: bool = True,
@@ -37,7 +43,7 @@ class SourceCRUD(BaseCRUD[models.Source, models.SourceCreate, models.SourceUpdat
         Args:
             obj_in (ModelUpdateType): The updated object.
             args (BinaryExpression): Binary expressions to filter by.
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             exclude_none (bool): Whether to exclude None values from the update.
             exclude_unset (bool): Whether to exclude unset values from the update.
             kwargs (Any): Keyword arguments to filter by.
@@ -62,11 +68,14 @@ class SourceCRUD(BaseCRUD[models.Source, models.SourceCreate, models.SourceUpdat
             **kwargs,
         )
 
+        db_source = await self.load_relationships(db=db, source=db_source)
         await build_source_rss_files(source=db_source)
 
         return db_source
 
-    async def remove(self, db: Session, *args: BinaryExpression[Any], **kwargs: Any) -> None:
+    async def remove(
+        self, db: Session | AsyncSession, *args: BinaryExpression[Any], **kwargs: Any
+    ) -> None:
         if source_id := kwargs.get("id"):
             #
 
@@ -80,14 +89,16 @@ class SourceCRUD(BaseCRUD[models.Source, models.SourceCreate, models.SourceUpdat
             return await super().remove(db, *args, **kwargs)
         raise ValueError("No source id provided")
 
-    async def create_source_from_url(self, db: Session, url: str, user_id: str) -> models.Source:
+    async def create_source_from_url(
+        self, db: Session | AsyncSession, url: str, user_id: str
+    ) -> models.Source:
         """
         Create a new source from a URL.
 
         Args:
             url: The URL to create the source from.
             user_id(str): The user id
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
 
         Returns:
             The created source.
@@ -134,16 +145,19 @@ class SourceCRUD(BaseCRUD[models.Source, models.SourceCreate, models.SourceUpdat
         if source_already_exists:
             raise crud.RecordAlreadyExistsError(f"Source '{db_source.name}' already exists")
 
+        db_source = await self.load_relationships(db=db, source=db_source)
         await build_source_rss_files(source=db_source)
 
         return db_source
 
-    async def add_default_filters(self, db: Session, source: models.Source, user_id: str) -> None:
+    async def add_default_filters(
+        self, db: Session | AsyncSession, source: models.Source, user_id: str
+    ) -> None:
         """
         Add default filters to a source.
 
         Args:
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             source (models.Source): The source to add the default filters to.
         """
 
@@ -305,17 +319,258 @@ class SourceCRUD(BaseCRUD[models.Source, models.SourceCreate, models.SourceUpdat
             ),
         )
 
-    async def delete_all_videos(self, db: Session, source_id: str) -> None:
+    async def load_relationships(
+        self, db: Session | AsyncSession, source: models.Source
+    ) -> models.Source:
+        """
+        Load the relationships of a source that its page and RSS files are built from.
+
+        The videos, with their descriptions, and the filters, with their criterias, are loaded
+        with a constant number of queries, instead of lazy loading them with one query per
+        filter and per video. An `AsyncSession` can not lazy load them.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            source (models.Source): The source.
+
+        Returns:
+            models.Source: The source, with its relationships loaded.
+        """
+        source = await self.load_videos(db=db, source=source)
+        return await self.load_filters(db=db, source=source)
+
+    async def load_videos(self, db: Session | AsyncSession, source: models.Source) -> models.Source:
+        """
+        Load the videos of a source, newest first, with their descriptions.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            source (models.Source): The source.
+
+        Returns:
+            models.Source: The source, with its videos loaded.
+        """
+
+        def _load_videos(session: Session) -> models.Source:
+            link = models.SourceVideoLink
+            statement = (
+                select(models.Video)
+                .join(link, link.video_id == models.Video.id)
+                .where(link.source_id == source.id)
+                .order_by(desc(models.Video.released_at))
+            )
+            videos = list(session.exec(statement).all())
+            set_committed_value(source, "videos", videos)
+            load_video_descriptions(videos=videos)
+            return source
+
+        return await run_sync(db, _load_videos)
+
+    async def load_filters(
+        self, db: Session | AsyncSession, source: models.Source
+    ) -> models.Source:
+        """
+        Load the filters of a source, with their criterias.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            source (models.Source): The source.
+
+        Returns:
+            models.Source: The source, with its filters loaded.
+        """
+
+        def _load_filters(session: Session) -> models.Source:
+            filters = list(
+                session.exec(select(models.Filter).where(models.Filter.source_id == source.id))
+            )
+            criterias = session.exec(
+                select(models.Criteria).where(
+                    col(models.Criteria.filter_id).in_([filter.id for filter in filters])
+                )
+            ).all()
+            for filter in filters:
+                set_committed_value(filter, "source", source)
+                set_committed_value(
+                    filter,
+                    "criterias",
+                    [criteria for criteria in criterias if criteria.filter_id == filter.id],
+                )
+            set_committed_value(source, "filters", filters)
+            return source
+
+        return await run_sync(db, _load_filters)
+
+    async def get_stats(
+        self, db: Session | AsyncSession, source_ids: list[str]
+    ) -> dict[str, models.SourceStats]:
+        """
+        Get the number of videos and users, the latest video and the last fetch of sources.
+
+        The aggregates are computed with one query, instead of loading every source's videos.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            source_ids (list[str]): The source ids.
+
+        Returns:
+            dict[str, models.SourceStats]: The sources' stats, by source id.
+        """
+        source_id = col(models.Source.id)
+        video_link = models.SourceVideoLink
+        videos_count = (
+            sa_select(func.count()).where(video_link.source_id == source_id).scalar_subquery()
+        )
+        latest_released_at = (
+            sa_select(func.max(models.Video.released_at))
+            .join(video_link, video_link.video_id == models.Video.id)
+            .where(video_link.source_id == source_id)
+            .scalar_subquery()
+        )
+        users_count = (
+            sa_select(func.count())
+            .where(models.UserSourceLink.source_id == source_id)
+            .scalar_subquery()
+        )
+        last_fetched_at = (
+            sa_select(func.max(models.FetchHistory.started_at))
+            .where(models.FetchHistory.source_id == source_id)
+            .scalar_subquery()
+        )
+        statement = sa_select(
+            source_id, videos_count, users_count, latest_released_at, last_fetched_at
+        ).where(source_id.in_(source_ids))
+
+        rows = await run_sync(db, lambda session: session.execute(statement).all())
+        return {
+            row[0]: models.SourceStats(
+                source_id=row[0],
+                videos_count=row[1],
+                users_count=row[2],
+                latest_released_at=row[3],
+                last_fetched_at=row[4],
+            )
+            for row in rows
+        }
+
+    async def get_fetchable_ids(self, db: Session | AsyncSession) -> list[str]:
+        """
+        Get the ids of the sources fetched by `fetch_all_sources`, ie. active and not deleted.
+
+        Only the ids are loaded, so that the sources can be fetched one at a time.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+
+        Returns:
+            list[str]: The source ids.
+        """
+        statement = select(models.Source.id).where(
+            col(models.Source.is_deleted).is_not(True), col(models.Source.is_active).is_not(False)
+        )
+        return await run_sync(db, lambda session: list(session.exec(statement).all()))
+
+    async def get_video_urls(self, db: Session | AsyncSession, source_id: str) -> list[str]:
+        """
+        Get the urls of a source's videos, without loading the videos.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            source_id (str): The source id.
+
+        Returns:
+            list[str]: The video urls.
+        """
+        statement = (
+            select(models.Video.url)
+            .join(models.SourceVideoLink, models.SourceVideoLink.video_id == models.Video.id)
+            .where(models.SourceVideoLink.source_id == source_id)
+        )
+        return await run_sync(db, lambda session: list(session.exec(statement).all()))
+
+    async def get_videos(
+        self, db: Session | AsyncSession, source_id: str, skip: int = 0, limit: int = 100
+    ) -> list[models.Video]:
+        """
+        Get a page of a source's videos, newest first, with their descriptions.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            source_id (str): The source id.
+            skip (int): The number of videos to skip.
+            limit (int): The maximum number of videos to return.
+
+        Returns:
+            list[models.Video]: The videos.
+        """
+        link = models.SourceVideoLink
+        statement = (
+            select(models.Video)
+            .join(link, link.video_id == models.Video.id)
+            .where(link.source_id == source_id)
+            .options(selectinload(models.Video.description_row))  # type: ignore
+            .order_by(desc(models.Video.released_at))
+            .offset(skip)
+            .limit(limit)
+        )
+        return await run_sync(db, lambda session: list(session.exec(statement).all()))
+
+    async def get_video_ids(self, db: Session | AsyncSession, source_id: str) -> set[str]:
+        """
+        Get the ids of a source's videos, without loading the videos.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            source_id (str): The source id.
+
+        Returns:
+            set[str]: The video ids.
+        """
+        statement = select(models.SourceVideoLink.video_id).where(
+            models.SourceVideoLink.source_id == source_id
+        )
+        return await run_sync(db, lambda session: set(session.exec(statement).all()))
+
+    async def add_videos(
+        self, db: Session | AsyncSession, source_id: str, video_ids: list[str]
+    ) -> None:
+        """
+        Link existing videos to a source, in a single commit.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            source_id (str): The source id.
+            video_ids (list[str]): The ids of the videos, which must not be linked yet.
+
+        Raises:
+            RecordAlreadyExistsError: If a video is already linked to the source.
+        """
+        links = [
+            models.SourceVideoLink(source_id=source_id, video_id=video_id) for video_id in video_ids
+        ]
+
+        def _add_videos(session: Session) -> None:
+            session.add_all(links)
+            try:
+                session.commit()
+            except IntegrityError as exc:
+                session.rollback()
+                raise crud.RecordAlreadyExistsError(
+                    f"A video is already linked to Source(id='{source_id}')"
+                ) from exc
+
+        await run_sync(db, _add_videos)
+
+    async def delete_all_videos(self, db: Session | AsyncSession, source_id: str) -> None:
         """
         Delete all videos from a source.
 
         Args:
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             source_id (str): The source id.
         """
-        source = await self.get(db=db, id=source_id)
-        for video in source.videos:
-            await crud.video.remove(db=db, id=video.id)
+        for video_id in await self.get_video_ids(db=db, source_id=source_id):
+            await crud.video.remove(db=db, id=video_id)
 
 
 source = SourceCRUD(models.Source)
@@ -1,20 +1,22 @@
-from sqlmodel import Session
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import models
 from app.core import security
+from app.db.session import run_sync
 
 from .base import BaseCRUD
 
 
 class UserCRUD(BaseCRUD[models.User, models.UserCreate, models.UserUpdate]):
     async def create_with_password(
-        self, db: Session, *, obj_in: models.UserCreateWithPassword
+        self, db: Session | AsyncSession, *, obj_in: models.UserCreateWithPassword
     ) -> models.User:
         """
         Create a new user by generating a hashed password from the provided password.
 
         Args:
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             obj_in (models.UserCreateWithPassword): The user to create.
 
         Returns:
@@ -28,13 +30,13 @@ class UserCRUD(BaseCRUD[models.User, models.UserCreate, models.UserUpdate]):
         return await self.create(db, obj_in=out_obj)
 
     async def authenticate(
-        self, db: Session, *, username: str, password: str
+        self, db: Session | AsyncSession, *, username: str, password: str
     ) -> models.User | None:
         """
         Authenticate a user by checking the provided password against the hashed password.
 
         Args:
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             username (str): The username to authenticate.
             password (str): The password to authenticate.
 
@@ -75,43 +77,73 @@ class UserCRUD(BaseCRUD[models.User, models.UserCreate, models.UserUpdate]):
         """
         return user_.is_superuser
 
-    async def add_source(self, db: Session, user_id: str, source: models.Source) -> models.User:
+    async def add_source(
+        self, db: Session | AsyncSession, user_id: str, source: models.Source
+    ) -> models.User:
         """
         Add a source to a user.
 
         Args:
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             user_id (str): The id of the user to add the source to.
             source (models.Source): The source to add to the user.
 
         Returns:
             user (models.User): The updated user.
         """
-        user = await self.get(id=user_id, db=db)
-        user.sources.append(source)
-        db.commit()
-        db.refresh(user)
-        return user
 
-    async def remove_source(self, db: Session, user_id: str, source: models.Source) -> models.User:
+        def _add_source(session: Session) -> models.User:
+            user = self._get(session, id=user_id)
+            user.sources.append(source)
+            session.commit()
+            session.refresh(user)
+            # The user's sources are refreshed by cascade, so reload the source for the caller
+            session.refresh(source)
+            return user
+
+        return await run_sync(db, _add_source)
+
+    async def remove_source(
+        self, db: Session | AsyncSession, user_id: str, source: models.Source
+    ) -> models.User:
         """
         Remove a source from a user.
 
         Args:
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
             user_id (str): The id of the user to remove the source from.
             source (models.Source): The source to remove from the user.
 
         Returns:
             user (models.User): The updated user.
         """
-        user = await self.get(id=user_id, db=db)
 
-        if source in user.sources:
-            user.sources.remove(source)
-            db.commit()
-            db.refresh(user)
-        return user
+        def _remove_source(session: Session) -> models.User:
+            user = self._get(session, id=user_id)
+            if source in user.sources:
+                user.sources.remove(source)
+                session.commit()
+                session.refresh(user)
+                session.refresh(source)
+            return user
+
+        return await run_sync(db, _remove_source)
+
+    async def get_source_ids(self, db: Session | AsyncSession, user_id: str) -> set[str]:
+        """
+        Get the ids of a user's sources, without loading the sources.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            user_id (str): The user id.
+
+        Returns:
+            set[str]: The source ids.
+        """
+        statement = select(models.UserSourceLink.source_id).where(
+            models.UserSourceLink.user_id == user_id
+        )
+        return await run_sync(db, lambda session: set(session.exec(statement).all()))
 
 
 user = UserCRUD(model=models.User)
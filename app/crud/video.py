@@ -1,6 +1,18 @@
-from sqlmodel import Session
+from typing import Any
+
+import datetime
+from collections.abc import Collection, Sequence
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.elements import BinaryExpression
+from sqlmodel import Session, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import crud, models
+from app.db.session import run_sync
+from app.handlers import registered_handlers
 from app.models.video import generate_video_id_from_url
 from app.services.video import get_video_from_video_info_dict, get_video_info_dict
 
@@ -8,12 +20,228 @@ from .base import BaseCRUD
 
 
 class VideoCRUD(BaseCRUD[models.Video, models.VideoCreate, models.VideoUpdate]):
-    async def create_video_from_url(self, url: str, db: Session) -> models.Video:
+    async def create(
+        self, db: Session | AsyncSession, *, obj_in: models.VideoCreate, **kwargs: Any
+    ) -> models.Video:
+        """
+        Create a new video, storing its description in the `videodescription` table.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            obj_in (models.VideoCreate): The video to create.
+
+        Returns:
+            The created video.
+
+        Raises:
+            RecordAlreadyExistsError: If the video already exists.
+        """
+        if obj_in.description is not None:
+            kwargs["description_row"] = models.VideoDescription.from_text(text=obj_in.description)
+        return await super().create(db=db, obj_in=obj_in, **kwargs)
+
+    async def create_many(
+        self, db: Session | AsyncSession, *, objs_in: list[models.VideoCreate]
+    ) -> list[models.Video]:
+        """
+        Create new videos, and their descriptions, in a single commit.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            objs_in (list[models.VideoCreate]): The videos to create.
+
+        Returns:
+            The created videos.
+
+        Raises:
+            RecordAlreadyExistsError: If a video already exists. No video is created.
+        """
+        db_objs = []
+        for obj_in in objs_in:
+            db_obj = models.Video(**obj_in.dict(exclude={"description"}))
+            if obj_in.description is not None:
+                db_obj.set_description(description=obj_in.description)
+            db_objs.append(db_obj)
+
+        def _create_many(session: Session) -> list[models.Video]:
+            session.add_all(db_objs)
+            try:
+                session.commit()
+            except IntegrityError as exc:
+                session.rollback()
+                raise crud.RecordAlreadyExistsError(
+                    f"One of {len(objs_in)} videos already exists in database"
+                ) from exc
+            return db_objs
+
+        return await run_sync(db, _create_many)
+
+    async def get_existing_ids(self, db: Session | AsyncSession, ids: list[str]) -> set[str]:
+        """
+        Get which of the given video ids are stored in the database.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            ids (list[str]): The video ids.
+
+        Returns:
+            set[str]: The ids of the videos that exist.
+        """
+        statement = select(models.Video.id).where(col(models.Video.id).in_(ids))
+        return await run_sync(db, lambda session: set(session.exec(statement).all()))
+
+    async def get_source_ids(self, db: Session | AsyncSession, video_id: str) -> list[str]:
+        """
+        Get the ids of the sources that a video belongs to.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            video_id (str): The video id.
+
+        Returns:
+            list[str]: The source ids.
+        """
+        link = models.SourceVideoLink
+        statement = select(link.source_id).where(link.video_id == video_id)
+        return await run_sync(db, lambda session: list(session.exec(statement).all()))
+
+    async def get_refresh_candidates(
+        self, db: Session | AsyncSession, limit: int | None = None
+    ) -> list[models.Video]:
+        """
+        Get the videos due for a refresh from yt-dlp, most overdue first.
+
+        Uses the indexed `next_refresh_at` column, instead of checking every video.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            limit (int | None): The maximum number of videos to return.
+
+        Returns:
+            list[models.Video]: The videos due for a refresh.
+        """
+        now = datetime.datetime.utcnow()
+        handlers = [handler for handler in registered_handlers if not handler.DISABLED]
+        released_recently = [
+            and_(
+                col(models.Video.handler) == handler.name,
+                col(models.Video.released_at)
+                > now - datetime.timedelta(days=handler.REFRESH_RELEASED_RECENT_DAYS),
+            )
+            for handler in handlers
+        ]
+        statement = (
+            select(models.Video)
+            .where(
+                col(models.Video.next_refresh_at) <= now,
+                col(models.Video.handler).in_([handler.name for handler in handlers]),
+                or_(
+                    col(models.Video.media_url).is_(None),
+                    col(models.Video.released_at).is_(None),
+                    *released_recently,
+                ),
+            )
+            .order_by(col(models.Video.next_refresh_at))
+            .limit(limit)
+        )
+        return await run_sync(db, lambda session: list(session.exec(statement).all()))
+
+    async def get_page(
+        self,
+        *args: BinaryExpression[Any],
+        db: Session | AsyncSession,
+        order_by: str = "created_at",
+        cursor: str | None = None,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Collection[str] | None = None,
+        options: Sequence[Any] = (),
+        **kwargs: Any,
+    ) -> tuple[list[models.Video], str | None]:
+        """
+        Retrieve a page of videos, newest first, using keyset pagination.
+
+        The descriptions are loaded in a single query per page, and only when `fields`
+        includes `description`.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            order_by: The column to order the videos by, `created_at` or `released_at`.
+            cursor: The cursor returned with the previous page, or None for the first page.
+            skip: The number of videos to skip, after the cursor.
+            limit: The maximum number of videos to return.
+            fields: Only load these fields. Loads all the fields if None.
+            options: Loader options for the statement.
+            args: Binary expressions used to filter the videos to be retrieved.
+            kwargs: Keyword arguments used to filter the videos to be retrieved.
+
+        Returns:
+            The videos, and the cursor of the next page, or None if this is the last page.
+        """
+        if fields is None or "description" in fields:
+            options = [selectinload(models.Video.description_row), *options]
+        return await super().get_page(
+            *args,
+            db=db,
+            order_by=order_by,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            fields=fields,
+            options=options,
+            **kwargs,
+        )
+
+    async def update(
+        self,
+        db: Session | AsyncSession,
+        *args: BinaryExpression[Any],
+        obj_in: models.VideoUpdate,
+        exclude_none: bool = True,
+        exclude_unset: bool = True,
+        **kwargs: Any,
+    ) -> models.Video:
+        """
+        Update an existing video, and its description in the `videodescription` table.
+
+        Args:
+            obj_in (models.VideoUpdate): The updated video.
+            args (BinaryExpression): Binary expressions to filter by.
+            db (Session | AsyncSession): The database session.
+            exclude_none (bool): Whether to exclude None values from the update.
+            exclude_unset (bool): Whether to exclude unset values from the update.
+            kwargs (Any): Keyword arguments to filter by.
+
+        Returns:
+            The updated video.
+        """
+        obj_in_values = obj_in.dict(exclude_unset=exclude_unset, exclude_none=exclude_none)
+        db_obj = await super().update(
+            db,
+            *args,
+            obj_in=obj_in.copy(exclude={"description"}),
+            exclude_none=exclude_none,
+            exclude_unset=exclude_unset,
+            **kwargs,
+        )
+        if "description" not in obj_in_values:
+            return db_obj
+
+        def _update_description(session: Session) -> models.Video:
+            if obj_in_values["description"] != db_obj.description:
+                db_obj.set_description(description=obj_in_values["description"])
+                session.commit()
+                session.refresh(db_obj)
+            return db_obj
+
+        return await run_sync(db, _update_description)
+
+    async def create_video_from_url(self, url: str, db: Session | AsyncSession) -> models.Video:
         """Create a new video from a URL.
 
         Args:
             url: The URL to create the video from.
-            db (Session): The database session.
+            db (Session | AsyncSession): The database session.
 
         Returns:
             The created video.
@@ -35,5 +263,38 @@ class VideoCRUD(BaseCRUD[models.Video, models.VideoCreate, models.VideoUpdate]):
         # Save the video to the database
         return await self.create(obj_in=_video, db=db)
 
+    async def search(
+        self,
+        db: Session | AsyncSession,
+        query: str,
+        source_ids: list[str] | None = None,
+        limit: int = 50,
+    ) -> list[models.Video]:
+        """
+        Search videos' titles, descriptions and uploaders with the full-text index.
+
+        Args:
+            db (Session | AsyncSession): The database session.
+            query (str): The words and "quoted phrases" that the videos must all contain.
+            source_ids (list[str] | None): Only search the videos of these sources.
+            limit (int): The maximum number of videos to return.
+
+        Returns:
+            list[models.Video]: The matching videos, best matches first.
+        """
+        search_query = models.get_search_query(query=query)
+        if search_query is None:
+            return []
+
+        def _search(session: Session) -> list[models.Video]:
+            video_ids = models.match_video_ids(
+                db=session, query=search_query, source_ids=source_ids, limit=limit
+            )
+            statement = select(models.Video).where(col(models.Video.id).in_(video_ids))
+            videos_by_id = {video.id: video for video in session.exec(statement).all()}
+            return [videos_by_id[video_id] for video_id in video_ids if video_id in videos_by_id]
+
+        return await run_sync(db, _search)
+
 
 video = VideoCRUD(models.Video)
@@ -0,0 +1,16 @@
+from app import models
+
+from .base import BaseCRUD
+
+
+class WebSubSubscriptionCRUD(
+    BaseCRUD[
+        models.WebSubSubscription,
+        models.WebSubSubscriptionCreate,
+        models.WebSubSubscriptionUpdate,
+    ]
+):
+    pass
+
+
+websub_subscription = WebSubSubscriptionCRUD(models.WebSubSubscription)
@@ -1,33 +1,259 @@
-import shutil
+"""
+Online, compressed database backups.
+
+Backups are taken with SQLite's online backup API, a few pages at a time, so that a backup
+is a consistent snapshot even while the app writes to the database. The snapshot is
+compressed with zstd, and old backups are pruned by an hourly/daily/weekly retention policy.
+
+With `DB_BACKUP_INCREMENTAL`, a backup is instead stored as a manifest of zstd compressed
+blocks of database pages. Blocks are content addressed, so blocks that did not change since
+a previous backup are shared instead of stored again.
+
+The blocking work runs in a thread, off the event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 
+import zstandard
 from sqlmodel import Session
 
-from app import crud, logger, paths
+from app import crud, logger, paths, settings
+
+BACKUP_SUFFIX = ".sqlite3.zst"
+MANIFEST_SUFFIX = ".manifest.json"
+BLOCKS_DIRNAME = "blocks"
+
+# Pages per block of an incremental backup
+INCREMENTAL_BLOCK_PAGES = 64
+
+BACKUP_DATETIME_FORMAT = "%Y-%m-%d - %H-%M-%S"
+LEGACY_BACKUP_DATETIME_FORMAT = "%m-%d-%y - %H-%M-%S"
+BACKUP_FILENAME_PATTERN = re.compile(r"^database - (?P<datetime>.+) - \d+\.")
 
 
 async def backup_database(db: Session) -> Path:
     """
-    Backs up the database.
+    Backs up the database, then prunes old backups.
 
     Args:
         db (Session): The database session.
 
     Returns:
-        Path: The path to the backup file.
+        Path: The path to the backup file, or to the manifest of an incremental backup.
     """
     logger.debug("Backing up database...")
 
-    dt_str = datetime.now().strftime("%m-%d-%y - %H-%M-%S")
+    dt_str = datetime.now().strftime(BACKUP_DATETIME_FORMAT)
     total_sources = await crud.source.count(db=db)
-    filename = f"database - {dt_str} - {total_sources}.sqlite3"
+    filename = f"database - {dt_str} - {total_sources}"
 
-    db_backup_file = paths.DB_BACKUP_PATH / filename
-    shutil.copy(src=paths.DATABASE_FILE, dst=db_backup_file)
+    paths.DB_BACKUP_PATH.mkdir(parents=True, exist_ok=True)
+    if settings.DB_BACKUP_INCREMENTAL:
+        db_backup_file = paths.DB_BACKUP_PATH / f"{filename}{MANIFEST_SUFFIX}"
+        await asyncio.to_thread(create_incremental_backup, db_backup_file)
+    else:
+        db_backup_file = paths.DB_BACKUP_PATH / f"{filename}{BACKUP_SUFFIX}"
+        await asyncio.to_thread(create_compressed_backup, db_backup_file)
 
     if not db_backup_file.exists():
         raise FileNotFoundError(
             f"Database backup file not found: {db_backup_file}"
         )  # pragma: no cover
+
+    deleted_backups = await asyncio.to_thread(prune_backups)
+    logger.info(f"Backed up database to '{db_backup_file}'. Pruned {len(deleted_backups)} backups.")
     return db_backup_file
+
+
+def snapshot_database(dst: Path) -> None:
+    """
+    Copy a consistent snapshot of the database with SQLite's online backup API.
+
+    The database is copied `DB_BACKUP_PAGES_PER_STEP` pages at a time, so that writers are
+    only locked out for one step at a time.
+
+    Args:
+        dst (Path): The snapshot file.
+    """
+    src_connection = sqlite3.connect(paths.DATABASE_FILE)
+    dst_connection = sqlite3.connect(dst)
+    try:
+        with dst_connection:
+            src_connection.backup(
+                dst_connection,
+                pages=settings.DB_BACKUP_PAGES_PER_STEP,
+                sleep=settings.DB_BACKUP_STEP_SLEEP_MS / 1000,
+            )
+    finally:
+        dst_connection.close()
+        src_connection.close()
+
+
+def create_compressed_backup(db_backup_file: Path) -> None:
+    """
+    Snapshot the database and compress it with zstd.
+
+    Args:
+        db_backup_file (Path): The compressed backup file.
+    """
+    snapshot_file = db_backup_file.with_name(f"{db_backup_file.name}.tmp")
+    try:
+        snapshot_database(dst=snapshot_file)
+        compressor = zstandard.ZstdCompressor(level=settings.DB_BACKUP_COMPRESSION_LEVEL)
+        with snapshot_file.open("rb") as src, db_backup_file.open("wb") as dst:
+            compressor.copy_stream(src, dst)
+    finally:
+        snapshot_file.unlink(missing_ok=True)
+
+
+def create_incremental_backup(manifest_file: Path) -> None:
+    """
+    Snapshot the database and store it as zstd compressed blocks of pages.
+
+    Only the blocks that are not already stored by a previous backup are written.
+
+    Args:
+        manifest_file (Path): The manifest file, listing the backup's blocks in order.
+    """
+    blocks_path = manifest_file.parent / BLOCKS_DIRNAME
+    blocks_path.mkdir(parents=True, exist_ok=True)
+    snapshot_file = manifest_file.with_name(f"{manifest_file.name}.tmp")
+    compressor = zstandard.ZstdCompressor(level=settings.DB_BACKUP_COMPRESSION_LEVEL)
+    try:
+        snapshot_database(dst=snapshot_file)
+        with sqlite3.connect(snapshot_file) as connection:
+            page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+        block_size = page_size * INCREMENTAL_BLOCK_PAGES
+
+        blocks = []
+        new_blocks = 0
+        with snapshot_file.open("rb") as src:
+            while block := src.read(block_size):
+                block_hash = hashlib.sha256(block).hexdigest()
+                block_file = blocks_path / f"{block_hash}.zst"
+                if not block_file.exists():
+                    block_file.write_bytes(compressor.compress(block))
+                    new_blocks += 1
+                blocks.append(block_hash)
+    finally:
+        snapshot_file.unlink(missing_ok=True)
+
+    manifest = {"page_size": page_size, "block_size": block_size, "blocks": blocks}
+    manifest_file.write_text(json.dumps(manifest), encoding="utf8")
+    logger.debug(f"Incremental backup stored {new_blocks}/{len(blocks)} new blocks.")
+
+
+def restore_backup(db_backup_file: Path, dst: Path) -> None:
+    """
+    Restore a compressed or incremental backup to a database file.
+
+    Args:
+        db_backup_file (Path): The compressed backup file, or the incremental backup's manifest.
+        dst (Path): The restored database file.
+    """
+    decompressor = zstandard.ZstdDecompressor()
+    if db_backup_file.name.endswith(MANIFEST_SUFFIX):
+        manifest = json.loads(db_backup_file.read_text(encoding="utf8"))
+        blocks_path = db_backup_file.parent / BLOCKS_DIRNAME
+        with dst.open("wb") as dst_file:
+            for block_hash in manifest["blocks"]:
+                block_file = blocks_path / f"{block_hash}.zst"
+                dst_file.write(decompressor.decompress(block_file.read_bytes()))
+        return
+
+    with db_backup_file.open("rb") as src, dst.open("wb") as dst_file:
+        decompressor.copy_stream(src, dst_file)
+
+
+def get_backup_datetime(db_backup_file: Path) -> datetime | None:
+    """
+    Get the datetime of a backup from its filename.
+
+    Args:
+        db_backup_file (Path): The backup file.
+
+    Returns:
+        datetime | None: The datetime, or None if the file is not a backup.
+    """
+    match = BACKUP_FILENAME_PATTERN.match(db_backup_file.name)
+    if not match:
+        return None
+    for datetime_format in (BACKUP_DATETIME_FORMAT, LEGACY_BACKUP_DATETIME_FORMAT):
+        try:
+            return datetime.strptime(match.group("datetime"), datetime_format)
+        except ValueError:
+            continue
+    return None
+
+
+def get_backups_to_keep(backups: dict[Path, datetime]) -> set[Path]:
+    """
+    Get the backups kept by the retention policy.
+
+    The newest backup of each of the last `DB_BACKUP_KEEP_HOURLY` hours,
+    `DB_BACKUP_KEEP_DAILY` days and `DB_BACKUP_KEEP_WEEKLY` weeks that have a backup is kept.
+    The newest backup is always kept.
+
+    Args:
+        backups (dict[Path, datetime]): The backups and their datetimes.
+
+    Returns:
+        set[Path]: The backups to keep.
+    """
+    newest_first = sorted(backups, key=lambda backup: backups[backup], reverse=True)
+    keep = set(newest_first[:1])
+    for period_format, count in (
+        ("%Y-%m-%d %H", settings.DB_BACKUP_KEEP_HOURLY),
+        ("%Y-%m-%d", settings.DB_BACKUP_KEEP_DAILY),
+        ("%G-%V", settings.DB_BACKUP_KEEP_WEEKLY),
+    ):
+        periods: set[str] = set()
+        for backup in newest_first:
+            period = backups[backup].strftime(period_format)
+            if period in periods:
+                continue
+            if len(periods) >= count:
+                break
+            periods.add(period)
+            keep.add(backup)
+    return keep
+
+
+def prune_backups() -> list[Path]:
+    """
+    Delete the backups that are not kept by the retention policy, and the incremental
+    backup blocks that are no longer used.
+
+    Returns:
+        list[Path]: The deleted backups.
+    """
+    backups = {
+        backup: backup_datetime
+        for backup in paths.DB_BACKUP_PATH.glob("database - *")
+        if (backup_datetime := get_backup_datetime(db_backup_file=backup))
+    }
+    keep = get_backups_to_keep(backups=backups)
+
+    deleted_backups = []
+    for backup in backups:
+        if backup not in keep:
+            backup.unlink(missing_ok=True)
+            deleted_backups.append(backup)
+
+    blocks_path = paths.DB_BACKUP_PATH / BLOCKS_DIRNAME
+    if blocks_path.exists():
+        used_blocks = set()
+        for manifest_file in paths.DB_BACKUP_PATH.glob(f"database - *{MANIFEST_SUFFIX}"):
+            manifest = json.loads(manifest_file.read_text(encoding="utf8"))
+            used_blocks.update(manifest["blocks"])
+        for block_file in blocks_path.glob("*.zst"):
+            if block_file.stem not in used_blocks:
+                block_file.unlink(missing_ok=True)
+
+    return deleted_backups
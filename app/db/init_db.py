@@ -2,6 +2,7 @@ from typing import Any
 
 from sqlalchemy.engine.base import Engine
 from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import crud, logger, models, settings
 from app.db.session import engine as _engine
@@ -28,7 +29,7 @@ async def create_all(engine: Engine = _engine, sqlmodel_create_all: bool = False
     return
 
 
-async def init_initial_data(db: Session, **kwargs: Any) -> None:
+async def init_initial_data(db: Session | AsyncSession, **kwargs: Any) -> None:
     await create_all(**kwargs)
 
     user = await crud.user.get_or_none(db=db, username=settings.FIRST_SUPERUSER_USERNAME)
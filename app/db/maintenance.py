@@ -0,0 +1,61 @@
+"""
+Database compaction.
+
+`ANALYZE` keeps the query planner's statistics up to date as tables grow and shrink. `VACUUM`
+rebuilds the database file to return the free pages left by deleted rows (e.g. archived
+videos), and only runs when enough of the file is free, since it rewrites the whole file.
+
+The blocking work runs in a thread, off the event loop.
+"""
+
+import asyncio
+import sqlite3
+
+from app import logger, paths, settings
+
+
+async def compact_database() -> bool:
+    """
+    Analyzes the database, and vacuums it if enough of its pages are free.
+
+    Returns:
+        bool: Whether the database was vacuumed.
+    """
+    logger.debug("Compacting database...")
+    vacuumed = await asyncio.to_thread(analyze_and_vacuum_database)
+    logger.info(f"Compacted database. {'Vacuumed' if vacuumed else 'Skipped vacuum'}.")
+    return vacuumed
+
+
+def get_free_page_ratio(connection: sqlite3.Connection) -> float:
+    """
+    Get the ratio of free pages to all pages of the database.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+
+    Returns:
+        float: The ratio of free pages.
+    """
+    page_count: int = connection.execute("PRAGMA page_count").fetchone()[0]
+    freelist_count: int = connection.execute("PRAGMA freelist_count").fetchone()[0]
+    return freelist_count / page_count if page_count else 0.0
+
+
+def analyze_and_vacuum_database() -> bool:
+    """
+    Run `ANALYZE`, then `VACUUM` if the ratio of free pages is at least
+    `DB_VACUUM_MIN_FREE_RATIO`.
+
+    Returns:
+        bool: Whether the database was vacuumed.
+    """
+    connection = sqlite3.connect(paths.DATABASE_FILE, isolation_level=None)
+    try:
+        connection.execute("ANALYZE")
+        if get_free_page_ratio(connection=connection) < settings.DB_VACUUM_MIN_FREE_RATIO:
+            return False
+        connection.execute("VACUUM")
+        return True
+    finally:
+        connection.close()
@@ -1,8 +1,16 @@
+from typing import Any, Callable, TypeVar
+
+from functools import lru_cache
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import paths, settings
 
+T = TypeVar("T")
+
 db_url = f"sqlite:///{paths.DATABASE_FILE}"
 engine = create_engine(
     db_url,
@@ -12,3 +20,83 @@ engine = create_engine(
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=Session)
+
+# Async sessions, on the same database file, using the aiosqlite driver.
+# Bound to `get_async_engine()` when they are created.
+async_db_url = f"sqlite+aiosqlite:///{paths.DATABASE_FILE}"
+
+AsyncSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    class_=AsyncSession,
+)
+
+
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the async engine, creating it on first use.
+
+    Creating the engine imports aiosqlite, so it is only created when an async session is.
+
+    Returns:
+        The async engine.
+    """
+    return create_async_engine(
+        async_db_url,
+        echo=settings.DATABASE_ECHO,
+        pool_pre_ping=True,
+    )
+
+
+def get_session() -> Session | AsyncSession:
+    """
+    Create a database session of the `DATABASE_BACKEND`.
+
+    Returns:
+        An `AsyncSession` with the "async" backend, otherwise a `Session`.
+    """
+    if settings.DATABASE_BACKEND == "async":
+        return AsyncSessionLocal(bind=get_async_engine())
+    return SessionLocal()
+
+
+async def run_sync(
+    db: Session | AsyncSession, fn: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """
+    Run synchronous ORM code against a database session, of either backend.
+
+    With an `AsyncSession`, the code runs in a greenlet, where the queries and lazy loads it
+    makes are awaited on aiosqlite, instead of blocking the event loop. With a `Session`, the
+    code is called directly.
+
+    Objects returned from an `AsyncSession` can not lazy load their relationships outside of
+    `run_sync`, so the code must load the relationships that its caller uses.
+
+    Args:
+        db: The database session.
+        fn: The function to run. Called with the synchronous session, then `args` and `kwargs`.
+        args: Positional arguments for `fn`.
+        kwargs: Keyword arguments for `fn`.
+
+    Returns:
+        The return value of `fn`.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return fn(db, *args, **kwargs)
+
+
+async def rollback(db: Session | AsyncSession) -> None:
+    """
+    Roll back the current transaction of a database session, of either backend.
+
+    Args:
+        db: The database session.
+    """
+    if isinstance(db, AsyncSession):
+        await db.rollback()
+    else:
+        db.rollback()
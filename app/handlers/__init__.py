@@ -1,3 +1,6 @@
+from typing import Type
+
+from functools import lru_cache
 from urllib.parse import ParseResult, urlparse
 
 from app.handlers.exceptions import HandlerNotFoundError
@@ -7,28 +10,96 @@ from .rumble import RumbleHandler
 from .tubesubs import TubeSubsHandler
 from .youtube import YoutubeHandler
 
-registered_handlers = [YoutubeHandler(), RumbleHandler(), TubeSubsHandler()]
+URL_CACHE_SIZE = 16384
+NETLOC_CACHE_SIZE = 1024
 
+# Handler singletons, in registration order
+registered_handlers: list[ServiceHandler] = []
 
-def get_handler_from_url(url: str | ParseResult) -> ServiceHandler:
-    url = url if isinstance(url, ParseResult) else urlparse(url=url)
-    subdomain = url.netloc.split(":")[0]
+# Registered handlers, keyed by domain, and by class name and `SERVICE_NAME`
+_handlers_by_domain: dict[str, ServiceHandler] = {}
+_handlers_by_name: dict[str, ServiceHandler] = {}
+
+
+def register_handler(handler_class: Type[ServiceHandler]) -> Type[ServiceHandler]:
+    """
+    Register a handler, so that `get_handler_from_url` resolves its `DOMAINS` to it and
+    `get_handler_from_string` resolves its class name and `SERVICE_NAME` to it.
+
+    A single instance of the handler is created and shared by every lookup. Registering a
+    handler class again replaces the previous registration. Can be used as a class decorator.
+
+    Args:
+        handler_class: The handler class.
+
+    Returns:
+        The handler class.
+    """
+    unregister_handler(handler_class=handler_class)
+    handler = handler_class()
+    registered_handlers.append(handler)
+    for domain in handler_class.DOMAINS:
+        _handlers_by_domain[domain] = handler
+    _handlers_by_name[handler.name] = handler
+    _handlers_by_name[handler_class.SERVICE_NAME] = handler
+    clear_handler_caches()
+    return handler_class
+
+
+def unregister_handler(handler_class: Type[ServiceHandler]) -> None:
+    """
+    Remove a handler's registration, if it is registered.
+
+    Args:
+        handler_class: The handler class.
+    """
+    registered_handlers[:] = [
+        handler for handler in registered_handlers if handler.name != handler_class.__name__
+    ]
+    for handlers_by_key in (_handlers_by_domain, _handlers_by_name):
+        for key, handler in list(handlers_by_key.items()):
+            if handler.name == handler_class.__name__:
+                del handlers_by_key[key]
+    clear_handler_caches()
+
+
+def clear_handler_caches() -> None:
+    """
+    Clear the memoized URL and domain lookups.
+    """
+    _get_handler_from_netloc.cache_clear()
+    _get_handler_from_url_string.cache_clear()
+
+
+@lru_cache(maxsize=NETLOC_CACHE_SIZE)
+def _get_handler_from_netloc(netloc: str) -> ServiceHandler | None:
+    subdomain = netloc.split(":")[0]
     domain_name = ".".join(subdomain.split(".")[-2:])
+    return _handlers_by_domain.get(domain_name) or _handlers_by_domain.get(subdomain)
+
 
-    if domain_name in YoutubeHandler.DOMAINS or subdomain in YoutubeHandler.DOMAINS:
-        return YoutubeHandler()
-    if domain_name in RumbleHandler.DOMAINS or subdomain in RumbleHandler.DOMAINS:
-        return RumbleHandler()
-    if domain_name in TubeSubsHandler.DOMAINS or subdomain in TubeSubsHandler.DOMAINS:
-        return TubeSubsHandler()
-    raise HandlerNotFoundError(f"A handler could not be found for url: `{str(url)}`.")
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _get_handler_from_url_string(url: str) -> ServiceHandler | None:
+    return _get_handler_from_netloc(urlparse(url=url).netloc)
+
+
+def get_handler_from_url(url: str | ParseResult) -> ServiceHandler:
+    if isinstance(url, ParseResult):
+        handler = _get_handler_from_netloc(url.netloc)
+    else:
+        handler = _get_handler_from_url_string(url)
+    if handler is None:
+        raise HandlerNotFoundError(f"A handler could not be found for url: `{str(url)}`.")
+    return handler
 
 
 def get_handler_from_string(handler_string: str) -> ServiceHandler:
-    if handler_string == "YoutubeHandler" or handler_string == "Youtube":
-        return YoutubeHandler()
-    if handler_string == "RumbleHandler" or handler_string == "Rumble":
-        return RumbleHandler()
-    if handler_string == "TubeSubsHandler" or handler_string == "TubeSubs":
-        return TubeSubsHandler()
-    raise HandlerNotFoundError(f"A handler could not be found for {handler_string=}.")
+    handler = _handlers_by_name.get(handler_string)
+    if handler is None:
+        raise HandlerNotFoundError(f"A handler could not be found for {handler_string=}.")
+    return handler
+
+
+register_handler(YoutubeHandler)
+register_handler(RumbleHandler)
+register_handler(TubeSubsHandler)
@@ -1,6 +1,7 @@
 from typing import Any, Type
 
 from abc import abstractmethod
+from collections.abc import AsyncIterator
 from urllib.parse import urlparse
 
 from yt_dlp.extractor.common import InfoExtractor
@@ -150,6 +151,38 @@ class ServiceHandler:
     def get_ordered_by(self, url: str) -> str:
         return str(SourceOrderBy.RELEASED_AT.value)
 
+    async def source_has_changes(self, url: str, known_video_urls: list[str]) -> bool:
+        """
+        Cheaply check if a source may have new videos before running yt-dlp.
+        Handlers without a cheaper change detector always return True.
+
+        Args:
+            url: The URL of the source.
+            known_video_urls: The URLs of the videos already stored for the source.
+
+        Returns:
+            True if the source should be fetched with yt-dlp.
+        """
+        return True
+
+    def crawl_source_entries(
+        self, url: str, known_video_urls: list[str], extracted_video_urls: list[str]
+    ) -> AsyncIterator[list[dict[str, Any]]] | None:
+        """
+        Get a crawler for the videos of a source that yt-dlp's extraction did not reach.
+        Handlers without a crawler return None.
+
+        Args:
+            url: The URL of the source.
+            known_video_urls: The URLs of the videos already stored for the source.
+            extracted_video_urls: The URLs of the videos of yt-dlp's extraction.
+
+        Returns:
+            An async iterator of the flat playlist entries of the unknown videos, a page at a
+            time, or None if the source is not crawled.
+        """
+        return None
+
     def _get_format_info_dict_from_entry_info_dict(
         self, entry_info_dict: dict[str, Any]
     ) -> dict[str, Any]:
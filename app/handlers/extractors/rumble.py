@@ -1,4 +1,6 @@
 # import itertools
+from typing import Any
+
 import re
 from datetime import datetime
 
@@ -20,6 +22,8 @@ from yt_dlp.utils import (
     unescapeHTML,
 )
 
+from .rumble_channel_parser import RumbleChannelVideo, parse_rumble_channel_page
+
 
 class CustomRumbleIE(InfoExtractor):
     _VALID_URL = r"https?://(?:www\.)?rumble\.com/(?P<id>v(?!ideos)[\w.-]+)[^/]*$"
@@ -367,6 +371,37 @@ class CustomRumbleEmbedIE(RumbleEmbedIE):
         }
 
 
+def get_channel_video_entry(video: RumbleChannelVideo) -> dict[str, Any] | None:
+    """
+    Get the flat playlist entry of a video listed on a channel page.
+
+    Args:
+        video (RumbleChannelVideo): The video.
+
+    Returns:
+        dict[str, Any] | None: The entry, or None for LIVE and upcoming videos.
+    """
+    # Skip LIVE and upcoming videos.
+    if video.is_live or video.is_upcoming or not video.url:
+        return None
+
+    url = f"https://rumble.com{video.url}"
+    title = video.title.replace("Channel: ", "") if video.title else None
+    return {
+        "_type": "url_transparent",
+        "id": video.video_id,
+        "display_id": video.video_id,
+        "url": url,
+        "webpage_url": url,
+        "title": title,
+        "description": title,
+        "thumbnail": video.thumbnail,
+        "duration": parse_duration(video.duration),
+        "timestamp": parse_iso8601(video.datetime),
+        "ie_key": "Rumble",  # Assuming "Rumble" extractor is defined and handles individual video pages.
+    }
+
+
 class CustomRumbleChannelIE(RumbleChannelIE):
     _VALID_URL = r"(?P<url>https?://(?:www\.)?rumble\.com/(?:c|user)/(?P<id>[^&?#$/]+))"
     # _VALID_URL = r"(?P<url>https?:\/\/(?:www\.)?rumble\.com\/(?:c|user)\/(?P<id>[a-zA-Z0-9_]+))"
@@ -428,99 +463,46 @@ class CustomRumbleChannelIE(RumbleChannelIE):
         },
     ]
 
-    def entries(self, url, playlist_id, webpage, **kwargs):
-        pattern = (
-            r"videostream thumbnail__grid--item.*?videostream__data--item videostream__comments"
-        )
-        findall = re.findall(pattern, webpage, flags=re.DOTALL)
-        for video in findall:
-            # Handle if video is a LIVE video.
-            live_match = re.search(r"videostream__status--live", video)
-            upcoming_match = re.search(r"videostream__status--upcoming", video)
-            if upcoming_match or live_match:
-                continue
-
-            video_id = self._search_regex(r'data-video-id="(\d+)"', video, "video id", default=None)
-            video_url = self._search_regex(
-                r'href="(/[^"]+\.html\?[^"]*)"', video, "video URL", default=None
-            )
-            thumbnail = self._search_regex(
-                r'<img[^>]+src="([^"]+)"', video, "thumbnail", default=None
+    def entries(self, url, playlist_id, page, **kwargs):
+        """
+        Yield the channel's videos, following the channel's pages until `playlistend` videos
+        were yielded or there are no more pages.
+
+        Args:
+            url: The channel url.
+            playlist_id: The channel id.
+            page (RumbleChannelPage): The parsed first page of the channel.
+        """
+        playlistend = self.get_param("playlistend") or None
+        yielded = 0
+        page_urls = {url}
+        while True:
+            for video in page.videos:
+                entry = get_channel_video_entry(video=video)
+                if not entry:
+                    continue
+
+                yield {**kwargs, **entry}
+                yielded += 1
+                if playlistend and yielded >= playlistend:
+                    return
+
+            if not page.next_page_url or page.next_page_url in page_urls:
+                return
+            page_urls.add(page.next_page_url)
+            webpage = self._download_webpage(
+                page.next_page_url, playlist_id, note=f"Downloading page {len(page_urls)}"
             )
-            timestamp = parse_iso8601(
-                self._search_regex(
-                    r'<time[^>]+datetime="([^"]+)"', video, "upload datetime", default=None
-                )
-            )
-            url = self._proto_relative_url(video_url, "https:")
-
-            # Duration extraction
-            duration_pattern = (
-                r'videostream__status videostream__status--duration"\n\t\t\t>\n\t\t\t\t(.*?)\t\t\t'
-            )
-            duration_search = re.search(duration_pattern, video, flags=re.DOTALL)
-            if duration_search:
-                duration_text = duration_search.group(1).strip()
-                duration = parse_duration(duration_text)
-            else:
-                duration = None
-
-            # Title
-            title_pattern = r"<h3[^>]*>\s*(.*?)\s*<\/h3>"
-            title_search = re.search(title_pattern, video, flags=re.DOTALL)
-            if title_search:
-                title = title_search.group(1).strip()
-                title = title.replace("\n", "").replace("\t", "").strip()
-                title = title.replace("Channel: ", "")
-            else:
-                title = None
-
-            # Description
-            description = title
-
-            yield {
-                **kwargs,
-                **self.url_result(f"https://rumble.com{video_url}"),
-                "_type": "url_transparent",
-                "id": video_id,
-                "display_id": video_id,
-                "url": f"https://rumble.com{video_url}",
-                "webpage_url": f"https://rumble.com{video_url}",
-                "title": title,
-                "description": description,
-                "thumbnail": thumbnail,
-                "duration": duration,
-                "timestamp": timestamp,
-                "ie_key": "Rumble",  # Assuming "Rumble" extractor is defined and handles individual video pages.
-            }
+            page = parse_rumble_channel_page(webpage=webpage, url=page.next_page_url)
 
     def _real_extract(self, url):
         playlist_id = self._match_id(url)
         webpage = self._download_webpage(url, playlist_id)
+        page = parse_rumble_channel_page(webpage=webpage, url=url)
 
-        #
-        thumbnail_match = re.search(
-            r'<img\n\t\t\t\t\t\t\t\t\tclass="channel-header--img"\n\t\t\t\t\t\t\t\t\tsrc="(.*?)"\n',
-            webpage,
-        )
-        if not thumbnail_match:
-            thumbnail_match = re.search(
-                r'class="channel-header--backsplash-img"\n\t\t\t\t\t\tsrc="(.*?)"\n', webpage
-            )
-        thumbnail = thumbnail_match.group(1) if thumbnail_match else None
-
-        #
-        channel_match = re.search(
-            r'<div class="channel-header--title">.*?<h1>(.*?)<\/h1>', webpage, re.DOTALL
-        )
-
-        channel = channel_match.group(1) if channel_match else None
-
-        channel_id_match = re.search(
-            r"(rel=canonical href=)(https:\/\/rumble\.com\/)(c|user)\/([^\">]+)", webpage
-        )
-        channel_id = channel_id_match.group(4) if channel_id_match else None
-
+        thumbnail = page.thumbnail or page.backsplash
+        channel = page.channel
+        channel_id = page.channel_id
         channel_url = f"https://rumble.com/c/{channel_id}"
 
         #
@@ -541,7 +523,7 @@ class CustomRumbleChannelIE(RumbleChannelIE):
         }
 
         return self.playlist_result(
-            self.entries(url, playlist_id, webpage),
+            self.entries(url, playlist_id, page),
             playlist_id=playlist_id,
             playlist_title=f"{channel}",
             **kwargs,
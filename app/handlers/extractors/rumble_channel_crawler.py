@@ -0,0 +1,197 @@
+"""
+Concurrent crawler for the pages of Rumble channels.
+
+yt-dlp extracts a channel one page at a time, and only up to `playlistend` videos. To catch up
+on, or import, a channel with thousands of videos, the crawler downloads the channel's
+`?page=N` pages with up to `RUMBLE_CRAWL_CONCURRENCY` requests in flight over a single
+connection pool, and stops at the first page past yt-dlp's extraction that only lists videos
+that are already known. The pages of the extraction itself only list known videos, as its
+videos were just added, so they are skipped.
+
+The pages are downloaded one at a time until a page lists unknown videos, so that a channel
+without new videos costs a request per page of the extraction, plus one. Pages are yielded in
+order, and the next pages keep downloading while a yielded page's videos are added to the
+database.
+"""
+
+from typing import Any
+
+import asyncio
+import re
+from collections import deque
+from collections.abc import AsyncIterator, Collection
+
+import httpx
+from loguru import logger as _logger
+
+from app.models.settings import Settings as _Settings
+from app.services import rate_limit
+
+from .rumble import get_channel_video_entry
+from .rumble_channel_parser import RumbleChannelPage, parse_rumble_channel_page
+
+settings = _Settings()
+
+logger = _logger.bind(name="logger")
+
+VIDEO_ID_PATTERN = re.compile(r"(?<=rumble\.com/)v\w+")
+
+
+def get_video_id_from_video_url(url: str) -> str | None:
+    """
+    Get the Rumble video id (ie. "v2vzqdk") from a video URL.
+
+    Args:
+        url: The video URL.
+
+    Returns:
+        The video id, or None if the URL is not a Rumble video URL.
+    """
+    match = VIDEO_ID_PATTERN.search(url)
+    return match.group() if match else None
+
+
+def get_channel_page_url(url: str, page_number: int) -> str:
+    """
+    Get the URL of a page of a channel.
+
+    Args:
+        url: The channel URL.
+        page_number: The page number, starting at 1.
+
+    Returns:
+        The page URL.
+    """
+    return url if page_number == 1 else f"{url}?page={page_number}"
+
+
+async def fetch_channel_page(
+    client: httpx.AsyncClient, url: str, page_number: int, rate_limit_key: str
+) -> RumbleChannelPage | None:
+    """
+    Download and parse a page of a channel.
+
+    Args:
+        client: The HTTP client.
+        url: The channel URL.
+        page_number: The page number, starting at 1.
+        rate_limit_key: The upstream to rate limit the request against.
+
+    Returns:
+        The parsed page, or None if the channel has no such page.
+
+    Raises:
+        httpx.HTTPError: If the page could not be downloaded.
+        CircuitOpenError: If the upstream is paused by its circuit breaker.
+    """
+    page_url = get_channel_page_url(url=url, page_number=page_number)
+    await rate_limit.acquire(key=rate_limit_key)
+    try:
+        response = await client.get(page_url)
+        if response.status_code != httpx.codes.NOT_FOUND:
+            response.raise_for_status()
+    except httpx.HTTPError as e:
+        rate_limit.record_result(key=rate_limit_key, error=e)
+        raise e
+    rate_limit.record_result(key=rate_limit_key)
+
+    if response.status_code == httpx.codes.NOT_FOUND:
+        return None
+    return parse_rumble_channel_page(webpage=response.text, url=page_url)
+
+
+async def crawl_channel(
+    url: str,
+    known_video_urls: list[str],
+    rate_limit_key: str,
+    extracted_video_urls: Collection[str] = (),
+    concurrency: int | None = None,
+    max_pages: int | None = None,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """
+    Crawl a channel's pages for the videos that are not known yet.
+
+    The crawl stops at the first page that does not exist, has no next page, or lists neither
+    unknown videos nor videos of yt-dlp's extraction, after `max_pages` pages, or when a page
+    could not be downloaded.
+
+    Args:
+        url: The channel URL.
+        known_video_urls: The URLs of the videos already stored for the channel.
+        rate_limit_key: The upstream to rate limit the requests against.
+        extracted_video_urls: The URLs of the videos of yt-dlp's extraction of the channel.
+        concurrency: The number of pages downloaded at a time.
+            Defaults to `RUMBLE_CRAWL_CONCURRENCY`.
+        max_pages: The maximum number of pages to crawl. Defaults to `RUMBLE_CRAWL_MAX_PAGES`.
+
+    Yields:
+        The flat playlist entries of each page's unknown videos, one page at a time.
+    """
+    concurrency = concurrency or settings.RUMBLE_CRAWL_CONCURRENCY
+    max_pages = max_pages or settings.RUMBLE_CRAWL_MAX_PAGES
+    known_video_ids = {get_video_id_from_video_url(url=video_url) for video_url in known_video_urls}
+    extracted_video_ids = {
+        get_video_id_from_video_url(url=video_url) for video_url in extracted_video_urls
+    }
+
+    async with httpx.AsyncClient(
+        timeout=settings.RUMBLE_CRAWL_TIMEOUT_SECONDS,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+    ) as client:
+        pending: deque[tuple[int, asyncio.Task[RumbleChannelPage | None]]] = deque()
+        next_page_number = 1
+        # Pages are downloaded alone until a page lists unknown videos
+        has_unknown_videos = False
+        try:
+            while True:
+                window = concurrency if has_unknown_videos else 1
+                while len(pending) < window and next_page_number <= max_pages:
+                    task = asyncio.create_task(
+                        fetch_channel_page(
+                            client=client,
+                            url=url,
+                            page_number=next_page_number,
+                            rate_limit_key=rate_limit_key,
+                        )
+                    )
+                    pending.append((next_page_number, task))
+                    next_page_number += 1
+                if not pending:
+                    return
+
+                page_number, task = pending.popleft()
+                try:
+                    page = await task
+                except (httpx.HTTPError, rate_limit.CircuitOpenError) as e:
+                    logger.warning(f"Could not crawl page {page_number} of channel '{url}'. {e=}")
+                    return
+                if page is None:
+                    return
+
+                page_entries = [
+                    entry
+                    for video in page.videos
+                    if (entry := get_channel_video_entry(video=video))
+                ]
+                video_ids = [
+                    get_video_id_from_video_url(url=entry["url"]) for entry in page_entries
+                ]
+                entries = [
+                    entry
+                    for entry, video_id in zip(page_entries, video_ids)
+                    if video_id not in known_video_ids
+                ]
+                if entries:
+                    has_unknown_videos = True
+                    yield entries
+                elif extracted_video_ids.isdisjoint(video_ids):
+                    return
+
+                if not page.next_page_url:
+                    return
+        finally:
+            # Cancel the pages downloaded ahead of an early stop
+            for _, task in pending:
+                task.cancel()
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
@@ -0,0 +1,188 @@
+"""
+Single-pass parser for Rumble channel pages.
+
+The page is tokenized once with `html.parser.HTMLParser`, collecting the channel header and
+the videos of the channel grid as their tags are seen. Matching is done on tag names, class
+names and attributes rather than on the page's exact whitespace layout.
+"""
+
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+VOID_ELEMENTS = frozenset(
+    "area base br col embed hr img input link meta param source track wbr".split()
+)
+CANONICAL_CHANNEL_ID_PATTERN = re.compile(r"rumble\.com/(?:c|user)/([^\"/?#>]+)")
+
+
+@dataclass
+class RumbleChannelVideo:
+    video_id: str | None = None
+    url: str | None = None
+    thumbnail: str | None = None
+    datetime: str | None = None
+    duration: str | None = None
+    title: str | None = None
+    is_live: bool = False
+    is_upcoming: bool = False
+
+
+@dataclass
+class RumbleChannelPage:
+    channel: str | None = None
+    channel_id: str | None = None
+    thumbnail: str | None = None
+    backsplash: str | None = None
+    next_page_url: str | None = None
+    videos: list[RumbleChannelVideo] = field(default_factory=list)
+
+
+class RumbleChannelPageParser(HTMLParser):
+    def __init__(self, url: str) -> None:
+        """
+        Initialize the parser.
+
+        Args:
+            url: The url of the page, to resolve relative links against.
+        """
+        super().__init__(convert_charrefs=True)
+        self.url = url
+        self.page = RumbleChannelPage()
+
+        self._depth = 0
+        self._video: RumbleChannelVideo | None = None
+        self._video_depth = 0
+        self._in_header_title = False
+        self._in_next_page_item = False
+        self._capture: str | None = None
+        self._captured: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._end_capture()
+        attributes = dict(attrs)
+        classes = set((attributes.get("class") or "").split())
+
+        if tag not in VOID_ELEMENTS:
+            self._depth += 1
+
+        if "thumbnail__grid--item" in classes and "videostream" in classes:
+            self._video = RumbleChannelVideo(video_id=attributes.get("data-video-id"))
+            self._video_depth = self._depth
+            self.page.videos.append(self._video)
+        elif self._video is not None:
+            self._handle_video_starttag(tag=tag, attributes=attributes, classes=classes)
+        else:
+            self._handle_page_starttag(tag=tag, attributes=attributes, classes=classes)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.handle_starttag(tag=tag, attrs=attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag=tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        self._end_capture()
+        if tag in VOID_ELEMENTS:
+            return
+        if self._video is not None and self._depth == self._video_depth:
+            self._video = None
+        if tag == "li":
+            self._in_next_page_item = False
+        self._depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if self._capture:
+            self._captured.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._end_capture()
+
+    def _handle_video_starttag(
+        self, tag: str, attributes: dict[str, str | None], classes: set[str]
+    ) -> None:
+        video = self._video
+        assert video is not None
+
+        if "videostream__status--live" in classes:
+            video.is_live = True
+        elif "videostream__status--upcoming" in classes:
+            video.is_upcoming = True
+        elif "videostream__status--duration" in classes and video.duration is None:
+            self._start_capture("duration")
+
+        if video.video_id is None and attributes.get("data-video-id"):
+            video.video_id = attributes["data-video-id"]
+
+        if tag == "a" and video.url is None:
+            href = attributes.get("href") or ""
+            if href.startswith("/") and ".html" in href:
+                video.url = href
+        elif tag == "img" and video.thumbnail is None:
+            video.thumbnail = attributes.get("src")
+        elif tag == "time" and video.datetime is None:
+            video.datetime = attributes.get("datetime")
+        elif tag == "h3" and video.title is None:
+            self._start_capture("title")
+
+    def _handle_page_starttag(
+        self, tag: str, attributes: dict[str, str | None], classes: set[str]
+    ) -> None:
+        if tag == "link" and attributes.get("rel") == "canonical":
+            match = CANONICAL_CHANNEL_ID_PATTERN.search(attributes.get("href") or "")
+            if match:
+                self.page.channel_id = match.group(1)
+        elif tag == "img" and "channel-header--img" in classes:
+            self.page.thumbnail = self.page.thumbnail or attributes.get("src")
+        elif tag == "img" and "channel-header--backsplash-img" in classes:
+            self.page.backsplash = self.page.backsplash or attributes.get("src")
+        elif "channel-header--title" in classes:
+            self._in_header_title = True
+        elif tag == "h1" and self._in_header_title and self.page.channel is None:
+            self._in_header_title = False
+            self._start_capture("channel")
+        elif tag == "li" and "paginator--li--next" in classes:
+            self._in_next_page_item = True
+        elif tag in ("a", "link") and attributes.get("href") and self.page.next_page_url is None:
+            if (
+                attributes.get("rel") == "next"
+                or attributes.get("aria-label") == "Next page"
+                or (tag == "a" and self._in_next_page_item)
+            ):
+                self.page.next_page_url = urljoin(self.url, attributes["href"])
+
+    def _start_capture(self, name: str) -> None:
+        self._capture = name
+        self._captured = []
+
+    def _end_capture(self) -> None:
+        if not self._capture:
+            return
+        text = " ".join("".join(self._captured).split()) or None
+        if self._capture == "channel":
+            self.page.channel = text
+        elif self._video is not None:
+            setattr(self._video, self._capture, text)
+        self._capture = None
+
+
+def parse_rumble_channel_page(
+    webpage: str, url: str, chunk_size: int = 64 * 1024
+) -> RumbleChannelPage:
+    """
+    Parse a Rumble channel page in a single pass.
+
+    Args:
+        webpage: The page's html.
+        url: The page's url.
+        chunk_size: The number of characters fed to the parser at a time.
+
+    Returns:
+        RumbleChannelPage: The channel header and the videos of the page.
+    """
+    parser = RumbleChannelPageParser(url=url)
+    for start in range(0, len(webpage), chunk_size):
+        parser.feed(webpage[start : start + chunk_size])
+    parser.close()
+    return parser.page
@@ -2,6 +2,7 @@ from typing import Any
 
 import datetime
 import re
+from collections.abc import AsyncIterator
 
 from loguru import logger as _logger
 
@@ -12,6 +13,7 @@ from app.handlers.extractors.rumble import (
     CustomRumbleEmbedIE,
     CustomRumbleIE,
 )
+from app.handlers.extractors.rumble_channel_crawler import crawl_channel
 from app.models.settings import Settings as _Settings
 from app.paths import LOG_FILE as _LOG_FILE
 from app.services.logo import is_invalid_image
@@ -158,6 +160,30 @@ class RumbleHandler(ServiceHandler):
 
         raise InvalidSourceUrl(f"Source info dict kwargs not found for url: ({str(url)})")
 
+    def crawl_source_entries(
+        self, url: str, known_video_urls: list[str], extracted_video_urls: list[str]
+    ) -> AsyncIterator[list[dict[str, Any]]] | None:
+        """
+        Crawls a channel's pages concurrently, if `RUMBLE_CRAWL_ENABLED`.
+
+        Args:
+            url: The URL of the source.
+            known_video_urls: The URLs of the videos already stored for the source.
+            extracted_video_urls: The URLs of the videos of yt-dlp's extraction.
+
+        Returns:
+            An async iterator of the flat playlist entries of the unknown videos, a page at a
+            time, or None if crawling is disabled.
+        """
+        if not settings.RUMBLE_CRAWL_ENABLED:
+            return None
+        return crawl_channel(
+            url=url,
+            known_video_urls=known_video_urls,
+            rate_limit_key=self.name,
+            extracted_video_urls=extracted_video_urls,
+        )
+
     def map_source_info_dict_to_source_dict(
         self, source_info_dict: dict[str, Any], source_videos: list[Any]
     ) -> dict[str, Any]:
@@ -5,10 +5,18 @@ import re
 
 from yt_dlp import YoutubeDL
 from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.utils import DownloadError
 
 from app.core.uuid import generate_uuid_from_url
 from app.models.settings import Settings as _Settings
 from app.models.source_video_link import SourceOrderBy
+from app.services.youtube_handles import (
+    get_handle_from_url,
+    handle_cache,
+    is_not_found_error,
+    remember_handle_from_info_dict,
+)
+from app.services.youtube_rss import channel_has_new_videos
 from app.services.ytdlp import (
     YDL_OPTS_BASE,
     AwaitingTranscodingError,
@@ -23,6 +31,9 @@ from .exceptions import InvalidSourceUrl
 
 settings = _Settings()
 
+SHORTS_VIDEO_ID_PATTERN = re.compile(r"(?<=shorts/).*")
+WATCH_VIDEO_ID_PATTERN = re.compile(r"(?<=watch\?v=).*")
+
 
 class YoutubeHandler(ServiceHandler):
     SERVICE_NAME = "Youtube"
@@ -83,20 +94,34 @@ class YoutubeHandler(ServiceHandler):
         Returns:
             The sanitized URL.
         """
-        match = re.search(r"(?<=\/@)[\w-]+", url)
-        if not match:
+        handle = get_handle_from_url(url=url)
+        if not handle:
             raise InvalidSourceUrl(f"Invalid YouTube source URL ({str(url)})")
 
-        ydl_opts = {
-            **YDL_OPTS_BASE,
-            "playlistreverse": True,
-            "extract_flat": True,
-            "playlistend": 0,
-        }
-        with YoutubeDL(ydl_opts) as ydl:
-            info_dict: dict[str, Any] = ydl.extract_info(url, download=False)
+        resolution = handle_cache.get(handle=handle)
+        if resolution and not resolution.channel_id:
+            raise InvalidSourceUrl(f"Could not resolve YouTube handle ({str(url)})")
+
+        if resolution and resolution.channel_id:
+            channel_id = resolution.channel_id
+        else:
+            ydl_opts = {
+                **YDL_OPTS_BASE,
+                "playlistreverse": True,
+                "extract_flat": True,
+                "playlistend": 0,
+            }
+            try:
+                with YoutubeDL(ydl_opts) as ydl:
+                    info_dict: dict[str, Any] = ydl.extract_info(url, download=False)
+            except DownloadError as e:
+                if is_not_found_error(error=e):
+                    handle_cache.set(handle=handle, channel_id=None)
+                raise e
+
+            channel_id = info_dict["channel_id"]
+            handle_cache.set(handle=handle, channel_id=channel_id)
 
-        channel_id = info_dict["channel_id"]
         channel_url = f"https://www.youtube.com/channel/{channel_id}"
         return channel_url
 
@@ -157,11 +182,11 @@ class YoutubeHandler(ServiceHandler):
         Raises:
             ValueError: If the URL is not a valid YouTube video URL.
         """
-        match = re.search(r"(?<=shorts/).*", url)
+        match = SHORTS_VIDEO_ID_PATTERN.search(url)
         if match:
             video_id = match.group()
         else:
-            match = re.search(r"(?<=watch\?v=).*", url)
+            match = WATCH_VIDEO_ID_PATTERN.search(url)
             if match:
                 video_id = match.group()
             else:
@@ -241,6 +266,7 @@ class YoutubeHandler(ServiceHandler):
             A Source object.
         """
         url = source_info_dict["metadata"]["url"]
+        remember_handle_from_info_dict(info_dict=source_info_dict)
 
         if "/playlist" in url:
             source_id = generate_uuid_from_url(url=url)
@@ -341,6 +367,8 @@ class YoutubeHandler(ServiceHandler):
         if entry_info_dict["title"] == "[Deleted video]":
             raise IsDeletedVideoError("Youtube video has been deleted.")
 
+        remember_handle_from_info_dict(info_dict=entry_info_dict)
+
         # Get metadata
         media_filesize = format_info_dict.get("filesize") or format_info_dict.get(
             "filesize_approx", 0
@@ -363,6 +391,22 @@ class YoutubeHandler(ServiceHandler):
             "released_at": released_at,
         }
 
+    async def source_has_changes(self, url: str, known_video_urls: list[str]) -> bool:
+        """
+        Probes the channel's `videos.xml` feed for videos that are not known yet.
+        Playlists are always fetched with yt-dlp.
+
+        Args:
+            url: The URL of the source.
+            known_video_urls: The URLs of the videos already stored for the source.
+
+        Returns:
+            True if the source should be fetched with yt-dlp.
+        """
+        if not settings.YOUTUBE_FEED_PROBE_ENABLED or "/channel/" not in url:
+            return True
+        return await channel_has_new_videos(url=url, known_video_urls=known_video_urls)
+
     def get_ordered_by(self, url: str) -> str:
         if "/playlist" in url:
             return str(SourceOrderBy.CREATED_AT.value)
@@ -0,0 +1,3 @@
+"""
+Offline load testing: a fake yt-dlp backend, a fake media upstream and a load-test scenario.
+"""
@@ -0,0 +1,39 @@
+import asyncio
+
+import typer
+from rich.console import Console
+
+from app.loadtest.scenario import run_load_test
+
+console = Console()
+
+loadtest_app = typer.Typer(name="loadtest", add_completion=False)
+
+
+@loadtest_app.command()
+def main(
+    sources: int = typer.Option(5, help="Number of synthetic sources."),
+    duration: float = typer.Option(30, help="Seconds to drive the load for."),
+    feed_workers: int = typer.Option(10, help="Concurrent feed readers."),
+    media_workers: int = typer.Option(10, help="Concurrent media HEAD/Range GET players."),
+    fetch_workers: int = typer.Option(2, help="Concurrent source fetch cycles."),
+    media_port: int = typer.Option(5099, help="Port of the fake media upstream."),
+) -> None:
+    """
+    Run the offline load test, with the fake yt-dlp backend and fake media upstream.
+    """
+    report = asyncio.run(
+        run_load_test(
+            sources=sources,
+            duration_seconds=duration,
+            feed_workers=feed_workers,
+            media_workers=media_workers,
+            fetch_workers=fetch_workers,
+            media_port=media_port,
+        )
+    )
+    console.print(report.render())
+
+
+if __name__ == "__main__":
+    loadtest_app()  # pragma: no cover
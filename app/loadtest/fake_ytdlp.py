@@ -0,0 +1,294 @@
+"""
+Fake yt-dlp backend, enabled with `YTDLP_BACKEND=fake`.
+
+`FakeYoutubeDL` stands in for `yt_dlp.YoutubeDL` in `app.services.ytdlp.get_ydl`. It serves
+info_dicts recorded with `YTDLP_RECORD_INFO_DICTS`, or synthetic YouTube channels and videos
+whose media URLs point at the fake media upstream. Latency and errors are injected like a
+real extraction: the latency blocks the calling thread and errors are raised as yt-dlp
+`DownloadError`s, so they go through the same error handling as real ones.
+"""
+
+from typing import Any
+
+import hashlib
+import json
+import random
+import re
+import string
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.utils import DownloadError
+
+from app.loadtest.media_server import sign_media_url
+from app.loadtest.settings import LoadTestSettings
+from app.paths import INFO_DICT_RECORDINGS_PATH
+
+settings = LoadTestSettings()
+
+WORDS = (
+    "news update live stream podcast episode review interview reaction tutorial guide "
+    "weekly highlights analysis breaking exclusive full uncut official clip series part "
+    "market crypto economy politics science history music gaming travel cooking fitness"
+).split()
+
+# Errors injected at `FAKE_YTDLP_ERROR_RATE`, as worded by yt-dlp.
+FAKE_ERRORS = (
+    "ERROR: [youtube] Unable to download webpage: HTTP Error 429: Too Many Requests",
+    "ERROR: [youtube] Unable to download API page: HTTP Error 503: Service Unavailable",
+    "ERROR: [youtube] Video unavailable. This video is no longer available",
+    "ERROR: Unable to download webpage: HTTP Error 404: Not Found",
+)
+
+SYNTHETIC_RELEASED_AT = datetime(2023, 6, 1)
+
+
+def get_random_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def get_random_video_id(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_letters + string.digits + "-_") for _ in range(11))
+
+
+def get_seed(value: str) -> int:
+    return zlib.crc32(value.encode())
+
+
+def get_thumbnails(video_id: str) -> list[dict[str, Any]]:
+    return [
+        {
+            "url": f"https://i.ytimg.com/vi/{video_id}/{name}.jpg",
+            "height": height,
+            "width": height * 16 // 9,
+        }
+        for name, height in (("default", 90), ("mqdefault", 180), ("hqdefault", 360))
+    ]
+
+
+def generate_entry_info_dict(
+    rng: random.Random, released_at: datetime, channel_id: str = "UCsyntheticchannel000000"
+) -> dict[str, Any]:
+    """
+    Generate a flat-extracted video entry of a channel's source_info_dict.
+
+    Args:
+        rng (random.Random): The random generator.
+        released_at (datetime): The video's release date.
+        channel_id (str): The channel's id.
+
+    Returns:
+        dict[str, Any]: The entry_info_dict.
+    """
+    video_id = get_random_video_id(rng=rng)
+    url = f"https://www.youtube.com/watch?v={video_id}"
+    return {
+        "_type": "url",
+        "ie_key": "Youtube",
+        "id": video_id,
+        "url": url,
+        "webpage_url": url,
+        "title": get_random_text(rng=rng, words=rng.randint(4, 14)).title(),
+        "description": get_random_text(rng=rng, words=rng.randint(20, 250)),
+        "duration": rng.randint(20, 3 * 60 * 60),
+        "upload_date": released_at.strftime("%Y%m%d"),
+        "timestamp": released_at.timestamp(),
+        "view_count": rng.randint(0, 5_000_000),
+        "live_status": rng.choice([None, None, None, "was_live"]),
+        "channel": "Synthetic Channel",
+        "channel_id": channel_id,
+        "thumbnails": get_thumbnails(video_id=video_id),
+    }
+
+
+def generate_source_info_dict(
+    source_id: str,
+    videos: int,
+    seed: int = 0,
+    channel_id: str = "UCsyntheticchannel000000",
+) -> dict[str, Any]:
+    """
+    Generate a flat-extracted YouTube channel source_info_dict with `videos` entries,
+    newest first.
+
+    Args:
+        source_id (str): The source's id.
+        videos (int): The number of video entries.
+        seed (int): The random seed, so that runs are comparable.
+        channel_id (str): The channel's id.
+
+    Returns:
+        dict[str, Any]: The source_info_dict.
+    """
+    rng = random.Random(seed)
+    url = f"https://www.youtube.com/channel/{channel_id}"
+    logo = f"https://yt3.googleusercontent.com/{channel_id}"
+    return {
+        "_type": "playlist",
+        "id": channel_id,
+        "source_id": source_id,
+        "url": url,
+        "title": "Synthetic Channel",
+        "uploader": "Synthetic Channel",
+        "description": get_random_text(rng=rng, words=60),
+        "thumbnail": f"{logo}=s900",
+        "thumbnails": [{"url": f"{logo}=s{size}"} for size in (88, 176, 900, 2560)],
+        "extractor_key": "YoutubeTab",
+        "metadata": {"url": url},
+        "entries": [
+            generate_entry_info_dict(
+                rng=rng,
+                released_at=SYNTHETIC_RELEASED_AT - timedelta(hours=6 * i),
+                channel_id=channel_id,
+            )
+            for i in range(videos)
+        ],
+    }
+
+
+def generate_video_info_dict(video_id: str) -> dict[str, Any]:
+    """
+    Generate a fully extracted YouTube video_info_dict, with a signed media URL on the fake
+    media upstream.
+
+    Args:
+        video_id (str): The video's id.
+
+    Returns:
+        dict[str, Any]: The video_info_dict.
+    """
+    rng = random.Random(get_seed(video_id))
+    url = f"https://www.youtube.com/watch?v={video_id}"
+    released_at = SYNTHETIC_RELEASED_AT - timedelta(hours=rng.randint(0, 24 * 365))
+    filesize = settings.FAKE_MEDIA_FILESIZE
+    return {
+        "id": video_id,
+        "title": get_random_text(rng=rng, words=rng.randint(4, 14)).title(),
+        "description": get_random_text(rng=rng, words=rng.randint(20, 250)),
+        "uploader": "Synthetic Channel",
+        "uploader_id": "@syntheticchannel",
+        "channel_id": "UCsyntheticchannel000000",
+        "duration": rng.randint(20, 3 * 60 * 60),
+        "webpage_url": url,
+        "thumbnail": get_thumbnails(video_id=video_id)[-1]["url"],
+        "thumbnails": get_thumbnails(video_id=video_id),
+        "upload_date": released_at.strftime("%Y%m%d"),
+        "timestamp": released_at.timestamp(),
+        "extractor_key": "Youtube",
+        "format_id": "18",
+        "formats": [
+            {
+                "format_id": "18",
+                "ext": "mp4",
+                "url": sign_media_url(video_id=video_id, clen=filesize),
+                "filesize": filesize,
+            }
+        ],
+    }
+
+
+def get_recording_path(url: str) -> Path:
+    return INFO_DICT_RECORDINGS_PATH / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+
+def save_recording(url: str, info_dict: dict[str, Any]) -> None:
+    """
+    Save an info_dict extracted by yt-dlp, to be served by the fake backend.
+
+    Args:
+        url (str): The extracted URL.
+        info_dict (dict[str, Any]): The info_dict.
+    """
+    INFO_DICT_RECORDINGS_PATH.mkdir(parents=True, exist_ok=True)
+    recording = {key: value for key, value in info_dict.items() if key != "metadata"}
+    get_recording_path(url=url).write_text(json.dumps(recording, default=str), encoding="utf8")
+
+
+def load_recording(url: str) -> dict[str, Any] | None:
+    """
+    Load the recorded info_dict of a URL.
+
+    Args:
+        url (str): The URL.
+
+    Returns:
+        dict[str, Any] | None: The info_dict, or None if the URL was not recorded.
+    """
+    path = get_recording_path(url=url)
+    if not path.exists():
+        return None
+    info_dict: dict[str, Any] = json.loads(path.read_text(encoding="utf8"))
+    return info_dict
+
+
+def get_synthetic_info_dict(url: str, playlistend: int = 0) -> dict[str, Any]:
+    """
+    Get the synthetic info_dict of a YouTube video or channel URL.
+
+    Args:
+        url (str): The URL.
+        playlistend (int): The maximum number of channel entries, 0 for no limit.
+
+    Returns:
+        dict[str, Any]: The info_dict.
+    """
+    parsed_url = urlparse(url)
+    if video_id := parse_qs(parsed_url.query).get("v", [None])[0]:
+        return generate_video_info_dict(video_id=video_id)
+
+    match = re.search(r"channel/([\w-]+)", parsed_url.path)
+    channel_id = match.group(1) if match else "UCsyntheticchannel000000"
+    videos = settings.FAKE_YTDLP_SOURCE_VIDEOS
+    if playlistend:
+        videos = min(videos, playlistend)
+    return generate_source_info_dict(
+        source_id="", videos=videos, seed=get_seed(channel_id), channel_id=channel_id
+    )
+
+
+class FakeYoutubeDL:
+    """
+    Stand-in for `yt_dlp.YoutubeDL` that serves recorded or synthetic info_dicts.
+    """
+
+    def __init__(self, params: dict[str, Any] | None = None) -> None:
+        self.params = params or {}
+        self._ies_instances: dict[str, InfoExtractor] = {}
+
+    def __enter__(self) -> "FakeYoutubeDL":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        return None
+
+    def add_info_extractor(self, ie: InfoExtractor) -> None:
+        self._ies_instances[ie.ie_key()] = ie
+
+    def extract_info(
+        self,
+        url: str,
+        download: bool = False,  # pylint: disable=unused-argument
+        ie_key: str | None = None,  # pylint: disable=unused-argument
+        process: bool = True,  # pylint: disable=unused-argument
+    ) -> dict[str, Any]:
+        """
+        Extract the info_dict of a URL, after the configured latency.
+
+        Raises:
+            DownloadError: At the configured error rate.
+        """
+        latency_ms = settings.FAKE_YTDLP_LATENCY_MS + random.uniform(
+            -settings.FAKE_YTDLP_JITTER_MS, settings.FAKE_YTDLP_JITTER_MS
+        )
+        time.sleep(max(latency_ms, 0) / 1000)
+
+        if random.random() < settings.FAKE_YTDLP_ERROR_RATE:
+            raise DownloadError(random.choice(FAKE_ERRORS))
+
+        return load_recording(url=url) or get_synthetic_info_dict(
+            url=url, playlistend=self.params.get("playlistend", 0)
+        )
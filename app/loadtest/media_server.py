@@ -0,0 +1,189 @@
+"""
+Fake googlevideo-style media upstream.
+
+Serves deterministic media bytes from signed, expiring `/videoplayback` URLs, with HEAD and
+Range support, so that the reverse proxy can be load tested without hitting YouTube.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import re
+import threading
+import time
+from collections.abc import Iterator
+from urllib.parse import urlencode
+
+import uvicorn
+from fastapi import FastAPI, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
+from loguru import logger as _logger
+
+from app.loadtest.settings import LoadTestSettings
+
+settings = LoadTestSettings()
+
+logger = _logger.bind(name="logger")
+
+CHUNK_SIZE = 1024 * 64
+
+# Media bytes repeat a 0..250 byte pattern, so any range can be generated and verified.
+PATTERN_PERIOD = 251
+PATTERN = bytes(i % PATTERN_PERIOD for i in range(PATTERN_PERIOD * 512)) * 2
+
+media_app = FastAPI(title="Fake Media Upstream", docs_url=None, redoc_url=None)
+
+
+def get_media_signature(video_id: str, clen: int, expire: int) -> str:
+    """
+    Get the signature of a media URL.
+
+    Args:
+        video_id (str): The video id.
+        clen (int): The media content length.
+        expire (int): The unix timestamp the URL expires at.
+
+    Returns:
+        str: The signature.
+    """
+    message = f"{video_id}:{clen}:{expire}".encode()
+    return hmac.new(settings.FAKE_MEDIA_SECRET.encode(), message, hashlib.sha256).hexdigest()[:32]
+
+
+def sign_media_url(video_id: str, clen: int, expire: int | None = None) -> str:
+    """
+    Get a signed media URL on the fake media upstream.
+
+    Args:
+        video_id (str): The video id.
+        clen (int): The media content length.
+        expire (int | None): The unix timestamp the URL expires at.
+            Defaults to `FAKE_MEDIA_URL_TTL_SECONDS` from now.
+
+    Returns:
+        str: The signed URL.
+    """
+    expire = expire or int(time.time()) + settings.FAKE_MEDIA_URL_TTL_SECONDS
+    query = urlencode(
+        {
+            "id": video_id,
+            "clen": clen,
+            "expire": expire,
+            "sig": get_media_signature(video_id=video_id, clen=clen, expire=expire),
+        }
+    )
+    return f"{settings.FAKE_MEDIA_BASE_URL}/videoplayback?{query}"
+
+
+def get_media_bytes(start: int, end: int) -> Iterator[bytes]:
+    """
+    Generate the media bytes from `start` to `end`, inclusive.
+
+    Args:
+        start (int): The first byte.
+        end (int): The last byte.
+
+    Yields:
+        bytes: Chunks of at most `CHUNK_SIZE` bytes.
+    """
+    position = start
+    while position <= end:
+        length = min(CHUNK_SIZE, end - position + 1)
+        offset = position % (len(PATTERN) // 2)
+        yield PATTERN[offset : offset + length]
+        position += length
+
+
+def parse_range_header(range_header: str, size: int) -> tuple[int, int]:
+    """
+    Parse a single "bytes=" Range header.
+
+    Args:
+        range_header (str): The Range header, ie. "bytes=0-1023", "bytes=1024-" or "bytes=-512".
+        size (int): The size of the media.
+
+    Returns:
+        tuple[int, int]: The first and last byte of the range, inclusive.
+
+    Raises:
+        ValueError: If the range is invalid or not satisfiable.
+    """
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", range_header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        raise ValueError(f"Invalid range. {range_header=}")
+
+    if match.group(1) == "":
+        start, end = max(size - int(match.group(2)), 0), size - 1
+    else:
+        start = int(match.group(1))
+        end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+
+    if start > end or start >= size:
+        raise ValueError(f"Range not satisfiable. {range_header=} {size=}")
+    return start, end
+
+
+@media_app.get("/videoplayback")
+@media_app.head("/videoplayback")
+async def videoplayback(
+    request: Request,
+    video_id: str = Query(alias="id"),
+    clen: int = Query(),
+    expire: int = Query(),
+    sig: str = Query(),
+) -> Response:
+    """
+    Serve the media of a signed URL.
+
+    Responds with 403 Forbidden if the signature is invalid or the URL has expired,
+    like googlevideo does.
+    """
+    expected_sig = get_media_signature(video_id=video_id, clen=clen, expire=expire)
+    if not hmac.compare_digest(sig, expected_sig) or expire < time.time():
+        return Response(status_code=status.HTTP_403_FORBIDDEN)
+
+    if settings.FAKE_MEDIA_LATENCY_MS:
+        await asyncio.sleep(settings.FAKE_MEDIA_LATENCY_MS / 1000)
+
+    headers = {"Accept-Ranges": "bytes", "Content-Type": "video/mp4"}
+    status_code = status.HTTP_200_OK
+    start, end = 0, clen - 1
+    if range_header := request.headers.get("range"):
+        try:
+            start, end = parse_range_header(range_header=range_header, size=clen)
+        except ValueError:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{clen}"},
+            )
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{clen}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    if request.method == "HEAD":
+        return Response(status_code=status_code, headers=headers)
+    return StreamingResponse(
+        get_media_bytes(start=start, end=end), status_code=status_code, headers=headers
+    )
+
+
+def start_media_server(host: str = "127.0.0.1", port: int = 5099) -> uvicorn.Server:
+    """
+    Start the fake media upstream in a background thread.
+
+    Args:
+        host (str): The host to bind.
+        port (int): The port to bind.
+
+    Returns:
+        uvicorn.Server: The running server. Set `should_exit` to stop it.
+    """
+    server = uvicorn.Server(
+        uvicorn.Config(media_app, host=host, port=port, log_level="warning", access_log=False)
+    )
+    thread = threading.Thread(target=server.run, name="fake-media-server", daemon=True)
+    thread.start()
+    while not server.started and thread.is_alive():
+        time.sleep(0.01)
+    logger.info(f"Fake media upstream listening on http://{host}:{port}")
+    return server
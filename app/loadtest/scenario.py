@@ -0,0 +1,279 @@
+"""
+Load-test scenario that drives feeds, HEAD/GET media and fetch cycles at the same time.
+
+The app runs in-process on a temporary database, with the fake yt-dlp backend and the fake
+media upstream, so that the whole fetch and proxy path is exercised without hitting
+YouTube. Requests are sent through the ASGI interface, on the same event loop as the fetch
+cycles, so the report reflects how the paths slow each other down.
+"""
+
+from typing import Any
+
+import asyncio
+import math
+import random
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Generator, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import Session, SQLModel, create_engine
+
+from app import crud, logger, models, settings
+from app.api import deps as api_deps
+from app.core.app import app
+from app.db.init_db import init_initial_data
+from app.loadtest import fake_ytdlp, media_server
+from app.services import feed, ytdlp
+from app.services.fetch import fetch_source
+from app.services.source import get_source_from_source_info_dict, get_source_info_dict
+from app.views import deps as views_deps
+
+MEDIA_RANGE_BYTES = 1024 * 1024
+
+
+@dataclass
+class OperationStats:
+    """
+    The latencies and errors of one operation of the load test.
+    """
+
+    name: str
+    durations: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.durations)
+
+    def percentile(self, percent: float) -> float:
+        if not self.durations:
+            return 0.0
+        durations = sorted(self.durations)
+        return durations[max(math.ceil(percent / 100 * len(durations)) - 1, 0)]
+
+
+@dataclass
+class LoadTestReport:
+    """
+    The results of a load test run.
+    """
+
+    duration_seconds: float = 0.0
+    operations: dict[str, OperationStats] = field(default_factory=dict)
+
+    def record(self, name: str, duration: float, ok: bool) -> None:
+        stats = self.operations.setdefault(name, OperationStats(name=name))
+        stats.durations.append(duration)
+        if not ok:
+            stats.errors += 1
+
+    def render(self) -> str:
+        """
+        Render the report as a text table.
+
+        Returns:
+            str: The report.
+        """
+        lines = [
+            f"{'operation':<16}{'count':>8}{'errors':>8}{'rps':>8}"
+            f"{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"
+        ]
+        for stats in sorted(self.operations.values(), key=lambda stats: stats.name):
+            rps = stats.count / self.duration_seconds if self.duration_seconds else 0.0
+            lines.append(
+                f"{stats.name:<16}{stats.count:>8}{stats.errors:>8}{rps:>8.1f}"
+                f"{stats.percentile(50) * 1000:>10.1f}{stats.percentile(95) * 1000:>10.1f}"
+                f"{stats.percentile(100) * 1000:>10.1f}"
+            )
+        return "\n".join(lines)
+
+
+@contextmanager
+def override_attributes(obj: Any, **values: Any) -> Iterator[None]:
+    """
+    Temporarily set attributes of an object, ie. a module's settings.
+    """
+    original_values = {name: getattr(obj, name) for name in values}
+    for name, value in values.items():
+        setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        for name, value in original_values.items():
+            setattr(obj, name, value)
+
+
+async def create_sources(db: Session, sources: int) -> list[str]:
+    """
+    Create and fetch synthetic YouTube channel sources.
+
+    Args:
+        db (Session): The database session.
+        sources (int): The number of sources.
+
+    Returns:
+        list[str]: The source ids.
+    """
+    user = await crud.user.get(db=db, username=settings.FIRST_SUPERUSER_USERNAME)
+    source_ids = []
+    for i in range(sources):
+        url = f"https://www.youtube.com/channel/UCloadtest{i:014d}"
+        source_id = await models.source.generate_source_id_from_url(url=url)
+        source_info_dict = await get_source_info_dict(source_id=source_id, url=url)
+        source = await get_source_from_source_info_dict(
+            source_info_dict=source_info_dict, created_by_user_id=user.id
+        )
+        await crud.source.create(obj_in=source, db=db)
+        await fetch_source(db=db, id=source_id)
+        source_ids.append(source_id)
+    return source_ids
+
+
+async def run_worker(
+    report: LoadTestReport,
+    name: str,
+    deadline: float,
+    operation: Callable[[], Awaitable[bool]],
+) -> None:
+    """
+    Run an operation repeatedly until the deadline, recording its latency and errors.
+    """
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            ok = await operation()
+        except Exception as e:  # pylint: disable=broad-except
+            logger.debug(f"Load test operation '{name}' failed. {e=}")
+            ok = False
+        report.record(name=name, duration=time.perf_counter() - start, ok=ok)
+        # Let the other workers run, even if the operation never suspended
+        await asyncio.sleep(0)
+
+
+async def run_load_test(
+    sources: int = 5,
+    duration_seconds: float = 30,
+    feed_workers: int = 10,
+    media_workers: int = 10,
+    fetch_workers: int = 2,
+    media_port: int = 5099,
+) -> LoadTestReport:
+    """
+    Run the load test against a temporary database.
+
+    Args:
+        sources (int): The number of synthetic sources.
+        duration_seconds (float): How long to drive the load for.
+        feed_workers (int): The number of concurrent feed readers.
+        media_workers (int): The number of concurrent media players, alternating HEAD and
+            Range GET requests.
+        fetch_workers (int): The number of concurrent source fetch cycles.
+        media_port (int): The port of the fake media upstream.
+
+    Returns:
+        LoadTestReport: The latencies and errors of each operation.
+    """
+    with tempfile.TemporaryDirectory(prefix="tubecast-loadtest-") as tmp_dir:
+        engine = create_engine(
+            f"sqlite:///{Path(tmp_dir) / 'loadtest.sqlite3'}",
+            connect_args={"check_same_thread": False},
+        )
+        SQLModel.metadata.create_all(bind=engine)
+        session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=Session)
+
+        def get_db() -> Generator[Session, None, None]:
+            with session_local() as db:
+                yield db
+
+        media = media_server.start_media_server(port=media_port)
+        try:
+            with (
+                override_attributes(ytdlp.settings, YTDLP_BACKEND="fake"),
+                override_attributes(
+                    media_server.settings, FAKE_MEDIA_BASE_URL=f"http://127.0.0.1:{media_port}"
+                ),
+                override_attributes(feed, FEEDS_PATH=Path(tmp_dir)),
+                override_attributes(
+                    app,
+                    dependency_overrides={
+                        api_deps.get_db: get_db,
+                        api_deps.get_sync_db: get_db,
+                        views_deps.get_db: get_db,
+                    },
+                ),
+            ):
+                with session_local() as db:
+                    await init_initial_data(db=db)
+                    with override_attributes(fake_ytdlp.settings, FAKE_YTDLP_ERROR_RATE=0.0):
+                        source_ids = await create_sources(db=db, sources=sources)
+                    video_ids = [video.id for video in await crud.video.get_all(db=db)]
+                logger.info(f"Load testing {len(source_ids)} sources, {len(video_ids)} videos.")
+
+                return await drive_load(
+                    source_ids=source_ids,
+                    video_ids=video_ids,
+                    session_local=session_local,
+                    duration_seconds=duration_seconds,
+                    feed_workers=feed_workers,
+                    media_workers=media_workers,
+                    fetch_workers=fetch_workers,
+                )
+        finally:
+            media.should_exit = True
+            engine.dispose()
+
+
+async def drive_load(
+    source_ids: list[str],
+    video_ids: list[str],
+    session_local: "sessionmaker[Session]",
+    duration_seconds: float,
+    feed_workers: int,
+    media_workers: int,
+    fetch_workers: int,
+) -> LoadTestReport:
+    """
+    Drive feeds, HEAD/GET media and fetch cycles concurrently until the duration has passed.
+    """
+    report = LoadTestReport(duration_seconds=duration_seconds)
+    deadline = time.perf_counter() + duration_seconds
+
+    async with httpx.AsyncClient(app=app, base_url="http://loadtest", timeout=60) as client:
+
+        async def get_feed() -> bool:
+            response = await client.get(f"/source/{random.choice(source_ids)}/feed")
+            return response.status_code == 200
+
+        async def head_media() -> bool:
+            response = await client.head(f"/media/{random.choice(video_ids)}")
+            return response.status_code == 200
+
+        async def get_media() -> bool:
+            response = await client.get(
+                f"/media/{random.choice(video_ids)}",
+                headers={"Range": f"bytes=0-{MEDIA_RANGE_BYTES - 1}"},
+            )
+            return response.status_code in (200, 206)
+
+        async def fetch() -> bool:
+            with session_local() as db:
+                await fetch_source(db=db, id=random.choice(source_ids))
+            return True
+
+        media_operations = [("media_get", get_media), ("media_head", head_media)]
+        workers = [
+            *(run_worker(report, "feed", deadline, get_feed) for _ in range(feed_workers)),
+            *(
+                run_worker(report, name, deadline, operation)
+                for name, operation in (media_operations[i % 2] for i in range(media_workers))
+            ),
+            *(run_worker(report, "fetch_source", deadline, fetch) for _ in range(fetch_workers)),
+        ]
+        await asyncio.gather(*workers)
+
+    return report
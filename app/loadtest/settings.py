@@ -0,0 +1,25 @@
+"""
+Settings of the fake yt-dlp backend and the fake media upstream.
+
+They are only read by the load testing package, so they are kept out of the app's `Settings`.
+"""
+
+import secrets
+
+from pydantic import BaseSettings, Field
+
+
+class LoadTestSettings(BaseSettings):
+    # Fake yt-dlp Backend
+    FAKE_YTDLP_LATENCY_MS: int = 300
+    FAKE_YTDLP_JITTER_MS: int = 200
+    FAKE_YTDLP_ERROR_RATE: float = 0.0
+    FAKE_YTDLP_SOURCE_VIDEOS: int = 100
+
+    # Fake Media Upstream
+    FAKE_MEDIA_BASE_URL: str = "http://127.0.0.1:5099"
+    # Random per process, unless set, as the upstream runs in the process signing its URLs
+    FAKE_MEDIA_SECRET: str = Field(default_factory=lambda: secrets.token_hex(16))
+    FAKE_MEDIA_URL_TTL_SECONDS: int = 60 * 60 * 6  # 6 hours
+    FAKE_MEDIA_FILESIZE: int = 1024 * 1024 * 5  # 5 MB
+    FAKE_MEDIA_LATENCY_MS: int = 50
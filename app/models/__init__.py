@@ -1,6 +1,8 @@
 from .alerts import *
+from .archived_video import *
 from .criteria import *
 from .fetch import *
+from .fetch_history import *
 from .filter import *
 from .msg import *
 from .server import *
@@ -11,3 +13,6 @@ from .tokens import *
 from .user import *
 from .user_source_link import *
 from .video import *
+from .video_description import *
+from .video_search import *
+from .websub import *
@@ -0,0 +1,28 @@
+import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class ArchivedVideoBase(SQLModel):
+    id: str = Field(default=None, primary_key=True, index=True)
+    url: str = Field(default=None, nullable=False)
+    handler: str = Field(default=None, nullable=False)
+    released_at: datetime.datetime | None = Field(default=None)
+    archived_at: datetime.datetime = Field(default_factory=datetime.datetime.utcnow, nullable=False)
+    data: bytes = Field(default=None, nullable=False)
+
+
+class ArchivedVideo(ArchivedVideoBase, table=True):
+    pass
+
+
+class ArchivedVideoCreate(ArchivedVideoBase):
+    pass
+
+
+class ArchivedVideoUpdate(ArchivedVideoBase):
+    pass
+
+
+class ArchivedVideoRead(ArchivedVideoBase):
+    pass
@@ -5,11 +5,13 @@ from datetime import datetime, timedelta
 from enum import Enum
 
 from pydantic import root_validator
+from sqlalchemy.orm import Session, object_session
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.core.uuid import generate_uuid_random
 
 from .common import TimestampModel
+from .video_search import get_phrase_query, match_video_ids
 
 if TYPE_CHECKING:
     from .filter import Filter  # pragma: no cover
@@ -69,6 +71,10 @@ class Criteria(CriteriaBase, table=True):
         Returns:
             list[Video]: Filtered list of videos
         """
+        keyword_video_ids = (
+            self.get_keyword_video_ids() if self.field == CriteriaField.KEYWORD.value else None
+        )
+
         filtered_videos = []
         for video in videos:
             if self.field in [CriteriaField.RELEASED.value, CriteriaField.CREATED.value]:
@@ -92,6 +98,7 @@ class Criteria(CriteriaBase, table=True):
                 if not self.matches_contains(
                     video=video,
                     keyword=str(self.value),
+                    keyword_video_ids=keyword_video_ids,
                 ):
                     continue
 
@@ -161,31 +168,51 @@ class Criteria(CriteriaBase, table=True):
         else:
             raise ValueError("Operator must be 'shorter_than' or 'longer_than'")
 
-    def matches_contains(self, video: "Video", keyword: str) -> bool:
+    def get_keyword_video_ids(self) -> set[str] | None:
         """
-        Check if video title or description contains keyword
+        Get the ids of the filter's source's videos whose title contains the keyword, from the
+        full-text index.
+
+        The index's tokenizer ignores diacritics and punctuation, so its hits are a superset of
+        the keyword's regex matches, and are confirmed with the regex by `matches_contains`.
+
+        Returns:
+            set[str] | None: The ids of the videos, or None if the criteria is not in a
+                database session or the keyword has no words.
+        """
+        db = object_session(self)
+        query = get_phrase_query(phrase=str(self.value), column="title")
+        if not isinstance(db, Session) or query is None:
+            return None
+        return set(match_video_ids(db=db, query=query, source_ids=[self.filter.source_id]))
+
+    def matches_contains(
+        self, video: "Video", keyword: str, keyword_video_ids: set[str] | None = None
+    ) -> bool:
+        """
+        Check if video title contains keyword
 
         Args:
             video (Video): Video to check
             keyword (str): Keyword to check for
+            keyword_video_ids (set[str] | None): Ids of the videos whose title may contain the
+                keyword, from the full-text index. Only these videos are matched with the
+                regex, or all videos if None.
 
         Returns:
-
+            bool: True if the video matches the criteria's operator, False otherwise
         """
-        match = None
+        contains = (keyword_video_ids is None or video.id in keyword_video_ids) and bool(
+            re.search(rf"\b{re.escape(keyword.lower())}\b", str(video.title).lower())
+        )
 
         if self.operator == CriteriaOperator.MUST_CONTAIN.value:
-            match = bool(re.search(rf"\b{re.escape(keyword.lower())}\b", str(video.title).lower()))
+            return contains
         elif self.operator == CriteriaOperator.MUST_NOT_CONTAIN.value:
-            match = (
-                bool(re.search(rf"\b{re.escape(keyword.lower())}\b", str(video.title).lower()))
-                is False
-            )
+            return contains is False
         else:
             raise ValueError("Operator must be 'must_contain' or 'must_not_contain'")
 
-        return match
-
 
 class CriteriaCreate(CriteriaBase):
     @root_validator(pre=True)
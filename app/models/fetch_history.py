@@ -0,0 +1,56 @@
+import datetime
+
+from sqlmodel import Field, SQLModel
+
+from app.core.uuid import generate_uuid_random
+
+
+class FetchHistoryBase(SQLModel):
+    id: str = Field(default_factory=generate_uuid_random, primary_key=True, index=True)
+    run_id: str = Field(default=None, index=True, nullable=False)
+    source_id: str = Field(default=None, foreign_key="source.id", index=True, nullable=False)
+    handler: str = Field(default=None, nullable=False)
+    outcome: str = Field(default=None, nullable=False)
+    error: str | None = Field(default=None)
+    started_at: datetime.datetime = Field(default=None, index=True, nullable=False)
+    finished_at: datetime.datetime = Field(default=None, nullable=False)
+    duration_seconds: float = Field(default=0, nullable=False)
+    ytdlp_seconds: float = Field(default=0, nullable=False)
+    db_seconds: float = Field(default=0, nullable=False)
+    feed_seconds: float = Field(default=0, nullable=False)
+    entries: int = Field(default=0, nullable=False)
+    bytes_extracted: int = Field(default=0, nullable=False)
+    added_videos: int = Field(default=0, nullable=False)
+
+
+class FetchHistory(FetchHistoryBase, table=True):
+    pass
+
+
+class FetchHistoryCreate(FetchHistoryBase):
+    pass
+
+
+class FetchHistoryUpdate(FetchHistoryBase):
+    pass
+
+
+class FetchHistoryRead(FetchHistoryBase):
+    pass
+
+
+class SourceFetchCost(SQLModel):
+    source_id: str
+    source_name: str
+    handler: str
+    fetches: int
+    errors: int
+    total_seconds: float
+    avg_seconds: float
+    ytdlp_seconds: float
+    db_seconds: float
+    feed_seconds: float
+    entries: int
+    bytes_extracted: int
+    added_videos: int
+    last_fetched_at: datetime.datetime
@@ -1,3 +1,5 @@
+import datetime
+
 from sqlmodel import SQLModel
 
 
@@ -5,3 +7,25 @@ class HealthCheck(SQLModel):
     name: str
     version: str
     description: str
+
+
+class UpstreamStatus(SQLModel):
+    key: str
+    state: str
+    requests_per_second: float
+    max_requests_per_second: float
+    tokens: float
+    consecutive_failures: int
+    backoff_seconds: float
+    open_until: datetime.datetime | None = None
+    total_requests: int = 0
+    total_throttled: int = 0
+
+
+class ProfileInfo(SQLModel):
+    id: str
+    kind: str
+    name: str
+    duration_ms: float
+    samples: int
+    created_at: datetime.datetime
@@ -1,4 +1,6 @@
-from pydantic import BaseSettings, EmailStr
+from typing import Any
+
+from pydantic import BaseSettings, EmailStr, validator
 import requests
 
 
@@ -19,6 +21,21 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_ECHO: bool = False
+    DATABASE_BACKEND: str = "sync"  # "sync" or "async" (aiosqlite, for the API routes)
+
+    # Database Backups
+    DB_BACKUP_INTERVAL_HOURS: int = 12
+    DB_BACKUP_COMPRESSION_LEVEL: int = 10
+    DB_BACKUP_PAGES_PER_STEP: int = 1024
+    DB_BACKUP_STEP_SLEEP_MS: int = 10
+    DB_BACKUP_KEEP_HOURLY: int = 24
+    DB_BACKUP_KEEP_DAILY: int = 7
+    DB_BACKUP_KEEP_WEEKLY: int = 8
+    DB_BACKUP_INCREMENTAL: bool = False
+
+    # Database Compaction
+    DB_COMPACT_INTERVAL_HOURS: int = 24
+    DB_VACUUM_MIN_FREE_RATIO: float = 0.2
 
     # Server
     SERVER_HOST: str = "0.0.0.0"
@@ -30,10 +47,26 @@ class Settings(BaseSettings):
     UVICORN_ENTRYPOINT: str = "app.core.app:app"
     UVICORN_WORKERS: int = 1
 
+    # Metrics
+    METRICS_ENABLED: bool = True
+
+    # Profiling
+    PROFILING_ENABLED: bool = False
+    PROFILING_SLOW_THRESHOLD_MS: int = 1000
+    PROFILING_SAMPLE_RATE: float = 1.0
+    PROFILING_INTERVAL_MS: int = 5
+    PROFILING_MAX_PROFILES: int = 100
+
+    # Page Fragment Cache
+    FRAGMENT_CACHE_ENABLED: bool = True
+    FRAGMENT_CACHE_TTL_SECONDS: int = 300
+    FRAGMENT_CACHE_MAX_ENTRIES: int = 500
+
     # API
     API_V1_PREFIX: str = "/api/v1"
     JWT_ACCESS_SECRET_KEY: str = "jwt_access_secret_key"
     JWT_REFRESH_SECRET_KEY: str = "jwt_refresh_secret_key"
+    API_EXPORT_BATCH_SIZE: int = 500
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 10080
     ALGORITHM: str = "HS256"
@@ -63,6 +96,11 @@ class Settings(BaseSettings):
     TELEGRAM_API_TOKEN: str = ""
     TELEGRAM_CHAT_ID: int = 0
     NOTIFY_ON_START: bool = True
+    NOTIFY_OUTBOX_ENABLED: bool = True
+    NOTIFY_OUTBOX_FLUSH_INTERVAL_SECONDS: int = 60
+    NOTIFY_TELEGRAM_MIN_INTERVAL_SECONDS: int = 60
+    NOTIFY_EMAIL_MIN_INTERVAL_SECONDS: int = 60 * 15  # 15 minutes
+    NOTIFY_DIGEST_MAX_MESSAGES: int = 50
 
     # Project Settings
     PROJECT_NAME: str = "TubeCast"
@@ -73,6 +111,62 @@ class Settings(BaseSettings):
     # Refresh Feeds
     REFRESH_SOURCES_INTERVAL_MINUTES: int = 15
     REFRESH_VIDEOS_INTERVAL_MINUTES: int = 30
+    REFRESH_VIDEOS_ENABLED: bool = False
+    REFRESH_VIDEOS_LIMIT: int = 500
+
+    # Fetch History
+    FETCH_HISTORY_ENABLED: bool = True
+    FETCH_HISTORY_RETENTION_DAYS: int = 30
+
+    # Video Descriptions
+    VIDEO_DESCRIPTION_COMPRESSION: str = "zstd"  # "none", "zlib" or "zstd"
+    VIDEO_DESCRIPTION_COMPRESSION_LEVEL: int = 10
+
+    # Video Archive
+    VIDEO_ARCHIVE_ENABLED: bool = False
+    VIDEO_ARCHIVE_AFTER_DAYS: int = 365
+    VIDEO_ARCHIVE_KEEP_PER_SOURCE: int = 100
+    VIDEO_ARCHIVE_BATCH_SIZE: int = 500
+    VIDEO_ARCHIVE_COMPRESSION_LEVEL: int = 10
+
+    # Youtube RSS Probe
+    YOUTUBE_FEED_PROBE_ENABLED: bool = True
+    YOUTUBE_FEED_URL: str = "https://www.youtube.com/feeds/videos.xml"
+    YOUTUBE_FEED_TIMEOUT_SECONDS: int = 10
+
+    # Youtube @handle Cache
+    YOUTUBE_HANDLE_CACHE_TTL_DAYS: int = 30
+    YOUTUBE_HANDLE_CACHE_NEGATIVE_TTL_MINUTES: int = 60
+
+    # Youtube WebSub (PubSubHubbub)
+    YOUTUBE_WEBSUB_ENABLED: bool = False
+    YOUTUBE_WEBSUB_HUB_URL: str = "https://pubsubhubbub.appspot.com/subscribe"
+    YOUTUBE_WEBSUB_TOPIC_URL: str = "https://www.youtube.com/xml/feeds/videos.xml"
+    YOUTUBE_WEBSUB_LEASE_SECONDS: int = 60 * 60 * 24 * 5  # 5 days
+    YOUTUBE_WEBSUB_RENEW_BEFORE_SECONDS: int = 60 * 60 * 24  # 1 day
+    YOUTUBE_WEBSUB_POLL_INTERVAL_HOURS: int = 24  # Safety poll of subscribed sources
+    YOUTUBE_WEBSUB_SECRET: str = ""  # Required when YOUTUBE_WEBSUB_ENABLED
+
+    # Rumble Channel Crawler
+    RUMBLE_CRAWL_ENABLED: bool = False
+    RUMBLE_CRAWL_CONCURRENCY: int = 4
+    RUMBLE_CRAWL_MAX_PAGES: int = 200
+    RUMBLE_CRAWL_TIMEOUT_SECONDS: int = 10
+
+    # yt-dlp
+    YTDLP_POOL_ENABLED: bool = True
+    YTDLP_POOL_MAX_IDLE_PER_KEY: int = 4
+    YTDLP_BACKEND: str = "ytdlp"  # "ytdlp" or "fake" (offline load testing)
+    YTDLP_RECORD_INFO_DICTS: bool = False  # Save yt-dlp's info_dicts for the fake backend
+
+    # Upstream Rate Limiting
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_REQUESTS_PER_SECOND: float = 1.0
+    RATE_LIMIT_MIN_REQUESTS_PER_SECOND: float = 0.05
+    RATE_LIMIT_BURST: int = 5
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 3
+    CIRCUIT_BREAKER_BASE_BACKOFF_SECONDS: int = 60
+    CIRCUIT_BREAKER_MAX_BACKOFF_SECONDS: int = 60 * 60  # 1 hour
 
     # Build Feeds
     BUILD_FEED_RECENT_VIDEOS: int = 10
@@ -81,3 +175,10 @@ class Settings(BaseSettings):
     # Disable Services
     DISABLE_YOUTUBE: bool = False
     DISABLE_RUMBLE: bool = False
+
+    @validator("YOUTUBE_WEBSUB_SECRET")
+    @classmethod
+    def validate_youtube_websub_secret(cls, value: str, values: dict[str, Any]) -> str:
+        if values.get("YOUTUBE_WEBSUB_ENABLED") and not value:
+            raise ValueError("YOUTUBE_WEBSUB_SECRET must be set when YOUTUBE_WEBSUB_ENABLED is.")
+        return value
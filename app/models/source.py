@@ -1,5 +1,6 @@
 from typing import TYPE_CHECKING, Any
 
+import datetime
 import re
 
 from pydantic import root_validator
@@ -117,5 +118,30 @@ class SourceUpdate(SourceBase):
         return values
 
 
+class SourceStats(SQLModel):
+    source_id: str
+    videos_count: int = 0
+    users_count: int = 0
+    latest_released_at: datetime.datetime | None = None
+    last_fetched_at: datetime.datetime | None = None
+
+
 class SourceRead(SourceBase):
-    pass
+    videos_count: int | None = None
+    latest_released_at: datetime.datetime | None = None
+    last_fetched_at: datetime.datetime | None = None
+
+    @classmethod
+    def from_source(cls, source: Source, stats: SourceStats | None = None) -> "SourceRead":
+        """
+        Create a SourceRead from a source, and the aggregates of its videos and fetches.
+
+        Args:
+            source (Source): The source.
+            stats (SourceStats | None): The source's stats, from `crud.source.get_stats`.
+
+        Returns:
+            SourceRead: The source to return from the API.
+        """
+        stats_values = stats.dict(exclude={"source_id", "users_count"}) if stats else {}
+        return cls(**source.dict(), **stats_values)
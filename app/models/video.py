@@ -3,11 +3,14 @@ from typing import TYPE_CHECKING, Any
 import datetime
 
 from pydantic import root_validator
+from sqlalchemy import event, inspect
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.core.uuid import generate_uuid_from_url
-from app.handlers import get_handler_from_url
+from app.handlers import get_handler_from_string, get_handler_from_url
+from app.handlers.exceptions import HandlerNotFoundError
 from app.models.source_video_link import SourceVideoLink
+from app.models.video_description import VideoDescription
 
 from .common import TimestampModel
 
@@ -21,6 +24,56 @@ async def generate_video_id_from_url(url: str) -> str:
     return generate_uuid_from_url(url=sanitized_video_url)
 
 
+def get_next_refresh_at(
+    handler: str | None,
+    title: str | None,
+    media_url: str | None,
+    released_at: datetime.datetime | None,
+    updated_at: datetime.datetime,
+) -> datetime.datetime | None:
+    """
+    Get when a video's data expires, and it should be refreshed from yt-dlp.
+
+    Videos missing their media url or release date are due right away. Other videos are due
+    `REFRESH_UPDATE_INTERVAL_HOURS` after their update, as long as they were released within
+    the handler's `REFRESH_RELEASED_RECENT_DAYS`.
+
+    Args:
+        handler: The name of the video's handler.
+        title: The video's title.
+        media_url: The video's media url.
+        released_at: When the video was released.
+        updated_at: When the video was updated, in UTC.
+
+    Returns:
+        When the video is due for a refresh, as a naive UTC datetime, or None if it is never due.
+    """
+    if "private" in str(title).lower() or "deleted" in str(title).lower():
+        return None
+    try:
+        service_handler = get_handler_from_string(handler_string=str(handler))
+    except HandlerNotFoundError:
+        return None
+
+    updated_at = to_naive_utc(value=updated_at)
+    if media_url is None or not released_at:
+        return updated_at
+
+    next_refresh_at = updated_at + datetime.timedelta(
+        hours=service_handler.REFRESH_UPDATE_INTERVAL_HOURS
+    )
+    released_recently_until = to_naive_utc(value=released_at) + datetime.timedelta(
+        days=service_handler.REFRESH_RELEASED_RECENT_DAYS
+    )
+    return next_refresh_at if next_refresh_at < released_recently_until else None
+
+
+def to_naive_utc(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+
 class VideoBase(TimestampModel, SQLModel):
     id: str = Field(default=None, primary_key=True, nullable=False)
     # source_id: str = Field(default=None, foreign_key="source.id", nullable=False)
@@ -28,7 +81,6 @@ class VideoBase(TimestampModel, SQLModel):
     uploader: str | None = Field(default=None)
     uploader_id: str | None = Field(default=None)
     title: str | None = Field(default=None)
-    description: str | None = Field(default=None)
     duration: int | None = Field(default=None)
     thumbnail: str | None = Field(default=None)
     url: str = Field(default=None, nullable=False)
@@ -36,6 +88,7 @@ class VideoBase(TimestampModel, SQLModel):
     feed_media_url: str | None = Field(default=None)
     media_filesize: int | None = Field(default=None)
     released_at: datetime.datetime = Field(default=None)
+    last_played_at: datetime.datetime | None = Field(default=None)
 
 
 class Video(VideoBase, table=True):
@@ -45,6 +98,22 @@ class Video(VideoBase, table=True):
         back_populates="videos",
         link_model=SourceVideoLink,
     )
+    description_row: VideoDescription | None = Relationship(
+        sa_relationship_kwargs={"uselist": False, "cascade": "all, delete-orphan"},
+    )
+    next_refresh_at: datetime.datetime | None = Field(default=None, index=True)
+
+    @property
+    def description(self) -> str | None:
+        """
+        The video's description, lazy loaded from the `videodescription` table.
+        """
+        return self.description_row.text if self.description_row else None
+
+    def set_description(self, description: str | None) -> None:
+        self.description_row = (
+            VideoDescription.from_text(text=description) if description is not None else None
+        )
 
     def __repr__(self) -> str:
         return f"Video(id={self.id}, title={self.title[:20] if self.title else ''}, uploader={self.uploader}, handler={self.handler})"
@@ -58,7 +127,28 @@ class Video(VideoBase, table=True):
         return False
 
 
+@event.listens_for(Video, "before_insert")  # type: ignore
+@event.listens_for(Video, "before_update")  # type: ignore
+def set_next_refresh_at(mapper: Any, connection: Any, video: Video) -> None:
+    """
+    Keep `next_refresh_at` up to date whenever a video is written.
+    """
+    updated_at = video.updated_at
+    if updated_at is None or not inspect(video).attrs.updated_at.history.has_changes():
+        # `updated_at` is set by the database on update
+        updated_at = datetime.datetime.utcnow()
+    video.next_refresh_at = get_next_refresh_at(
+        handler=video.handler,
+        title=video.title,
+        media_url=video.media_url,
+        released_at=video.released_at,
+        updated_at=updated_at,
+    )
+
+
 class VideoCreate(VideoBase):
+    description: str | None = Field(default=None)
+
     @root_validator(pre=True)
     @classmethod
     def set_pre_validation_defaults(cls, values: dict[str, Any]) -> dict[str, Any]:
@@ -77,8 +167,8 @@ class VideoCreate(VideoBase):
 
 
 class VideoUpdate(VideoBase):
-    pass
+    description: str | None = Field(default=None)
 
 
 class VideoRead(VideoBase):
-    pass
+    description: str | None = Field(default=None)
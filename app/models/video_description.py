@@ -0,0 +1,33 @@
+from sqlmodel import Field, SQLModel
+
+from app.core.compression import Compression, compress_text, decompress_text
+from app.models.settings import Settings as _Settings
+
+settings = _Settings()
+
+
+class VideoDescription(SQLModel, table=True):
+    """
+    A video's description, stored off the `video` table and optionally compressed, so that
+    loading videos does not load their (often several KB) descriptions.
+    """
+
+    video_id: str = Field(default=None, foreign_key="video.id", primary_key=True)
+    compression: str = Field(default=Compression.NONE.value, nullable=False)
+    data: bytes = Field(default=None, nullable=False)
+
+    @classmethod
+    def from_text(cls, text: str) -> "VideoDescription":
+        compression = Compression(settings.VIDEO_DESCRIPTION_COMPRESSION)
+        return cls(
+            compression=compression.value,
+            data=compress_text(
+                text=text,
+                compression=compression,
+                level=settings.VIDEO_DESCRIPTION_COMPRESSION_LEVEL,
+            ),
+        )
+
+    @property
+    def text(self) -> str:
+        return decompress_text(data=self.data, compression=Compression(self.compression))
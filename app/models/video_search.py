@@ -0,0 +1,220 @@
+"""
+SQLite FTS5 full-text index over videos' titles, descriptions and uploaders.
+
+Descriptions are stored compressed (see `VideoDescription`), so the index can not be kept in
+sync by SQL triggers. Instead, the videos inserted, updated or deleted by a session flush are
+re-indexed by the `after_flush` listener below.
+
+Index rows are keyed by a rowid derived from the video's id, so that a video's row can be
+replaced by its rowid without scanning the index, and does not change when the database is
+vacuumed.
+"""
+
+from typing import Any
+
+import hashlib
+import re
+
+from sqlalchemy import DDL, bindparam, event, inspect, text
+from sqlalchemy.orm import Session as _Session
+from sqlmodel import Session, SQLModel
+
+from .video import Video
+from .video_description import VideoDescription
+
+VIDEO_SEARCH_TABLE = "videosearch"
+VIDEO_SEARCH_COLUMNS = ("title", "description", "uploader")
+
+CREATE_VIDEO_SEARCH_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {VIDEO_SEARCH_TABLE} "
+    f"USING fts5(video_id UNINDEXED, {', '.join(VIDEO_SEARCH_COLUMNS)})"
+)
+event.listen(SQLModel.metadata, "after_create", DDL(CREATE_VIDEO_SEARCH_TABLE))
+
+QUERY_TERM_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def get_video_search_rowid(video_id: str) -> int:
+    """
+    Get the index rowid of a video, a positive 63 bit integer derived from its id.
+
+    Args:
+        video_id (str): The video's id.
+
+    Returns:
+        int: The rowid.
+    """
+    return int.from_bytes(hashlib.sha1(video_id.encode("utf8")).digest()[:8], "big") >> 1
+
+
+def get_phrase_query(phrase: str, column: str | None = None) -> str | None:
+    """
+    Get an FTS5 query matching a phrase as whole, consecutive words. This is the index's
+    equivalent of `re.search(rf"\\b{re.escape(phrase)}\\b", ...)`, case insensitive.
+
+    Args:
+        phrase (str): The phrase.
+        column (str | None): Only match the phrase in this column.
+
+    Returns:
+        str | None: The query, or None if the phrase has no words.
+    """
+    if not re.search(r"\w", phrase):
+        return None
+    query = '"{}"'.format(phrase.replace('"', '""'))
+    return f"{column} : {query}" if column else query
+
+
+def get_search_query(query: str) -> str | None:
+    """
+    Get an FTS5 query matching all of the words and "quoted phrases" of a search query.
+
+    Args:
+        query (str): The search query.
+
+    Returns:
+        str | None: The FTS5 query, or None if the search query has no words.
+    """
+    phrases = [
+        get_phrase_query(phrase=quoted or word)
+        for quoted, word in QUERY_TERM_PATTERN.findall(query)
+    ]
+    return " AND ".join(phrase for phrase in phrases if phrase) or None
+
+
+def match_video_ids(
+    db: _Session, query: str, source_ids: list[str] | None = None, limit: int | None = None
+) -> list[str]:
+    """
+    Get the ids of the videos matching an FTS5 query, best matches first.
+
+    Args:
+        db (Session): The database session.
+        query (str): The FTS5 query.
+        source_ids (list[str] | None): Only match the videos of these sources.
+        limit (int | None): The maximum number of ids to return.
+
+    Returns:
+        list[str]: The ids of the matching videos.
+    """
+    table = VIDEO_SEARCH_TABLE
+    statement = f"SELECT DISTINCT {table}.video_id, {table}.rank FROM {table}"
+    params: dict[str, Any] = {"query": query}
+    if source_ids is not None:
+        statement += (
+            f" JOIN sourcevideolink ON sourcevideolink.video_id = {table}.video_id"
+            " AND sourcevideolink.source_id IN :source_ids"
+        )
+        params["source_ids"] = source_ids
+    statement += f" WHERE {table} MATCH :query ORDER BY {table}.rank"
+    if limit is not None:
+        statement += " LIMIT :limit"
+        params["limit"] = limit
+
+    text_statement = text(statement)
+    if source_ids is not None:
+        text_statement = text_statement.bindparams(bindparam("source_ids", expanding=True))
+    return [row[0] for row in db.execute(text_statement, params)]
+
+
+def index_videos(db: _Session, videos: list[Video]) -> None:
+    """
+    Add or replace the index rows of videos.
+
+    Args:
+        db (Session): The database session.
+        videos (list[Video]): The videos.
+    """
+    db.connection().execute(
+        text(
+            f"INSERT OR REPLACE INTO {VIDEO_SEARCH_TABLE} "
+            f"(rowid, video_id, {', '.join(VIDEO_SEARCH_COLUMNS)}) "
+            "VALUES (:rowid, :video_id, :title, :description, :uploader)"
+        ),
+        [
+            {
+                "rowid": get_video_search_rowid(video_id=video.id),
+                "video_id": video.id,
+                "title": video.title,
+                "description": video.description,
+                "uploader": video.uploader,
+            }
+            for video in videos
+        ],
+    )
+
+
+def unindex_videos(db: _Session, video_ids: list[str]) -> None:
+    """
+    Delete the index rows of videos.
+
+    Args:
+        db (Session): The database session.
+        video_ids (list[str]): The ids of the videos.
+    """
+    db.connection().execute(
+        text(f"DELETE FROM {VIDEO_SEARCH_TABLE} WHERE rowid = :rowid"),
+        [{"rowid": get_video_search_rowid(video_id=video_id)} for video_id in video_ids],
+    )
+
+
+def rebuild_video_search_index(db: Session, batch_size: int = 500) -> int:
+    """
+    Rebuild the index from all videos.
+
+    Args:
+        db (Session): The database session.
+        batch_size (int): The number of videos to index at a time.
+
+    Returns:
+        int: The number of indexed videos.
+    """
+    db.execute(text(f"DELETE FROM {VIDEO_SEARCH_TABLE}"))
+    indexed = 0
+    offset = 0
+    while videos := db.query(Video).order_by(Video.id).offset(offset).limit(batch_size).all():
+        index_videos(db=db, videos=videos)
+        indexed += len(videos)
+        offset += batch_size
+    db.commit()
+    return indexed
+
+
+def is_search_change(video: Video) -> bool:
+    """
+    Whether an indexed column of a flushed video changed.
+    """
+    state = inspect(video)
+    return any(state.attrs[column].history.has_changes() for column in ("title", "uploader"))
+
+
+@event.listens_for(_Session, "after_flush")  # type: ignore
+def index_flushed_videos(db: _Session, flush_context: Any) -> None:
+    """
+    Re-index the videos inserted, updated or deleted by a flush.
+    """
+    # `Session.new`, `dirty` and `deleted` build a new set on every access
+    new, dirty, deleted = db.new, db.dirty, db.deleted
+    videos: dict[str, Video] = {}
+    deleted_video_ids: set[str] = set()
+    for obj in deleted:
+        if isinstance(obj, Video):
+            deleted_video_ids.add(obj.id)
+    for obj in new:
+        if isinstance(obj, Video):
+            videos[obj.id] = obj
+    for obj in dirty:
+        if isinstance(obj, Video) and is_search_change(video=obj):
+            videos[obj.id] = obj
+    for obj in [*new, *dirty, *deleted]:
+        if isinstance(obj, VideoDescription) and obj.video_id not in deleted_video_ids:
+            identity_key = inspect(Video).identity_key_from_primary_key([obj.video_id])
+            video = db.identity_map.get(identity_key)
+            if video is not None:
+                videos[obj.video_id] = video
+
+    if deleted_video_ids:
+        unindex_videos(db=db, video_ids=list(deleted_video_ids))
+    if videos:
+        with db.no_autoflush:
+            index_videos(db=db, videos=list(videos.values()))
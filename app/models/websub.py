@@ -0,0 +1,39 @@
+import datetime
+
+from sqlmodel import Field, SQLModel
+
+from .common import TimestampModel
+
+
+class WebSubSubscriptionBase(TimestampModel, SQLModel):
+    id: str = Field(default=None, primary_key=True, index=True)
+    source_id: str = Field(default=None, foreign_key="source.id", index=True, nullable=False)
+    topic: str = Field(default=None, nullable=False)
+    callback_url: str = Field(default=None, nullable=False)
+    lease_seconds: int | None = Field(default=None)
+    requested_mode: str | None = Field(default=None)
+    requested_at: datetime.datetime | None = Field(default=None)
+    verified_at: datetime.datetime | None = Field(default=None)
+    lease_expires_at: datetime.datetime | None = Field(default=None)
+    last_notification_at: datetime.datetime | None = Field(default=None)
+    last_polled_at: datetime.datetime | None = Field(default=None)
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self.lease_expires_at and self.lease_expires_at > datetime.datetime.utcnow())
+
+
+class WebSubSubscription(WebSubSubscriptionBase, table=True):
+    pass
+
+
+class WebSubSubscriptionCreate(WebSubSubscriptionBase):
+    pass
+
+
+class WebSubSubscriptionUpdate(WebSubSubscriptionBase):
+    pass
+
+
+class WebSubSubscriptionRead(WebSubSubscriptionBase):
+    pass
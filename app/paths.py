@@ -21,6 +21,7 @@ FEEDS_PATH = DATA_PATH / "feed"
 EXPORTS_PATH = DATA_PATH / "exports"
 FONTS_PATH = DATA_PATH / "fonts"
 DB_BACKUP_PATH = DATA_PATH / "db_backup"
+PROFILES_PATH = DATA_PATH / "profiles"
 
 # Static Folder
 LOGOS_PATH = STATIC_PATH / "logos"
@@ -28,10 +29,15 @@ LOGOS_PATH = STATIC_PATH / "logos"
 # Cache Folders
 SOURCE_INFO_CACHE_PATH = CACHE_PATH / "source_info"
 VIDEO_INFO_CACHE_PATH = CACHE_PATH / "video_info"
+INFO_DICT_RECORDINGS_PATH = CACHE_PATH / "info_dict_recordings"
+
+# Cache Files
+YOUTUBE_HANDLES_CACHE_FILE = CACHE_PATH / "youtube_handles.json"
 
 # Files
 ENV_FILE = DATA_PATH / ".env"
 DATABASE_FILE = DATA_PATH / "database.sqlite3"
+NOTIFY_OUTBOX_FILE = DATA_PATH / "notify_outbox.jsonl"
 
 # Logs
 LOG_FILE = LOGS_PATH / "log.log"
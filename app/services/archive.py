@@ -0,0 +1,216 @@
+"""
+Archival of old videos.
+
+Videos that were released more than `VIDEO_ARCHIVE_AFTER_DAYS` ago, were never played, and
+are not among the newest `VIDEO_ARCHIVE_KEEP_PER_SOURCE` videos of any source are moved out
+of the `video` table to the `archivedvideo` table, as a zstd compressed JSON row.
+
+An archived video is restored to the `video` table the next time its `/media/{video_id}` is
+requested, so that media urls in previously downloaded feeds keep working.
+"""
+
+import datetime
+import json
+
+import zstandard
+from sqlalchemy import delete, func
+from sqlalchemy import select as sa_select
+from sqlmodel import Session, col, select
+
+from app import crud, logger, models, settings
+from app.services.feed import build_source_rss_files
+from app.services.fragment_cache import fragment_cache
+
+
+def compress_video(video: models.Video, source_ids: list[str]) -> bytes:
+    """
+    Serialize a video and the ids of its sources to zstd compressed JSON.
+
+    Args:
+        video (models.Video): The video.
+        source_ids (list[str]): The ids of the video's sources.
+
+    Returns:
+        bytes: The compressed video.
+    """
+    data = {"video": json.loads(models.VideoRead.from_orm(video).json()), "source_ids": source_ids}
+    compressor = zstandard.ZstdCompressor(level=settings.VIDEO_ARCHIVE_COMPRESSION_LEVEL)
+    return compressor.compress(json.dumps(data).encode("utf8"))
+
+
+def decompress_video(data: bytes) -> tuple[models.Video, list[str]]:
+    """
+    Deserialize a video compressed by `compress_video`.
+
+    Args:
+        data (bytes): The compressed video.
+
+    Returns:
+        tuple[models.Video, list[str]]: The video, and the ids of its sources.
+    """
+    decompressed = json.loads(zstandard.ZstdDecompressor().decompress(data))
+    video_read = models.VideoRead.parse_obj(decompressed["video"])
+    video = models.Video(**video_read.dict())
+    video.set_description(description=video_read.description)
+    return video, decompressed["source_ids"]
+
+
+def get_video_ids_to_archive(db: Session, limit: int) -> list[str]:
+    """
+    Get the ids of the videos due to be archived, oldest first.
+
+    Args:
+        db (Session): The database session.
+        limit (int): The maximum number of ids to return.
+
+    Returns:
+        list[str]: The ids of the videos.
+    """
+    link = models.SourceVideoLink
+    rank = (
+        func.row_number()
+        .over(partition_by=link.source_id, order_by=col(models.Video.released_at).desc())
+        .label("rank")
+    )
+    ranked = (
+        sa_select(link.video_id, rank)
+        .join(models.Video, models.Video.id == link.video_id)
+        .subquery()
+    )
+    newest_video_ids = sa_select(ranked.c.video_id).where(
+        ranked.c.rank <= settings.VIDEO_ARCHIVE_KEEP_PER_SOURCE
+    )
+
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=settings.VIDEO_ARCHIVE_AFTER_DAYS)
+    statement = (
+        select(models.Video.id)
+        .where(
+            col(models.Video.released_at) < cutoff,
+            col(models.Video.last_played_at).is_(None),
+            col(models.Video.id).not_in(newest_video_ids),
+        )
+        .order_by(col(models.Video.released_at))
+        .limit(limit)
+    )
+    return db.exec(statement).all()
+
+
+async def archive_videos(db: Session, video_ids: list[str]) -> set[str]:
+    """
+    Move videos to the archive, in a single transaction.
+
+    Args:
+        db (Session): The database session.
+        video_ids (list[str]): The ids of the videos.
+
+    Returns:
+        set[str]: The ids of the sources that the archived videos were removed from.
+    """
+    link = models.SourceVideoLink
+    source_ids_by_video_id: dict[str, list[str]] = {video_id: [] for video_id in video_ids}
+    for source_id, video_id in db.execute(
+        sa_select(link.source_id, link.video_id).where(col(link.video_id).in_(video_ids))
+    ):
+        source_ids_by_video_id[video_id].append(source_id)
+
+    # Merged, as a video that was recreated after it was archived replaces its archived copy
+    videos = db.exec(select(models.Video).where(col(models.Video.id).in_(video_ids))).all()
+    for video in videos:
+        db.merge(
+            models.ArchivedVideo(
+                id=video.id,
+                url=video.url,
+                handler=video.handler,
+                released_at=video.released_at,
+                data=compress_video(video=video, source_ids=source_ids_by_video_id[video.id]),
+            )
+        )
+    db.execute(delete(link).where(col(link.video_id).in_(video_ids)))
+    db.execute(
+        delete(models.VideoDescription).where(col(models.VideoDescription.video_id).in_(video_ids))
+    )
+    db.execute(delete(models.Video).where(col(models.Video.id).in_(video_ids)))
+    models.unindex_videos(db=db, video_ids=video_ids)
+    db.commit()
+    db.expire_all()
+
+    return {source_id for source_ids in source_ids_by_video_id.values() for source_id in source_ids}
+
+
+async def archive_old_videos(db: Session) -> int:
+    """
+    Archive the videos that are due to be archived, `VIDEO_ARCHIVE_BATCH_SIZE` at a time,
+    then rebuild the feeds of the sources they were removed from.
+
+    Args:
+        db (Session): The database session.
+
+    Returns:
+        int: The number of archived videos.
+    """
+    archived = 0
+    source_ids: set[str] = set()
+    while video_ids := get_video_ids_to_archive(db=db, limit=settings.VIDEO_ARCHIVE_BATCH_SIZE):
+        source_ids |= await archive_videos(db=db, video_ids=video_ids)
+        archived += len(video_ids)
+    fragment_cache.invalidate(*source_ids)
+
+    for source_id in source_ids:
+        source = await crud.source.get_or_none(id=source_id, db=db)
+        if source:
+            await build_source_rss_files(source=source)
+
+    logger.info(f"Archived {archived} videos from {len(source_ids)} sources.")
+    return archived
+
+
+async def restore_archived_video(db: Session, video_id: str) -> models.Video:
+    """
+    Restore an archived video, and its links to the sources that still exist.
+
+    Args:
+        db (Session): The database session.
+        video_id (str): The video's id.
+
+    Returns:
+        models.Video: The restored video.
+
+    Raises:
+        RecordNotFoundError: If the video is not archived.
+    """
+    archived_video = await crud.archived_video.get(id=video_id, db=db)
+    video, source_ids = decompress_video(data=archived_video.data)
+
+    existing_source_ids = db.exec(
+        select(models.Source.id).where(col(models.Source.id).in_(source_ids))
+    ).all()
+    db.add(video)
+    db.add_all(
+        models.SourceVideoLink(source_id=source_id, video_id=video.id)
+        for source_id in existing_source_ids
+    )
+    db.delete(archived_video)
+    db.commit()
+    db.refresh(video)
+    fragment_cache.invalidate(*existing_source_ids)
+
+    logger.info(f"Restored archived video '{video_id}'.")
+    return video
+
+
+async def mark_video_played(db: Session, video: models.Video) -> None:
+    """
+    Record that a video's media was requested, so that it is not archived.
+
+    The video is only updated once a day at most.
+
+    Args:
+        db (Session): The database session.
+        video (models.Video): The video.
+    """
+    now = datetime.datetime.utcnow()
+    if video.last_played_at and video.last_played_at > now - datetime.timedelta(days=1):
+        return
+    video.last_played_at = now
+    db.add(video)
+    db.commit()
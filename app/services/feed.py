@@ -2,9 +2,14 @@ import datetime
 from pathlib import Path
 
 from feedgen.feed import FeedGenerator
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import col, select
 
 from app import settings
-from app.models import Filter, Source
+from app.core import metrics
+from app.models import Filter, Source, Video, VideoDescription
 from app.models.source_video_link import SourceOrderBy
 from app.paths import FEEDS_PATH
 
@@ -30,6 +35,30 @@ def get_published_at(
     return released_at
 
 
+def load_video_descriptions(videos: list[Video], batch_size: int = 500) -> None:
+    """
+    Load the descriptions of videos with one query per batch, instead of lazy loading them
+    with one query per video.
+
+    Args:
+        videos: The videos.
+        batch_size: The number of descriptions to load per query.
+    """
+    videos = [video for video in videos if "description_row" in inspect(video).unloaded]
+    db = object_session(videos[0]) if videos else None
+    if not isinstance(db, Session):
+        return
+
+    for start in range(0, len(videos), batch_size):
+        batch = videos[start : start + batch_size]
+        statement = select(VideoDescription).where(
+            col(VideoDescription.video_id).in_([video.id for video in batch])
+        )
+        descriptions = {row.video_id: row for row in db.execute(statement).scalars()}
+        for video in batch:
+            set_committed_value(video, "description_row", descriptions.get(video.id))
+
+
 class SourceFeedGenerator(FeedGenerator):
     def __init__(self, source: Source | None = None, filter: Filter | None = None):
         """
@@ -99,6 +128,7 @@ class SourceFeedGenerator(FeedGenerator):
         )
 
         # Generate Feed Posts
+        load_video_descriptions(videos=videos)
         for video in videos:
             # Get Published Date
             if ordered_by == SourceOrderBy.CREATED_AT.value:
@@ -197,8 +227,11 @@ async def build_rss_file(source: Source | None = None, filter: Filter | None = N
     Returns:
         The path to the rss file.
     """
-    feed = SourceFeedGenerator(source=source, filter=filter)
-    rss_file = await feed.save()
+    kind = "filter" if filter else "source"
+    with metrics.FEED_BUILD_DURATION.time(kind=kind), metrics.track_fetch_cost("feed_seconds"):
+        feed = SourceFeedGenerator(source=source, filter=filter)
+        rss_file = await feed.save()
+    metrics.FEED_SIZE.observe(rss_file.stat().st_size, kind=kind)
     return rss_file
 
 
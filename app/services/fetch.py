@@ -5,28 +5,40 @@ Note:
 """
 
 import asyncio
+import json
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
 from loguru import logger as _logger
 from sqlmodel import Session
 from yt_dlp.utils import YoutubeDLError
 
-from app import crud, logger, paths
-from app.core.notify import notify
-from app.handlers import get_handler_from_string
+from app import crud, logger, models, paths, settings
+from app.core import metrics
+from app.core.outbox import queue_notification
+from app.core.uuid import generate_uuid_random
+from app.db.session import rollback
+from app.handlers import get_handler_from_string, get_handler_from_url
 from app.models import FetchResults, Source, SourceUpdate, Video, VideoUpdate
 from app.services.feed import build_source_rss_files
+from app.services.fragment_cache import fragment_cache
 from app.services.logo import create_logo_from_text
+from app.services.rate_limit import CircuitOpenError
 from app.services.source import (
+    add_crawled_source_videos_to_source,
     add_new_source_info_dict_videos_to_source,
     get_source_from_source_info_dict,
     get_source_info_dict,
+    get_source_video_entries_from_source_info_dict,
 )
 from app.services.video import (
     get_video_from_video_info_dict,
     get_video_info_dict,
     sort_videos_by_updated_at,
 )
+from app.services.websub import is_websub_poll_due
 from app.services.ytdlp import (
     AccountNotFoundError,
     AwaitingTranscodingError,
@@ -37,6 +49,7 @@ from app.services.ytdlp import (
     IsPrivateVideoError,
     NoUploadsError,
     PlaylistNotFoundError,
+    UpstreamThrottledError,
     VideoUnavailableError,
 )
 
@@ -75,7 +88,29 @@ async def log_and_notify(message: str) -> None:
         message (str): The message to log and notify.
     """
     logger.critical(message)
-    await notify(telegram=True, email=False, text=message)
+    await queue_notification(telegram=True, email=False, text=message)
+
+
+@contextmanager
+def expunge_loaded_objects(db: Session) -> Iterator[None]:
+    """
+    Expunge the objects loaded into the session by the block, once it is done.
+
+    Objects that were already in the session, or have pending changes, are kept.
+
+    Args:
+        db (Session): The database session.
+    """
+    loaded_before = set(db.identity_map.keys())
+    try:
+        yield
+    finally:
+        # Session objects are not hashable, so they are compared by identity
+        pending_ids = {id(obj) for obj in (*db.new, *db.dirty)}
+        for key in set(db.identity_map.keys()) - loaded_before:
+            obj = db.identity_map.get(key)
+            if obj is not None and id(obj) not in pending_ids:
+                db.expunge(obj)
 
 
 async def fetch_all_sources(db: Session) -> FetchResults:
@@ -90,16 +125,27 @@ async def fetch_all_sources(db: Session) -> FetchResults:
     """
     logger.info("Fetching ALL Sources...")
     fetch_logger.info("Fetching ALL Sources...")
-    sources = await crud.source.get_all(db=db) or []
+    source_ids = await crud.source.get_fetchable_ids(db=db)
     results = FetchResults()
-
-    for _source in sources:
-        if _source.is_deleted or _source.is_active is False:
-            continue
-        try:
-            source_fetch_results = await fetch_source(id=_source.id, db=db)
-        except FetchCanceledError:
-            continue
+    run_id = generate_uuid_random()
+
+    for source_id in source_ids:
+        # Release each source's objects, so memory does not grow with the number of sources
+        with expunge_loaded_objects(db=db):
+            _source = await crud.source.get_or_none(db=db, id=source_id)
+            if _source is None:
+                continue
+
+            # Sources with an active WebSub lease are fetched when the hub notifies a change
+            if not await is_websub_poll_due(db=db, source=_source):
+                continue
+
+            try:
+                source_fetch_results = await fetch_source(
+                    id=source_id, db=db, skip_unchanged=True, run_id=run_id
+                )
+            except FetchCanceledError:
+                continue
 
         results += source_fetch_results
 
@@ -116,10 +162,19 @@ async def fetch_all_sources(db: Session) -> FetchResults:
     logger.success(success_message)
     fetch_logger.success(success_message)
 
+    await crud.fetch_history.remove_older_than(
+        db=db, before=datetime.utcnow() - timedelta(days=settings.FETCH_HISTORY_RETENTION_DAYS)
+    )
     return results
 
 
-async def fetch_source(db: Session, id: str, ignore_video_refresh: bool = False) -> FetchResults:
+async def fetch_source(
+    db: Session,
+    id: str,
+    ignore_video_refresh: bool = False,
+    skip_unchanged: bool = False,
+    run_id: str | None = None,
+) -> FetchResults:
     """
     Fetch new data from yt-dlp for the source and update the source in the database.
 
@@ -129,6 +184,10 @@ async def fetch_source(db: Session, id: str, ignore_video_refresh: bool = False)
         db (Session): The database session.
         id: The id of the source to fetch and update.
         ignore_video_refresh: If True, do not refresh videos.
+        skip_unchanged: If True, skip yt-dlp when the handler's change probe reports
+            that the source has no new videos, and the source's metadata is complete.
+        run_id: The id of the `fetch_all_sources` run, recorded in the fetch history.
+            Defaults to a new id.
 
     Returns:
         models.FetchResult: The result of the fetch.
@@ -140,6 +199,113 @@ async def fetch_source(db: Session, id: str, ignore_video_refresh: bool = False)
     logger.info(info_message)
     fetch_logger.info(info_message)
 
+    cost = metrics.FetchCost()
+    token = metrics.fetch_cost.set(cost)
+    results = FetchResults()
+    outcome = "error"
+    error: str | None = None
+    started_at = datetime.utcnow()
+    start = time.perf_counter()
+    try:
+        results = await _fetch_db_source(
+            db=db, db_source=db_source, skip_unchanged=skip_unchanged, cost=cost
+        )
+        outcome = "skipped" if cost.skipped else "success"
+    except FetchCanceledError as e:
+        outcome = "canceled"
+        error = (e.__cause__ or e).__class__.__name__
+        raise
+    except Exception as e:
+        error = e.__class__.__name__
+        raise
+    finally:
+        metrics.fetch_cost.reset(token)
+        fragment_cache.invalidate(id)
+        duration = time.perf_counter() - start
+        metrics.FETCH_SOURCE_DURATION.observe(duration, handler=db_source.handler, outcome=outcome)
+        await record_fetch_history(
+            db=db,
+            obj_in=models.FetchHistoryCreate(
+                run_id=run_id or generate_uuid_random(),
+                source_id=id,
+                handler=db_source.handler,
+                outcome=outcome,
+                error=error,
+                started_at=started_at,
+                finished_at=datetime.utcnow(),
+                duration_seconds=duration,
+                ytdlp_seconds=cost.ytdlp_seconds,
+                db_seconds=cost.db_seconds,
+                feed_seconds=cost.feed_seconds,
+                entries=cost.entries,
+                bytes_extracted=cost.bytes_extracted,
+                added_videos=results.added_videos,
+            ),
+        )
+    return results
+
+
+async def record_fetch_history(db: Session, obj_in: models.FetchHistoryCreate) -> None:
+    """
+    Save a source fetch to the fetch history. Errors are logged, not raised, so that
+    recording the history never fails a fetch.
+
+    Args:
+        db (Session): The database session.
+        obj_in (models.FetchHistoryCreate): The fetch.
+    """
+    if not settings.FETCH_HISTORY_ENABLED:
+        return
+    try:
+        await crud.fetch_history.create(db=db, obj_in=obj_in)
+    except Exception as e:  # pylint: disable=broad-except
+        await rollback(db)
+        logger.error(f"Could not record fetch history. {e=}")
+
+
+def is_source_metadata_incomplete(source: Source) -> bool:
+    """
+    Check if a source is missing metadata that only yt-dlp can fill in.
+
+    Args:
+        source (Source): The source.
+
+    Returns:
+        bool: True if the source has no logo, name or description.
+    """
+    return not (source.logo and source.name and source.description)
+
+
+async def _fetch_db_source(
+    db: Session, db_source: Source, skip_unchanged: bool, cost: metrics.FetchCost
+) -> FetchResults:
+    """
+    Fetch new data from yt-dlp for a source loaded from the database. See `fetch_source`.
+
+    Args:
+        db (Session): The database session.
+        db_source (Source): The source to fetch and update.
+        skip_unchanged: If True, skip yt-dlp when the handler's change probe reports
+            that the source has no new videos.
+        cost (metrics.FetchCost): The fetch's cost, updated with the extracted data.
+
+    Returns:
+        models.FetchResult: The result of the fetch.
+    """
+    id = db_source.id  # pylint: disable=redefined-builtin
+
+    # Skip yt-dlp if the source has no new videos, and no missing metadata
+    if skip_unchanged and not is_source_metadata_incomplete(source=db_source):
+        handler = get_handler_from_url(url=db_source.url)
+        known_video_urls = await crud.source.get_video_urls(db=db, source_id=id)
+        if not await handler.source_has_changes(
+            url=db_source.url, known_video_urls=known_video_urls
+        ):
+            logger.debug(f"No changes found for Source(id='{db_source.id}'). Skipping yt-dlp.")
+            await build_source_rss_files(source=db_source)
+            cost.skipped = True
+            return FetchResults(sources=1)
+
     # Fetch source information from yt-dlp and create the source object
     logger.debug("Getting source_info_dict from yt-dlp")
     try:
@@ -160,9 +326,20 @@ async def fetch_source(db: Session, id: str, ignore_video_refresh: bool = False)
         await log_and_notify(message=f"PlaylistNotFoundError: \n{e=} \n{db_source=}")
         await handle_source_is_deleted(db=db, source_id=id, error_message=str(e))
         raise FetchCanceledError from e
+    except (CircuitOpenError, UpstreamThrottledError) as e:
+        logger.warning(f"Skipping Source(id='{db_source.id}'). {e}")
+        raise FetchCanceledError(str(e)) from e
     except (NoUploadsError, Exception) as e:
         raise FetchCanceledError from e
 
+    cost.entries = len(source_info_dict.get("entries") or [])
+    cost.bytes_extracted = len(json.dumps(source_info_dict, default=str))
+
+    # Map the source_info_dict's videos once, for both the source and its new videos
+    video_entries = get_source_video_entries_from_source_info_dict(
+        source_info_dict=source_info_dict
+    )
+
     # Update source in database
     logger.debug("Updating db from source_info_dict")
     _source = await get_source_from_source_info_dict(
@@ -170,13 +347,19 @@ async def fetch_source(db: Session, id: str, ignore_video_refresh: bool = False)
         created_by_user_id=db_source.created_by,
         reverse_import_order=db_source.reverse_import_order,
         source_name=db_source.name,
+        video_entries=video_entries,
     )
     db_source = await crud.source.update(obj_in=SourceUpdate(**_source.dict()), id=id, db=db)
 
     # Use source_info_dict to add new videos to the Source
     logger.debug("Adding new videos to db")
     new_videos = await add_new_source_info_dict_videos_to_source(
-        db=db, source_info_dict=source_info_dict, db_source=db_source
+        db=db, source_info_dict=source_info_dict, db_source=db_source, video_entries=video_entries
+    )
+
+    # Crawl the source for the videos that yt-dlp's extraction did not reach
+    new_videos += await add_crawled_source_videos_to_source(
+        db=db, db_source=db_source, video_entries=video_entries
     )
 
     # Delete orphaned videos from database
@@ -316,11 +499,17 @@ async def fetch_video(video_id: str, db: Session) -> Video:
     """
     # Get the video from the database
     db_video = await crud.video.get(id=video_id, db=db)
+    source_ids = await crud.video.get_source_ids(db=db, video_id=video_id)
 
     # Fetch video information from yt-dlp and create the video object
     try:
         video_info_dict = await get_video_info_dict(url=db_video.url)
 
+    # Throttled extractions say nothing about the video, so it is kept
+    except (CircuitOpenError, UpstreamThrottledError) as e:
+        logger.warning(f"Skipping Video(id='{db_video.id}'). {e}")
+        raise FetchCanceledError(str(e)) from e
+
     except crud.RecordNotFoundError as e:
         await log_and_notify(message=f"Database error: Video not found: \n{db_video=}")
         raise e
@@ -335,6 +524,7 @@ async def fetch_video(video_id: str, db: Session) -> Video:
         YoutubeDLError,
     ) as e:
         await handle_unavailable_video(db=db, video_id=video_id, error_message=str(e))
+        fragment_cache.invalidate(*source_ids)
 
         # If the video was created more than 36 hours ago, raise an error
         if db_video.created_at < datetime.utcnow() - timedelta(hours=36):
@@ -354,7 +544,9 @@ async def fetch_video(video_id: str, db: Session) -> Video:
         raise AwaitingTranscodingError(e) from e
 
     # Update the video in the database and return it
-    return await crud.video.update(obj_in=VideoUpdate(**_video.dict()), id=_video.id, db=db)
+    video = await crud.video.update(obj_in=VideoUpdate(**_video.dict()), id=_video.id, db=db)
+    fragment_cache.invalidate(*source_ids)
+    return video
 
 
 async def handle_unavailable_video(db: Session, video_id: str, error_message: str) -> None:
@@ -412,7 +604,8 @@ def get_videos_needing_refresh(videos: list[Video]) -> list[Video]:
 
 async def refresh_all_videos(db: Session) -> list[Video]:
     """
-    If a video has expired data, fetches new data from yt-dlp.
+    Fetches new data from yt-dlp for the videos with expired data, up to
+    `REFRESH_VIDEOS_LIMIT` videos, most overdue first.
 
     Args:
         db (Session): The database session.
@@ -420,8 +613,8 @@ async def refresh_all_videos(db: Session) -> list[Video]:
     Returns:
         The refreshed list of videos.
     """
-    videos = await crud.video.get_all(db=db) or []
-    return await refresh_videos(videos=videos, db=db)
+    videos = await crud.video.get_refresh_candidates(db=db, limit=settings.REFRESH_VIDEOS_LIMIT)
+    return await fetch_videos(videos=videos, db=db)
 
 
 async def refresh_videos(videos: list[Video], db: Session) -> list[Video]:
@@ -0,0 +1,144 @@
+"""
+In-memory cache of rendered page fragments.
+
+The video lists of the source and filter pages (and their `Filter.videos()` counts and
+`humanize`d dates) are the expensive parts of those pages, and they only change when the
+videos of the source do, ie. after a fetch. Their rendered HTML is cached, keyed by the
+source's generation, and the fetch pipeline bumps the generation of the sources it changes.
+
+Only the fragments are cached. The rest of the page, such as the alerts and the current user,
+is rendered on every request. Cached fragments also expire after a TTL, so that their
+`humanize`d dates stay accurate, and so that changes made outside of the fetch pipeline show up.
+"""
+
+from typing import Callable, Hashable
+
+import threading
+import time
+from collections import OrderedDict
+
+from markupsafe import Markup
+
+from app.models.settings import Settings as _Settings
+
+settings = _Settings()
+
+
+class FragmentCache:
+    """
+    LRU cache of rendered HTML fragments, with a TTL and per-source invalidation.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.clock = clock
+        self._fragments: OrderedDict[tuple[Hashable, ...], tuple[float, Markup]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get_generation(self, source_id: str) -> int:
+        """
+        Get the generation of a source's fragments, to include in their keys.
+
+        Args:
+            source_id: The source's id.
+
+        Returns:
+            The generation, bumped by every `invalidate` of the source.
+        """
+        with self._lock:
+            return self._generations.get(source_id, 0)
+
+    def get(self, key: tuple[Hashable, ...]) -> Markup | None:
+        """
+        Get a cached fragment.
+
+        Args:
+            key: The fragment's key.
+
+        Returns:
+            The rendered fragment, or None if it is not cached or it expired.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._fragments.get(key)
+            if entry is None:
+                return None
+            cached_at, fragment = entry
+            if self.clock() - cached_at > self.ttl_seconds:
+                del self._fragments[key]
+                return None
+            self._fragments.move_to_end(key)
+            return fragment
+
+    def set(self, key: tuple[Hashable, ...], fragment: str) -> Markup:
+        """
+        Cache a rendered fragment, evicting the least recently used fragments over
+        `max_entries`.
+
+        Args:
+            key: The fragment's key.
+            fragment: The rendered HTML.
+
+        Returns:
+            The fragment, marked as safe HTML.
+        """
+        fragment = Markup(fragment)
+        if not self.enabled:
+            return fragment
+        with self._lock:
+            self._fragments[key] = (self.clock(), fragment)
+            self._fragments.move_to_end(key)
+            while len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+        return fragment
+
+    def get_or_render(self, key: tuple[Hashable, ...], render: Callable[[], str]) -> Markup:
+        """
+        Get a cached fragment, or render and cache it.
+
+        Args:
+            key: The fragment's key.
+            render: Renders the fragment, on a cache miss.
+
+        Returns:
+            The rendered fragment, marked as safe HTML.
+        """
+        fragment = self.get(key=key)
+        if fragment is None:
+            fragment = self.set(key=key, fragment=render())
+        return fragment
+
+    def invalidate(self, *source_ids: str) -> None:
+        """
+        Invalidate the fragments of sources, and of their filters, after their videos changed.
+
+        Args:
+            source_ids: The ids of the sources.
+        """
+        with self._lock:
+            for source_id in source_ids:
+                self._generations[source_id] = self._generations.get(source_id, 0) + 1
+
+    def clear(self) -> None:
+        """
+        Remove all the cached fragments.
+        """
+        with self._lock:
+            self._fragments.clear()
+
+
+fragment_cache = FragmentCache(
+    max_entries=settings.FRAGMENT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.FRAGMENT_CACHE_TTL_SECONDS,
+    enabled=settings.FRAGMENT_CACHE_ENABLED,
+)
@@ -5,6 +5,7 @@ from fastapi.responses import RedirectResponse, Response
 from sqlmodel import Session
 
 from app import logger, models
+from app.core import metrics
 from app.core.proxy import Http403ForbiddenError, reverse_proxy
 from app.handlers import get_handler_from_string
 from app.services.fetch import FetchCanceledError, fetch_video
@@ -17,15 +18,17 @@ async def get_media_response(db: Session, video: models.Video, request: Request)
     refresh_interval_age_threshold = datetime.utcnow() - timedelta(
         hours=handler.REFRESH_UPDATE_INTERVAL_HOURS
     )
-    if not video.media_url or video.updated_at < refresh_interval_age_threshold:
-        try:
-            video = await fetch_video(video_id=video.id, db=db)
-        except (FetchCanceledError, AwaitingTranscodingError) as e:
-            logger.error(e)
-            raise HTTPException(
-                status_code=status.HTTP_202_ACCEPTED,
-                detail=f"Tubecast Fetch was canceled. {e.args[0]}",
-            ) from e
+    needs_refresh = not video.media_url or video.updated_at < refresh_interval_age_threshold
+    with metrics.MEDIA_RESOLVE_DURATION.time(cache="refresh" if needs_refresh else "hit"):
+        if needs_refresh:
+            try:
+                video = await fetch_video(video_id=video.id, db=db)
+            except (FetchCanceledError, AwaitingTranscodingError) as e:
+                logger.error(e)
+                raise HTTPException(
+                    status_code=status.HTTP_202_ACCEPTED,
+                    detail=f"Tubecast Fetch was canceled. {e.args[0]}",
+                ) from e
 
     if video.media_url is None:
         msg = f"The server has not able to fetch a media_url from yt-dlp. {video.id=}"
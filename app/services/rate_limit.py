@@ -0,0 +1,277 @@
+"""
+Adaptive rate limiting and circuit breaking for upstream extraction (Youtube, Rumble, etc.).
+
+Every upstream (keyed by handler name) gets a token bucket. The bucket's refill rate is
+halved whenever the upstream throttles us (HTTP 429, bot checks) and recovers additively
+after successful requests. Repeated throttling opens a circuit breaker, which pauses the
+upstream with an exponential backoff so fetch cycles skip it instead of hammering a
+throttled service.
+"""
+
+from typing import Callable
+
+import asyncio
+import datetime
+import time
+from dataclasses import dataclass, field
+
+from loguru import logger as _logger
+
+from app.models.server import UpstreamStatus
+from app.models.settings import Settings as _Settings
+
+settings = _Settings()
+
+logger = _logger.bind(name="logger")
+
+THROTTLE_ERROR_MESSAGES = [
+    "HTTP Error 429",
+    "Too Many Requests",
+    "Sign in to confirm you're not a bot",
+    "Sign in to confirm you’re not a bot",
+]
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when an upstream is paused by its circuit breaker.
+    """
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """
+    Check if an extraction error means the upstream is throttling us.
+
+    Args:
+        error: The error raised by the extraction.
+
+    Returns:
+        True if the error is a throttling signal.
+    """
+    message = str(error)
+    return any(throttle_message in message for throttle_message in THROTTLE_ERROR_MESSAGES)
+
+
+@dataclass
+class UpstreamLimiter:
+    """
+    Token bucket with an adaptive refill rate and a circuit breaker for one upstream.
+    """
+
+    key: str
+    max_rate: float
+    min_rate: float
+    burst: int
+    failure_threshold: int
+    base_backoff_seconds: float
+    max_backoff_seconds: float
+    clock: Callable[[], float] = time.monotonic
+    rate: float = field(init=False)
+    tokens: float = field(init=False)
+    updated_at: float = field(init=False)
+    consecutive_failures: int = 0
+    open_count: int = 0
+    open_until: float | None = None
+    probe_started_at: float | None = None
+    total_requests: int = 0
+    total_throttled: int = 0
+
+    def __post_init__(self) -> None:
+        self.rate = self.max_rate
+        self.tokens = float(self.burst)
+        self.updated_at = self.clock()
+
+    @property
+    def state(self) -> str:
+        if self.open_until is None:
+            return "closed"
+        return "open" if self.clock() < self.open_until else "half-open"
+
+    @property
+    def backoff_seconds(self) -> float:
+        if not self.open_count:
+            return 0.0
+        return min(
+            self.max_backoff_seconds, self.base_backoff_seconds * 2.0 ** (self.open_count - 1)
+        )
+
+    def refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(float(self.burst), self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        """
+        Take a token from the bucket.
+
+        Returns:
+            The number of seconds to wait before making the request.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open, or half-open with a trial request
+                already in flight.
+        """
+        state = self.state
+        if state == "open":
+            remaining = self.open_until - self.clock()  # type: ignore
+            raise CircuitOpenError(
+                f"Upstream '{self.key}' is paused for {remaining:.0f}s "
+                f"after {self.consecutive_failures} throttled requests."
+            )
+        if state == "half-open":
+            # Only one trial request at a time. A trial that never recorded its result, ie. a
+            # canceled one, is given up on after `base_backoff_seconds`.
+            now = self.clock()
+            if (
+                self.probe_started_at is not None
+                and now - self.probe_started_at < self.base_backoff_seconds
+            ):
+                raise CircuitOpenError(
+                    f"Upstream '{self.key}' is paused while a trial request checks if it "
+                    "recovered."
+                )
+            self.probe_started_at = now
+
+        self.refill()
+        self.tokens -= 1
+        self.total_requests += 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def record_success(self) -> None:
+        """
+        Record a request the upstream answered. Closes the circuit and slowly restores the rate.
+        """
+        if self.open_until is not None:
+            logger.info(f"Upstream '{self.key}' recovered. Closing circuit breaker.")
+        self.consecutive_failures = 0
+        self.open_count = 0
+        self.open_until = None
+        self.probe_started_at = None
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def record_throttled(self) -> bool:
+        """
+        Record a throttled request. Halves the rate and opens the circuit breaker after
+        `failure_threshold` consecutive throttled requests, or immediately in half-open state.
+
+        Returns:
+            True if the circuit breaker was opened.
+        """
+        self.total_throttled += 1
+        self.consecutive_failures += 1
+        self.probe_started_at = None
+        self.rate = max(self.min_rate, self.rate / 2)
+
+        if self.state == "half-open" or self.consecutive_failures >= self.failure_threshold:
+            self.open_count += 1
+            self.open_until = self.clock() + self.backoff_seconds
+            logger.warning(
+                f"Upstream '{self.key}' is throttling. "
+                f"Pausing for {self.backoff_seconds:.0f}s ({self.open_count=})."
+            )
+            return True
+        return False
+
+    def get_status(self) -> UpstreamStatus:
+        remaining = max(0.0, self.open_until - self.clock()) if self.open_until else 0.0
+        self.refill()
+        return UpstreamStatus(
+            key=self.key,
+            state=self.state,
+            requests_per_second=self.rate,
+            max_requests_per_second=self.max_rate,
+            tokens=self.tokens,
+            consecutive_failures=self.consecutive_failures,
+            backoff_seconds=self.backoff_seconds,
+            open_until=(
+                datetime.datetime.utcnow() + datetime.timedelta(seconds=remaining)
+                if remaining
+                else None
+            ),
+            total_requests=self.total_requests,
+            total_throttled=self.total_throttled,
+        )
+
+
+_limiters: dict[str, UpstreamLimiter] = {}
+
+
+def get_limiter(key: str) -> UpstreamLimiter:
+    """
+    Get (or create) the limiter for an upstream.
+
+    Args:
+        key: The upstream key, ie. the handler name.
+
+    Returns:
+        The upstream's limiter.
+    """
+    if key not in _limiters:
+        _limiters[key] = UpstreamLimiter(
+            key=key,
+            max_rate=settings.RATE_LIMIT_REQUESTS_PER_SECOND,
+            min_rate=settings.RATE_LIMIT_MIN_REQUESTS_PER_SECOND,
+            burst=settings.RATE_LIMIT_BURST,
+            failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            base_backoff_seconds=settings.CIRCUIT_BREAKER_BASE_BACKOFF_SECONDS,
+            max_backoff_seconds=settings.CIRCUIT_BREAKER_MAX_BACKOFF_SECONDS,
+        )
+    return _limiters[key]
+
+
+def get_upstream_statuses() -> list[UpstreamStatus]:
+    """
+    Get the current limits and circuit breaker state of every upstream.
+
+    Returns:
+        The upstream statuses.
+    """
+    return [limiter.get_status() for limiter in _limiters.values()]
+
+
+def reset_limiters() -> None:
+    """
+    Remove all limiters.
+    """
+    _limiters.clear()
+
+
+async def acquire(key: str) -> None:
+    """
+    Wait until a request to the upstream is allowed.
+
+    Args:
+        key: The upstream key.
+
+    Raises:
+        CircuitOpenError: If the upstream is paused by its circuit breaker.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    wait_seconds = get_limiter(key=key).reserve()
+    if wait_seconds > 0:
+        logger.debug(f"Rate limiting '{key}'. Waiting {wait_seconds:.2f}s.")
+        await asyncio.sleep(wait_seconds)
+
+
+def record_result(key: str, error: BaseException | None = None) -> bool:
+    """
+    Record the outcome of a request to the upstream.
+
+    Errors that are not throttling signals (private videos, deleted channels, etc.) mean
+    the upstream answered normally, and are recorded as successes.
+
+    Args:
+        key: The upstream key.
+        error: The error raised by the request, if any.
+
+    Returns:
+        True if the request opened the circuit breaker.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return False
+    limiter = get_limiter(key=key)
+    if error is not None and is_throttle_error(error=error):
+        return limiter.record_throttled()
+    limiter.record_success()
+    return False
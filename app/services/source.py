@@ -1,8 +1,13 @@
 from typing import Any
 
+import datetime
+from dataclasses import dataclass
+
 from sqlmodel import Session
 
 from app import crud, paths
+from app.core.uuid import generate_uuid_from_url
+from app.db.session import rollback
 from app.handlers import get_handler_from_url
 from app.models import Source, SourceCreate, Video, VideoCreate
 from app.services.logo import create_logo_from_text, is_invalid_image
@@ -63,6 +68,7 @@ async def get_source_info_dict(
         url=url,
         ydl_opts=ydl_opts,
         custom_extractors=custom_extractors,
+        rate_limit_key=handler.name,
         # ie_key="CustomRumbleChannel",
     )
     _source_info_dict["source_id"] = source_id
@@ -72,11 +78,49 @@ async def get_source_info_dict(
     return _source_info_dict
 
 
+@dataclass(slots=True)
+class SourceVideoEntry:
+    """
+    A video of a source_info_dict's playlist entries, mapped and sanitized once per fetch.
+    """
+
+    id: str
+    handler: str
+    url: str
+    title: str | None
+    description: str | None
+    duration: int | None
+    thumbnail: str | None
+    released_at: datetime.datetime | None
+    updated_at: datetime.datetime
+
+    def to_video_create(self) -> VideoCreate:
+        """
+        Build the `VideoCreate` of the entry, without running its validators again.
+
+        Returns:
+            The `VideoCreate` object.
+        """
+        return VideoCreate.construct(
+            id=self.id,
+            handler=self.handler,
+            url=self.url,
+            feed_media_url=f"/media/{self.id}",
+            title=self.title,
+            description=self.description,
+            duration=self.duration,
+            thumbnail=self.thumbnail,
+            released_at=self.released_at,
+            updated_at=self.updated_at,
+        )
+
+
 async def get_source_from_source_info_dict(
     source_info_dict: dict[str, Any],
     created_by_user_id: str,
     reverse_import_order: bool = False,
     source_name: str | None = None,
+    video_entries: list[SourceVideoEntry] | None = None,
 ) -> SourceCreate:
     """
     Get a `Source` object from a source_info_dict.
@@ -85,14 +129,19 @@ async def get_source_from_source_info_dict(
         source_info_dict (dict): The source_info_dict.
         created_by (str): user_id of authenticated user.
         reverse_import_order (bool): Whether to reverse the import order of the videos.
+        video_entries (list[SourceVideoEntry] | None): The source_info_dict's mapped videos,
+            if they were already mapped.
 
     Returns:
         SourceCreate: The `SourceCreate` object.
     """
     source_handler = get_handler_from_url(url=source_info_dict["metadata"]["url"])
-    source_videos = get_source_videos_from_source_info_dict(source_info_dict=source_info_dict)
+    if video_entries is None:
+        video_entries = get_source_video_entries_from_source_info_dict(
+            source_info_dict=source_info_dict
+        )
     handler_source_dict = source_handler.map_source_info_dict_to_source_dict(
-        source_info_dict=source_info_dict, source_videos=source_videos
+        source_info_dict=source_info_dict, source_videos=video_entries
     )
     handler_source_dict["name"] = source_name or handler_source_dict["name"]
     return SourceCreate(
@@ -104,15 +153,20 @@ async def get_source_from_source_info_dict(
     )
 
 
-def get_source_videos_from_source_info_dict(source_info_dict: dict[str, Any]) -> list[VideoCreate]:
+def get_source_video_entries_from_source_info_dict(
+    source_info_dict: dict[str, Any],
+) -> list[SourceVideoEntry]:
     """
-    Get a list of `Video` objects from a source_info_dict.
+    Map the videos of a source_info_dict's playlist entries, in a single pass.
+
+    Each video's URL is sanitized, and its id generated, once. The `VideoCreate` objects are
+    only built, with `SourceVideoEntry.to_video_create`, for the videos that are stored.
 
     Parameters:
         source_info_dict (dict): The source_info_dict.
 
     Returns:
-        list: The list of `Video` objects.
+        list: The mapped videos, in playlist order.
     """
     handler = get_handler_from_url(url=source_info_dict["metadata"]["url"])
     entries = source_info_dict["entries"]
@@ -122,60 +176,164 @@ def get_source_videos_from_source_info_dict(source_info_dict: dict[str, Any]) ->
     else:
         playlists = [source_info_dict]
 
-    video_dicts = []
+    updated_at = datetime.datetime.now(tz=datetime.timezone.utc)
+    video_entries = []
     for playlist in playlists:
         for entry_info_dict in playlist.get("entries", []):
-            if (
-                not entry_info_dict.get("live_status")
-                or entry_info_dict.get("live_status") == "was_live"
-            ):
-                if (
-                    "[private video]" in str(entry_info_dict.get("title")).lower()
-                    or "[deleted video]" in str(entry_info_dict.get("title")).lower()
-                ):
-                    continue
-                video_dict = handler.map_source_info_dict_entity_to_video_dict(
-                    source_id=source_info_dict["source_id"], entry_info_dict=entry_info_dict
+            live_status = entry_info_dict.get("live_status")
+            if live_status and live_status != "was_live":
+                continue
+            title = str(entry_info_dict.get("title")).lower()
+            if "[private video]" in title or "[deleted video]" in title:
+                continue
+
+            video_dict = handler.map_source_info_dict_entity_to_video_dict(
+                source_id=source_info_dict["source_id"], entry_info_dict=entry_info_dict
+            )
+            video_handler = get_handler_from_url(url=video_dict["url"])
+            url = video_handler.sanitize_video_url(url=video_dict["url"])
+            duration = video_dict.get("duration")
+            video_entries.append(
+                SourceVideoEntry(
+                    id=generate_uuid_from_url(url=url),
+                    handler=video_handler.name,
+                    url=url,
+                    title=video_dict.get("title"),
+                    description=video_dict.get("description"),
+                    duration=int(duration) if duration is not None else None,
+                    thumbnail=video_dict.get("thumbnail"),
+                    released_at=video_dict.get("released_at"),
+                    updated_at=updated_at,
                 )
-                video_dicts.append(video_dict)
+            )
 
-    return [VideoCreate(**video_dict) for video_dict in video_dicts]
+    return video_entries
+
+
+def get_source_videos_from_source_info_dict(source_info_dict: dict[str, Any]) -> list[VideoCreate]:
+    """
+    Get a list of `Video` objects from a source_info_dict.
+
+    Parameters:
+        source_info_dict (dict): The source_info_dict.
+
+    Returns:
+        list: The list of `Video` objects.
+    """
+    return [
+        video_entry.to_video_create()
+        for video_entry in get_source_video_entries_from_source_info_dict(
+            source_info_dict=source_info_dict
+        )
+    ]
 
 
 async def add_new_source_info_dict_videos_to_source(
-    source_info_dict: dict[str, Any], db_source: Source, db: Session
+    source_info_dict: dict[str, Any],
+    db_source: Source,
+    db: Session,
+    video_entries: list[SourceVideoEntry] | None = None,
 ) -> list[VideoCreate]:
     """
     Add new videos from a list of fetched videos to a source in the database.
 
+    The source's video ids are queried, instead of loading its videos. The new videos are
+    created, and linked to the source, in one commit each. Archived videos are not new, they
+    are restored when their media is requested.
+
     Args:
-        fetched_videos: A list of Video objects fetched from a source.
+        source_info_dict: The source_info_dict of the fetched source.
         db_source: The Source object in the database to add the new videos to.
         db (Session): The database session.
+        video_entries: The source_info_dict's mapped videos, if they were already mapped.
 
     Returns:
         A list of Video objects that were added to the database.
     """
-    fetched_videos = get_source_videos_from_source_info_dict(source_info_dict=source_info_dict)
-    db_video_ids = [video.id for video in db_source.videos]
+    if video_entries is None:
+        video_entries = get_source_video_entries_from_source_info_dict(
+            source_info_dict=source_info_dict
+        )
+    source_video_ids = await crud.source.get_video_ids(db=db, source_id=db_source.id)
+
+    # Videos that were fetched, but not in the source.
+    new_video_entries = []
+    for video_entry in video_entries:
+        if video_entry.id not in source_video_ids:
+            source_video_ids.add(video_entry.id)
+            new_video_entries.append(video_entry)
+    if new_video_entries:
+        archived_video_ids = await crud.archived_video.get_existing_ids(
+            db=db, ids=[video_entry.id for video_entry in new_video_entries]
+        )
+        new_video_entries = [
+            video_entry
+            for video_entry in new_video_entries
+            if video_entry.id not in archived_video_ids
+        ]
+    if not new_video_entries:
+        return []
+
+    new_videos = [video_entry.to_video_create() for video_entry in new_video_entries]
+    existing_video_ids = await crud.video.get_existing_ids(
+        db=db, ids=[new_video.id for new_video in new_videos]
+    )
+    videos_to_create = [
+        new_video for new_video in new_videos if new_video.id not in existing_video_ids
+    ]
+    try:
+        await crud.video.create_many(db=db, objs_in=videos_to_create)
+    except crud.RecordAlreadyExistsError:  # pragma: no cover
+        # A video was created by another fetch in the meantime. Create the others one at a time.
+        for new_video in videos_to_create:
+            if not await crud.video.get_or_none(db=db, id=new_video.id):
+                try:
+                    await crud.video.create(obj_in=new_video, db=db)
+                except crud.RecordAlreadyExistsError:
+                    await rollback(db)
 
-    # Add videos that were fetched, but not in the database.
-    new_videos = []
-    for fetched_video in fetched_videos:
-        if fetched_video.id not in db_video_ids:
-            new_video = VideoCreate(**fetched_video.dict())
-            new_videos.append(new_video)
+    await crud.source.add_videos(
+        db=db, source_id=db_source.id, video_ids=[new_video.id for new_video in new_videos]
+    )
+    return new_videos
 
-            db_video = await crud.video.get_or_none(db=db, id=new_video.id)
-            if not db_video:
-                try:
-                    db_video = await crud.video.create(obj_in=new_video, db=db)
-                except crud.RecordAlreadyExistsError:  # pragma: no cover
-                    db_video = await crud.video.get(db=db, id=new_video.id)  # pragma: no cover
 
-            db_source.videos.append(db_video)
-            db.commit()
+async def add_crawled_source_videos_to_source(
+    db_source: Source, db: Session, video_entries: list[SourceVideoEntry]
+) -> list[VideoCreate]:
+    """
+    Crawl a source for videos that yt-dlp's extraction did not reach, adding them to the
+    source a page at a time, as the pages are crawled.
 
+    Args:
+        db_source: The Source object in the database to add the new videos to.
+        db (Session): The database session.
+        video_entries: The mapped videos of yt-dlp's extraction.
+
+    Returns:
+        A list of Video objects that were added to the database.
+    """
+    handler = get_handler_from_url(url=db_source.url)
+    known_video_urls = await crud.source.get_video_urls(db=db, source_id=db_source.id)
+    crawler = handler.crawl_source_entries(
+        url=db_source.url,
+        known_video_urls=known_video_urls,
+        extracted_video_urls=[video_entry.url for video_entry in video_entries],
+    )
+    if crawler is None:
+        return []
+
+    new_videos = []
+    async for entries in crawler:
+        new_videos += await add_new_source_info_dict_videos_to_source(
+            source_info_dict={
+                "source_id": db_source.id,
+                "metadata": {"url": db_source.url},
+                "entries": entries,
+            },
+            db_source=db_source,
+            db=db,
+        )
     return new_videos
 
 
@@ -1,8 +1,8 @@
 from typing import Any
 
-from app.handlers import get_handler_from_url
+from app.handlers import get_handler_from_url, registered_handlers
 from app.models import Video, VideoCreate
-from app.services.ytdlp import get_info_dict
+from app.services.ytdlp import get_info_dict, ydl_pool
 
 
 async def get_video_info_dict(
@@ -25,10 +25,28 @@ async def get_video_info_dict(
 
     ydl_opts = handler.get_video_ydl_opts()
     custom_extractors = handler.YTDLP_CUSTOM_EXTRACTORS
-    info_dict = await get_info_dict(url=url, ydl_opts=ydl_opts, custom_extractors=custom_extractors)
+    info_dict = await get_info_dict(
+        url=url,
+        ydl_opts=ydl_opts,
+        custom_extractors=custom_extractors,
+        rate_limit_key=handler.name,
+    )
     return info_dict
 
 
+def warm_ydl_pool() -> None:
+    """
+    Pre-create a pooled YoutubeDL instance for every enabled handler's video options.
+    """
+    for handler in registered_handlers:
+        if handler.DISABLED:
+            continue
+        ydl_pool.warm(
+            ydl_opts=handler.get_video_ydl_opts(),
+            custom_extractors=handler.YTDLP_CUSTOM_EXTRACTORS,
+        )
+
+
 def get_video_from_video_info_dict(video_info_dict: dict[str, Any]) -> VideoCreate:
     """
     Get a VideoCreate object from a video info_dict.
@@ -0,0 +1,476 @@
+"""
+WebSub (PubSubHubbub) push subscriptions for Youtube channel sources.
+
+Youtube publishes channel uploads to a WebSub hub. A subscription makes the hub POST an
+Atom notification to our callback whenever the channel changes, so the channel only
+needs to be fetched when it actually has new content.
+
+Subscriptions are leased. `renew_websub_subscriptions` re-subscribes every Youtube channel
+source whose lease is missing or about to expire. While a source has no active lease it
+is fetched by the regular polling in `fetch_all_sources`. Sources with an active lease are
+still polled every `YOUTUBE_WEBSUB_POLL_INTERVAL_HOURS`, in case a notification was lost.
+
+The hub only verifies the intents we requested, and notifications must be signed with
+`YOUTUBE_WEBSUB_SECRET`, which is required to subscribe.
+"""
+
+import datetime
+import hashlib
+import hmac
+import re
+
+import httpx
+from sqlmodel import Session, col
+
+from app import crud, logger, models, settings
+from app.services.youtube_rss import get_channel_id_from_channel_url
+
+CHANNEL_ID_PATTERN = re.compile(r"<yt:channelId>([\w-]+)</yt:channelId>")
+TOPIC_CHANNEL_ID_PATTERN = re.compile(r"(?<=channel_id=)[\w-]+")
+
+
+class WebSubVerificationError(Exception):
+    """
+    Raised when the hub verifies an intent for a subscription we did not request.
+    """
+
+
+class WebSubSecretNotSetError(Exception):
+    """
+    Raised when subscribing without a `YOUTUBE_WEBSUB_SECRET` to sign notifications with.
+    """
+
+
+def get_callback_url() -> str:
+    """
+    Get the url the hub sends verifications and notifications to.
+
+    Returns:
+        The callback url.
+    """
+    return f"{settings.BASE_URL}{settings.API_V1_PREFIX}/websub/youtube"
+
+
+def get_topic_url(channel_id: str) -> str:
+    """
+    Get the WebSub topic url for a Youtube channel.
+
+    Args:
+        channel_id: The channel_id.
+
+    Returns:
+        The topic url.
+    """
+    return f"{settings.YOUTUBE_WEBSUB_TOPIC_URL}?channel_id={channel_id}"
+
+
+def get_channel_id_from_topic_url(topic_url: str) -> str | None:
+    """
+    Get the channel_id from a WebSub topic url.
+
+    Args:
+        topic_url: The topic url.
+
+    Returns:
+        The channel_id, or None if the topic is not a channel topic.
+    """
+    match = TOPIC_CHANNEL_ID_PATTERN.search(topic_url)
+    return match.group() if match else None
+
+
+async def send_hub_request(mode: str, topic_url: str, callback_url: str) -> bool:
+    """
+    Send a subscribe/unsubscribe request to the WebSub hub.
+
+    Args:
+        mode: "subscribe" or "unsubscribe".
+        topic_url: The topic url.
+        callback_url: The callback url.
+
+    Returns:
+        True if the hub accepted the request.
+    """
+    data = {
+        "hub.callback": callback_url,
+        "hub.mode": mode,
+        "hub.topic": topic_url,
+        "hub.verify": "async",
+        "hub.lease_seconds": str(settings.YOUTUBE_WEBSUB_LEASE_SECONDS),
+    }
+    if mode == "subscribe":
+        data["hub.secret"] = settings.YOUTUBE_WEBSUB_SECRET
+
+    try:
+        async with httpx.AsyncClient(timeout=httpx.Timeout(30.0)) as client:
+            response = await client.post(settings.YOUTUBE_WEBSUB_HUB_URL, data=data)
+    except httpx.HTTPError as e:
+        logger.warning(f"WebSub hub request failed for topic '{topic_url}'. {e=}")
+        return False
+
+    if response.status_code not in (httpx.codes.ACCEPTED, httpx.codes.NO_CONTENT):
+        logger.warning(
+            f"WebSub hub rejected {mode} for topic '{topic_url}'. "
+            f"{response.status_code=} {response.text=}"
+        )
+        return False
+    return True
+
+
+async def subscribe_source(db: Session, source: models.Source) -> models.WebSubSubscription | None:
+    """
+    Request a WebSub subscription for a Youtube channel source.
+
+    Args:
+        db (Session): The database session.
+        source (models.Source): The source to subscribe to.
+
+    Returns:
+        The pending subscription, or None if the source is not a channel or the hub
+            did not accept the request.
+
+    Raises:
+        WebSubSecretNotSetError: If `YOUTUBE_WEBSUB_SECRET` is not set.
+    """
+    if not settings.YOUTUBE_WEBSUB_SECRET:
+        raise WebSubSecretNotSetError("YOUTUBE_WEBSUB_SECRET must be set to subscribe.")
+    channel_id = get_channel_id_from_channel_url(url=source.url)
+    if not channel_id:
+        return None
+
+    topic_url = get_topic_url(channel_id=channel_id)
+    callback_url = get_callback_url()
+    if not await send_hub_request(mode="subscribe", topic_url=topic_url, callback_url=callback_url):
+        return None
+
+    obj_in = models.WebSubSubscriptionCreate(
+        id=channel_id,
+        source_id=source.id,
+        topic=topic_url,
+        callback_url=callback_url,
+        requested_mode="subscribe",
+        requested_at=datetime.datetime.utcnow(),
+    )
+    if await crud.websub_subscription.get_or_none(db=db, id=channel_id):
+        return await crud.websub_subscription.update(
+            db=db, id=channel_id, obj_in=models.WebSubSubscriptionUpdate(**obj_in.dict())
+        )
+    return await crud.websub_subscription.create(db=db, obj_in=obj_in)
+
+
+async def unsubscribe_source(
+    db: Session, subscription: models.WebSubSubscription
+) -> models.WebSubSubscription | None:
+    """
+    Request the removal of a WebSub subscription. It is removed once the hub verifies it.
+
+    Args:
+        db (Session): The database session.
+        subscription (models.WebSubSubscription): The subscription to remove.
+
+    Returns:
+        The pending subscription, or None if the hub did not accept the request.
+    """
+    if not await send_hub_request(
+        mode="unsubscribe", topic_url=subscription.topic, callback_url=subscription.callback_url
+    ):
+        return None
+    return await crud.websub_subscription.update(
+        db=db,
+        id=subscription.id,
+        obj_in=models.WebSubSubscriptionUpdate(
+            requested_mode="unsubscribe", requested_at=datetime.datetime.utcnow()
+        ),
+    )
+
+
+def subscription_needs_renewal(subscription: models.WebSubSubscription | None) -> bool:
+    """
+    Check if a subscription is missing or its lease expires soon.
+
+    Args:
+        subscription: The subscription, if any.
+
+    Returns:
+        True if the subscription should be (re)requested.
+    """
+    if not subscription or not subscription.lease_expires_at:
+        return True
+    renew_at = subscription.lease_expires_at - datetime.timedelta(
+        seconds=settings.YOUTUBE_WEBSUB_RENEW_BEFORE_SECONDS
+    )
+    return renew_at <= datetime.datetime.utcnow()
+
+
+async def renew_websub_subscriptions(db: Session) -> list[models.WebSubSubscription]:
+    """
+    Subscribe every active Youtube channel source that has no lease or an expiring lease, and
+    unsubscribe the sources that were deactivated or deleted.
+
+    Args:
+        db (Session): The database session.
+
+    Returns:
+        The subscriptions that were requested.
+    """
+    requested = []
+    sources = await crud.source.get_all(db=db)
+    for source in sources:
+        if source.handler != "YoutubeHandler":
+            continue
+        channel_id = get_channel_id_from_channel_url(url=source.url)
+        if not channel_id:
+            continue
+
+        subscription = await crud.websub_subscription.get_or_none(db=db, id=channel_id)
+        if source.is_deleted or not source.is_active:
+            if (
+                subscription
+                and subscription.source_id == source.id
+                and subscription.requested_mode != "unsubscribe"
+            ):
+                await unsubscribe_source(db=db, subscription=subscription)
+            continue
+        if not subscription_needs_renewal(subscription=subscription):
+            continue
+
+        if subscription := await subscribe_source(db=db, source=source):
+            requested.append(subscription)
+
+    logger.info(f"Requested {len(requested)} WebSub subscriptions.")
+    return requested
+
+
+async def verify_websub_intent(
+    db: Session, mode: str, topic: str, challenge: str, lease_seconds: int | None
+) -> str:
+    """
+    Verify a hub's subscribe/unsubscribe intent and update the subscription's lease.
+
+    Only the intent of a pending request, of the same mode, is verified, once. The lease is
+    capped at the `YOUTUBE_WEBSUB_LEASE_SECONDS` we requested.
+
+    Args:
+        db (Session): The database session.
+        mode: The `hub.mode` being verified.
+        topic: The `hub.topic` being verified.
+        challenge: The `hub.challenge` to echo back.
+        lease_seconds: The `hub.lease_seconds` granted by the hub.
+
+    Returns:
+        The challenge to echo back to the hub.
+
+    Raises:
+        WebSubVerificationError: If the intent does not match a pending request.
+    """
+    channel_id = get_channel_id_from_topic_url(topic_url=topic)
+    subscription = (
+        await crud.websub_subscription.get_or_none(db=db, id=channel_id) if channel_id else None
+    )
+    if not subscription or subscription.topic != topic:
+        raise WebSubVerificationError(f"Unknown WebSub topic '{topic}'.")
+    if subscription.requested_at is None or subscription.requested_mode != mode:
+        raise WebSubVerificationError(f"No pending WebSub {mode} request for topic '{topic}'.")
+
+    if mode == "unsubscribe":
+        await crud.websub_subscription.remove(db=db, id=subscription.id)
+        return challenge
+
+    now = datetime.datetime.utcnow()
+    lease_seconds = min(
+        lease_seconds or settings.YOUTUBE_WEBSUB_LEASE_SECONDS,
+        settings.YOUTUBE_WEBSUB_LEASE_SECONDS,
+    )
+    await crud.websub_subscription.update(
+        db=db,
+        id=subscription.id,
+        obj_in=models.WebSubSubscriptionUpdate(
+            requested_mode=None,
+            requested_at=None,
+            lease_seconds=lease_seconds,
+            verified_at=now,
+            lease_expires_at=now + datetime.timedelta(seconds=lease_seconds),
+        ),
+        exclude_none=False,
+    )
+    return challenge
+
+
+def is_valid_signature(body: bytes, signature: str | None) -> bool:
+    """
+    Validate a notification's `X-Hub-Signature` header against the shared secret.
+    Never valid when no secret is configured, as the notification could be forged.
+
+    Args:
+        body: The raw notification body.
+        signature: The `X-Hub-Signature` header value, ie. "sha1=<hexdigest>".
+
+    Returns:
+        True if the signature is valid.
+    """
+    if not settings.YOUTUBE_WEBSUB_SECRET or not signature or "=" not in signature:
+        return False
+
+    method, digest = signature.split("=", 1)
+    if method not in ("sha1", "sha256", "sha384", "sha512"):
+        return False
+    expected = hmac.new(
+        settings.YOUTUBE_WEBSUB_SECRET.encode(), body, getattr(hashlib, method)
+    ).hexdigest()
+    return hmac.compare_digest(expected, digest)
+
+
+def parse_websub_notification(body: bytes) -> set[str]:
+    """
+    Parse the channel_ids from a Youtube Atom push notification.
+
+    Args:
+        body: The raw notification body.
+
+    Returns:
+        The set of channel_ids with new or updated videos.
+    """
+    return set(CHANNEL_ID_PATTERN.findall(body.decode("utf-8", errors="replace")))
+
+
+async def get_channel_sources(db: Session, channel_id: str) -> list[models.Source]:
+    """
+    Get the active sources of a Youtube channel, which are all notified by its subscription.
+
+    Args:
+        db (Session): The database session.
+        channel_id (str): The channel_id.
+
+    Returns:
+        The active sources with a "/channel/" URL of the channel.
+    """
+    sources = await crud.source.get_multi(
+        col(models.Source.url).contains(channel_id),  # type: ignore
+        db=db,
+        handler="YoutubeHandler",
+        is_active=True,
+        is_deleted=False,
+    )
+    return [
+        source
+        for source in sources
+        if get_channel_id_from_channel_url(url=source.url) == channel_id
+    ]
+
+
+async def handle_websub_notification(
+    db: Session, body: bytes, signature: str | None
+) -> list[models.Source]:
+    """
+    Handle a push notification from the hub.
+
+    Args:
+        db (Session): The database session.
+        body: The raw notification body.
+        signature: The `X-Hub-Signature` header value.
+
+    Returns:
+        The sources that changed and should be fetched, every active source of each channel
+            with a subscription.
+    """
+    if not is_valid_signature(body=body, signature=signature):
+        logger.warning("Ignoring WebSub notification with an invalid signature.")
+        return []
+
+    changed_sources = []
+    for channel_id in parse_websub_notification(body=body):
+        subscription = await crud.websub_subscription.get_or_none(db=db, id=channel_id)
+        if not subscription:
+            continue
+        sources = await get_channel_sources(db=db, channel_id=channel_id)
+        if not sources:
+            continue
+
+        await crud.websub_subscription.update(
+            db=db,
+            id=subscription.id,
+            obj_in=models.WebSubSubscriptionUpdate(last_notification_at=datetime.datetime.utcnow()),
+        )
+        changed_sources.extend(sources)
+
+    return changed_sources
+
+
+async def get_active_websub_subscription(
+    db: Session, source: models.Source
+) -> models.WebSubSubscription | None:
+    """
+    Get the active WebSub subscription that keeps a source up to date.
+
+    Args:
+        db (Session): The database session.
+        source (models.Source): The source.
+
+    Returns:
+        The subscription, or None if WebSub is disabled or the source has no active lease.
+    """
+    if not settings.YOUTUBE_WEBSUB_ENABLED:
+        return None
+    channel_id = get_channel_id_from_channel_url(url=source.url)
+    if not channel_id:
+        return None
+    subscription = await crud.websub_subscription.get_or_none(db=db, id=channel_id)
+    if subscription and subscription.source_id == source.id and subscription.is_active:
+        return subscription
+    return None
+
+
+async def has_active_websub_subscription(db: Session, source: models.Source) -> bool:
+    """
+    Check if a source is kept up to date by an active WebSub subscription.
+
+    Args:
+        db (Session): The database session.
+        source (models.Source): The source.
+
+    Returns:
+        True if WebSub is enabled and the source has an active lease.
+    """
+    return await get_active_websub_subscription(db=db, source=source) is not None
+
+
+async def is_websub_poll_due(db: Session, source: models.Source) -> bool:
+    """
+    Check if a source should be polled by `fetch_all_sources`, and record the poll.
+
+    Sources with an active lease are fetched when the hub notifies a change, and only polled
+    every `YOUTUBE_WEBSUB_POLL_INTERVAL_HOURS` since their last notification or poll.
+
+    Args:
+        db (Session): The database session.
+        source (models.Source): The source.
+
+    Returns:
+        True if the source has no active lease, or its safety poll is due.
+    """
+    subscription = await get_active_websub_subscription(db=db, source=source)
+    if subscription is None:
+        return True
+
+    now = datetime.datetime.utcnow()
+    last_checked_at = max(
+        (
+            checked_at
+            for checked_at in (
+                subscription.verified_at,
+                subscription.last_notification_at,
+                subscription.last_polled_at,
+            )
+            if checked_at is not None
+        ),
+        default=None,
+    )
+    poll_interval = datetime.timedelta(hours=settings.YOUTUBE_WEBSUB_POLL_INTERVAL_HOURS)
+    if last_checked_at is not None and now - last_checked_at < poll_interval:
+        return False
+
+    await crud.websub_subscription.update(
+        db=db,
+        id=subscription.id,
+        obj_in=models.WebSubSubscriptionUpdate(last_polled_at=now),
+    )
+    return True
@@ -0,0 +1,252 @@
+"""
+Persistent cache of Youtube `@handle` to channel_id resolutions.
+
+Sanitizing an "@handle" source URL to its "/channel/" URL takes a yt-dlp extraction. The
+resolutions are stored in a small JSON file, so that a known handle is sanitized without a
+network call. Handles that do not exist are cached for a shorter time, so that an invalid
+handle is not extracted again on every attempt. Other errors, such as network errors or
+throttling, are not cached.
+
+Besides the extractions made to sanitize URLs, the cache is populated from every info_dict that
+carries both a handle and a channel_id, ie. from every fetch of a Youtube source or video.
+"""
+
+from typing import Any, Callable
+
+import json
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from loguru import logger as _logger
+
+from app import paths
+from app.models.settings import Settings as _Settings
+
+settings = _Settings()
+
+logger = _logger.bind(name="logger")
+
+HANDLE_PATTERN = re.compile(r"(?<=/@)[\w.-]+")
+CHANNEL_ID_PATTERN = re.compile(r"^UC[\w-]{22}$")
+
+# Extraction errors meaning that a handle does not exist, as worded by yt-dlp.
+NOT_FOUND_ERROR_MESSAGES = [
+    "HTTP Error 404",
+    "does not exist",
+    "This account has been terminated",
+    "is not available",
+    "is not currently available",
+]
+
+
+@dataclass
+class HandleResolution:
+    channel_id: str | None
+    resolved_at: float
+
+
+def get_handle_from_url(url: str) -> str | None:
+    """
+    Get the handle (without the "@") from an "@handle" URL.
+
+    Args:
+        url: The URL.
+
+    Returns:
+        The handle, or None if the URL is not an "@handle" URL.
+    """
+    match = HANDLE_PATTERN.search(url)
+    return match.group() if match else None
+
+
+def is_not_found_error(error: BaseException) -> bool:
+    """
+    Check if an extraction error means that a handle does not exist.
+
+    Args:
+        error: The error raised by the extraction.
+
+    Returns:
+        True if the handle does not exist, False if the error may be transient.
+    """
+    message = str(error)
+    return any(not_found_message in message for not_found_message in NOT_FOUND_ERROR_MESSAGES)
+
+
+class YoutubeHandleCache:
+    """
+    Persistent `@handle` to channel_id mapping, with a TTL and negative caching.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.clock = clock
+        self._resolutions: dict[str, HandleResolution] | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(handle: str) -> str:
+        """
+        Get the key of a handle, which is case insensitive.
+
+        Args:
+            handle: The handle, with or without the "@".
+
+        Returns:
+            The lowercase handle, without the "@".
+        """
+        return handle.lstrip("@").lower()
+
+    def load(self) -> dict[str, HandleResolution]:
+        """
+        Load the resolutions from disk, once.
+
+        Returns:
+            The resolutions, keyed by lowercase handle.
+        """
+        if self._resolutions is not None:
+            return self._resolutions
+
+        resolutions = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf8"))
+                resolutions = {key: HandleResolution(**value) for key, value in data.items()}
+            except (json.JSONDecodeError, TypeError, AttributeError) as e:
+                logger.warning(f"Ignoring invalid Youtube handle cache '{self.path}'. {e=}")
+        self._resolutions = resolutions
+        return resolutions
+
+    def save(self) -> None:
+        """
+        Rewrite the cache file with the resolutions that have not expired.
+        """
+        now = self.clock()
+        with self._lock:
+            data = {
+                key: asdict(resolution)
+                for key, resolution in self.load().items()
+                if not self.is_expired(resolution=resolution, now=now)
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf8")
+        tmp_path.replace(self.path)
+
+    def get_ttl_seconds(self, resolution: HandleResolution) -> float:
+        """
+        Get the TTL of a resolution, which is shorter for handles that could not be resolved.
+
+        Args:
+            resolution: The resolution.
+
+        Returns:
+            The TTL in seconds.
+        """
+        return self.ttl_seconds if resolution.channel_id else self.negative_ttl_seconds
+
+    def is_expired(self, resolution: HandleResolution, now: float) -> bool:
+        """
+        Check if a resolution is older than its TTL.
+
+        Args:
+            resolution: The resolution.
+            now: The current time, from the cache's clock.
+
+        Returns:
+            True if the resolution expired.
+        """
+        return now - resolution.resolved_at > self.get_ttl_seconds(resolution=resolution)
+
+    def get(self, handle: str) -> HandleResolution | None:
+        """
+        Get the cached resolution of a handle.
+
+        Args:
+            handle: The handle, with or without the "@".
+
+        Returns:
+            The resolution, or None if the handle is not cached or its resolution expired.
+            A resolution without a channel_id means the handle could not be resolved.
+        """
+        with self._lock:
+            resolution = self.load().get(self.get_key(handle=handle))
+        if resolution is None or self.is_expired(resolution=resolution, now=self.clock()):
+            return None
+        return resolution
+
+    def set(self, handle: str, channel_id: str | None) -> None:
+        """
+        Cache the resolution of a handle. Writes the cache file if the resolution changed.
+
+        Args:
+            handle: The handle, with or without the "@".
+            channel_id: The channel_id, or None if the handle could not be resolved.
+        """
+        key = self.get_key(handle=handle)
+        now = self.clock()
+        with self._lock:
+            resolutions = self.load()
+            previous = resolutions.get(key)
+            # Skip rewriting the file when a fetch only confirms a recent resolution
+            if (
+                previous
+                and previous.channel_id == channel_id
+                and now - previous.resolved_at < self.get_ttl_seconds(resolution=previous) / 2
+            ):
+                return
+            resolutions[key] = HandleResolution(channel_id=channel_id, resolved_at=now)
+        self.save()
+
+    def clear(self) -> None:
+        """
+        Remove all resolutions, in memory and on disk.
+        """
+        with self._lock:
+            self._resolutions = {}
+        self.path.unlink(missing_ok=True)
+
+
+handle_cache = YoutubeHandleCache(
+    path=paths.YOUTUBE_HANDLES_CACHE_FILE,
+    ttl_seconds=settings.YOUTUBE_HANDLE_CACHE_TTL_DAYS * 24 * 60 * 60,
+    negative_ttl_seconds=settings.YOUTUBE_HANDLE_CACHE_NEGATIVE_TTL_MINUTES * 60,
+)
+
+
+def remember_handle_from_info_dict(info_dict: dict[str, Any]) -> str | None:
+    """
+    Cache the handle to channel_id resolution carried by a channel or video info_dict.
+
+    yt-dlp reports a channel's handle as its `uploader_id` (ie. "@handle"), or in its
+    `uploader_url`.
+
+    Args:
+        info_dict: The info_dict.
+
+    Returns:
+        The handle, or None if the info_dict does not carry both a handle and a channel_id.
+    """
+    channel_id = info_dict.get("channel_id")
+    if not channel_id or not CHANNEL_ID_PATTERN.match(str(channel_id)):
+        return None
+
+    uploader_id = str(info_dict.get("uploader_id") or "")
+    handle = uploader_id[1:] if uploader_id.startswith("@") else None
+    handle = handle or get_handle_from_url(url=str(info_dict.get("uploader_url") or ""))
+    if not handle:
+        return None
+
+    handle_cache.set(handle=handle, channel_id=channel_id)
+    return handle
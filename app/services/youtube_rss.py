@@ -0,0 +1,182 @@
+"""
+Lightweight change detection for Youtube channels.
+
+Youtube publishes a small Atom feed for every channel (`feeds/videos.xml`) that lists the
+most recent uploads. Fetching it is a single small request, compared to the multiple page
+and innertube requests made by a yt-dlp flat playlist extraction. The feed is used as a
+probe: yt-dlp only needs to run when the feed lists a video that is not yet known.
+"""
+
+import re
+from dataclasses import dataclass
+
+import httpx
+from loguru import logger as _logger
+
+from app.models.settings import Settings as _Settings
+
+settings = _Settings()
+
+logger = _logger.bind(name="logger")
+
+VIDEO_ID_PATTERN = re.compile(r"<yt:videoId>([\w-]+)</yt:videoId>")
+WATCH_URL_VIDEO_ID_PATTERN = re.compile(r"(?<=watch\?v=)[\w-]+")
+CHANNEL_URL_CHANNEL_ID_PATTERN = re.compile(r"(?<=/channel/)[\w-]+")
+
+
+@dataclass
+class FeedValidators:
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+@dataclass
+class FeedProbeResult:
+    has_changes: bool
+    video_ids: list[str]
+    not_modified: bool = False
+
+
+# Conditional GET validators, keyed by channel_id.
+# Validators are only stored once a probe has confirmed that every video in the feed is
+# already known, so a `304 Not Modified` response always means "nothing new".
+_feed_validators: dict[str, FeedValidators] = {}
+
+
+def get_channel_id_from_channel_url(url: str) -> str | None:
+    """
+    Get the channel_id from a "/channel/" URL.
+
+    Args:
+        url: The channel URL.
+
+    Returns:
+        The channel_id, or None if the URL is not a "/channel/" URL.
+    """
+    match = CHANNEL_URL_CHANNEL_ID_PATTERN.search(url)
+    return match.group() if match else None
+
+
+def get_video_ids_from_video_urls(urls: list[str]) -> set[str]:
+    """
+    Get the Youtube video ids from a list of "/watch?v=" URLs.
+
+    Args:
+        urls: The list of video URLs.
+
+    Returns:
+        The set of video ids found in the URLs.
+    """
+    video_ids = set()
+    for url in urls:
+        match = WATCH_URL_VIDEO_ID_PATTERN.search(url)
+        if match:
+            video_ids.add(match.group())
+    return video_ids
+
+
+def parse_feed_video_ids(feed_xml: str) -> list[str]:
+    """
+    Parse the video ids from a channel's `videos.xml` feed.
+
+    Args:
+        feed_xml: The feed's XML text.
+
+    Returns:
+        The video ids, in feed order.
+    """
+    return VIDEO_ID_PATTERN.findall(feed_xml)
+
+
+def get_channel_feed_url(channel_id: str) -> str:
+    """
+    Get the `videos.xml` feed url for a channel.
+
+    Args:
+        channel_id: The channel_id.
+
+    Returns:
+        The feed url.
+    """
+    return f"{settings.YOUTUBE_FEED_URL}?channel_id={channel_id}"
+
+
+def clear_feed_validators() -> None:
+    """
+    Clear all stored conditional GET validators.
+    """
+    _feed_validators.clear()
+
+
+async def probe_channel_feed(channel_id: str, known_video_ids: set[str]) -> FeedProbeResult:
+    """
+    Fetch a channel's `videos.xml` feed and compare it against the known video ids.
+
+    Uses a conditional GET (`If-None-Match`/`If-Modified-Since`) when the feed was
+    previously probed without changes.
+
+    Args:
+        channel_id: The channel_id to probe.
+        known_video_ids: The video ids already stored for the channel.
+
+    Returns:
+        The probe result.
+
+    Raises:
+        httpx.HTTPError: If the feed could not be fetched.
+    """
+    headers = {}
+    validators = _feed_validators.get(channel_id)
+    if validators:
+        if validators.etag:
+            headers["If-None-Match"] = validators.etag
+        if validators.last_modified:
+            headers["If-Modified-Since"] = validators.last_modified
+
+    async with httpx.AsyncClient(timeout=settings.YOUTUBE_FEED_TIMEOUT_SECONDS) as client:
+        response = await client.get(get_channel_feed_url(channel_id=channel_id), headers=headers)
+
+    if response.status_code == httpx.codes.NOT_MODIFIED:
+        return FeedProbeResult(has_changes=False, video_ids=[], not_modified=True)
+    response.raise_for_status()
+
+    video_ids = parse_feed_video_ids(feed_xml=response.text)
+    has_changes = any(video_id not in known_video_ids for video_id in video_ids)
+
+    if has_changes:
+        _feed_validators.pop(channel_id, None)
+    else:
+        _feed_validators[channel_id] = FeedValidators(
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    return FeedProbeResult(has_changes=has_changes, video_ids=video_ids)
+
+
+async def channel_has_new_videos(url: str, known_video_urls: list[str]) -> bool:
+    """
+    Check if a "/channel/" source has videos that are not known yet.
+
+    Errs on the side of reporting changes: any probe failure, a source without known videos,
+    or a non-channel URL returns True so that yt-dlp runs as usual.
+
+    Args:
+        url: The source URL.
+        known_video_urls: The URLs of the videos already stored for the source.
+
+    Returns:
+        True if yt-dlp should fetch the source.
+    """
+    channel_id = get_channel_id_from_channel_url(url=url)
+    known_video_ids = get_video_ids_from_video_urls(urls=known_video_urls)
+    if not channel_id or not known_video_ids:
+        return True
+
+    try:
+        result = await probe_channel_feed(channel_id=channel_id, known_video_ids=known_video_ids)
+    except httpx.HTTPError as e:
+        logger.warning(f"Youtube RSS probe failed for channel '{channel_id}'. {e=}")
+        return True
+
+    return result.has_changes
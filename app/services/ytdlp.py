@@ -1,12 +1,23 @@
 from typing import Any, Type
 
+import json
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
 from loguru import logger as _logger
 from yt_dlp import YoutubeDL
 from yt_dlp.extractor.common import InfoExtractor
 from yt_dlp.utils import DownloadError, ExtractorError, YoutubeDLError
 
 # from app.core.loggers import ytdlp_logger as logger
-from app.core.notify import notify
+from app.core import metrics
+from app.core.outbox import queue_notification
+from app.models.settings import Settings as _Settings
+from app.services import rate_limit
+
+settings = _Settings()
 
 # YoutubeDL Logger
 logger = _logger.bind(name="logger")
@@ -76,6 +87,12 @@ class VideoUnavailableError(YoutubeDLError):
     """
 
 
+class UpstreamThrottledError(YoutubeDLError):
+    """
+    Raised when the upstream is throttling requests (HTTP 429, bot checks, etc.).
+    """
+
+
 class FormatNotFoundError(Exception):
     """
     Exception raised when a format cannot be found.
@@ -88,11 +105,219 @@ class AwaitingTranscodingError(Exception):
     """
 
 
+class YoutubeDLPool:
+    """
+    Pool of reusable YoutubeDL instances, keyed by `ydl_opts` and custom extractors.
+
+    Creating a YoutubeDL instance loads the extractor list, builds the request director
+    and cookie jar, and registers the custom extractors. Pooled instances are created once
+    per option set and reset to their initial state when they are released.
+    """
+
+    def __init__(self, max_idle_per_key: int) -> None:
+        self.max_idle_per_key = max_idle_per_key
+        self._idle: dict[str, list[tuple[YoutubeDL, dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    @staticmethod
+    def get_key(
+        ydl_opts: dict[str, Any], custom_extractors: list[Type[InfoExtractor]] | None = None
+    ) -> str:
+        """
+        Get the pool key for an option set.
+
+        Args:
+            ydl_opts: The YoutubeDL options.
+            custom_extractors: The custom extractors registered on the instance.
+
+        Returns:
+            The pool key.
+        """
+        extractor_keys = [extractor.ie_key() for extractor in custom_extractors or []]
+        return json.dumps([ydl_opts, extractor_keys], sort_keys=True, default=repr)
+
+    def create(
+        self, ydl_opts: dict[str, Any], custom_extractors: list[Type[InfoExtractor]] | None = None
+    ) -> YoutubeDL:
+        """
+        Create a new YoutubeDL instance with the custom extractors registered.
+
+        Args:
+            ydl_opts: The YoutubeDL options.
+            custom_extractors: The custom extractors to register.
+
+        Returns:
+            The YoutubeDL instance.
+        """
+        # YoutubeDL keeps and mutates the params dict, so give each instance its own copy
+        ydl = YoutubeDL(dict(ydl_opts))
+        add_custom_extractors(ydl=ydl, custom_extractors=custom_extractors)
+        self.created += 1
+        return ydl
+
+    @staticmethod
+    def reset(ydl: YoutubeDL, params: dict[str, Any]) -> None:
+        """
+        Reset the per-run state of a YoutubeDL instance.
+
+        Args:
+            ydl: The YoutubeDL instance.
+            params: The snapshot of `ydl.params` taken when the instance was created.
+        """
+        ydl.params.clear()
+        ydl.params.update(params)
+        ydl._download_retcode = 0  # pylint: disable=protected-access
+        ydl._num_downloads = 0  # pylint: disable=protected-access
+        ydl._num_videos = 0  # pylint: disable=protected-access
+        ydl._playlist_level = 0  # pylint: disable=protected-access
+        ydl._playlist_urls = set()  # pylint: disable=protected-access
+        ydl._printed_messages = set()  # pylint: disable=protected-access
+
+    @contextmanager
+    def acquire(
+        self, ydl_opts: dict[str, Any], custom_extractors: list[Type[InfoExtractor]] | None = None
+    ) -> Iterator[YoutubeDL]:
+        """
+        Borrow a YoutubeDL instance for the option set.
+
+        The instance is returned to the pool after use. If the extraction raised an error
+        other than a `YoutubeDLError`, the instance is closed instead of being reused.
+
+        Args:
+            ydl_opts: The YoutubeDL options.
+            custom_extractors: The custom extractors registered on the instance.
+
+        Yields:
+            The YoutubeDL instance.
+        """
+        key = self.get_key(ydl_opts=ydl_opts, custom_extractors=custom_extractors)
+        with self._lock:
+            idle = self._idle.get(key)
+            pooled = idle.pop() if idle else None
+
+        if pooled:
+            self.reused += 1
+            ydl, params = pooled
+        else:
+            ydl = self.create(ydl_opts=ydl_opts, custom_extractors=custom_extractors)
+            params = dict(ydl.params)
+
+        try:
+            yield ydl
+        except YoutubeDLError:
+            self.release(key=key, ydl=ydl, params=params)
+            raise
+        except BaseException:
+            ydl.close()
+            raise
+        self.release(key=key, ydl=ydl, params=params)
+
+    def release(self, key: str, ydl: YoutubeDL, params: dict[str, Any]) -> None:
+        """
+        Reset a YoutubeDL instance and return it to the pool, or close it if the pool is full.
+
+        Args:
+            key: The pool key.
+            ydl: The YoutubeDL instance.
+            params: The snapshot of `ydl.params` taken when the instance was created.
+        """
+        self.reset(ydl=ydl, params=params)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_key:
+                idle.append((ydl, params))
+                return
+        ydl.close()
+
+    def clear(self) -> None:
+        """
+        Close and remove all idle instances.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for instances in idle.values():
+            for ydl, _ in instances:
+                ydl.close()
+
+    def warm(
+        self, ydl_opts: dict[str, Any], custom_extractors: list[Type[InfoExtractor]] | None = None
+    ) -> None:
+        """
+        Pre-create an idle instance for the option set.
+
+        Args:
+            ydl_opts: The YoutubeDL options.
+            custom_extractors: The custom extractors to register.
+        """
+        ydl = self.create(ydl_opts=ydl_opts, custom_extractors=custom_extractors)
+        key = self.get_key(ydl_opts=ydl_opts, custom_extractors=custom_extractors)
+        self.release(key=key, ydl=ydl, params=dict(ydl.params))
+
+
+ydl_pool = YoutubeDLPool(max_idle_per_key=settings.YTDLP_POOL_MAX_IDLE_PER_KEY)
+
+
+def add_custom_extractors(
+    ydl: YoutubeDL, custom_extractors: list[Type[InfoExtractor]] | None = None
+) -> None:
+    """
+    Register custom extractors on a YoutubeDL instance, skipping already registered ones.
+
+    Args:
+        ydl: The YoutubeDL instance.
+        custom_extractors: The custom extractors to register.
+    """
+    for custom_extractor in custom_extractors or []:
+        if custom_extractor.ie_key() in ydl._ies_instances:  # pylint: disable=protected-access
+            continue
+        ydl.add_info_extractor(custom_extractor())
+
+
+@contextmanager
+def get_ydl(
+    ydl_opts: dict[str, Any], custom_extractors: list[Type[InfoExtractor]] | None = None
+) -> Iterator[YoutubeDL]:
+    """
+    Get a YoutubeDL instance, from the pool if `YTDLP_POOL_ENABLED`.
+
+    If `YTDLP_BACKEND` is "fake", a `FakeYoutubeDL` serving recorded or synthetic
+    info_dicts is used instead.
+
+    Args:
+        ydl_opts: The YoutubeDL options.
+        custom_extractors: The custom extractors to register.
+
+    Yields:
+        The YoutubeDL instance.
+    """
+    if settings.YTDLP_BACKEND == "fake":
+        # Imported lazily, so the load testing package is only loaded when it is used
+        # pylint: disable-next=import-outside-toplevel
+        from app.loadtest.fake_ytdlp import FakeYoutubeDL
+
+        with FakeYoutubeDL(ydl_opts) as fake_ydl:
+            add_custom_extractors(ydl=fake_ydl, custom_extractors=custom_extractors)  # type: ignore
+            yield fake_ydl  # type: ignore
+        return
+
+    if not settings.YTDLP_POOL_ENABLED:
+        with YoutubeDL(ydl_opts) as ydl:
+            add_custom_extractors(ydl=ydl, custom_extractors=custom_extractors)
+            yield ydl
+        return
+
+    with ydl_pool.acquire(ydl_opts=ydl_opts, custom_extractors=custom_extractors) as ydl:
+        yield ydl
+
+
 async def get_info_dict(
     url: str,
     ydl_opts: dict[str, Any],
     ie_key: str | None = None,
     custom_extractors: list[Type[InfoExtractor]] | None = None,
+    rate_limit_key: str | None = None,
 ) -> dict[str, Any]:
     """
     Use YouTube-DL to get the info dictionary for a given URL.
@@ -104,12 +329,24 @@ async def get_info_dict(
             If not provided, the default extractor will be used.
         custom_extractors (Optional[list[Type[InfoExtractor]]]): A list of
             Custom Extractors to make available to yt-dlp.
+        rate_limit_key (Optional[str]): The upstream to rate limit the request against,
+            ie. the handler name. Defaults to the URL's domain.
 
     Returns:
         dict[str, Any]: The info dictionary for the object.
+
+    Raises:
+        CircuitOpenError: If the upstream is paused by its circuit breaker.
     """
+    rate_limit_key = rate_limit_key or get_rate_limit_key_from_url(url=url)
+    await rate_limit.acquire(key=rate_limit_key)
+
     try:
-        with YoutubeDL(ydl_opts) as ydl:
+        with (
+            metrics.YTDLP_EXTRACT_DURATION.time(upstream=rate_limit_key),
+            metrics.track_fetch_cost("ytdlp_seconds"),
+            get_ydl(ydl_opts=ydl_opts, custom_extractors=custom_extractors) as ydl,
+        ):
             # Extract info dict, handle if no videos uploaded
             info_dict = await get_info_dict_from_ydl(
                 ydl=ydl,
@@ -122,10 +359,47 @@ async def get_info_dict(
         # TODO: Handle this error.
         # Test: https://www.youtube.com/channel/UCeTX6IZlqeB6qhNBAB6cgTQ
         # See: https://github.com/yt-dlp/yt-dlp/issues/5906
+        metrics.YTDLP_EXTRACT_ERRORS.inc(upstream=rate_limit_key, error=e.__class__.__name__)
+        rate_limit.record_result(key=rate_limit_key)
+        raise e
+    except Exception as e:
+        metrics.YTDLP_EXTRACT_ERRORS.inc(upstream=rate_limit_key, error=e.__class__.__name__)
+        if rate_limit.record_result(key=rate_limit_key, error=e):
+            limiter = rate_limit.get_limiter(key=rate_limit_key)
+            await queue_notification(
+                telegram=True,
+                email=False,
+                text=(
+                    f"Upstream '{rate_limit_key}' is throttling requests. "
+                    f"Pausing extraction for {limiter.backoff_seconds:.0f}s. {e=}"
+                ),
+            )
         raise e
+
+    rate_limit.record_result(key=rate_limit_key)
+    if settings.YTDLP_RECORD_INFO_DICTS and settings.YTDLP_BACKEND != "fake":
+        from app.loadtest.fake_ytdlp import (  # pylint: disable=import-outside-toplevel
+            save_recording,
+        )
+
+        save_recording(url=url, info_dict=info_dict)
     return info_dict
 
 
+def get_rate_limit_key_from_url(url: str) -> str:
+    """
+    Get the default rate limit key for a URL, ie. its domain without subdomains.
+
+    Args:
+        url: The URL.
+
+    Returns:
+        The rate limit key.
+    """
+    hostname = urlparse(url).hostname or url
+    return ".".join(hostname.split(".")[-2:])
+
+
 async def get_info_dict_from_ydl(
     ydl: YoutubeDL,
     url: str,
@@ -149,9 +423,7 @@ async def get_info_dict_from_ydl(
         dict[str, Any]: The info dictionary for the object.
     """
     # Add custom_extractors
-    if custom_extractors:
-        for custom_extractor in custom_extractors:
-            ydl.add_info_extractor(custom_extractor())
+    add_custom_extractors(ydl=ydl, custom_extractors=custom_extractors)
 
     # Extract info dict, handle if no videos uploaded
     info_dict = await ydl_extract_info(ydl=ydl, url=url, download=False, ie_key=ie_key)
@@ -222,11 +494,14 @@ async def ydl_extract_info(
                 raise Http410Error from e
             if "HTTP Error 404" in str(e):
                 raise Http404Error from e
+        if rate_limit.is_throttle_error(error=e):
+            # Notified once by `get_info_dict` when the upstream's circuit breaker opens
+            raise UpstreamThrottledError(f"yt-dlp was throttled for {url}. {e=}") from e
 
         err_msg = f"yt-dlp could not extract info for {url}. {e=}"
         logger.critical(err_msg)
         ytdlp_logger.critical(err_msg)
-        await notify(telegram=True, email=False, text=err_msg)
+        await queue_notification(telegram=True, email=False, text=err_msg)
         raise YoutubeDLError(err_msg) from e
 
     # Handle if info_dict is None/Empty
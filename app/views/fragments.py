@@ -0,0 +1,88 @@
+from typing import Any, Hashable
+
+from markupsafe import Markup
+
+from app import models
+from app.services.fragment_cache import fragment_cache
+from app.views import templates
+
+
+def get_source_fingerprint(source: models.Source) -> tuple[Hashable, ...]:
+    """
+    Get the part of a fragment's key that changes with its source and the source's videos.
+
+    Args:
+        source (models.Source): The source.
+
+    Returns:
+        tuple[Hashable, ...]: The source's fingerprint.
+    """
+    return (
+        source.id,
+        source.created_at,
+        source.updated_at,
+        fragment_cache.get_generation(source_id=source.id),
+    )
+
+
+def get_filter_fingerprint(filter: models.Filter) -> tuple[Hashable, ...]:
+    """
+    Get the part of a fragment's key that changes with a filter and its criterias.
+
+    Args:
+        filter (models.Filter): The filter.
+
+    Returns:
+        tuple[Hashable, ...]: The filter's fingerprint.
+    """
+    return (
+        filter.id,
+        filter.name,
+        filter.ordered_by,
+        tuple(
+            (
+                criteria.id,
+                criteria.field,
+                criteria.operator,
+                criteria.value,
+                criteria.unit_of_measure,
+            )
+            for criteria in filter.criterias
+        ),
+    )
+
+
+def is_fragment_cached(template_name: str, key: tuple[Hashable, ...]) -> bool:
+    """
+    Check if a fragment is cached, ie. if rendering it does not need its data loaded.
+
+    Args:
+        template_name (str): The fragment's template.
+        key (tuple[Hashable, ...]): The fragment's key.
+
+    Returns:
+        bool: Whether the fragment is cached.
+    """
+    return fragment_cache.get(key=(template_name, *key)) is not None
+
+
+def render_fragment(
+    template_name: str, key: tuple[Hashable, ...], context: dict[str, Any]
+) -> Markup:
+    """
+    Render a page fragment, or get it from the fragment cache.
+
+    The fragment must only depend on the data fingerprinted in its key.
+
+    Args:
+        template_name (str): The fragment's template.
+        key (tuple[Hashable, ...]): The fragment's key.
+        context (dict[str, Any]): The template context, used on a cache miss.
+
+    Returns:
+        Markup: The rendered fragment.
+    """
+    return fragment_cache.get_or_render(
+        key=(template_name, *key),
+        render=lambda: templates.get_template(template_name).render(context),
+    )
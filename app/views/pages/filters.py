@@ -3,11 +3,17 @@ from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from sqlmodel import Session
 
 from app import crud, logger, models
-from app.core.notify import notify
+from app.core.outbox import queue_notification
 from app.models.source_video_link import SourceOrderBy
 from app.services.feed import build_rss_file, delete_rss_file, get_rss_file
 from app.services.fetch import FetchCanceledError, fetch_source
 from app.views import deps, templates
+from app.views.fragments import (
+    get_filter_fingerprint,
+    get_source_fingerprint,
+    is_fragment_cached,
+    render_fragment,
+)
 
 router = APIRouter()
 
@@ -106,11 +112,25 @@ async def view_filter(
 
     ordered_by_select = list(attr.value for attr in SourceOrderBy)
 
+    # The source's videos are only loaded if the filter's videos fragment is not cached
+    videos_key = (
+        *get_source_fingerprint(source=_filter.source),
+        *get_filter_fingerprint(filter=_filter),
+        current_user.is_superuser,
+    )
+    if not is_fragment_cached("filter/videos.html", key=videos_key):
+        await crud.source.load_videos(db=db, source=_filter.source)
+
     return templates.TemplateResponse(
         "filter/view.html",
         {
             "request": request,
             "filter": _filter,
+            "videos_fragment": render_fragment(
+                "filter/videos.html",
+                key=videos_key,
+                context={"filter": _filter, "is_superuser": current_user.is_superuser},
+            ),
             "ordered_by_select": ordered_by_select,
             "criteria_field_select": criteria_field_select,
             "created_release_operators_select": created_release_operators_select,
@@ -323,7 +343,7 @@ async def get_filter_rss_feed(filter_id: str, db: Session = Depends(deps.get_db)
         except FileNotFoundError as exc:  # pragma: no cover
             err_msg = f"RSS file ({filter_.id}.rss) does not exist for filter '{filter_.id=}' ({filter_.source.name} - [{filter_.name}]).)"
             logger.critical(err_msg)
-            await notify(telegram=True, email=False, text=err_msg)
+            await queue_notification(telegram=True, email=False, text=err_msg)
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=err_msg) from exc
 
     # Serve RSS File as a Response
@@ -6,8 +6,9 @@ from fastapi.responses import Response
 from sqlmodel import Session
 
 from app import crud, logger
-from app.api.deps import get_db
+from app.api.deps import get_sync_db
 from app.core.proxy import Http403ForbiddenError
+from app.services.archive import mark_video_played, restore_archived_video
 from app.services.media import get_media_response
 
 router = APIRouter()
@@ -15,10 +16,13 @@ router = APIRouter()
 
 @router.get("/{video_id}")
 @router.head("/{video_id}")
-async def handle_media(video_id: str, request: Request, db: Session = Depends(get_db)) -> Response:
+async def handle_media(
+    video_id: str, request: Request, db: Session = Depends(get_sync_db)
+) -> Response:
     """
     Handles the repose for a media request by video_id.
     Uses a reverse proxy if required by the handler.
+    Restores the video first if it was archived.
 
     Args:
         video_id(str): The video_id of the video.
@@ -33,12 +37,17 @@ async def handle_media(video_id: str, request: Request, db: Session = Depends(ge
     """
     try:
         video = await crud.video.get(id=video_id, db=db)
-    except crud.RecordNotFoundError as e:
-        logger.error(e)
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"The video_id '{video_id}' was not found.",
-        ) from e
+    except crud.RecordNotFoundError:
+        try:
+            video = await restore_archived_video(db=db, video_id=video_id)
+        except crud.RecordNotFoundError as e:
+            logger.error(e)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"The video_id '{video_id}' was not found.",
+            ) from e
+
+    await mark_video_played(db=db, video=video)
 
     # Get Media Response. Retry on Http403ForbiddenError
     MAX_RETRIES = 2
@@ -1,3 +1,4 @@
+import datetime
 import random
 
 from fastapi import APIRouter, BackgroundTasks, Depends, Form, HTTPException, Request, status
@@ -5,7 +6,7 @@ from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from sqlmodel import Session
 
 from app import crud, logger, models
-from app.core.notify import notify
+from app.core.outbox import queue_notification
 from app.handlers.exceptions import HandlerNotFoundError, InvalidSourceUrl
 from app.services.feed import build_source_rss_files, get_rss_file
 from app.services.fetch import FetchCanceledError, fetch_all_sources, fetch_source
@@ -13,6 +14,12 @@ from app.services.logo import DARK_COLORS
 from app.services.source import create_source_logo, source_needs_logo
 from app.services.ytdlp import NoUploadsError, PlaylistNotFoundError
 from app.views import deps, templates
+from app.views.fragments import (
+    get_filter_fingerprint,
+    get_source_fingerprint,
+    is_fragment_cached,
+    render_fragment,
+)
 
 router = APIRouter()
 
@@ -39,11 +46,14 @@ async def list_sources(
     # Get alerts dict from cookies
     alerts = models.Alerts().from_cookies(request.cookies)
 
+    sources = current_user.sources
+    stats = await crud.source.get_stats(db=db, source_ids=[source.id for source in sources])
     return templates.TemplateResponse(
         "source/list.html",
         {
             "request": request,
-            "sources": current_user.sources,
+            "sources": sources,
+            "stats": stats,
             "current_user": current_user,
             "alerts": alerts,
         },
@@ -74,9 +84,53 @@ async def list_all_sources(
     alerts = models.Alerts().from_cookies(request.cookies)
 
     sources = await crud.source.get_all(db=db)
+    stats = await crud.source.get_stats(db=db, source_ids=[source.id for source in sources])
     return templates.TemplateResponse(
         "source/list.html",
-        {"request": request, "sources": sources, "current_user": current_user, "alerts": alerts},
+        {
+            "request": request,
+            "sources": sources,
+            "stats": stats,
+            "current_user": current_user,
+            "alerts": alerts,
+        },
+    )
+
+
+@router.get("/sources/costs", response_class=HTMLResponse)
+async def list_source_fetch_costs(
+    request: Request,
+    days: int = 7,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(  # pylint: disable=unused-argument
+        deps.get_current_active_superuser
+    ),
+) -> Response:
+    """
+    Returns HTML response with the sources ranked by cumulative fetch time.
+
+    Args:
+        request(Request): The request object
+        days(int): Only include fetches of the last `days` days.
+        db(Session): The database session.
+        current_user(User): The authenticated superuser.
+
+    Returns:
+        Response: HTML page with the sources' fetch costs
+    """
+    alerts = models.Alerts().from_cookies(request.cookies)
+
+    since = datetime.datetime.utcnow() - datetime.timedelta(days=max(days, 1))
+    source_costs = await crud.fetch_history.get_source_costs(db=db, since=since)
+    return templates.TemplateResponse(
+        "source/costs.html",
+        {
+            "request": request,
+            "source_costs": source_costs,
+            "days": days,
+            "current_user": current_user,
+            "alerts": alerts,
+        },
     )
 
 
@@ -116,10 +170,38 @@ async def view_source(
         response.set_cookie(key="alerts", value=alerts.json(), httponly=True, max_age=5)
         return response
 
+    # The videos are only loaded if a fragment that lists them is not cached
+    source = await crud.source.load_filters(db=db, source=source)
+    source_fingerprint = get_source_fingerprint(source=source)
+    filters_key = (
+        *source_fingerprint,
+        *(get_filter_fingerprint(filter=filter) for filter in source.filters),
+    )
+    videos_key = (*source_fingerprint, current_user.is_superuser)
+    filters_cached = is_fragment_cached("source/filters.html", key=filters_key)
+    videos_cached = is_fragment_cached("source/videos.html", key=videos_key)
+    if not filters_cached or not videos_cached:
+        source = await crud.source.load_videos(db=db, source=source)
+    stats = (await crud.source.get_stats(db=db, source_ids=[source.id]))[source.id]
+
     source.description = str(source.description).replace("\n", "<br>")
     return templates.TemplateResponse(
         "source/view.html",
-        {"request": request, "source": source, "current_user": current_user, "alerts": alerts},
+        {
+            "request": request,
+            "source": source,
+            "stats": stats,
+            "filters_fragment": render_fragment(
+                "source/filters.html", key=filters_key, context={"source": source}
+            ),
+            "videos_fragment": render_fragment(
+                "source/videos.html",
+                key=videos_key,
+                context={"source": source, "is_superuser": current_user.is_superuser},
+            ),
+            "current_user": current_user,
+            "alerts": alerts,
+        },
     )
 
 
@@ -479,7 +561,7 @@ async def get_source_rss_feed(source_id: str, db: Session = Depends(deps.get_db)
         except crud.RecordNotFoundError as exc:
             err_msg = f"Source '{source_id}' not found."
             logger.critical(err_msg)
-            await notify(telegram=True, email=False, text=err_msg)
+            await queue_notification(telegram=True, email=False, text=err_msg)
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=err_msg) from exc
 
         # Build and get rss file
@@ -491,7 +573,7 @@ async def get_source_rss_feed(source_id: str, db: Session = Depends(deps.get_db)
                 f"RSS file ({source.id}.rss) does not exist for '{source.id=}' ({source.name}).)"
             )
             logger.critical(err_msg)
-            await notify(telegram=True, email=False, text=err_msg)
+            await queue_notification(telegram=True, email=False, text=err_msg)
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=err_msg) from exc
 
     # Serve RSS File as a Response
@@ -40,7 +40,7 @@ async def view_video(
         response = RedirectResponse("/sources", status_code=status.HTTP_303_SEE_OTHER)
         response.set_cookie(key="alerts", value=alerts.json(), httponly=True, max_age=5)
         return response
-    video.description = str(video.description).replace("\n", "<br>")
+    description = str(video.description).replace("\n", "<br>")
 
     source = await crud.source.get_or_none(db=db, id=source_id) if source_id else None
 
@@ -49,6 +49,7 @@ async def view_video(
         {
             "request": request,
             "video": video,
+            "description": description,
             "source": source,
             "current_user": current_user,
             "alerts": alerts,
@@ -0,0 +1,58 @@
+"""add VideoSearch
+
+Revision ID: e6a94c0b2f81
+Revises: b3f07c5e9d12
+Create Date: 2026-10-19 18:05:33.671840
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # added
+
+from app.core.compression import Compression, decompress_text # added
+from app.models.video_search import CREATE_VIDEO_SEARCH_TABLE, get_video_search_rowid # added
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6a94c0b2f81'
+down_revision = 'b3f07c5e9d12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(CREATE_VIDEO_SEARCH_TABLE)
+
+    # Index the existing videos
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text(
+            "SELECT v.id, v.title, v.uploader, d.compression, d.data FROM video v "
+            "LEFT JOIN videodescription d ON d.video_id = v.id"
+        )
+    ).fetchall()
+    if rows:
+        connection.execute(
+            sa.text(
+                "INSERT INTO videosearch (rowid, video_id, title, description, uploader) "
+                "VALUES (:rowid, :video_id, :title, :description, :uploader)"
+            ),
+            [
+                {
+                    "rowid": get_video_search_rowid(video_id=video_id),
+                    "video_id": video_id,
+                    "title": title,
+                    "description": (
+                        decompress_text(data=data, compression=Compression(compression))
+                        if data is not None
+                        else None
+                    ),
+                    "uploader": uploader,
+                }
+                for video_id, title, uploader, compression, data in rows
+            ],
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE videosearch")
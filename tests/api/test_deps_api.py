@@ -0,0 +1,46 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api import deps
+
+
+async def test_get_db() -> None:
+    """
+    Test that get_db() yields a session of the `DATABASE_BACKEND`.
+    """
+    async for db in deps.get_db():
+        assert isinstance(db, Session)
+
+    with patch("app.db.session.settings.DATABASE_BACKEND", "async"):
+        async for db in deps.get_db():
+            assert isinstance(db, AsyncSession)
+
+
+async def test_get_db_context() -> None:
+    """
+    Test that get_db_context() closes its session, of either backend.
+    """
+    sync_db = MagicMock(spec=Session)
+    with patch("app.api.deps.get_session", return_value=sync_db):
+        async with deps.get_db_context() as db:
+            assert db is sync_db
+    sync_db.close.assert_called_once_with()
+
+    async_db = AsyncMock(spec=AsyncSession)
+    with patch("app.api.deps.get_session", return_value=async_db):
+        async with deps.get_db_context() as db:
+            assert db is async_db
+    async_db.close.assert_awaited_once_with()
+
+
+def test_get_sync_db_context() -> None:
+    """
+    Test that get_sync_db_context() closes its Session.
+    """
+    sync_db = MagicMock(spec=Session)
+    with patch("app.api.deps.SessionLocal", return_value=sync_db):
+        with deps.get_sync_db_context() as db:
+            assert db is sync_db
+    sync_db.close.assert_called_once_with()
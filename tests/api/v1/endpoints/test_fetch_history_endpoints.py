@@ -0,0 +1,42 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud, models, settings
+from app.services.fetch import fetch_source
+
+
+async def test_fetch_history_endpoints(
+    db: Session,
+    source_1: models.Source,
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    """
+    Test ranking sources by fetch cost and listing a source's fetches.
+    """
+    await fetch_source(db=db, id=source_1.id)
+    await fetch_source(db=db, id=source_1.id)
+
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/fetch-history/costs", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    costs = response.json()
+    assert costs[0]["source_id"] == source_1.id
+    assert costs[0]["fetches"] == 2
+
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/fetch-history/source/{source_1.id}?limit=1",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    history = response.json()
+    assert len(history) == 1
+    assert history[0]["outcome"] == "success"
+
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/fetch-history/costs", headers=normal_user_token_headers
+    )
+    assert response.status_code == 403
+    assert len(await crud.fetch_history.get_source_history(db=db, source_id=source_1.id)) == 2
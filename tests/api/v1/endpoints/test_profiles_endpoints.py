@@ -0,0 +1,49 @@
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app import settings
+from app.core import profiling
+
+
+async def test_profiles_endpoints(
+    client: TestClient, superuser_token_headers: dict[str, str], tmp_path: Path
+) -> None:
+    """
+    Test that a superuser can list and download saved profiles.
+    """
+    with (
+        patch("app.core.profiling.PROFILES_PATH", tmp_path),
+        patch("app.core.profiling.settings.PROFILING_SLOW_THRESHOLD_MS", 10),
+        patch("app.core.profiling.settings.PROFILING_INTERVAL_MS", 1),
+    ):
+        async with profiling.profile(kind="task", name="fetch_all_sources"):
+            time.sleep(0.03)
+
+        response = client.get(
+            f"{settings.API_V1_PREFIX}/profiles/", headers=superuser_token_headers
+        )
+        assert response.status_code == 200
+        profiles = response.json()
+        assert profiles[0]["name"] == "fetch_all_sources"
+
+        response = client.get(
+            f"{settings.API_V1_PREFIX}/profiles/{profiles[0]['id']}",
+            headers=superuser_token_headers,
+        )
+        assert response.status_code == 200
+        assert "test_profiles_endpoints" in response.text
+
+        response = client.get(
+            f"{settings.API_V1_PREFIX}/profiles/missing", headers=superuser_token_headers
+        )
+        assert response.status_code == 404
+
+
+def test_profiles_endpoints_not_superuser(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.get(f"{settings.API_V1_PREFIX}/profiles/", headers=normal_user_token_headers)
+    assert response.status_code == 403
@@ -1,3 +1,4 @@
+import json
 from unittest.mock import patch
 
 from fastapi.testclient import TestClient
@@ -190,6 +191,56 @@ def test_normal_user_get_all_sources(
     assert len(sources) == 2
 
 
+def test_export_sources(
+    db: Session,  # pylint: disable=unused-argument
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    superuser_token_headers: dict[str, str],
+) -> None:
+    """
+    Test that a user exports their own sources as newline delimited JSON.
+    """
+    for source in MOCKED_SOURCES[:2]:
+        response = client.post(
+            f"{settings.API_V1_PREFIX}/source/",
+            headers=normal_user_token_headers,
+            json=source,
+        )
+        assert response.status_code == 201
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/source/",
+        headers=superuser_token_headers,
+        json=MOCKED_SOURCES[2],
+    )
+    assert response.status_code == 201
+
+    with patch("app.settings.API_EXPORT_BATCH_SIZE", 1):
+        response = client.get(
+            f"{settings.API_V1_PREFIX}/source/export",
+            headers=normal_user_token_headers,
+            params={"fields": "id,name,videos_count"},
+        )
+    assert response.status_code == 200
+    sources = [json.loads(line) for line in response.text.splitlines()]
+    assert len(sources) == 2
+    assert all(source.keys() == {"id", "name", "videos_count"} for source in sources)
+
+    # Get a page of sources, and the next page with its cursor
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/source/",
+        headers=superuser_token_headers,
+        params={"limit": 2},
+    )
+    assert len(response.json()) == 2
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/source/",
+        headers=superuser_token_headers,
+        params={"limit": 2, "cursor": response.headers["X-Next-Cursor"]},
+    )
+    assert len(response.json()) == 1
+    assert "X-Next-Cursor" not in response.headers
+
+
 def test_update_source(client: TestClient, superuser_token_headers: dict[str, str]) -> None:
     """
     Test that a superuser can update an source.
@@ -1,5 +1,7 @@
+import json
 from unittest.mock import patch
 
+import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
@@ -7,6 +9,7 @@ from app import crud, settings
 from tests.mock_objects import MOCKED_RUMBLE_SOURCE_1, MOCKED_YOUTUBE_SOURCE_1
 
 
+@pytest.mark.sync_db
 async def test_read_video(
     client: TestClient,
     db: Session,
@@ -98,6 +101,7 @@ async def test_superuser_get_all_videos(
     assert len(videos) == 4
 
 
+@pytest.mark.sync_db
 async def test_fetch_video(
     client: TestClient,
     db: Session,
@@ -173,3 +177,138 @@ async def test_refresh_all_videos(
         assert response.status_code == 200
         assert mock_refresh_all_videos.call_count == 1
         assert response.json() == {"msg": "Refreshing all videos in the background."}
+
+
+@pytest.mark.sync_db
+async def test_search_videos(
+    client: TestClient,
+    db: Session,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    """
+    Test searching videos, and that normal users only search the videos of their sources.
+    """
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/source/",
+        headers=superuser_token_headers,
+        json={"url": MOCKED_YOUTUBE_SOURCE_1["url"]},
+    )
+    assert response.status_code == 201
+    source = await crud.source.get(db=db, id=response.json()["id"])
+    video_0 = source.videos[0]
+
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/video/search",
+        params={"q": f'"{video_0.title}"'},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    assert [video["id"] for video in response.json()] == [video_0.id]
+
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/video/search",
+        params={"q": "nonexistentword"},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == []
+
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/video/search",
+        params={"q": f'"{video_0.title}"'},
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+async def test_get_videos_pages_and_fields(
+    db: Session,
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+) -> None:
+    """
+    Test that videos are paginated with a cursor, and projected to the requested fields.
+    """
+    for source in [MOCKED_YOUTUBE_SOURCE_1, MOCKED_RUMBLE_SOURCE_1]:
+        response = client.post(
+            f"{settings.API_V1_PREFIX}/source/",
+            headers=superuser_token_headers,
+            json={"url": source["url"]},
+        )
+        assert response.status_code == 201
+
+    # Walk the pages with the cursor of the previous page
+    video_ids: list[str] = []
+    params: dict[str, str | int] = {"limit": 3, "order_by": "released_at"}
+    while True:
+        response = client.get(
+            f"{settings.API_V1_PREFIX}/video/", headers=superuser_token_headers, params=params
+        )
+        assert response.status_code == 200
+        video_ids.extend(video["id"] for video in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+    assert len(video_ids) == len(set(video_ids)) == 4
+
+    # Only return the requested fields
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/video/",
+        headers=superuser_token_headers,
+        params={"fields": "id,title"},
+    )
+    assert response.status_code == 200
+    videos = response.json()
+    assert {video["id"] for video in videos} == set(video_ids)
+    assert all(video.keys() == {"id", "title"} for video in videos)
+
+    # Unknown fields and invalid cursors are rejected
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/video/",
+        headers=superuser_token_headers,
+        params={"fields": "id,password"},
+    )
+    assert response.status_code == 422
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/video/",
+        headers=superuser_token_headers,
+        params={"cursor": "invalid"},
+    )
+    assert response.status_code == 400
+
+
+async def test_export_videos(
+    db: Session,
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    """
+    Test that all videos are exported as newline delimited JSON.
+    """
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/source/",
+        headers=superuser_token_headers,
+        json={"url": MOCKED_RUMBLE_SOURCE_1["url"]},
+    )
+    assert response.status_code == 201
+
+    with patch("app.settings.API_EXPORT_BATCH_SIZE", 1):
+        response = client.get(
+            f"{settings.API_V1_PREFIX}/video/export",
+            headers=superuser_token_headers,
+            params={"fields": "id,title,description"},
+        )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    videos = [json.loads(line) for line in response.text.splitlines()]
+    assert len(videos) == 2
+    assert all(video.keys() == {"id", "title", "description"} for video in videos)
+
+    # Export as normal user is forbidden
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/video/export", headers=normal_user_token_headers
+    )
+    assert response.status_code == 403
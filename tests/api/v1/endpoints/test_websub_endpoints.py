@@ -0,0 +1,102 @@
+import datetime
+import hashlib
+import hmac
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud, models, settings
+from app.services.websub import get_callback_url, get_topic_url
+from tests.mock_objects import MOCKED_YOUTUBE_SOURCE_1
+
+CHANNEL_ID = "UCDRIjKy6eZOvKtOELtTdeUA"
+NOTIFICATION = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" '
+    'xmlns="http://www.w3.org/2005/Atom">'
+    "<entry><yt:videoId>NEW_VIDEO_1</yt:videoId>"
+    f"<yt:channelId>{CHANNEL_ID}</yt:channelId></entry></feed>"
+)
+
+
+async def create_subscription(db: Session, user_id: str) -> models.Source:
+    source = await crud.source.create_source_from_url(
+        db=db, url=MOCKED_YOUTUBE_SOURCE_1["url"], user_id=user_id
+    )
+    await crud.websub_subscription.create(
+        db=db,
+        obj_in=models.WebSubSubscriptionCreate(
+            id=CHANNEL_ID,
+            source_id=source.id,
+            topic=get_topic_url(channel_id=CHANNEL_ID),
+            callback_url=get_callback_url(),
+            requested_mode="subscribe",
+            requested_at=datetime.datetime.utcnow(),
+        ),
+    )
+    return source
+
+
+async def test_verify_youtube_websub(
+    db: Session, client: TestClient, normal_user: models.User
+) -> None:
+    """
+    Test that the hub's verification challenge is echoed for a requested subscription.
+    """
+    params = {
+        "hub.mode": "subscribe",
+        "hub.topic": get_topic_url(channel_id=CHANNEL_ID),
+        "hub.challenge": "challenge_1",
+        "hub.lease_seconds": "432000",
+    }
+    response = client.get(f"{settings.API_V1_PREFIX}/websub/youtube", params=params)
+    assert response.status_code == 404
+
+    await create_subscription(db=db, user_id=normal_user.id)
+    response = client.get(f"{settings.API_V1_PREFIX}/websub/youtube", params=params)
+    assert response.status_code == 200
+    assert response.text == "challenge_1"
+
+    subscription = await crud.websub_subscription.get(db=db, id=CHANNEL_ID)
+    assert subscription.is_active
+
+    # The request was verified
+    response = client.get(f"{settings.API_V1_PREFIX}/websub/youtube", params=params)
+    assert response.status_code == 404
+
+
+async def test_youtube_websub_notification(
+    db: Session, client: TestClient, normal_user: models.User
+) -> None:
+    """
+    Test that a notification fetches the source in the background.
+    """
+    source = await create_subscription(db=db, user_id=normal_user.id)
+
+    signature = hmac.new(b"secret", NOTIFICATION.encode(), hashlib.sha1).hexdigest()
+
+    with (
+        patch("app.api.v1.endpoints.websub.fetch_source") as mocked_fetch_source,
+        patch("app.services.websub.settings.YOUTUBE_WEBSUB_SECRET", "secret"),
+    ):
+        response = client.post(
+            f"{settings.API_V1_PREFIX}/websub/youtube",
+            content=NOTIFICATION,
+            headers={"X-Hub-Signature": f"sha1={signature}"},
+        )
+        assert response.status_code == 204
+        mocked_fetch_source.assert_called_once()
+        assert mocked_fetch_source.call_args.kwargs["id"] == source.id
+
+        # Invalid signature is acknowledged but ignored
+        response = client.post(
+            f"{settings.API_V1_PREFIX}/websub/youtube",
+            content=NOTIFICATION,
+            headers={"X-Hub-Signature": "sha1=invalid"},
+        )
+        assert response.status_code == 204
+        mocked_fetch_source.assert_called_once()
+
+    subscription = await crud.websub_subscription.get(db=db, id=CHANNEL_ID)
+    assert subscription.last_notification_at is not None
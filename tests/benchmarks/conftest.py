@@ -0,0 +1,96 @@
+"""
+Benchmark timing against stored baselines.
+
+Baselines are stored per number of synthetic videos in `baselines.json`. A benchmark fails
+if it is slower than its baseline times the threshold. Run with:
+
+    pytest tests/benchmarks --benchmark [--benchmark-videos 100000] [--benchmark-save]
+"""
+
+from typing import Any
+
+import json
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+BASELINES_FILE = Path(__file__).parent / "baselines.json"
+
+# Results of this session, by number of videos and benchmark name
+results: dict[str, dict[str, float]] = {}
+
+
+def load_baselines() -> dict[str, Any]:
+    if not BASELINES_FILE.exists():
+        return {"threshold": 2.0, "baselines": {}}
+    baselines: dict[str, Any] = json.loads(BASELINES_FILE.read_text())
+    return baselines
+
+
+class Benchmark:
+    def __init__(self, videos: int, threshold: float, baselines: dict[str, float]) -> None:
+        self.videos = videos
+        self.threshold = threshold
+        self.baselines = baselines
+
+    @contextmanager
+    def __call__(self, name: str) -> Iterator[None]:
+        """
+        Time the block and fail if it regressed past the baseline.
+
+        Args:
+            name (str): The benchmark name.
+        """
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        results.setdefault(str(self.videos), {})[name] = round(elapsed, 4)
+
+        baseline = self.baselines.get(name)
+        if baseline is not None and elapsed > baseline * self.threshold:
+            pytest.fail(
+                f"Benchmark '{name}' regressed: {elapsed:.3f}s > {self.threshold}x "
+                f"baseline of {baseline:.3f}s ({self.videos} videos)"
+            )
+
+
+@pytest.fixture(name="benchmark_videos")
+def fixture_benchmark_videos(request: pytest.FixtureRequest) -> int:
+    videos: int = request.config.getoption("--benchmark-videos")
+    return videos
+
+
+@pytest.fixture(name="benchmark_ingest_videos")
+def fixture_benchmark_ingest_videos(request: pytest.FixtureRequest) -> int:
+    videos: int = request.config.getoption("--benchmark-ingest-videos")
+    return videos
+
+
+@pytest.fixture(name="benchmark")
+def fixture_benchmark(request: pytest.FixtureRequest, benchmark_videos: int) -> Benchmark:
+    stored = load_baselines()
+    threshold = request.config.getoption("--benchmark-threshold") or stored["threshold"]
+    return Benchmark(
+        videos=benchmark_videos,
+        threshold=threshold,
+        baselines=stored["baselines"].get(str(benchmark_videos), {}),
+    )
+
+
+def pytest_terminal_summary(terminalreporter: Any, config: pytest.Config) -> None:
+    if not results:
+        return
+    terminalreporter.section("benchmarks")
+    for videos, benchmarks in results.items():
+        for name, elapsed in benchmarks.items():
+            terminalreporter.write_line(f"{name:<50} {videos:>7} videos {elapsed:>9.3f}s")
+
+    if config.getoption("--benchmark-save"):
+        stored = load_baselines()
+        for videos, benchmarks in results.items():
+            stored["baselines"].setdefault(videos, {}).update(benchmarks)
+        BASELINES_FILE.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+        terminalreporter.write_line(f"Saved baselines to {BASELINES_FILE}")
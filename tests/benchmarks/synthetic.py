@@ -0,0 +1,118 @@
+"""
+Synthetic sources for the benchmarks, generated like the fake yt-dlp backend's channels.
+"""
+
+from typing import Any
+
+from sqlmodel import Session
+
+from app import models
+from app.core.uuid import generate_uuid_from_url
+from app.loadtest.fake_ytdlp import generate_source_info_dict
+from app.services.source import get_source_videos_from_source_info_dict
+
+
+def get_synthetic_channel_id(index: int) -> str:
+    return f"UCsyntheticchannel{index:06d}"
+
+
+def get_synthetic_source_id(index: int) -> str:
+    channel_id = get_synthetic_channel_id(index=index)
+    return generate_uuid_from_url(url=f"https://www.youtube.com/channel/{channel_id}")
+
+
+def generate_synthetic_source_info_dict(
+    source_id: str, videos: int, index: int = 0
+) -> dict[str, Any]:
+    """
+    Generate the source_info_dict of the synthetic source with the given index.
+    """
+    return generate_source_info_dict(
+        source_id=source_id,
+        videos=videos,
+        seed=index,
+        channel_id=get_synthetic_channel_id(index=index),
+    )
+
+
+def create_synthetic_source(
+    db: Session, user_id: str, videos: int, index: int = 0
+) -> models.Source:
+    """
+    Bulk insert a synthetic source and its videos.
+
+    Args:
+        db (Session): The database session.
+        user_id (str): The id of the user creating the source.
+        videos (int): The number of videos.
+        index (int): The index of the source, to create several distinct sources.
+
+    Returns:
+        models.Source: The source.
+    """
+    source_id = get_synthetic_source_id(index=index)
+    source_info_dict = generate_synthetic_source_info_dict(
+        source_id=source_id, videos=videos, index=index
+    )
+    source = models.Source(
+        id=source_id,
+        created_by=user_id,
+        url=source_info_dict["url"],
+        name=source_info_dict["title"],
+        author=source_info_dict["uploader"],
+        logo=source_info_dict["thumbnail"],
+        description=source_info_dict["description"],
+        ordered_by=models.SourceOrderBy.RELEASED_AT.value,
+        extractor=source_info_dict["extractor_key"],
+        handler="YoutubeHandler",
+        service="youtube",
+    )
+    videos_ = []
+    for video in get_source_videos_from_source_info_dict(source_info_dict=source_info_dict):
+        video_ = models.Video(**video.dict())
+        video_.set_description(description=video.description)
+        videos_.append(video_)
+    db.add(source)
+    db.add_all(videos_)
+    source.videos = videos_
+    db.commit()
+    db.refresh(source)
+    return source
+
+
+RUMBLE_CHANNEL_VIDEO_HTML = """
+			<div class="videostream thumbnail__grid--item" data-video-id="{index}">
+				<div class="videostream__footer">
+					<a class="videostream__link link" draggable="false" href="/v{index}-video.html?e9s=src_v1_cbl"></a>
+				</div>
+				<div class="thumbnail__thumb">
+					<img class="thumbnail__image" draggable="false" src="https://1a-1791.com/video/{index}.jpg" alt="Video {index}">
+					<div class="videostream__badge videostream__status videostream__status--duration"
+			>
+				{minutes}:{seconds:02d}			</div>
+				</div>
+				<div class="thumbnail__title-wrapper">
+					<h3 class="thumbnail__title clamp-2">
+						Video {index} &amp; More
+					</h3>
+				</div>
+				<div class="videostream__data">
+					<time class="videostream__data--subitem videostream__time" datetime="2023-06-30T14:05:11-04:00">Jun 30, 2023</time>
+					<span class="videostream__data--item videostream__comments">{index}</span>
+				</div>
+			</div>"""  # noqa: E501
+
+
+def generate_rumble_channel_page(videos: int) -> str:
+    """
+    Generate a Rumble channel page listing the given number of videos.
+    """
+    items = "".join(
+        RUMBLE_CHANNEL_VIDEO_HTML.format(index=index, minutes=index % 90, seconds=index % 60)
+        for index in range(videos)
+    )
+    return (
+        "<html><head><link rel=canonical href=https://rumble.com/c/synthetic></head><body>"
+        '<div class="channel-header--title"><h1>synthetic</h1></div>'
+        f'<ol class="thumbnail__grid">{items}</ol></body></html>'
+    )
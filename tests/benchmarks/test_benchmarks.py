@@ -0,0 +1,177 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from fastapi import Response
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud, models
+from app.handlers import get_handler_from_url
+from app.handlers.extractors.rumble_channel_parser import parse_rumble_channel_page
+from app.loadtest.fake_ytdlp import generate_source_info_dict
+from app.services.feed import SourceFeedGenerator, build_rss_file
+from app.services.source import (
+    add_new_source_info_dict_videos_to_source,
+    get_source_video_entries_from_source_info_dict,
+    get_source_videos_from_source_info_dict,
+)
+from tests.benchmarks.conftest import Benchmark
+from tests.benchmarks.synthetic import create_synthetic_source, generate_rumble_channel_page
+
+pytestmark = pytest.mark.benchmark
+
+ENDPOINT_REQUESTS = 50
+
+
+@pytest.fixture(name="synthetic_source")
+async def fixture_synthetic_source(
+    db: Session, normal_user: models.User, benchmark_videos: int
+) -> models.Source:
+    return create_synthetic_source(db=db, user_id=normal_user.id, videos=benchmark_videos)
+
+
+@pytest.fixture(name="synthetic_filter")
+async def fixture_synthetic_filter(
+    db: Session, normal_user: models.User, synthetic_source: models.Source
+) -> models.Filter:
+    db_filter = await crud.filter.create(
+        db,
+        obj_in=models.FilterCreate(
+            name="benchmark",
+            source_id=synthetic_source.id,
+            created_by=normal_user.id,
+            ordered_by=models.SourceOrderBy.RELEASED_AT.value,
+        ),
+    )
+    for field, operator, value, unit_of_measure in (
+        ("keyword", "must_contain", "news", "keyword"),
+        ("keyword", "must_not_contain", "clip", "keyword"),
+        ("duration", "longer_than", 10, "minutes"),
+        ("released", "within", 3650, "days"),
+    ):
+        await crud.criteria.create(
+            db,
+            obj_in=models.CriteriaCreate(
+                filter_id=db_filter.id,
+                created_by=normal_user.id,
+                field=field,
+                operator=operator,
+                value=value,
+                unit_of_measure=unit_of_measure,
+            ),
+        )
+    db.refresh(db_filter)
+    return db_filter
+
+
+def test_get_source_videos_from_source_info_dict(
+    benchmark: Benchmark, benchmark_videos: int
+) -> None:
+    source_info_dict = generate_source_info_dict(source_id="synthetic", videos=benchmark_videos)
+    with benchmark("get_source_videos_from_source_info_dict"):
+        videos = get_source_videos_from_source_info_dict(source_info_dict=source_info_dict)
+    assert len(videos) == benchmark_videos
+
+
+def test_get_source_video_entries_from_source_info_dict(
+    benchmark: Benchmark, benchmark_videos: int
+) -> None:
+    source_info_dict = generate_source_info_dict(source_id="synthetic", videos=benchmark_videos)
+    with benchmark("get_source_video_entries_from_source_info_dict"):
+        video_entries = get_source_video_entries_from_source_info_dict(
+            source_info_dict=source_info_dict
+        )
+    assert len(video_entries) == benchmark_videos
+
+
+def test_parse_rumble_channel_page(benchmark: Benchmark, benchmark_videos: int) -> None:
+    webpage = generate_rumble_channel_page(videos=benchmark_videos)
+    with benchmark("parse_rumble_channel_page"):
+        page = parse_rumble_channel_page(webpage=webpage, url="https://rumble.com/c/synthetic")
+    assert len(page.videos) == benchmark_videos
+
+
+def test_get_handler_from_url(benchmark: Benchmark, benchmark_videos: int) -> None:
+    urls = [f"https://www.youtube.com/watch?v={index:011d}" for index in range(benchmark_videos)]
+    with benchmark("get_handler_from_url_x3"):
+        for _ in range(3):
+            handlers = [get_handler_from_url(url=url) for url in urls]
+    assert len(set(handlers)) == 1
+
+
+async def test_add_new_source_info_dict_videos_to_source(
+    db: Session, normal_user: models.User, benchmark: Benchmark, benchmark_ingest_videos: int
+) -> None:
+    db_source = create_synthetic_source(db=db, user_id=normal_user.id, videos=0)
+    source_info_dict = generate_source_info_dict(
+        source_id=db_source.id, videos=benchmark_ingest_videos
+    )
+    with benchmark(f"add_new_source_info_dict_videos_to_source_x{benchmark_ingest_videos}"):
+        new_videos = await add_new_source_info_dict_videos_to_source(
+            source_info_dict=source_info_dict, db_source=db_source, db=db
+        )
+    assert len(new_videos) == benchmark_ingest_videos
+
+
+def test_filter_videos(db: Session, synthetic_filter: models.Filter, benchmark: Benchmark) -> None:
+    db.expire_all()
+    with benchmark("filter_videos"):
+        videos = synthetic_filter.videos()
+    assert 0 < len(videos) < len(synthetic_filter.source.videos)
+
+
+async def test_video_search(
+    db: Session, synthetic_source: models.Source, benchmark: Benchmark
+) -> None:
+    with benchmark(f"video_search_x{ENDPOINT_REQUESTS}"):
+        for _ in range(ENDPOINT_REQUESTS):
+            videos = await crud.video.search(db=db, query='news "live stream"', limit=20)
+    assert videos
+
+
+async def test_get_refresh_candidates(
+    db: Session, synthetic_source: models.Source, benchmark: Benchmark
+) -> None:
+    db.expire_all()
+    with benchmark(f"get_refresh_candidates_x{ENDPOINT_REQUESTS}"):
+        for _ in range(ENDPOINT_REQUESTS):
+            videos = await crud.video.get_refresh_candidates(db=db, limit=100)
+    assert videos
+
+
+async def test_source_feed_generator(
+    db: Session, synthetic_source: models.Source, benchmark: Benchmark
+) -> None:
+    db.expire_all()
+    with benchmark("source_feed_generator"):
+        await SourceFeedGenerator(source=synthetic_source).save()
+
+
+async def test_feed_endpoint(
+    client: TestClient, synthetic_source: models.Source, benchmark: Benchmark
+) -> None:
+    await build_rss_file(source=synthetic_source)
+    with benchmark(f"feed_endpoint_x{ENDPOINT_REQUESTS}"):
+        for _ in range(ENDPOINT_REQUESTS):
+            response = client.get(f"/source/{synthetic_source.id}/feed")
+            assert response.status_code == 200
+
+
+async def test_media_endpoint(
+    db: Session, client: TestClient, synthetic_source: models.Source, benchmark: Benchmark
+) -> None:
+    videos = synthetic_source.videos[:ENDPOINT_REQUESTS]
+    for video in videos:
+        video.media_url = f"https://media.example.com/{video.id}.mp4"
+        video.updated_at = datetime.utcnow()
+    db.commit()
+
+    # The reverse proxy is replaced so the benchmark stays offline
+    with (
+        patch("app.services.media.reverse_proxy", return_value=Response(status_code=200)),
+        benchmark(f"media_endpoint_x{ENDPOINT_REQUESTS}"),
+    ):
+        for video in videos:
+            response = client.get(f"/media/{video.id}")
+            assert response.status_code == 200
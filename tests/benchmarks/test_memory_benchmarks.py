@@ -0,0 +1,85 @@
+"""
+Memory benchmarks, checking that peak memory does not grow with the size of the library.
+"""
+
+from typing import Any
+
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import Session
+
+from app import models
+from app.core.uuid import generate_uuid_from_url
+from app.services.fetch import fetch_all_sources
+from tests.benchmarks.synthetic import (
+    create_synthetic_source,
+    generate_synthetic_source_info_dict,
+    get_synthetic_source_id,
+)
+
+pytestmark = pytest.mark.benchmark
+
+VIDEOS_PER_SOURCE = 300
+
+SMALL_LIBRARY_SOURCES = 2
+LARGE_LIBRARY_SOURCES = 12
+
+# Peak memory of a fetch cycle may grow by this factor from the small to the large library
+MAX_PEAK_MEMORY_GROWTH = 1.25
+
+source_indexes = {
+    get_synthetic_source_id(index=index): index for index in range(LARGE_LIBRARY_SOURCES)
+}
+
+
+async def get_fetch_all_sources_peak_memory(db: Session) -> int:
+    """
+    Measure the peak memory of a fetch cycle of all sources.
+    """
+
+    async def get_source_info_dict(source_id: str, **kwargs: Any) -> dict[str, Any]:
+        return generate_synthetic_source_info_dict(
+            source_id=source_id, videos=VIDEOS_PER_SOURCE, index=source_indexes[source_id]
+        )
+
+    # Most sources of a cycle are unchanged, and only have their feeds rebuilt
+    async def source_has_changes(self: Any, url: str, known_video_urls: list[str]) -> bool:
+        return source_indexes[generate_uuid_from_url(url=url)] % 2 == 0
+
+    db.expunge_all()
+    with (
+        patch("app.services.fetch.get_source_info_dict", get_source_info_dict),
+        patch("app.handlers.youtube.YoutubeHandler.source_has_changes", source_has_changes),
+        # The fetch history's commits would expire the loaded objects and hide any growth
+        patch("app.services.fetch.settings.FETCH_HISTORY_ENABLED", False),
+    ):
+        tracemalloc.start()
+        try:
+            await fetch_all_sources(db=db)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return peak
+
+
+async def test_fetch_all_sources_peak_memory(db: Session, normal_user: models.User) -> None:
+    """
+    Test that the peak memory of `fetch_all_sources` is flat in the number of sources.
+    """
+    user_id = normal_user.id
+    for index in range(SMALL_LIBRARY_SOURCES):
+        create_synthetic_source(db=db, user_id=user_id, videos=VIDEOS_PER_SOURCE, index=index)
+    peak_small = await get_fetch_all_sources_peak_memory(db=db)
+
+    for index in range(SMALL_LIBRARY_SOURCES, LARGE_LIBRARY_SOURCES):
+        create_synthetic_source(db=db, user_id=user_id, videos=VIDEOS_PER_SOURCE, index=index)
+    peak_large = await get_fetch_all_sources_peak_memory(db=db)
+
+    print(
+        f"fetch_all_sources peak memory: {peak_small / 2**20:.1f}MB "
+        f"({SMALL_LIBRARY_SOURCES} sources), {peak_large / 2**20:.1f}MB "
+        f"({LARGE_LIBRARY_SOURCES} sources)"
+    )
+    assert peak_large < peak_small * MAX_PEAK_MEMORY_GROWTH
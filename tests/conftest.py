@@ -1,5 +1,6 @@
 from typing import Any
 
+from collections import OrderedDict
 from collections.abc import AsyncGenerator, Generator
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -9,8 +10,10 @@ import sqlalchemy as sa
 from fastapi import Request, Response
 from fastapi.testclient import TestClient
 from httpx import Cookies
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import crud, models, settings
 from app.api import deps as api_deps
@@ -58,6 +61,65 @@ def do_begin(conn: Any) -> None:
     conn.exec_driver_sql("BEGIN")
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--db-backend",
+        choices=["sync", "async"],
+        default="sync",
+        help="Run the tests with a Session, or with an aiosqlite AsyncSession.",
+    )
+
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark", action="store_true", help="Run the benchmarks in tests/benchmarks."
+    )
+    group.addoption(
+        "--benchmark-videos",
+        type=int,
+        default=10_000,
+        help="Number of synthetic videos per benchmark source.",
+    )
+    group.addoption(
+        "--benchmark-ingest-videos",
+        type=int,
+        default=1_000,
+        help="Number of synthetic videos inserted by the ingestion benchmark.",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=None,
+        help="Fail benchmarks slower than the baseline times this factor.",
+    )
+    group.addoption(
+        "--benchmark-save", action="store_true", help="Save the results as the new baselines."
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "benchmark: performance benchmark, run with --benchmark")
+    config.addinivalue_line(
+        "markers",
+        "sync_db: lazy loads relationships, or uses services that need a Session. Skipped with"
+        " --db-backend async",
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if config.getoption("--db-backend") == "async":
+        skip_sync_db = pytest.mark.skip(reason="needs a Session, not an AsyncSession")
+        for item in items:
+            if "sync_db" in item.keywords:
+                item.add_marker(skip_sync_db)
+
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmarks only run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 @pytest.fixture(name="init")
 def fixture_init(mocker: MagicMock, tmp_path: Path) -> None:  # pylint: disable=unused-argument
     mocker.patch("app.paths.FEEDS_PATH", return_value=tmp_path)
@@ -65,12 +127,91 @@ def fixture_init(mocker: MagicMock, tmp_path: Path) -> None:  # pylint: disable=
     mocker.patch("app.services.feed.build_source_rss_files", None)
     mocker.patch("app.services.source.is_invalid_image", return_value=False)
     mocker.patch("app.handlers.rumble.is_invalid_image", return_value=False)
+    mocker.patch("app.handlers.youtube.settings.YOUTUBE_FEED_PROBE_ENABLED", False)
+
+
+@pytest.fixture(autouse=True)
+def disable_rate_limit() -> Generator[None, None, None]:
+    with patch("app.services.rate_limit.settings.RATE_LIMIT_ENABLED", False):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def notification_outbox(tmp_path: Path) -> Generator[None, None, None]:
+    with (
+        patch("app.core.outbox.outbox.path", tmp_path / "notify_outbox.jsonl"),
+        patch("app.core.outbox.outbox.pending", []),
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def youtube_handle_cache(tmp_path: Path) -> Generator[None, None, None]:
+    with (
+        patch("app.services.youtube_handles.handle_cache.path", tmp_path / "youtube_handles.json"),
+        patch("app.services.youtube_handles.handle_cache._resolutions", {}),
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def fragment_cache() -> Generator[None, None, None]:
+    with (
+        patch("app.services.fragment_cache.fragment_cache._fragments", OrderedDict()),
+        patch("app.services.fragment_cache.fragment_cache._generations", {}),
+    ):
+        yield
 
 
 @pytest.fixture(name="db")
 async def fixture_db(
-    init: Any, tmp_path: Path, mocker: MagicMock  # pylint: disable=unused-argument
-) -> AsyncGenerator[Session, None]:
+    request: pytest.FixtureRequest,
+    init: Any,  # pylint: disable=unused-argument
+    tmp_path: Path,
+    mocker: MagicMock,
+) -> AsyncGenerator[Session | AsyncSession, None]:
+    mocker.patch("app.services.feed.FEEDS_PATH", tmp_path)
+    with (
+        patch(
+            "app.services.source.get_info_dict",
+            get_mocked_source_info_dict,
+        ),
+        patch(
+            "app.services.video.get_info_dict",
+            get_mocked_video_info_dict,
+        ),
+    ):
+        if request.config.getoption("--db-backend") == "async":
+            async for async_session in _get_async_db(tmp_path=tmp_path):
+                yield async_session
+        else:
+            async for session in _get_db():
+                yield session
+
+
+async def _get_async_db(tmp_path: Path) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Yield an AsyncSession on a new sqlite database file, which is deleted with `tmp_path`.
+    """
+    database_file = tmp_path / "database.sqlite3"
+    sync_engine = create_engine(f"sqlite:///{database_file}")
+    SQLModel.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_file}")
+    session = AsyncSession(bind=async_engine, autoflush=False, expire_on_commit=False)
+    await init_initial_data(db=session)
+
+    yield session
+
+    await session.close()
+    await async_engine.dispose()
+
+
+async def _get_db() -> AsyncGenerator[Session, None]:
+    """
+    Yield a Session on the in-memory database, in a transaction rolled back after the test.
+    """
     connection = engine.connect()
     transaction = connection.begin()
     session = TestingSessionLocal(bind=connection)
@@ -89,18 +230,7 @@ async def fixture_db(
         if not nested.is_active:
             nested = connection.begin_nested()
 
-    mocker.patch("app.services.feed.FEEDS_PATH", tmp_path)
-    with (
-        patch(
-            "app.services.source.get_info_dict",
-            get_mocked_source_info_dict,
-        ),
-        patch(
-            "app.services.video.get_info_dict",
-            get_mocked_video_info_dict,
-        ),
-    ):
-        yield session
+    yield session
 
     # Rollback the overall transaction, restoring the state before the test ran.
     session.close()
@@ -108,19 +238,50 @@ async def fixture_db(
     connection.close()
 
 
+@pytest.fixture(name="sync_session")
+def fixture_sync_session(db: Session | AsyncSession) -> Generator[Session, None, None]:
+    """
+    Fixture for the services that need a Session. With the async backend, it is a Session on
+    the database file of the AsyncSession, otherwise it is the `db` Session.
+    """
+    if not isinstance(db, AsyncSession):
+        yield db
+        return
+
+    sync_engine = create_engine(
+        db.bind.url.set(drivername="sqlite"), connect_args={"check_same_thread": False}
+    )
+    sync_session = Session(bind=sync_engine, autoflush=False)
+    yield sync_session
+    sync_session.close()
+    sync_engine.dispose()
+
+
 @pytest.fixture(name="client")
-async def fixture_client(db: Session) -> AsyncGenerator[TestClient, None]:
+async def fixture_client(
+    db: Session | AsyncSession, sync_session: Session
+) -> AsyncGenerator[TestClient, None]:
     """
     Fixture that creates a test client with the database session override.
+
+    With the async backend, the routes that depend on `get_db` get the AsyncSession, and the
+    routes that depend on `get_sync_db` get a Session on the same database file.
     """
 
-    def override_get_db() -> Generator[Session, None, None]:
+    async def override_get_db() -> AsyncGenerator[Session | AsyncSession, None]:
         yield db
 
+    def override_get_sync_db() -> Generator[Session, None, None]:
+        yield sync_session
+
     app.dependency_overrides[api_deps.get_db] = override_get_db
-    app.dependency_overrides[views_deps.get_db] = override_get_db
+    app.dependency_overrides[api_deps.get_sync_db] = override_get_sync_db
+    app.dependency_overrides[api_deps.get_async_db] = override_get_db
+    app.dependency_overrides[views_deps.get_db] = override_get_sync_db
     yield TestClient(app)
     del app.dependency_overrides[api_deps.get_db]
+    del app.dependency_overrides[api_deps.get_sync_db]
+    del app.dependency_overrides[api_deps.get_async_db]
     del app.dependency_overrides[views_deps.get_db]
 
 
@@ -244,8 +405,7 @@ async def fixture_source_1_w_videos(
     # Create fetched_source
     await fetch_source(db=db, id=source_1.id)
 
-    fetched_source = await crud.source.get(db=db, id=source_1.id)
-    assert len(fetched_source.videos) == 2
+    assert len(await crud.source.get_video_ids(db=db, source_id=source_1.id)) == 2
 
     return source_1
 
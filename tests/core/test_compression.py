@@ -0,0 +1,16 @@
+import pytest
+
+from app.core.compression import Compression, compress_text, decompress_text
+
+
+@pytest.mark.parametrize("compression", list(Compression))
+def test_compress_text(compression: Compression) -> None:
+    """
+    Test that a compressed text decompresses to the original text.
+    """
+    text = "Check out my links! https://example.com/ 🎉\n" * 50
+
+    data = compress_text(text=text, compression=compression)
+    assert decompress_text(data=data, compression=compression) == text
+    if compression != Compression.NONE:
+        assert len(data) < len(text.encode("utf8")) / 10
@@ -1,13 +1,16 @@
 import os
+import sqlite3
+from datetime import datetime, timedelta
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import patch
 
 import pytest
 from sqlmodel import Session, SQLModel
 
 from app import paths
-from app.db.backup import backup_database
+from app.db.backup import backup_database, get_backup_datetime, prune_backups, restore_backup
 from app.db.init_db import create_all
+from app.db.maintenance import compact_database
 
 
 async def test_create_all(tmpdir: str, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -35,32 +38,123 @@ async def test_create_all(tmpdir: str, monkeypatch: pytest.MonkeyPatch) -> None:
     assert "fake_table" not in tables
 
 
-@pytest.fixture()
-def mocked_shutil_copy(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
-    mocked_copy = MagicMock()
+@pytest.fixture(name="database_file")
+def fixture_database_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """
+    Fixture that creates a database file with some rows, and the backup directory.
+    """
+    database_file = tmp_path / "database.sqlite3"
+    with sqlite3.connect(database_file) as connection:
+        connection.execute("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT)")
+        connection.executemany(
+            "INSERT INTO item (name) VALUES (?)", [(f"item {i}" * 20,) for i in range(2000)]
+        )
+    monkeypatch.setattr("app.paths.DATABASE_FILE", database_file)
+    monkeypatch.setattr("app.paths.DB_BACKUP_PATH", tmp_path / "db_backup")
+    return database_file
 
-    def mock_copy(src: str, dst: str) -> None:
-        # Instead of copying files, we'll just create empty files to simulate the copy operation
-        open(dst, "w").close()
-        mocked_copy(src=src, dst=dst)
 
-    monkeypatch.setattr("shutil.copy", mock_copy)
-    return mocked_copy
+def get_rows(database_file: Path) -> list[tuple[int, str]]:
+    with sqlite3.connect(database_file) as connection:
+        return connection.execute("SELECT id, name FROM item ORDER BY id").fetchall()
 
 
-async def test_backup_database(db: Session, tmpdir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_backup_database(db: Session, database_file: Path, tmp_path: Path) -> None:
     """
-    Test that the function creates a backup of the database.
+    Test that the function creates a compressed backup of the database.
     """
-
-    # Patch the database backup path,
-    monkeypatch.setattr("app.paths.DB_BACKUP_PATH", tmpdir)
-
-    # Call the function
     db_backup_file = await backup_database(db=db)
 
-    # Check that the backup file exists
     assert db_backup_file.exists() is True
+    assert db_backup_file.name.endswith(".sqlite3.zst")
+    assert db_backup_file.stat().st_size < database_file.stat().st_size
+
+    restored_file = tmp_path / "restored.sqlite3"
+    restore_backup(db_backup_file=db_backup_file, dst=restored_file)
+    assert get_rows(restored_file) == get_rows(database_file)
+
+
+async def test_backup_database_incremental(
+    db: Session, database_file: Path, tmp_path: Path
+) -> None:
+    """
+    Test that incremental backups only store the blocks that changed.
+    """
+    with patch("app.db.backup.settings.DB_BACKUP_INCREMENTAL", True):
+        first_backup = await backup_database(db=db)
+        blocks_path = first_backup.parent / "blocks"
+        first_blocks = set(blocks_path.iterdir())
+
+        with sqlite3.connect(database_file) as connection:
+            connection.execute("UPDATE item SET name = 'changed' WHERE id = 1")
+
+        with patch("app.db.backup.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime.now() + timedelta(hours=1)
+            mock_datetime.strptime = datetime.strptime
+            second_backup = await backup_database(db=db)
+
+    assert first_backup.name.endswith(".manifest.json")
+    new_blocks = set(blocks_path.iterdir()) - first_blocks
+    assert 0 < len(new_blocks) < len(first_blocks)
+
+    restored_file = tmp_path / "restored.sqlite3"
+    restore_backup(db_backup_file=second_backup, dst=restored_file)
+    assert get_rows(restored_file)[0] == (1, "changed")
+    assert get_rows(restored_file) == get_rows(database_file)
+
+
+def test_prune_backups(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that backups are pruned by the hourly/daily/weekly retention policy.
+    """
+    monkeypatch.setattr("app.paths.DB_BACKUP_PATH", tmp_path)
+    monkeypatch.setattr("app.db.backup.settings.DB_BACKUP_KEEP_HOURLY", 2)
+    monkeypatch.setattr("app.db.backup.settings.DB_BACKUP_KEEP_DAILY", 2)
+    monkeypatch.setattr("app.db.backup.settings.DB_BACKUP_KEEP_WEEKLY", 2)
+
+    now = datetime(2023, 6, 15, 12, 40)
+    backup_datetimes = [
+        now,
+        now - timedelta(minutes=30),  # Same hour as newest
+        now - timedelta(hours=1),  # Hourly
+        now - timedelta(hours=2),  # Not kept
+        now - timedelta(days=1),  # Daily
+        now - timedelta(days=2),  # Not kept
+        now - timedelta(days=8),  # Weekly
+        now - timedelta(days=15),  # Not kept
+    ]
+    for backup_datetime in backup_datetimes:
+        (tmp_path / f"database - {backup_datetime:%Y-%m-%d - %H-%M-%S} - 5.sqlite3.zst").touch()
+    legacy_backup = tmp_path / "database - 01-01-22 - 10-00-00 - 5.sqlite3"
+    legacy_backup.touch()
+    other_file = tmp_path / "notes.txt"
+    other_file.touch()
+
+    deleted_backups = prune_backups()
+
+    deleted_datetimes = {get_backup_datetime(db_backup_file=backup) for backup in deleted_backups}
+    assert deleted_datetimes == {
+        now - timedelta(minutes=30),
+        now - timedelta(hours=2),
+        now - timedelta(days=2),
+        now - timedelta(days=15),
+        datetime(2022, 1, 1, 10, 0),
+    }
+    assert other_file.exists()
+    assert len(list(tmp_path.glob("database - *"))) == 4
+
+
+async def test_compact_database(database_file: Path) -> None:
+    """
+    Test that the database is only vacuumed once enough of its pages are free.
+    """
+    assert await compact_database() is False
+    size = database_file.stat().st_size
+
+    with sqlite3.connect(database_file) as connection:
+        connection.execute("DELETE FROM item WHERE id > 100")
+    assert database_file.stat().st_size == size
 
-    # Delete the backup file
-    os.remove(db_backup_file)
+    assert await compact_database() is True
+    assert database_file.stat().st_size < size / 2
+    assert len(get_rows(database_file)) == 100
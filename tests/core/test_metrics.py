@@ -0,0 +1,104 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import settings
+from app.core import metrics
+from app.core.proxy import count_streamed_bytes
+from app.services.fetch import FetchCanceledError, fetch_source
+
+
+def test_histogram_observe() -> None:
+    """
+    Test that observations are counted in every bucket they fit and in the sum.
+    """
+    count = metrics.FEED_BUILD_DURATION.get_count(kind="test")
+    metrics.FEED_BUILD_DURATION.observe(0.02, kind="test")
+    metrics.FEED_BUILD_DURATION.observe(7, kind="test")
+    with metrics.FEED_BUILD_DURATION.time(kind="test"):
+        pass
+
+    assert metrics.FEED_BUILD_DURATION.get_count(kind="test") == count + 3
+    assert metrics.FEED_BUILD_DURATION.get_sum(kind="test") >= 7.02
+    rendered = metrics.FEED_BUILD_DURATION.render()
+    assert 'tubecast_feed_build_duration_seconds_bucket{kind="test",le="0.01"}' in rendered
+    assert 'tubecast_feed_build_duration_seconds_bucket{kind="test",le="+Inf"} 3' in rendered
+    assert 'tubecast_feed_build_duration_seconds_count{kind="test"} 3' in rendered
+
+    with pytest.raises(ValueError):
+        metrics.FEED_BUILD_DURATION.observe(1, handler="test")
+
+
+def test_format_labels() -> None:
+    assert metrics.format_labels(("error",), ('a "b"\n',)) == '{error="a \\"b\\"\\n"}'
+    assert metrics.format_labels((), ()) == ""
+
+
+def test_metrics_endpoint(client: TestClient) -> None:
+    """
+    Test that the metrics are exposed in the Prometheus text format.
+    """
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE tubecast_fetch_source_duration_seconds histogram" in response.text
+    assert "# TYPE tubecast_proxy_active_streams gauge" in response.text
+
+    with patch("app.core.app.settings.METRICS_ENABLED", False):
+        assert client.get("/metrics").status_code == 404
+
+
+def test_db_queries_per_request(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    """
+    Test that the database queries of each request are counted by endpoint.
+    """
+    count = metrics.DB_QUERIES_PER_REQUEST.get_count(endpoint="get_users")
+    queries = metrics.DB_QUERIES_PER_REQUEST.get_sum(endpoint="get_users")
+
+    response = client.get(f"{settings.API_V1_PREFIX}/user/", headers=superuser_token_headers)
+    assert response.status_code == 200
+    assert metrics.DB_QUERIES_PER_REQUEST.get_count(endpoint="get_users") == count + 1
+    assert metrics.DB_QUERIES_PER_REQUEST.get_sum(endpoint="get_users") > queries
+
+
+async def test_fetch_source_duration_by_outcome() -> None:
+    """
+    Test that fetch_source records its duration by handler and outcome.
+    """
+    db_source = MagicMock(id="source_id", handler="YoutubeHandler")
+    count = metrics.FETCH_SOURCE_DURATION.get_count(handler="YoutubeHandler", outcome="canceled")
+    with (
+        patch("app.services.fetch.crud.source.get", new_callable=AsyncMock) as mock_get,
+        patch("app.services.fetch._fetch_db_source", new_callable=AsyncMock) as mock_fetch,
+    ):
+        mock_get.return_value = db_source
+        mock_fetch.side_effect = FetchCanceledError("canceled")
+        with pytest.raises(FetchCanceledError):
+            await fetch_source(id="source_id", db=MagicMock())
+
+    assert (
+        metrics.FETCH_SOURCE_DURATION.get_count(handler="YoutubeHandler", outcome="canceled")
+        == count + 1
+    )
+
+
+async def test_count_streamed_bytes() -> None:
+    """
+    Test that the reverse proxy stream counts its bytes and active streams.
+    """
+
+    async def stream():  # type: ignore
+        yield b"12345"
+        assert metrics.PROXY_ACTIVE_STREAMS.get() == active + 1
+        yield b"678"
+
+    active = metrics.PROXY_ACTIVE_STREAMS.get()
+    streamed_bytes = metrics.PROXY_BYTES.get()
+    chunks = [chunk async for chunk in count_streamed_bytes(stream=stream())]
+
+    assert chunks == [b"12345", b"678"]
+    assert metrics.PROXY_BYTES.get() == streamed_bytes + 8
+    assert metrics.PROXY_ACTIVE_STREAMS.get() == active
@@ -0,0 +1,115 @@
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core import notify
+from app.core.outbox import (
+    NotificationOutbox,
+    OutboxMessage,
+    build_digest,
+    get_message_group,
+    outbox,
+    queue_notification,
+)
+
+
+@pytest.fixture(name="telegram_enabled")
+def fixture_telegram_enabled() -> Generator[None, None, None]:
+    with patch("app.core.outbox.settings.NOTIFY_TELEGRAM_ENABLED", True):
+        yield
+
+
+async def test_queue_notification_is_persisted(telegram_enabled: None) -> None:
+    """
+    Test that queueing a notification does not send it and persists it to the backlog.
+    """
+    with patch("app.core.outbox.send_telegram_message") as mock_telegram:
+        await queue_notification(text="Http404Error: \nsource 1", email=False)
+    assert not mock_telegram.called
+
+    reloaded = NotificationOutbox(path=outbox.path)
+    assert [message.text for message in reloaded.pending] == ["Http404Error: \nsource 1"]
+    assert reloaded.pending[0].group == "Http404Error"
+
+
+@patch("app.core.outbox.settings.NOTIFY_OUTBOX_ENABLED", False)
+async def test_queue_notification_outbox_disabled() -> None:
+    """
+    Test that notifications are sent immediately when the outbox is disabled.
+    """
+    with patch("app.core.outbox.notify") as mock_notify:
+        await queue_notification(text="test", telegram=True, email=False)
+    mock_notify.assert_called_once_with(text="test", telegram=True, email=False)
+    assert outbox.pending == []
+
+
+def test_build_digest() -> None:
+    """
+    Test that repeated groups are collapsed into one digest entry.
+    """
+    messages = [
+        OutboxMessage(channel="telegram", text=f"Http404Error: source {i}", group="Http404Error")
+        for i in range(3)
+    ] + [OutboxMessage(channel="telegram", text="Started.", group="Started.")]
+
+    digest = build_digest(messages=messages)
+    assert "4 notifications" in digest
+    assert "[3x] Http404Error: source 0" in digest
+    assert "source 1" not in digest
+    assert "Started." in digest
+    assert build_digest(messages=messages[:1]) == "Http404Error: source 0"
+    assert get_message_group(text="yt-dlp could not extract info: e") == (
+        "yt-dlp could not extract info"
+    )
+
+
+async def test_flush_rate_limits_channels(telegram_enabled: None) -> None:
+    """
+    Test that a flush sends one digest per channel and respects the channel's rate limit.
+    """
+    for i in range(3):
+        await queue_notification(text=f"Error: {i}", email=False)
+
+    with patch("app.core.outbox.send_telegram_message", new_callable=AsyncMock) as mock_telegram:
+        assert await outbox.flush() == 3
+        assert mock_telegram.call_count == 1
+        assert "[3x] Error: 0" in mock_telegram.call_args.kwargs["text"]
+
+        await queue_notification(text="Error: 4", email=False)
+        assert await outbox.flush() == 0
+        assert mock_telegram.call_count == 1
+
+        assert await outbox.flush(force=True) == 1
+        assert mock_telegram.call_count == 2
+
+    assert NotificationOutbox(path=outbox.path).pending == []
+
+
+async def test_flush_keeps_failed_messages(telegram_enabled: None) -> None:
+    """
+    Test that messages stay in the backlog when sending fails.
+    """
+    await queue_notification(text="Error: 1", email=False)
+    with patch("app.core.outbox.send_telegram_message", new_callable=AsyncMock) as mock_telegram:
+        mock_telegram.side_effect = ValueError("chat not initialized")
+        assert await outbox.flush(force=True) == 0
+    assert len(NotificationOutbox(path=outbox.path).pending) == 1
+
+
+def test_outbox_skips_invalid_lines(tmp_path: Path) -> None:
+    path = tmp_path / "outbox.jsonl"
+    path.write_text('not json\n{"channel": "email", "text": "t", "group": "t"}\n')
+    assert [message.channel for message in NotificationOutbox(path=path).pending] == ["email"]
+
+
+def test_clients_are_reused() -> None:
+    """
+    Test that the Telegram Bot and SMTP backend are created once.
+    """
+    assert notify.get_telegram_bot(token="123:abc") is notify.get_telegram_bot(token="123:abc")
+    smtp_options = {"host": "localhost", "port": 25}
+    assert notify.get_smtp_backend(smtp_options=smtp_options) is notify.get_smtp_backend(
+        smtp_options=dict(smtp_options)
+    )
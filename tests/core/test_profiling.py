@@ -0,0 +1,84 @@
+import time
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.core import profiling
+
+
+@pytest.fixture(name="profiles_path")
+def fixture_profiles_path(tmp_path: Path) -> Generator[Path, None, None]:
+    profiles_path = tmp_path / "profiles"
+    with (
+        patch("app.core.profiling.PROFILES_PATH", profiles_path),
+        patch("app.core.profiling.settings.PROFILING_ENABLED", True),
+        patch("app.core.profiling.settings.PROFILING_SLOW_THRESHOLD_MS", 20),
+        patch("app.core.profiling.settings.PROFILING_INTERVAL_MS", 1),
+    ):
+        yield profiles_path
+
+
+def slow_function() -> None:
+    time.sleep(0.05)
+
+
+async def test_profile_saves_slow_block(profiles_path: Path) -> None:
+    """
+    Test that a block slower than the threshold is saved as folded stacks.
+    """
+    async with profiling.profile(kind="request", name="GET /filter/1"):
+        slow_function()
+
+    profiles = profiling.get_profiles()
+    assert len(profiles) == 1
+    assert profiles[0].kind == "request"
+    assert profiles[0].name == "GET /filter/1"
+    assert profiles[0].duration_ms >= 50
+
+    folded = profiling.get_profile_file(profile_id=profiles[0].id).read_text()
+    stack, count = folded.splitlines()[0].rsplit(" ", 1)
+    assert "slow_function (tests/core/test_profiling.py:" in stack
+    assert int(count) > 0
+
+
+async def test_profile_skips_fast_block(profiles_path: Path) -> None:
+    async with profiling.profile(kind="request", name="GET /"):
+        pass
+    assert profiling.get_profiles() == []
+
+
+async def test_profile_task(profiles_path: Path) -> None:
+    """
+    Test that profiled tasks return their result and are not profiled when disabled.
+    """
+
+    @profiling.profile_task(name="slow_task")
+    async def slow_task() -> str:
+        slow_function()
+        return "done"
+
+    assert await slow_task() == "done"
+    assert [profile.name for profile in profiling.get_profiles()] == ["slow_task"]
+
+    with patch("app.core.profiling.settings.PROFILING_ENABLED", False):
+        with patch("app.core.profiling.StackSampler") as mock_sampler:
+            assert await slow_task() == "done"
+        assert not mock_sampler.called
+
+
+async def test_prune_profiles(profiles_path: Path) -> None:
+    with patch("app.core.profiling.settings.PROFILING_MAX_PROFILES", 2):
+        for i in range(3):
+            async with profiling.profile(kind="task", name=f"task {i}"):
+                slow_function()
+
+    assert [profile.name for profile in profiling.get_profiles()] == ["task 2", "task 1"]
+
+
+def test_get_profile_file_invalid_id(profiles_path: Path) -> None:
+    with pytest.raises(profiling.ProfileNotFoundError):
+        profiling.get_profile_file(profile_id="../../database")
+    with pytest.raises(profiling.ProfileNotFoundError):
+        profiling.get_profile_file(profile_id="missing")
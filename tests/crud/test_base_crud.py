@@ -0,0 +1,48 @@
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud, models
+
+
+@pytest.fixture(name="async_db")
+async def fixture_async_db(tmp_path: Path) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Fixture that creates an AsyncSession on a new sqlite database file.
+    """
+    database_file = tmp_path / "database.sqlite3"
+    SQLModel.metadata.create_all(bind=create_engine(f"sqlite:///{database_file}"))
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_file}")
+    async with AsyncSession(bind=async_engine, autoflush=False, expire_on_commit=False) as session:
+        yield session
+    await async_engine.dispose()
+
+
+async def test_base_crud_with_async_session(async_db: AsyncSession) -> None:
+    """
+    Test that the BaseCRUD methods work with an AsyncSession.
+    """
+    user_create = models.UserCreate(
+        username="async_user", email="async_user@example.com", hashed_password="hashed"
+    )
+    user_id = (await crud.user.create(db=async_db, obj_in=user_create)).id
+    with pytest.raises(crud.RecordAlreadyExistsError):
+        await crud.user.create(db=async_db, obj_in=user_create)
+    await async_db.rollback()
+
+    assert (await crud.user.get(db=async_db, id=user_id)).username == "async_user"
+    assert await crud.user.get_or_none(db=async_db, id="missing") is None
+    assert [_user.id for _user in await crud.user.get_multi(db=async_db)] == [user_id]
+    assert await crud.user.count(db=async_db) == 1
+
+    updated_user = await crud.user.update(
+        db=async_db, id=user_id, obj_in=models.UserUpdate(full_name="Async User")
+    )
+    assert updated_user.full_name == "Async User"
+
+    await crud.user.remove(db=async_db, id=user_id)
+    assert await crud.user.get_all(db=async_db) == []
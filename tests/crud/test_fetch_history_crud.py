@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session
+
+from app import crud, models
+from tests.mock_objects import MOCKED_RUMBLE_SOURCE_2, MOCKED_YOUTUBE_SOURCE_1
+
+
+async def create_fetch_history(
+    db: Session, source_id: str, duration_seconds: float, started_at: datetime, **kwargs: str
+) -> models.FetchHistory:
+    return await crud.fetch_history.create(
+        db=db,
+        obj_in=models.FetchHistoryCreate(
+            run_id="run",
+            source_id=source_id,
+            handler="YoutubeHandler",
+            started_at=started_at,
+            finished_at=started_at + timedelta(seconds=duration_seconds),
+            duration_seconds=duration_seconds,
+            ytdlp_seconds=duration_seconds / 2,
+            added_videos=1,
+            **{"outcome": "success", **kwargs},
+        ),
+    )
+
+
+@pytest.mark.sync_db
+async def test_get_source_costs(
+    db: Session, normal_user: models.User, source_1: models.Source
+) -> None:
+    """
+    Test that sources are ranked by their cumulative fetch time.
+    """
+    sources = [source_1]
+    for url in (MOCKED_YOUTUBE_SOURCE_1["url"], MOCKED_RUMBLE_SOURCE_2["url"]):
+        sources.append(
+            await crud.source.create_source_from_url(db=db, url=url, user_id=normal_user.id)
+        )
+    now = datetime.utcnow()
+    await create_fetch_history(db=db, source_id=source_1.id, duration_seconds=1, started_at=now)
+    await create_fetch_history(db=db, source_id=source_1.id, duration_seconds=2, started_at=now)
+    await create_fetch_history(
+        db=db,
+        source_id=sources[1].id,
+        duration_seconds=5,
+        started_at=now,
+        outcome="canceled",
+        error="Http404Error",
+    )
+    await create_fetch_history(
+        db=db, source_id=sources[2].id, duration_seconds=60, started_at=now - timedelta(days=10)
+    )
+
+    costs = await crud.fetch_history.get_source_costs(db=db, since=now - timedelta(days=7))
+    assert [cost.source_id for cost in costs] == [sources[1].id, source_1.id]
+    assert costs[0].errors == 1
+    assert costs[1].fetches == 2
+    assert costs[1].total_seconds == 3
+    assert costs[1].avg_seconds == 1.5
+    assert costs[1].ytdlp_seconds == 1.5
+    assert costs[1].added_videos == 2
+    assert costs[1].source_name == source_1.name
+
+    assert (await crud.fetch_history.get_source_costs(db=db))[0].source_id == sources[2].id
+
+    assert await crud.fetch_history.remove_older_than(db=db, before=now - timedelta(days=7)) == 1
+    assert len(await crud.fetch_history.get_source_costs(db=db)) == 2
@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock
 
 import pytest
+from sqlalchemy import inspect
 from sqlmodel import Session
 
 from app import crud, models
@@ -66,6 +67,7 @@ async def test_update_item_without_filter(db: Session, source_1: models.Source)
         await crud.source.update(db=db, obj_in=db_source_update)
 
 
+@pytest.mark.sync_db
 async def test_update_item_reverse_order(db: Session, source_1_w_videos: models.Source) -> None:
     """
     Test updating an item's ordered by
@@ -108,3 +110,54 @@ async def test_delete_item_delete_error(db: Session, mocker: MagicMock) -> None:
     mocker.patch("app.crud.source.SourceCRUD.get", return_value=None)
     with pytest.raises(crud.DeleteError):
         await crud.source.remove(db=db, id="00000001")
+
+
+async def test_get_fetchable_ids(db: Session, source_1: models.Source) -> None:
+    """
+    Test that only active, not deleted, sources are fetched.
+    """
+    assert await crud.source.get_fetchable_ids(db=db) == [source_1.id]
+
+    await crud.source.update(db=db, id=source_1.id, obj_in=models.SourceUpdate(is_deleted=True))
+    assert await crud.source.get_fetchable_ids(db=db) == []
+
+    await crud.source.update(
+        db=db, id=source_1.id, obj_in=models.SourceUpdate(is_deleted=False, is_active=False)
+    )
+    assert await crud.source.get_fetchable_ids(db=db) == []
+
+
+@pytest.mark.sync_db
+async def test_get_video_urls(db: Session, source_1_w_videos: models.Source) -> None:
+    """
+    Test getting the urls of a source's videos.
+    """
+    video_urls = await crud.source.get_video_urls(db=db, source_id=source_1_w_videos.id)
+    assert sorted(video_urls) == sorted(video.url for video in source_1_w_videos.videos)
+
+
+async def test_get_stats(db: Session, source_1_w_videos: models.Source) -> None:
+    """
+    Test getting the aggregates of sources' videos, users and fetches.
+    """
+    videos = await crud.source.get_videos(db=db, source_id=source_1_w_videos.id)
+    stats = await crud.source.get_stats(db=db, source_ids=[source_1_w_videos.id, "missing"])
+
+    assert list(stats) == [source_1_w_videos.id]
+    source_stats = stats[source_1_w_videos.id]
+    assert source_stats.videos_count == len(videos) == 2
+    assert source_stats.users_count == 1
+    assert source_stats.latest_released_at == max(video.released_at for video in videos)
+    assert source_stats.last_fetched_at is not None
+
+
+async def test_get_videos(db: Session, source_1_w_videos: models.Source) -> None:
+    """
+    Test getting a page of a source's videos, with their descriptions loaded.
+    """
+    videos = await crud.source.get_videos(db=db, source_id=source_1_w_videos.id)
+    assert videos[0].released_at >= videos[1].released_at
+    assert not any("description_row" in inspect(video).unloaded for video in videos)
+
+    page = await crud.source.get_videos(db=db, source_id=source_1_w_videos.id, skip=1, limit=1)
+    assert [video.id for video in page] == [videos[1].id]
@@ -1,10 +1,15 @@
+import datetime
+from unittest.mock import patch
+
 import pytest
 from sqlmodel import Session
 
 from app import crud, models
+from app.handlers.rumble import RumbleHandler
 from app.services.fetch import fetch_source
 
 
+@pytest.mark.sync_db
 async def test_create_video_from_url_already_exists(
     db: Session, normal_user: models.User, source_1: models.Source
 ) -> None:
@@ -15,3 +20,123 @@ async def test_create_video_from_url_already_exists(
 
     with pytest.raises(crud.RecordAlreadyExistsError):
         await crud.video.create_video_from_url(db=db, url=source_1.videos[0].url)
+
+
+@pytest.mark.sync_db
+async def test_video_description_is_stored_in_side_table(
+    db: Session, source_1_w_videos: models.Source
+) -> None:
+    """
+    Test that a video's description is stored, compressed, in the videodescription table.
+    """
+    video = (await crud.source.get(db=db, id=source_1_w_videos.id)).videos[0]
+    description = db.get(models.VideoDescription, video.id)
+    assert description is not None
+    assert description.compression == "zstd"
+    assert description.text == video.description
+
+    # Update the description
+    updated_video = await crud.video.update(
+        db=db, id=video.id, obj_in=models.VideoUpdate(description="new description")
+    )
+    assert updated_video.description == "new description"
+
+    # Update another field, and leave the description unchanged
+    updated_video = await crud.video.update(
+        db=db, id=video.id, obj_in=models.VideoUpdate(title="new title")
+    )
+    assert updated_video.title == "new title"
+    assert updated_video.description == "new description"
+
+    # Delete the video and its description
+    await crud.video.remove(db=db, id=video.id)
+    assert db.get(models.VideoDescription, video.id) is None
+
+
+@pytest.mark.sync_db
+async def test_get_refresh_candidates(db: Session, source_1_w_videos: models.Source) -> None:
+    """
+    Test that the videos due for a refresh are selected by their `next_refresh_at`.
+    """
+    video_1, video_2 = (await crud.source.get(db=db, id=source_1_w_videos.id)).videos
+
+    # Videos added from a flat playlist miss their media url, and are due right away
+    assert set(await crud.video.get_refresh_candidates(db=db)) == {video_1, video_2}
+    video_1.media_url = video_2.media_url = "https://example.com/media.mp4"
+    db.commit()
+    assert await crud.video.get_refresh_candidates(db=db) == []
+
+    video_1.media_url = None
+    # Video released recently, and not updated within `REFRESH_UPDATE_INTERVAL_HOURS`
+    now = datetime.datetime.utcnow()
+    update_interval = datetime.timedelta(hours=RumbleHandler.REFRESH_UPDATE_INTERVAL_HOURS)
+    released_recently = datetime.timedelta(days=RumbleHandler.REFRESH_RELEASED_RECENT_DAYS)
+    video_2.released_at = now - update_interval - datetime.timedelta(days=2)
+    video_2.updated_at = now - update_interval - datetime.timedelta(days=1)
+    db.commit()
+
+    assert await crud.video.get_refresh_candidates(db=db) == [video_2, video_1]
+    assert await crud.video.get_refresh_candidates(db=db, limit=1) == [video_2]
+
+    # Video released before `REFRESH_RELEASED_RECENT_DAYS`
+    video_2.released_at = now - released_recently - datetime.timedelta(days=1)
+    video_2.updated_at = now - update_interval - datetime.timedelta(days=1)
+    # Deleted video
+    video_1.title = "[Deleted video]"
+    db.commit()
+    assert await crud.video.get_refresh_candidates(db=db) == []
+
+    # Disabled handler
+    video_1.title = "title"
+    db.commit()
+    assert await crud.video.get_refresh_candidates(db=db) == [video_1]
+    with patch("app.handlers.RumbleHandler.DISABLED", True):
+        assert await crud.video.get_refresh_candidates(db=db) == []
+
+
+async def test_get_page(db: Session) -> None:
+    """
+    Test that pages of videos are walked with a keyset cursor, newest first.
+    """
+    released_at = datetime.datetime(2023, 1, 1)
+    videos = await crud.video.create_many(
+        db=db,
+        objs_in=[
+            models.VideoCreate(
+                url=f"https://rumble.com/v{index}-video-{index}.html",
+                title=f"Video {index}",
+                description=f"Description {index}",
+                # Two videos per release date, and one video without a release date
+                released_at=released_at + datetime.timedelta(days=index // 2) if index else None,
+            )
+            for index in range(7)
+        ],
+    )
+    expected_ids = [
+        video.id
+        for video in sorted(
+            videos,
+            key=lambda video: (video.released_at is not None, video.released_at, video.id),
+            reverse=True,
+        )
+    ]
+
+    page_ids: list[str] = []
+    cursor = None
+    while True:
+        page, cursor = await crud.video.get_page(
+            db=db, order_by="released_at", cursor=cursor, limit=3
+        )
+        assert len(page) <= 3
+        page_ids.extend(video.id for video in page)
+        if cursor is None:
+            break
+    assert page_ids == expected_ids
+
+    # Only the requested fields are loaded, and the descriptions only if requested
+    page, cursor = await crud.video.get_page(db=db, limit=7, fields=["title"])
+    assert cursor is None
+    assert {video.title for video in page} == {f"Video {index}" for index in range(7)}
+
+    with pytest.raises(crud.InvalidCursorError):
+        await crud.video.get_page(db=db, cursor="invalid")
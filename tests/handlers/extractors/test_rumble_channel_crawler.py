@@ -0,0 +1,210 @@
+from typing import Any
+
+import threading
+import time
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app.handlers.extractors.rumble_channel_crawler import (
+    crawl_channel,
+    get_channel_page_url,
+    get_video_id_from_video_url,
+)
+
+FIXTURE_FILE = Path(__file__).parent / "fixtures" / "rumble_channel_page.html"
+RATE_LIMIT_KEY = "RumbleHandler"
+
+
+class FakeRumbleChannelServer:
+    """
+    Local stand-in for a Rumble channel's `?page=N` pages, built from the saved channel page.
+
+    Every page lists two videos (the fixture's LIVE and upcoming videos are skipped), with
+    video ids `v{page}a` and `v{page}b`.
+    """
+
+    def __init__(self, pages: int) -> None:
+        self.pages = pages
+        self.error_pages: set[int] = set()
+        self.delay_seconds = 0.05
+        self.requested_pages: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.webpage = FIXTURE_FILE.read_text(encoding="utf8")
+        server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                query = parse_qs(urlparse(self.path).query)
+                page_number = int(query.get("page", ["1"])[0])
+                with server.lock:
+                    server.requested_pages.append(page_number)
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                time.sleep(server.delay_seconds)
+                with server.lock:
+                    server.in_flight -= 1
+
+                if page_number in server.error_pages:
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                if page_number > server.pages:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+
+                body = server.build_page(page_number=page_number).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), RequestHandler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/c/Styxhexenhammer666"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def build_page(self, page_number: int) -> str:
+        webpage = self.webpage.replace("/v2vzqdk-", f"/v{page_number}a-").replace(
+            "/v2vzn00-", f"/v{page_number}b-"
+        )
+        webpage = webpage.replace("?page=2", f"?page={page_number + 1}")
+        if page_number == self.pages:
+            webpage = webpage.replace('rel="next"', 'rel="prev"')
+            webpage = webpage.replace("paginator--li--next", "paginator--li--disabled")
+            webpage = webpage.replace(' aria-label="Next page"', "")
+        return webpage
+
+    def get_video_urls(self, page_number: int) -> list[str]:
+        return [
+            f"https://rumble.com/v{page_number}a-the-week-in-review.html",
+            f"https://rumble.com/v{page_number}b-short-clip.html",
+        ]
+
+
+@pytest.fixture(name="channel_server")
+def fixture_channel_server() -> Generator[FakeRumbleChannelServer, None, None]:
+    server = FakeRumbleChannelServer(pages=10)
+    server.thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
+
+
+async def crawl(
+    server: FakeRumbleChannelServer, known_video_urls: list[str], **kwargs: Any
+) -> list[list[dict[str, Any]]]:
+    return [
+        entries
+        async for entries in crawl_channel(
+            url=server.url,
+            known_video_urls=known_video_urls,
+            rate_limit_key=RATE_LIMIT_KEY,
+            **kwargs,
+        )
+    ]
+
+
+def test_get_video_id_and_page_url() -> None:
+    assert (
+        get_video_id_from_video_url(url="https://rumble.com/v2vzqdk-the-week.html?e9s=src_v1_cbl")
+        == "v2vzqdk"
+    )
+    assert get_video_id_from_video_url(url="https://rumble.com/c/channel") is None
+    assert get_channel_page_url(url="https://rumble.com/c/channel", page_number=1) == (
+        "https://rumble.com/c/channel"
+    )
+    assert get_channel_page_url(url="https://rumble.com/c/channel", page_number=3) == (
+        "https://rumble.com/c/channel?page=3"
+    )
+
+
+async def test_crawl_channel_stops_at_known_page(channel_server: FakeRumbleChannelServer) -> None:
+    """
+    Test that the crawl stops at the first page that only lists known videos, and that the
+    pages downloaded ahead of it are bounded by the concurrency.
+    """
+    known_video_urls = channel_server.get_video_urls(page_number=4)
+    pages = await crawl(channel_server, known_video_urls=known_video_urls, concurrency=3)
+
+    assert len(pages) == 3
+    assert [entry["url"].split("-")[0] for entry in pages[0]] == [
+        "https://rumble.com/v1a",
+        "https://rumble.com/v1b",
+    ]
+    assert pages[2][1]["title"] == "Short Clip"
+    assert pages[2][1]["duration"] == 245
+    assert channel_server.requested_pages[0] == 1
+    assert max(channel_server.requested_pages) <= 4 + 3
+
+
+async def test_crawl_channel_past_extracted_pages(
+    channel_server: FakeRumbleChannelServer,
+) -> None:
+    """
+    Test that the pages of yt-dlp's extraction do not stop the crawl, even though their videos
+    are all known, and that the first known page past them does.
+    """
+    known_video_urls = [
+        *channel_server.get_video_urls(page_number=1),
+        *channel_server.get_video_urls(page_number=3),
+    ]
+    pages = await crawl(
+        channel_server,
+        known_video_urls=known_video_urls,
+        extracted_video_urls=channel_server.get_video_urls(page_number=1),
+        concurrency=1,
+    )
+
+    assert len(pages) == 1
+    assert [entry["url"].split("-")[0] for entry in pages[0]] == [
+        "https://rumble.com/v2a",
+        "https://rumble.com/v2b",
+    ]
+    assert channel_server.requested_pages == [1, 2, 3]
+
+
+async def test_crawl_channel_partially_known_page(
+    channel_server: FakeRumbleChannelServer,
+) -> None:
+    known_video_urls = channel_server.get_video_urls(page_number=2)[:1]
+    pages = await crawl(channel_server, known_video_urls=known_video_urls, max_pages=2)
+
+    assert len(pages) == 2
+    assert [entry["url"].split("-")[0] for entry in pages[1]] == ["https://rumble.com/v2b"]
+    assert sorted(channel_server.requested_pages) == [1, 2]
+
+
+async def test_crawl_channel_to_last_page(channel_server: FakeRumbleChannelServer) -> None:
+    """
+    Test that a channel without known videos is crawled to its last page, with up to
+    `concurrency` pages downloading at a time.
+    """
+    pages = await crawl(channel_server, known_video_urls=[], concurrency=4)
+
+    assert len(pages) == channel_server.pages
+    assert sum(len(entries) for entries in pages) == channel_server.pages * 2
+    assert 1 < channel_server.max_in_flight <= 4
+    assert len(channel_server.requested_pages) <= channel_server.pages + 4
+
+
+async def test_crawl_channel_page_error(channel_server: FakeRumbleChannelServer) -> None:
+    """
+    Test that the crawl keeps the pages before a page that could not be downloaded.
+    """
+    channel_server.error_pages = {3}
+    pages = await crawl(channel_server, known_video_urls=[], concurrency=2)
+
+    assert len(pages) == 2
+
+    channel_server.error_pages = {1}
+    assert await crawl(channel_server, known_video_urls=[]) == []
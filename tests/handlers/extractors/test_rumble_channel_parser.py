@@ -0,0 +1,100 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from yt_dlp import YoutubeDL
+
+from app.handlers.extractors.rumble import CustomRumbleChannelIE
+from app.handlers.extractors.rumble_channel_parser import (
+    RumbleChannelVideo,
+    parse_rumble_channel_page,
+)
+
+FIXTURE_FILE = Path(__file__).parent / "fixtures" / "rumble_channel_page.html"
+CHANNEL_URL = "https://rumble.com/c/Styxhexenhammer666"
+
+
+def get_fixture_pages() -> dict[str, str]:
+    """
+    Get the fixture channel's two pages, by url.
+    """
+    webpage = FIXTURE_FILE.read_text(encoding="utf8")
+    last_page = webpage.replace('<link rel="next" href="/c/Styxhexenhammer666?page=2">', "")
+    last_page = last_page.replace("paginator--li--next", "paginator--li--disabled")
+    last_page = last_page.replace(' aria-label="Next page"', "")
+    return {CHANNEL_URL: webpage, f"{CHANNEL_URL}?page=2": last_page}
+
+
+def test_parse_rumble_channel_page() -> None:
+    webpage = FIXTURE_FILE.read_text(encoding="utf8")
+    page = parse_rumble_channel_page(webpage=webpage, url=CHANNEL_URL)
+
+    assert page.channel == "Styxhexenhammer666"
+    assert page.channel_id == "Styxhexenhammer666"
+    assert page.thumbnail is not None
+    assert page.thumbnail.endswith("tjsba.baa.1-Styxhexenhammer666-qyv16v.png")
+    assert page.backsplash == "https://ak2.rmbl.ws/z8/backsplash.jpeg"
+    assert page.next_page_url == f"{CHANNEL_URL}?page=2"
+
+    assert len(page.videos) == 4
+    assert page.videos[0] == RumbleChannelVideo(
+        video_id="249155911",
+        url="/v2vzqdk-the-week-in-review.html?e9s=src_v1_cbl",
+        thumbnail="https://1a-1791.com/video/s8/1/a/b/c/abc.0kob-small-The-Week-in-Review.jpg",
+        datetime="2023-06-30T14:05:11-04:00",
+        duration="1:02:03",
+        title="The Week in Review & More",
+    )
+    assert page.videos[1].is_live is True
+    assert page.videos[2].is_upcoming is True
+    assert page.videos[3].duration == "4:05"
+    assert page.videos[3].title == "Channel: Short Clip"
+
+
+def test_parse_rumble_channel_page_in_chunks() -> None:
+    """
+    Test that the page is parsed the same when fed a few characters at a time.
+    """
+    webpage = FIXTURE_FILE.read_text(encoding="utf8")
+    assert parse_rumble_channel_page(
+        webpage=webpage, url=CHANNEL_URL, chunk_size=7
+    ) == parse_rumble_channel_page(webpage=webpage, url=CHANNEL_URL)
+
+
+def test_custom_rumble_channel_ie_follows_pages() -> None:
+    pages = get_fixture_pages()
+    for playlistend, expected_entries in ((None, 4), (3, 3), (1, 1)):
+        with YoutubeDL({"playlistend": playlistend}) as ydl:
+            ie = CustomRumbleChannelIE(ydl)
+            with patch.object(
+                ie, "_download_webpage", side_effect=lambda url, *args, **kwargs: pages[url]
+            ) as mock_download_webpage:
+                info_dict = ie._real_extract(CHANNEL_URL)  # pylint: disable=protected-access
+                entries = list(info_dict["entries"])
+
+        assert len(entries) == expected_entries
+        assert mock_download_webpage.call_count == (2 if expected_entries > 2 else 1)
+
+    assert info_dict["title"] == "Styxhexenhammer666"
+    assert info_dict["channel_url"] == CHANNEL_URL
+    assert entries[0]["url"] == "https://rumble.com/v2vzqdk-the-week-in-review.html?e9s=src_v1_cbl"
+    assert entries[0]["duration"] == 3723
+    assert entries[0]["timestamp"] == 1688148311
+    assert entries[0]["title"] == "The Week in Review & More"
+
+
+def test_custom_rumble_channel_ie_stops_on_repeated_page() -> None:
+    """
+    Test that a page linking to an already downloaded page as its next page ends the channel.
+    """
+    webpage = FIXTURE_FILE.read_text(encoding="utf8")
+    pages = {CHANNEL_URL: webpage, f"{CHANNEL_URL}?page=2": webpage}
+    with YoutubeDL() as ydl:
+        ie = CustomRumbleChannelIE(ydl)
+        with patch.object(
+            ie, "_download_webpage", side_effect=lambda url, *args, **kwargs: pages[url]
+        ) as mock_download_webpage:
+            info_dict = ie._real_extract(CHANNEL_URL)  # pylint: disable=protected-access
+            entries = list(info_dict["entries"])
+
+    assert len(entries) == 4
+    assert mock_download_webpage.call_count == 2
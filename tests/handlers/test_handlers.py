@@ -1,8 +1,16 @@
 from typing import Any
 
+from urllib.parse import urlparse
+
 import pytest
 
-from app.handlers import get_handler_from_string, get_handler_from_url
+from app.handlers import (
+    get_handler_from_string,
+    get_handler_from_url,
+    register_handler,
+    registered_handlers,
+    unregister_handler,
+)
 from app.handlers.base import ServiceHandler
 from app.handlers.exceptions import HandlerNotFoundError
 from app.services.ytdlp import AwaitingTranscodingError, FormatNotFoundError
@@ -42,6 +50,54 @@ def test_get_handler_from_string() -> None:
         get_handler_from_string(handler_string=handler_string)
 
 
+def test_get_handler_singletons() -> None:
+    """
+    Tests that handler lookups share a single instance per handler.
+    """
+    handler = get_handler_from_url(url="https://www.youtube.com/watch?v=1234567890")
+    assert get_handler_from_url(url="https://youtube.com/watch?v=0987654321") is handler
+    assert get_handler_from_url(url=urlparse("https://m.youtube.com/watch?v=1")) is handler
+    assert get_handler_from_string(handler_string="YoutubeHandler") is handler
+    assert get_handler_from_string(handler_string="Youtube") is handler
+    assert handler in registered_handlers
+
+    handler = get_handler_from_url(url="https://tubesubs.duckdns.org:8080/feed")
+    assert handler.__class__.__name__ == "TubeSubsHandler"
+
+
+def test_register_handler() -> None:
+    """
+    Tests registering and unregistering a plugin handler.
+    """
+
+    class ExampleHandler(ServiceHandler):
+        SERVICE_NAME = "Example"
+        DOMAINS = ["example.com"]
+
+    url = "https://videos.example.com/watch/1"
+    with pytest.raises(HandlerNotFoundError):
+        get_handler_from_url(url=url)
+
+    assert register_handler(ExampleHandler) is ExampleHandler  # type: ignore
+    try:
+        handler = get_handler_from_url(url=url)
+        assert isinstance(handler, ExampleHandler)
+        assert get_handler_from_string(handler_string="Example") is handler
+        assert registered_handlers[-1] is handler
+    finally:
+        unregister_handler(ExampleHandler)  # type: ignore
+
+    with pytest.raises(HandlerNotFoundError):
+        get_handler_from_url(url=url)
+    with pytest.raises(HandlerNotFoundError):
+        get_handler_from_string(handler_string="ExampleHandler")
+    assert [handler.name for handler in registered_handlers] == [
+        "YoutubeHandler",
+        "RumbleHandler",
+        "TubeSubsHandler",
+    ]
+
+
 async def test_map_video_info_dict_entity_to_video_dict_format_id_keyerror(
     mocked_entry_info_dict: dict[str, Any]
 ) -> None:
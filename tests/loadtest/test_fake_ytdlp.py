@@ -0,0 +1,83 @@
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.handlers.youtube import YoutubeHandler
+from app.loadtest import fake_ytdlp
+from app.services.ytdlp import Http404Error, get_info_dict
+
+
+@pytest.fixture(autouse=True)
+def fake_backend(tmp_path: Path) -> Generator[None, None, None]:
+    with (
+        patch("app.services.ytdlp.settings.YTDLP_BACKEND", "fake"),
+        patch("app.loadtest.fake_ytdlp.settings.FAKE_YTDLP_LATENCY_MS", 0),
+        patch("app.loadtest.fake_ytdlp.settings.FAKE_YTDLP_JITTER_MS", 0),
+        patch("app.loadtest.fake_ytdlp.INFO_DICT_RECORDINGS_PATH", tmp_path),
+    ):
+        yield
+
+
+async def test_get_info_dict_fake_channel() -> None:
+    """
+    Test that the fake backend serves a synthetic channel, limited by `playlistend`.
+    """
+    url = "https://www.youtube.com/channel/UCloadtest00000000000001"
+    with patch("app.loadtest.fake_ytdlp.settings.FAKE_YTDLP_SOURCE_VIDEOS", 20):
+        info_dict = await get_info_dict(url=url, ydl_opts={"playlistend": 5})
+        assert len(info_dict["entries"]) == 5
+        assert info_dict["metadata"]["url"] == url
+        assert info_dict["entries"][0]["channel_id"] == "UCloadtest00000000000001"
+
+        # Same channel, same videos
+        info_dict_2 = await get_info_dict(url=url, ydl_opts={})
+        assert len(info_dict_2["entries"]) == 20
+        assert info_dict_2["entries"][:5] == info_dict["entries"]
+
+    source_dict = YoutubeHandler().map_source_info_dict_to_source_dict(
+        source_info_dict=info_dict, source_videos=[]
+    )
+    assert source_dict["name"] == "Synthetic Channel"
+
+
+async def test_get_info_dict_fake_video() -> None:
+    """
+    Test that the fake backend serves videos with a signed media URL on the fake upstream.
+    """
+    info_dict = await get_info_dict(url="https://www.youtube.com/watch?v=abcdefghijk", ydl_opts={})
+    video_dict = YoutubeHandler().map_video_info_dict_entity_to_video_dict(
+        entry_info_dict=info_dict
+    )
+    assert video_dict["url"] == "https://www.youtube.com/watch?v=abcdefghijk"
+    assert video_dict["media_url"].startswith(f"{fake_ytdlp.settings.FAKE_MEDIA_BASE_URL}/")
+    assert "sig=" in video_dict["media_url"]
+    assert video_dict["media_filesize"] == fake_ytdlp.settings.FAKE_MEDIA_FILESIZE
+
+
+async def test_get_info_dict_fake_errors() -> None:
+    """
+    Test that injected errors are handled like yt-dlp's.
+    """
+    with (
+        patch("app.loadtest.fake_ytdlp.settings.FAKE_YTDLP_ERROR_RATE", 1.0),
+        patch(
+            "app.loadtest.fake_ytdlp.FAKE_ERRORS",
+            ("ERROR: Unable to download webpage: HTTP Error 404: Not Found",),
+        ),
+    ):
+        with pytest.raises(Http404Error):
+            await get_info_dict(url="https://www.youtube.com/watch?v=abcdefghijk", ydl_opts={})
+
+
+async def test_recorded_info_dict() -> None:
+    """
+    Test that recorded info_dicts are served instead of synthetic ones.
+    """
+    url = "https://www.youtube.com/watch?v=recorded000"
+    fake_ytdlp.save_recording(url=url, info_dict={"id": "recorded000", "metadata": {}})
+
+    info_dict = await get_info_dict(url=url, ydl_opts={})
+    assert info_dict["id"] == "recorded000"
+    assert info_dict["metadata"]["url"] == url
@@ -0,0 +1,74 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.loadtest.media_server import (
+    PATTERN_PERIOD,
+    media_app,
+    parse_range_header,
+    settings,
+    sign_media_url,
+)
+
+CLEN = 300_000
+
+
+@pytest.fixture(name="media_client")
+def fixture_media_client() -> TestClient:
+    return TestClient(media_app)
+
+
+def get_path(url: str) -> str:
+    return url.removeprefix(settings.FAKE_MEDIA_BASE_URL)
+
+
+def test_get_media(media_client: TestClient) -> None:
+    """
+    Test that signed URLs serve the full, deterministic media.
+    """
+    response = media_client.get(get_path(sign_media_url(video_id="video", clen=CLEN)))
+    assert response.status_code == 200
+    assert response.headers["accept-ranges"] == "bytes"
+    assert len(response.content) == CLEN
+    assert response.content[: PATTERN_PERIOD + 1] == bytes([*range(PATTERN_PERIOD), 0])
+
+
+def test_get_media_range(media_client: TestClient) -> None:
+    """
+    Test that Range requests are served as partial content.
+    """
+    path = get_path(sign_media_url(video_id="video", clen=CLEN))
+
+    response = media_client.get(path, headers={"Range": "bytes=250000-"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 250000-{CLEN - 1}/{CLEN}"
+    assert response.content == bytes(i % PATTERN_PERIOD for i in range(250000, CLEN))
+
+    response = media_client.head(path, headers={"Range": "bytes=0-1023"})
+    assert response.status_code == 206
+    assert response.headers["content-length"] == "1024"
+
+    response = media_client.get(path, headers={"Range": f"bytes={CLEN}-"})
+    assert response.status_code == 416
+
+
+def test_get_media_forbidden(media_client: TestClient) -> None:
+    """
+    Test that expired and tampered URLs are forbidden.
+    """
+    expired_url = sign_media_url(video_id="video", clen=CLEN, expire=int(time.time()) - 1)
+    assert media_client.get(get_path(expired_url)).status_code == 403
+
+    tampered_url = sign_media_url(video_id="video", clen=CLEN).replace("id=video", "id=other")
+    assert media_client.head(get_path(tampered_url)).status_code == 403
+
+
+def test_parse_range_header() -> None:
+    assert parse_range_header(range_header="bytes=0-99", size=1000) == (0, 99)
+    assert parse_range_header(range_header="bytes=900-2000", size=1000) == (900, 999)
+    assert parse_range_header(range_header="bytes=-100", size=1000) == (900, 999)
+    with pytest.raises(ValueError):
+        parse_range_header(range_header="bytes=-", size=1000)
+    with pytest.raises(ValueError):
+        parse_range_header(range_header="bytes=1000-", size=1000)
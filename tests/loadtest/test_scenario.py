@@ -0,0 +1,44 @@
+import socket
+from unittest.mock import patch
+
+from app.loadtest.scenario import LoadTestReport, OperationStats, run_load_test
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def test_operation_stats_percentile() -> None:
+    stats = OperationStats(name="feed", durations=[0.4, 0.1, 0.3, 0.2])
+    assert stats.percentile(50) == 0.2
+    assert stats.percentile(95) == 0.4
+    assert OperationStats(name="feed").percentile(50) == 0.0
+
+
+async def test_run_load_test() -> None:
+    """
+    Test that the scenario drives feeds, media and fetch cycles offline.
+    """
+    with (
+        patch("app.loadtest.fake_ytdlp.settings.FAKE_YTDLP_LATENCY_MS", 5),
+        patch("app.loadtest.fake_ytdlp.settings.FAKE_YTDLP_JITTER_MS", 0),
+        patch("app.loadtest.fake_ytdlp.settings.FAKE_YTDLP_SOURCE_VIDEOS", 10),
+        patch("app.loadtest.media_server.settings.FAKE_MEDIA_LATENCY_MS", 0),
+    ):
+        report = await run_load_test(
+            sources=1,
+            duration_seconds=1,
+            feed_workers=1,
+            media_workers=2,
+            fetch_workers=1,
+            media_port=get_free_port(),
+        )
+
+    assert isinstance(report, LoadTestReport)
+    assert set(report.operations) == {"feed", "media_get", "media_head", "fetch_source"}
+    for stats in report.operations.values():
+        assert stats.count > 0
+        assert stats.errors == 0
+    assert "media_head" in report.render()
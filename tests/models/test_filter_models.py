@@ -1,9 +1,11 @@
+import pytest
 from sqlmodel import Session
 
 from app import crud, models
 from app.models import Filter, Source
 
 
+@pytest.mark.sync_db
 async def test_filter_videos(
     db: Session,
     source_1_w_videos: Source,
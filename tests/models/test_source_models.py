@@ -8,6 +8,7 @@ from app.models import Source
 from app.models.source_video_link import SourceOrderBy
 
 
+@pytest.mark.sync_db
 async def test_source_videos_sorted(db: Session, source_1_w_videos: models.Source) -> None:
     """
     Test Source.videos_sorted() if ordered_by is RELEASED_AT.
@@ -0,0 +1,97 @@
+import pytest
+from sqlmodel import Session
+
+from app import crud, models
+from app.models import Criteria, Source
+from app.models.criteria import CriteriaField, CriteriaOperator, CriteriaUnitOfMeasure
+from app.models.video_search import (
+    get_phrase_query,
+    get_search_query,
+    match_video_ids,
+    rebuild_video_search_index,
+)
+
+
+def test_get_phrase_query() -> None:
+    """
+    Test that phrases are quoted, and that phrases without words are not queried.
+    """
+    assert get_phrase_query(phrase="bidens scandal") == '"bidens scandal"'
+    assert get_phrase_query(phrase='say "hi"', column="title") == 'title : "say ""hi"""'
+    assert get_phrase_query(phrase=" -- ") is None
+
+
+def test_get_search_query() -> None:
+    """
+    Test that all the words and quoted phrases of a search query must match.
+    """
+    assert get_search_query(query='trump "russian oligarch"') == '"trump" AND "russian oligarch"'
+    assert get_search_query(query=" ! ") is None
+
+
+@pytest.mark.sync_db
+async def test_video_search_index_is_synced(db: Session, source_1_w_videos: Source) -> None:
+    """
+    Test that the index is updated when videos are inserted, updated and deleted.
+    """
+    video = (await crud.source.get(db=db, id=source_1_w_videos.id)).videos[0]
+    title_query = get_phrase_query(phrase=str(video.title), column="title")
+    assert title_query is not None
+    assert match_video_ids(db=db, query=title_query) == [video.id]
+
+    await crud.video.update(
+        db=db,
+        id=video.id,
+        obj_in=models.VideoUpdate(title="Brand new title", description="Fresh description"),
+    )
+    assert match_video_ids(db=db, query='title : "brand new"') == [video.id]
+    assert match_video_ids(db=db, query='description : "fresh"') == [video.id]
+    assert match_video_ids(db=db, query=title_query) == []
+
+    await crud.video.remove(db=db, id=video.id)
+    assert match_video_ids(db=db, query='"brand new"') == []
+
+
+@pytest.mark.sync_db
+async def test_rebuild_video_search_index(db: Session, source_1_w_videos: Source) -> None:
+    """
+    Test that the index can be rebuilt from the videos.
+    """
+    assert rebuild_video_search_index(db=db) == 2
+    video = (await crud.source.get(db=db, id=source_1_w_videos.id)).videos[0]
+    title_query = get_phrase_query(phrase=str(video.title))
+    assert title_query is not None
+    assert match_video_ids(db=db, query=title_query, source_ids=[source_1_w_videos.id]) == [
+        video.id
+    ]
+    assert match_video_ids(db=db, query=title_query, source_ids=["other-source"]) == []
+
+
+@pytest.mark.sync_db
+async def test_keyword_criteria_confirms_index_hits(db: Session, source_1_w_videos: Source) -> None:
+    """
+    Test that KEYWORD criteria confirm the index's hits with their regex, as the index's
+    tokenizer ignores diacritics and punctuation.
+    """
+    video = (await crud.source.get(db=db, id=source_1_w_videos.id)).videos[0]
+    video = await crud.video.update(
+        db=db, id=video.id, obj_in=models.VideoUpdate(title="Café talk")
+    )
+    keyword_query = get_phrase_query(phrase="cafe", column="title")
+    assert keyword_query is not None
+    keyword_video_ids = set(match_video_ids(db=db, query=keyword_query))
+    assert keyword_video_ids == {video.id}
+
+    criteria = Criteria(
+        field=CriteriaField.KEYWORD.value,
+        operator=CriteriaOperator.MUST_CONTAIN.value,
+        value="cafe",
+        unit_of_measure=CriteriaUnitOfMeasure.KEYWORD.value,
+    )
+    for keyword, contains in (("cafe", False), ("café", True)):
+        assert (
+            criteria.matches_contains(
+                video=video, keyword=keyword, keyword_video_ids=keyword_video_ids
+            )
+            is contains
+        )
@@ -0,0 +1,120 @@
+from collections.abc import Generator
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import Session
+
+from app import crud, settings
+from app.models import Source, SourceVideoLink
+from app.services.archive import (
+    archive_old_videos,
+    decompress_video,
+    get_video_ids_to_archive,
+    mark_video_played,
+    restore_archived_video,
+)
+from app.services.fetch import fetch_source
+
+
+@pytest.fixture(autouse=True)
+def archive_settings() -> Generator[None, None, None]:
+    """
+    Archive every video but the newest of each source.
+    """
+    with patch.object(settings, "VIDEO_ARCHIVE_AFTER_DAYS", 0), patch.object(
+        settings, "VIDEO_ARCHIVE_KEEP_PER_SOURCE", 1
+    ):
+        yield
+
+
+async def test_get_video_ids_to_archive(sync_session: Session, source_1_w_videos: Source) -> None:
+    """
+    Test that the newest video of a source, and played videos, are not archived.
+    """
+    source = await crud.source.get(db=sync_session, id=source_1_w_videos.id)
+    oldest, newest = sorted(source.videos, key=lambda video: video.released_at)
+
+    assert get_video_ids_to_archive(db=sync_session, limit=10) == [oldest.id]
+
+    await mark_video_played(db=sync_session, video=oldest)
+    assert get_video_ids_to_archive(db=sync_session, limit=10) == []
+
+
+async def test_archive_and_restore_video(sync_session: Session, source_1_w_videos: Source) -> None:
+    """
+    Test that an archived video is removed from its source, and restored with its links.
+    """
+    source = await crud.source.get(db=sync_session, id=source_1_w_videos.id)
+    oldest, newest = sorted(source.videos, key=lambda video: video.released_at)
+    oldest_dict = oldest.dict()
+    oldest_description = oldest.description
+
+    assert await archive_old_videos(db=sync_session) == 1
+    assert await crud.video.get_or_none(db=sync_session, id=oldest.id) is None
+    assert await crud.archived_video.get_or_none(db=sync_session, id=oldest.id) is not None
+    source = await crud.source.get(db=sync_session, id=source_1_w_videos.id)
+    assert source.videos == [newest]
+
+    # Nothing left to archive
+    assert await archive_old_videos(db=sync_session) == 0
+
+    video = await restore_archived_video(db=sync_session, video_id=oldest.id)
+    assert video.dict() == oldest_dict
+    assert video.description == oldest_description
+    assert await crud.archived_video.get_or_none(db=sync_session, id=oldest.id) is None
+    assert video.sources == [source]
+
+
+async def test_archived_video_is_not_recreated(
+    sync_session: Session, source_1_w_videos: Source
+) -> None:
+    """
+    Test that fetching a source does not recreate its archived videos, and that a video that
+    was recreated anyway is archived again.
+    """
+    source = await crud.source.get(db=sync_session, id=source_1_w_videos.id)
+    oldest, _ = sorted(source.videos, key=lambda video: video.released_at)
+    assert await archive_old_videos(db=sync_session) == 1
+
+    await fetch_source(db=sync_session, id=source.id)
+    assert await crud.video.get_or_none(db=sync_session, id=oldest.id) is None
+
+    archived_video = await crud.archived_video.get(db=sync_session, id=oldest.id)
+    video, source_ids = decompress_video(data=archived_video.data)
+    sync_session.add(video)
+    sync_session.add_all(
+        SourceVideoLink(source_id=source_id, video_id=video.id) for source_id in source_ids
+    )
+    sync_session.commit()
+
+    assert await archive_old_videos(db=sync_session) == 1
+    assert await crud.video.get_or_none(db=sync_session, id=oldest.id) is None
+    assert await crud.archived_video.get_or_none(db=sync_session, id=oldest.id) is not None
+
+
+async def test_restore_archived_video_not_found(sync_session: Session) -> None:
+    """
+    Test that restoring a video that is not archived raises RecordNotFoundError.
+    """
+    with pytest.raises(crud.RecordNotFoundError):
+        await restore_archived_video(db=sync_session, video_id="not-archived")
+
+
+async def test_mark_video_played(sync_session: Session, source_1_w_videos: Source) -> None:
+    """
+    Test that a video's last_played_at is only updated once a day.
+    """
+    source = await crud.source.get(db=sync_session, id=source_1_w_videos.id)
+    video = source.videos[0]
+    assert video.last_played_at is None
+
+    await mark_video_played(db=sync_session, video=video)
+    played_video = await crud.video.get(db=sync_session, id=video.id)
+    last_played_at = played_video.last_played_at
+    assert last_played_at is not None
+    assert last_played_at <= datetime.utcnow()
+
+    await mark_video_played(db=sync_session, video=played_video)
+    played_video = await crud.video.get(db=sync_session, id=video.id)
+    assert played_video.last_played_at == last_played_at
@@ -1,8 +1,12 @@
 import datetime
 
 import pytest
+from sqlalchemy import inspect
+from sqlmodel import Session
 
-from app.services.feed import SourceFeedGenerator, get_published_at
+from app import crud
+from app.models import Source
+from app.services.feed import SourceFeedGenerator, get_published_at, load_video_descriptions
 
 
 def test_missing_feed_or_source() -> None:
@@ -39,3 +43,17 @@ def test_get_published_date() -> None:
     created_at = datetime.datetime(2021, 1, 1, 0, 0, 0)
     released_at = datetime.datetime(2021, 1, 1, 0, 0, 0, tzinfo=datetime.timezone.utc)
     assert get_published_at(created_at=created_at, released_at=released_at) == created_at
+
+
+@pytest.mark.sync_db
+async def test_load_video_descriptions(db: Session, source_1_w_videos: Source) -> None:
+    """
+    Tests that the descriptions of videos are loaded in one batch.
+    """
+    db.expire_all()
+    videos = (await crud.source.get(db=db, id=source_1_w_videos.id)).videos
+    assert all("description_row" in inspect(video).unloaded for video in videos)
+
+    load_video_descriptions(videos=videos)
+    assert not any("description_row" in inspect(video).unloaded for video in videos)
+    assert all(video.description for video in videos)
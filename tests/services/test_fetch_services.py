@@ -86,6 +86,27 @@ async def test_fetch_all_sources_fetch_canceled_error(
     assert fetch_results.sources == 0
 
 
+async def test_fetch_all_sources_expunges_loaded_objects(
+    db: Session, normal_user: User, source_1: Source
+) -> None:
+    """
+    Test that fetching all sources does not keep each source's objects in the session.
+    """
+    new_source = await crud.source.create_source_from_url(
+        db=db, url=MOCKED_YOUTUBE_SOURCE_1["url"], user_id=normal_user.id
+    )
+    new_source_id = new_source.id
+    db.expunge(new_source)
+
+    fetch_results = await fetch_all_sources(db=db)
+
+    assert fetch_results.sources == 2
+    assert source_1 in db
+    identities = [key[1] for key in db.identity_map.keys()]
+    assert (new_source_id,) not in identities
+    assert len(await crud.source.get_video_urls(db=db, source_id=new_source_id)) == 2
+
+
 # Fetch Source
 # @pytest.mark.filterwarnings("ignore::DeprecationWarning")
 # async def test_fetch_source_create_logo(mocker: Mock, db: Session, source_1: Source) -> None:
@@ -134,26 +155,28 @@ async def test_fetch_videos(db: Session, source_1_w_videos: Source) -> None:
     """
     Tests 'fetch_videos', fetching new data for a list of videos from yt-dlp.
     """
-    with patch("app.services.fetch.fetch_video", return_value=source_1_w_videos.videos[0]):
-        fetched_videos = await fetch_videos(videos=source_1_w_videos.videos, db=db)
-        assert len(fetched_videos) == len(source_1_w_videos.videos)
+    videos = await crud.source.get_videos(db=db, source_id=source_1_w_videos.id)
+    with patch("app.services.fetch.fetch_video", return_value=videos[0]):
+        fetched_videos = await fetch_videos(videos=videos, db=db)
+        assert len(fetched_videos) == len(videos)
 
 
 async def test_fetch_videos_unavailable(
     db: Session, normal_user: User, source_1_w_videos: Source
 ) -> None:
     # Test that videos that are not found are ignored
-    assert len(source_1_w_videos.videos) == 2
+    videos = await crud.source.get_videos(db=db, source_id=source_1_w_videos.id)
+    assert len(videos) == 2
     with patch("app.services.fetch.get_video_info_dict", side_effect=VideoUnavailableError):
-        fetched_videos = await fetch_videos(videos=source_1_w_videos.videos, db=db)
+        fetched_videos = await fetch_videos(videos=videos, db=db)
         assert len(fetched_videos) == 0
-        assert len(source_1_w_videos.videos) == 0
+        assert await crud.source.get_video_ids(db=db, source_id=source_1_w_videos.id) == set()
 
 
 # Fetch Video
 async def test_fetch_video_unavailable_error(db: Session, source_1_w_videos: Source) -> None:
     # Test that videos recent videos are ignored via FetchCanceledError
-    video1: Video = source_1_w_videos.videos[0]
+    video1: Video = (await crud.source.get_videos(db=db, source_id=source_1_w_videos.id))[0]
     video1 = await crud.video.update(
         db=db, id=video1.id, obj_in=VideoUpdate(released_at=datetime.utcnow() - timedelta(hours=1))
     )
@@ -162,7 +185,7 @@ async def test_fetch_video_unavailable_error(db: Session, source_1_w_videos: Sou
             await fetch_video(db=db, video_id=video1.id)
 
     # Test Errors from videos released more than 36 hour ago are not ignored
-    video2 = source_1_w_videos.videos[0]
+    video2 = (await crud.source.get_videos(db=db, source_id=source_1_w_videos.id))[0]
     video2 = await crud.video.update(
         db=db, id=video2.id, obj_in=VideoUpdate(released_at=datetime.utcnow() - timedelta(hours=37))
     )
@@ -176,7 +199,7 @@ async def test_fetch_video_Exception(db: Session, source_1_w_videos: Source) ->
     Test fetch_video when Exception is raised.
     """
     # Test that videos recent videos are ignored via FetchCanceledError
-    video1: Video = source_1_w_videos.videos[0]
+    video1: Video = (await crud.source.get_videos(db=db, source_id=source_1_w_videos.id))[0]
     video1 = await crud.video.update(
         db=db, id=video1.id, obj_in=VideoUpdate(released_at=datetime.utcnow() - timedelta(hours=1))
     )
@@ -185,7 +208,7 @@ async def test_fetch_video_Exception(db: Session, source_1_w_videos: Source) ->
             await fetch_video(db=db, video_id=video1.id)
 
     # Test Errors from videos released more than 36 hour ago are not ignored
-    video2 = source_1_w_videos.videos[0]
+    video2 = (await crud.source.get_videos(db=db, source_id=source_1_w_videos.id))[0]
     video2 = await crud.video.update(
         db=db, id=video2.id, obj_in=VideoUpdate(released_at=datetime.utcnow() - timedelta(hours=37))
     )
@@ -198,7 +221,7 @@ async def test_fetch_video_record_not_found(db: Session, source_1_w_videos: Sour
     """
     Test fetch_video when RecordNotFoundError is raised.
     """
-    video1: Video = source_1_w_videos.videos[0]
+    video1: Video = (await crud.source.get_videos(db=db, source_id=source_1_w_videos.id))[0]
     with patch("app.services.fetch.get_video_info_dict", side_effect=crud.RecordNotFoundError):
         with pytest.raises(crud.RecordNotFoundError):
             await fetch_video(db=db, video_id=video1.id)
@@ -208,14 +231,16 @@ async def test_fetch_video_youtubedl_error(db: Session, source_1_w_videos: Sourc
     """
     Test fetch_video when RecordNotFoundError is raised.
     """
-    video1: Video = source_1_w_videos.videos[0]
+    video1: Video = (await crud.source.get_videos(db=db, source_id=source_1_w_videos.id))[0]
     with patch("app.services.fetch.get_video_info_dict", side_effect=YoutubeDLError):
         with pytest.raises(FetchCanceledError):
             await fetch_video(db=db, video_id=video1.id)
 
 
 # Refresh All Videos
-async def test_refresh_all_videos(db: Session, normal_user: User, source_1: Source) -> None:
+async def test_refresh_all_videos(
+    db: Session, normal_user: User, source_1_w_videos: Source
+) -> None:
     """
     Tests 'refresh_all_videos', fetching new data from yt-dlp for all Videos.
     """
@@ -224,11 +249,20 @@ async def test_refresh_all_videos(db: Session, normal_user: User, source_1: Sour
         db=db, url=MOCKED_RUMBLE_SOURCE_2["url"], user_id=normal_user.id
     )
 
-    # Refresh all videos older than 0 hours
-    with patch("app.services.fetch.refresh_videos") as mocked_refresh_videos:
+    # Videos added from a flat playlist miss their media url, and are due right away
+    with patch("app.services.fetch.fetch_videos") as mocked_fetch_videos:
         await refresh_all_videos(db=db)
-        assert mocked_refresh_videos.call_count == 1
-        mocked_refresh_videos.assert_called_with(videos=ANY, db=ANY)
+        assert mocked_fetch_videos.call_count == 1
+        mocked_fetch_videos.assert_called_with(videos=ANY, db=ANY)
+        assert len(mocked_fetch_videos.call_args.kwargs["videos"]) == 2
+
+    # Only up to `REFRESH_VIDEOS_LIMIT` videos are refreshed
+    with (
+        patch("app.services.fetch.fetch_videos") as mocked_fetch_videos,
+        patch("app.services.fetch.settings.REFRESH_VIDEOS_LIMIT", 1),
+    ):
+        await refresh_all_videos(db=db)
+        assert len(mocked_fetch_videos.call_args.kwargs["videos"]) == 1
 
 
 # Refresh Videos
@@ -257,3 +291,31 @@ def test_get_videos_needing_refresh(
     # videos[1].media_url = None
     # videos_needing_refresh = get_videos_needing_refresh(videos=source_1_w_videos.videos)
     # assert len(videos_needing_refresh) == 1
+
+
+async def test_fetch_source_records_history(db: Session, source_1: Source) -> None:
+    """
+    Test that each source fetch is recorded with its cost and error class.
+    """
+    await fetch_source(db=db, id=source_1.id, run_id="run_1")
+
+    with patch("app.services.fetch.get_source_info_dict") as mocked_get_source_info_dict:
+        mocked_get_source_info_dict.side_effect = AccountNotFoundError("Account not found")
+        with pytest.raises(FetchCanceledError):
+            await fetch_source(db=db, id=source_1.id, run_id="run_2")
+
+    canceled, success = await crud.fetch_history.get_source_history(db=db, source_id=source_1.id)
+    assert success.run_id == "run_1"
+    assert success.outcome == "success"
+    assert success.error is None
+    assert success.entries > 0
+    assert success.bytes_extracted > 0
+    assert success.duration_seconds >= success.db_seconds > 0
+    assert success.feed_seconds > 0
+    assert canceled.outcome == "canceled"
+    assert canceled.error == "AccountNotFoundError"
+    assert canceled.finished_at >= canceled.started_at
+
+    with patch("app.services.fetch.settings.FETCH_HISTORY_ENABLED", False):
+        await fetch_source(db=db, id=source_1.id)
+    assert len(await crud.fetch_history.get_source_history(db=db, source_id=source_1.id)) == 2
@@ -0,0 +1,69 @@
+from markupsafe import Markup
+
+from app.services.fragment_cache import FragmentCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_fragment_cache_get_or_render() -> None:
+    """
+    Test that a fragment is rendered once, then served from the cache until it expires.
+    """
+    clock = FakeClock()
+    cache = FragmentCache(max_entries=10, ttl_seconds=60, clock=clock)
+    renders: list[str] = []
+
+    def render() -> str:
+        renders.append("<b>videos</b>")
+        return renders[-1]
+
+    fragment = cache.get_or_render(key=("videos", "source_1"), render=render)
+    assert fragment == Markup("<b>videos</b>")
+    assert cache.get_or_render(key=("videos", "source_1"), render=render) == fragment
+    assert len(renders) == 1
+
+    # Expired
+    clock.now += 61
+    assert cache.get(key=("videos", "source_1")) is None
+    cache.get_or_render(key=("videos", "source_1"), render=render)
+    assert len(renders) == 2
+
+    # Disabled
+    cache.enabled = False
+    cache.get_or_render(key=("videos", "source_1"), render=render)
+    assert len(renders) == 3
+
+
+def test_fragment_cache_evicts_least_recently_used() -> None:
+    """
+    Test that the least recently used fragments are evicted over `max_entries`.
+    """
+    cache = FragmentCache(max_entries=2, ttl_seconds=60)
+    cache.set(key=("a",), fragment="a")
+    cache.set(key=("b",), fragment="b")
+    assert cache.get(key=("a",)) == "a"
+
+    cache.set(key=("c",), fragment="c")
+    assert cache.get(key=("a",)) == "a"
+    assert cache.get(key=("b",)) is None
+    assert cache.get(key=("c",)) == "c"
+
+
+def test_fragment_cache_invalidate() -> None:
+    """
+    Test that invalidating a source bumps its generation, and only its generation.
+    """
+    cache = FragmentCache(max_entries=10, ttl_seconds=60)
+    assert cache.get_generation(source_id="source_1") == 0
+
+    cache.invalidate("source_1", "source_2")
+    cache.invalidate("source_1")
+    assert cache.get_generation(source_id="source_1") == 2
+    assert cache.get_generation(source_id="source_2") == 1
+    assert cache.get_generation(source_id="source_3") == 0
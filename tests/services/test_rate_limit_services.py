@@ -0,0 +1,210 @@
+from collections.abc import Generator
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from yt_dlp.utils import DownloadError, YoutubeDLError
+
+from app import crud, settings
+from app.models import Source
+from app.services import rate_limit
+from app.services.fetch import FetchCanceledError, fetch_video
+from app.services.rate_limit import CircuitOpenError, UpstreamLimiter
+from app.services.ytdlp import (
+    YDL_OPTS_BASE,
+    IsPrivateVideoError,
+    UpstreamThrottledError,
+    get_info_dict,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(name="limiter")
+def fixture_limiter() -> tuple[UpstreamLimiter, FakeClock]:
+    clock = FakeClock()
+    limiter = UpstreamLimiter(
+        key="Test",
+        max_rate=2.0,
+        min_rate=0.25,
+        burst=2,
+        failure_threshold=2,
+        base_backoff_seconds=10,
+        max_backoff_seconds=40,
+        clock=clock,
+    )
+    return limiter, clock
+
+
+@pytest.fixture(name="enable_rate_limit")
+def fixture_enable_rate_limit() -> Generator[None, None, None]:
+    rate_limit.reset_limiters()
+    with (
+        patch("app.services.rate_limit.settings.RATE_LIMIT_ENABLED", True),
+        patch("app.services.rate_limit.settings.RATE_LIMIT_BURST", 100),
+        patch("app.services.rate_limit.settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD", 2),
+    ):
+        yield
+    rate_limit.reset_limiters()
+
+
+def test_token_bucket(limiter: tuple[UpstreamLimiter, FakeClock]) -> None:
+    """
+    Test that the bucket allows a burst, then spaces requests by the refill rate.
+    """
+    upstream, clock = limiter
+    assert upstream.reserve() == 0
+    assert upstream.reserve() == 0
+    assert upstream.reserve() == pytest.approx(0.5)
+
+    clock.now += 1.5
+    assert upstream.reserve() == 0
+
+
+def test_adaptive_rate(limiter: tuple[UpstreamLimiter, FakeClock]) -> None:
+    """
+    Test that throttling halves the rate down to `min_rate` and successes restore it.
+    """
+    upstream, _ = limiter
+    upstream.record_throttled()
+    assert upstream.rate == 1.0
+    upstream.record_success()
+    assert upstream.rate == pytest.approx(1.2)
+
+    for _ in range(10):
+        upstream.record_throttled()
+    assert upstream.rate == 0.25
+
+
+def test_circuit_breaker(limiter: tuple[UpstreamLimiter, FakeClock]) -> None:
+    """
+    Test that the circuit opens after consecutive throttles with an exponential backoff.
+    """
+    upstream, clock = limiter
+    assert upstream.record_throttled() is False
+    assert upstream.record_throttled() is True
+    assert upstream.state == "open"
+    assert upstream.backoff_seconds == 10
+    with pytest.raises(CircuitOpenError):
+        upstream.reserve()
+
+    # Half-open: a single trial request is allowed, a throttle reopens with a doubled backoff
+    clock.now += 10
+    assert upstream.state == "half-open"
+    upstream.reserve()
+    with pytest.raises(CircuitOpenError):
+        upstream.reserve()
+    assert upstream.record_throttled() is True
+    assert upstream.backoff_seconds == 20
+
+    clock.now += 20
+    upstream.reserve()
+    upstream.record_throttled()
+    clock.now += 40
+    upstream.reserve()
+    upstream.record_throttled()
+    assert upstream.backoff_seconds == 40
+
+    # A trial request that never recorded its result is given up on
+    clock.now += 40
+    upstream.reserve()
+    clock.now += 9
+    with pytest.raises(CircuitOpenError):
+        upstream.reserve()
+    clock.now += 1
+
+    # Success closes the circuit
+    upstream.reserve()
+    upstream.record_success()
+    assert upstream.state == "closed"
+    assert upstream.get_status().open_until is None
+
+
+def test_is_throttle_error() -> None:
+    assert rate_limit.is_throttle_error(DownloadError("ERROR: HTTP Error 429: Too Many Requests"))
+    assert rate_limit.is_throttle_error(
+        YoutubeDLError("Sign in to confirm you're not a bot. This helps protect our community.")
+    )
+    assert not rate_limit.is_throttle_error(YoutubeDLError("[Private video]"))
+    assert not rate_limit.is_throttle_error(
+        DownloadError("ERROR: HTTP Error 500: Internal Server Error")
+    )
+
+
+async def test_get_info_dict_opens_circuit(enable_rate_limit: None) -> None:
+    """
+    Test that repeated throttling pauses the upstream and notifies once.
+    """
+    url = "https://www.youtube.com/watch?v=throttled"
+    with (
+        patch("yt_dlp.YoutubeDL.YoutubeDL.extract_info") as mocked_extract_info,
+        patch("app.services.ytdlp.queue_notification") as mocked_notify,
+    ):
+        mocked_extract_info.side_effect = DownloadError("HTTP Error 429: Too Many Requests")
+        with pytest.raises(UpstreamThrottledError):
+            await get_info_dict(url, ydl_opts=YDL_OPTS_BASE, rate_limit_key="YoutubeHandler")
+        assert not mocked_notify.called
+
+        with pytest.raises(UpstreamThrottledError):
+            await get_info_dict(url, ydl_opts=YDL_OPTS_BASE, rate_limit_key="YoutubeHandler")
+        assert mocked_notify.call_count == 1
+
+        with pytest.raises(CircuitOpenError):
+            await get_info_dict(url, ydl_opts=YDL_OPTS_BASE, rate_limit_key="YoutubeHandler")
+        assert mocked_extract_info.call_count == 2
+
+        # Other upstreams are unaffected, content errors are not throttling
+        mocked_extract_info.side_effect = YoutubeDLError("[Private video]")
+        with pytest.raises(IsPrivateVideoError):
+            await get_info_dict("https://rumble.com/v1.html", ydl_opts=YDL_OPTS_BASE)
+        assert rate_limit.get_limiter(key="rumble.com").consecutive_failures == 0
+
+
+@pytest.mark.sync_db
+@pytest.mark.parametrize(
+    "error",
+    [
+        UpstreamThrottledError("yt-dlp was throttled. HTTP Error 429: Too Many Requests"),
+        CircuitOpenError("Upstream 'YoutubeHandler' is paused for 10s."),
+    ],
+)
+async def test_fetch_video_throttled(
+    db: Session, source_1_w_videos: Source, error: Exception
+) -> None:
+    """
+    Test that a throttled fetch is canceled with the reason, and keeps the video.
+    """
+    video = source_1_w_videos.videos[0]
+    with patch("app.services.fetch.get_video_info_dict", side_effect=error):
+        with pytest.raises(FetchCanceledError) as exc_info:
+            await fetch_video(video_id=video.id, db=db)
+
+    assert exc_info.value.args[0] == str(error)
+    assert await crud.video.get_or_none(db=db, id=video.id)
+
+
+def test_upstream_statuses_endpoint(
+    enable_rate_limit: None, client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    """
+    Test the upstream status surface.
+    """
+    rate_limit.get_limiter(key="YoutubeHandler").record_throttled()
+
+    response = client.get(f"{settings.API_V1_PREFIX}/upstreams", headers=superuser_token_headers)
+    assert response.status_code == 200
+    statuses = response.json()
+    assert statuses[0]["key"] == "YoutubeHandler"
+    assert statuses[0]["state"] == "closed"
+    assert statuses[0]["consecutive_failures"] == 1
+    assert statuses[0]["requests_per_second"] == settings.RATE_LIMIT_REQUESTS_PER_SECOND / 2
+
+    response = client.get(f"{settings.API_V1_PREFIX}/upstreams")
+    assert response.status_code == 401
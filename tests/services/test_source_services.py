@@ -1,17 +1,24 @@
+from typing import Any
+
 from unittest.mock import Mock, patch
 
 import pytest
 from sqlmodel import Session
 
 from app import crud, models, paths
-from app.models import Source, SourceUpdate
+from app.handlers import get_handler_from_url
+from app.handlers.extractors.rumble_channel_crawler import crawl_channel
+from app.models import Source, SourceUpdate, VideoCreate
 from app.services.fetch import FetchCanceledError, fetch_all_sources, fetch_source
 from app.services.source import (
+    add_new_source_info_dict_videos_to_source,
     delete_orphaned_source_videos,
     get_source_info_dict,
+    get_source_video_entries_from_source_info_dict,
     get_source_videos_from_source_info_dict,
 )
 from app.services.ytdlp import AccountNotFoundError
+from tests.handlers.extractors.test_rumble_channel_crawler import FakeRumbleChannelServer
 from tests.mock_objects import (
     MOCKED_RUMBLE_SOURCE_1,
     MOCKED_RUMBLE_VIDEO_3,
@@ -77,6 +84,68 @@ async def test_get_nested_source_videos_from_source_info_dict() -> None:
     assert result_video.url == mocked_video["url"]
 
 
+@pytest.mark.parametrize("mocked_source", [MOCKED_RUMBLE_SOURCE_1, MOCKED_YOUTUBE_SOURCE_1])
+async def test_source_video_entries_match_validated_videos(mocked_source: dict[str, Any]) -> None:
+    """
+    Test that the videos built from `SourceVideoEntry` records, without validation, equal the
+    videos validated by `VideoCreate`.
+    """
+    mocked_source_info_dict = await get_mocked_source_info_dict(url=mocked_source["url"])
+    mocked_source_info_dict["source_id"] = mocked_source["id"]
+    handler = get_handler_from_url(url=mocked_source["url"])
+
+    video_entries = get_source_video_entries_from_source_info_dict(
+        source_info_dict=mocked_source_info_dict
+    )
+
+    assert len(video_entries) == len(mocked_source_info_dict["entries"])
+    for video_entry, entry_info_dict in zip(video_entries, mocked_source_info_dict["entries"]):
+        validated_video = VideoCreate(
+            **handler.map_source_info_dict_entity_to_video_dict(
+                source_id=mocked_source["id"], entry_info_dict=entry_info_dict
+            )
+        )
+        exclude = {"created_at", "updated_at"}
+        assert video_entry.to_video_create().dict(exclude=exclude) == validated_video.dict(
+            exclude=exclude
+        )
+
+
+@pytest.mark.sync_db
+async def test_add_new_source_info_dict_videos_to_source(db: Session, source_1: Source) -> None:
+    """
+    Tests that only the videos that are not linked to the source are added, and that videos
+    already in the database are linked without being created again.
+    """
+    await fetch_source(db=db, id=source_1.id)
+    mocked_source_info_dict = await get_mocked_source_info_dict(url=source_1.url)
+    mocked_source_info_dict["source_id"] = source_1.id
+    db_source = await crud.source.get(db=db, id=source_1.id)
+
+    new_videos = await add_new_source_info_dict_videos_to_source(
+        source_info_dict=mocked_source_info_dict, db_source=db_source, db=db
+    )
+    assert new_videos == []
+
+    # Unlink a video from the source, keeping it in the database
+    unlinked_video = db_source.videos[0]
+    db_source.videos.remove(unlinked_video)
+    db.commit()
+
+    # Fetched entries may list a video twice
+    mocked_source_info_dict["entries"].append(mocked_source_info_dict["entries"][0])
+    new_videos = await add_new_source_info_dict_videos_to_source(
+        source_info_dict=mocked_source_info_dict, db_source=db_source, db=db
+    )
+
+    assert [new_video.id for new_video in new_videos] == [unlinked_video.id]
+    assert await crud.source.get_video_ids(db=db, source_id=source_1.id) == {
+        video["id"] for video in MOCKED_RUMBLE_SOURCE_1["videos"]
+    }
+    assert len((await crud.source.get(db=db, id=source_1.id)).videos) == 2
+
+
+@pytest.mark.sync_db
 async def test_delete_orphaned_source_videos(
     db: Session, normal_user: models.User, source_1: models.Source
 ) -> None:
@@ -109,3 +178,73 @@ async def test_delete_orphaned_source_videos(
     # Check that videos were deleted from database
     source = await crud.source.get(db=db, id=fetched_source.id)
     assert len(source.videos) == 2
+
+
+@pytest.mark.sync_db
+async def test_fetch_source_crawls_rumble_channel(db: Session, source_1: Source) -> None:
+    """
+    Tests that fetching a Rumble source with `RUMBLE_CRAWL_ENABLED` adds the videos of the
+    channel's crawled pages, and that a refetch stops at the first page.
+    """
+    server = FakeRumbleChannelServer(pages=5)
+    server.delay_seconds = 0
+    server.thread.start()
+    try:
+        with (
+            patch("app.handlers.rumble.settings.RUMBLE_CRAWL_ENABLED", True),
+            patch(
+                "app.handlers.rumble.crawl_channel",
+                side_effect=lambda **kwargs: crawl_channel(**{**kwargs, "url": server.url}),
+            ),
+        ):
+            results = await fetch_source(db=db, id=source_1.id)
+            assert results.added_videos == 2 + 5 * 2
+            source = await crud.source.get(db=db, id=source_1.id)
+            assert len(source.videos) == 2 + 5 * 2
+
+            server.requested_pages.clear()
+            results = await fetch_source(db=db, id=source_1.id)
+            assert results.added_videos == 0
+            assert server.requested_pages == [1]
+    finally:
+        server.httpd.shutdown()
+        server.httpd.server_close()
+
+
+@pytest.mark.sync_db
+async def test_fetch_source_crawls_past_extracted_pages(db: Session, source_1: Source) -> None:
+    """
+    Tests that the crawl does not stop at the pages that yt-dlp's extraction already added,
+    and that a refetch stops at the first known page past them.
+    """
+    server = FakeRumbleChannelServer(pages=5)
+    server.delay_seconds = 0
+    server.thread.start()
+
+    async def get_page_1_source_info_dict(*args: Any, **kwargs: Any) -> dict[str, Any]:
+        source_info_dict = await get_mocked_source_info_dict(*args, **kwargs)
+        for entry, url in zip(source_info_dict["entries"], server.get_video_urls(page_number=1)):
+            entry.update(url=url, webpage_url=url, original_url=url)
+        return source_info_dict
+
+    try:
+        with (
+            patch("app.services.source.get_info_dict", get_page_1_source_info_dict),
+            patch("app.handlers.rumble.settings.RUMBLE_CRAWL_ENABLED", True),
+            patch(
+                "app.handlers.rumble.crawl_channel",
+                side_effect=lambda **kwargs: crawl_channel(**{**kwargs, "url": server.url}),
+            ),
+        ):
+            results = await fetch_source(db=db, id=source_1.id)
+            assert results.added_videos == 5 * 2
+            source = await crud.source.get(db=db, id=source_1.id)
+            assert len(source.videos) == 5 * 2
+
+            server.requested_pages.clear()
+            results = await fetch_source(db=db, id=source_1.id)
+            assert results.added_videos == 0
+            assert server.requested_pages == [1, 2]
+    finally:
+        server.httpd.shutdown()
+        server.httpd.server_close()
@@ -0,0 +1,280 @@
+from typing import Any
+
+import datetime
+import hashlib
+import hmac
+import threading
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs
+
+import pytest
+from sqlmodel import Session
+
+from app import crud, models, settings
+from app.services import websub
+from app.services.fetch import fetch_all_sources
+from tests.mock_objects import MOCKED_YOUTUBE_SOURCE_1
+
+CHANNEL_ID = "UCDRIjKy6eZOvKtOELtTdeUA"
+
+
+class FakeWebSubHub:
+    """
+    Local stand-in for the WebSub hub that records subscription requests.
+    """
+
+    def __init__(self) -> None:
+        self.status_code = 202
+        self.requests: list[dict[str, list[str]]] = []
+        server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # pylint: disable=invalid-name
+                length = int(self.headers.get("Content-Length", 0))
+                server.requests.append(parse_qs(self.rfile.read(length).decode()))
+                self.send_response(server.status_code)
+                self.end_headers()
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), RequestHandler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/subscribe"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+
+@pytest.fixture(name="hub")
+def fixture_hub() -> Generator[FakeWebSubHub, None, None]:
+    hub = FakeWebSubHub()
+    hub.thread.start()
+    with (
+        patch("app.services.websub.settings.YOUTUBE_WEBSUB_HUB_URL", hub.url),
+        patch("app.services.websub.settings.YOUTUBE_WEBSUB_SECRET", "secret"),
+    ):
+        yield hub
+    hub.httpd.shutdown()
+    hub.httpd.server_close()
+
+
+async def test_renew_websub_subscriptions(
+    db: Session, normal_user: models.User, hub: FakeWebSubHub
+) -> None:
+    """
+    Test that channel sources are subscribed and only renewed when the lease expires soon.
+    """
+    source = await crud.source.create_source_from_url(
+        db=db, url=MOCKED_YOUTUBE_SOURCE_1["url"], user_id=normal_user.id
+    )
+
+    requested = await websub.renew_websub_subscriptions(db=db)
+    assert len(requested) == 1
+    assert requested[0].source_id == source.id
+    assert requested[0].verified_at is None
+    assert hub.requests[0]["hub.mode"] == ["subscribe"]
+    assert hub.requests[0]["hub.topic"] == [websub.get_topic_url(channel_id=CHANNEL_ID)]
+    assert hub.requests[0]["hub.callback"] == [websub.get_callback_url()]
+    assert hub.requests[0]["hub.secret"] == ["secret"]
+
+    # Verified lease is not renewed
+    await websub.verify_websub_intent(
+        db=db,
+        mode="subscribe",
+        topic=websub.get_topic_url(channel_id=CHANNEL_ID),
+        challenge="challenge",
+        lease_seconds=60 * 60 * 24 * 5,
+    )
+    assert await websub.renew_websub_subscriptions(db=db) == []
+    assert len(hub.requests) == 1
+
+    # Expiring lease is renewed
+    await crud.websub_subscription.update(
+        db=db,
+        id=CHANNEL_ID,
+        obj_in=models.WebSubSubscriptionUpdate(
+            lease_expires_at=datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+        ),
+    )
+    assert len(await websub.renew_websub_subscriptions(db=db)) == 1
+    assert len(hub.requests) == 2
+
+    # Deactivated source is unsubscribed, once
+    await crud.source.update(db=db, id=source.id, obj_in=models.SourceUpdate(is_active=False))
+    assert await websub.renew_websub_subscriptions(db=db) == []
+    assert await websub.renew_websub_subscriptions(db=db) == []
+    assert len(hub.requests) == 3
+    assert hub.requests[2]["hub.mode"] == ["unsubscribe"]
+
+
+async def test_subscribe_source_hub_rejected(
+    db: Session, normal_user: models.User, hub: FakeWebSubHub
+) -> None:
+    """
+    Test that no subscription is stored when the hub rejects the request.
+    """
+    source = await crud.source.create_source_from_url(
+        db=db, url=MOCKED_YOUTUBE_SOURCE_1["url"], user_id=normal_user.id
+    )
+    hub.status_code = 400
+    assert await websub.subscribe_source(db=db, source=source) is None
+    assert await crud.websub_subscription.get_or_none(db=db, id=CHANNEL_ID) is None
+
+    # Notifications could not be verified without a secret
+    with patch("app.services.websub.settings.YOUTUBE_WEBSUB_SECRET", ""):
+        with pytest.raises(websub.WebSubSecretNotSetError):
+            await websub.subscribe_source(db=db, source=source)
+    assert len(hub.requests) == 1
+
+
+async def test_verify_websub_intent(
+    db: Session, normal_user: models.User, hub: FakeWebSubHub  # pylint: disable=unused-argument
+) -> None:
+    """
+    Test verifying subscribe/unsubscribe intents.
+    """
+    source = await crud.source.create_source_from_url(
+        db=db, url=MOCKED_YOUTUBE_SOURCE_1["url"], user_id=normal_user.id
+    )
+    topic = websub.get_topic_url(channel_id=CHANNEL_ID)
+
+    with pytest.raises(websub.WebSubVerificationError):
+        await websub.verify_websub_intent(
+            db=db, mode="subscribe", topic=topic, challenge="abc", lease_seconds=100
+        )
+
+    subscription = await websub.subscribe_source(db=db, source=source)
+    with pytest.raises(websub.WebSubVerificationError):
+        await websub.verify_websub_intent(
+            db=db, mode="unsubscribe", topic=topic, challenge="abc", lease_seconds=None
+        )
+    challenge = await websub.verify_websub_intent(
+        db=db, mode="subscribe", topic=topic, challenge="abc", lease_seconds=100
+    )
+    assert challenge == "abc"
+    subscription = await crud.websub_subscription.get(db=db, id=CHANNEL_ID)
+    assert subscription.lease_seconds == 100
+    assert subscription.is_active
+    assert subscription.requested_at is None
+
+    # The pending request is only verified once
+    with pytest.raises(websub.WebSubVerificationError):
+        await websub.verify_websub_intent(
+            db=db, mode="subscribe", topic=topic, challenge="abc", lease_seconds=100
+        )
+
+    # The lease is capped at the requested lease
+    await websub.subscribe_source(db=db, source=source)
+    await websub.verify_websub_intent(
+        db=db, mode="subscribe", topic=topic, challenge="abc", lease_seconds=10**9
+    )
+    subscription = await crud.websub_subscription.get(db=db, id=CHANNEL_ID)
+    assert subscription.lease_seconds == settings.YOUTUBE_WEBSUB_LEASE_SECONDS
+
+    await websub.unsubscribe_source(db=db, subscription=subscription)
+    await websub.verify_websub_intent(
+        db=db, mode="unsubscribe", topic=topic, challenge="abc", lease_seconds=None
+    )
+    assert await crud.websub_subscription.get_or_none(db=db, id=CHANNEL_ID) is None
+
+
+def test_is_valid_signature() -> None:
+    """
+    Test validating the `X-Hub-Signature` header.
+    """
+    body = b"<feed></feed>"
+    with patch("app.services.websub.settings.YOUTUBE_WEBSUB_SECRET", ""):
+        assert not websub.is_valid_signature(body=body, signature=None)
+
+    with patch("app.services.websub.settings.YOUTUBE_WEBSUB_SECRET", "secret"):
+        digest = hmac.new(b"secret", body, hashlib.sha1).hexdigest()
+        assert websub.is_valid_signature(body=body, signature=f"sha1={digest}")
+        assert not websub.is_valid_signature(body=body, signature="sha1=invalid")
+        assert not websub.is_valid_signature(body=body, signature=None)
+        assert not websub.is_valid_signature(body=body, signature=f"md5={digest}")
+
+
+async def test_handle_websub_notification(
+    db: Session,
+    sync_session: Session,
+    normal_user: models.User,
+    hub: FakeWebSubHub,  # pylint: disable=unused-argument
+) -> None:
+    """
+    Test that a notification changes every active source of the subscribed channel.
+    """
+    source = await crud.source.create_source_from_url(
+        db=db, url=MOCKED_YOUTUBE_SOURCE_1["url"], user_id=normal_user.id
+    )
+    # Sources saved before their URLs were sanitized
+    for source_id, is_active in (("videos-source", True), ("inactive-source", False)):
+        sync_session.add(
+            models.Source(
+                **{
+                    **source.dict(),
+                    "id": source_id,
+                    "url": f"{source.url}/videos",
+                    "is_active": is_active,
+                }
+            )
+        )
+    sync_session.commit()
+
+    body = (
+        "<feed><entry><yt:videoId>NEW_VIDEO_1</yt:videoId>"
+        f"<yt:channelId>{CHANNEL_ID}</yt:channelId></entry></feed>"
+    ).encode()
+    signature = f"sha1={hmac.new(b'secret', body, hashlib.sha1).hexdigest()}"
+
+    # Not subscribed
+    assert await websub.handle_websub_notification(db=db, body=body, signature=signature) == []
+
+    await websub.subscribe_source(db=db, source=source)
+    changed_sources = await websub.handle_websub_notification(db=db, body=body, signature=signature)
+    assert {changed.id for changed in changed_sources} == {source.id, "videos-source"}
+    subscription = await crud.websub_subscription.get(db=db, id=CHANNEL_ID)
+    assert subscription.last_notification_at is not None
+
+
+async def test_fetch_all_sources_skips_active_subscriptions(
+    db: Session, normal_user: models.User, hub: FakeWebSubHub  # pylint: disable=unused-argument
+) -> None:
+    """
+    Test that `fetch_all_sources` only polls sources with an active WebSub lease every
+    `YOUTUBE_WEBSUB_POLL_INTERVAL_HOURS`.
+    """
+    source = await crud.source.create_source_from_url(
+        db=db, url=MOCKED_YOUTUBE_SOURCE_1["url"], user_id=normal_user.id
+    )
+    await websub.subscribe_source(db=db, source=source)
+
+    with (
+        patch("app.services.websub.settings.YOUTUBE_WEBSUB_ENABLED", True),
+        patch("app.services.fetch.fetch_source") as mocked_fetch_source,
+    ):
+        mocked_fetch_source.return_value = models.FetchResults(sources=1)
+
+        # Unverified subscription is polled
+        await fetch_all_sources(db=db)
+        assert mocked_fetch_source.call_count == 1
+
+        await websub.verify_websub_intent(
+            db=db,
+            mode="subscribe",
+            topic=websub.get_topic_url(channel_id=CHANNEL_ID),
+            challenge="abc",
+            lease_seconds=100,
+        )
+        await fetch_all_sources(db=db)
+        assert mocked_fetch_source.call_count == 1
+
+        # Safety poll
+        verified_at = datetime.datetime.utcnow() - datetime.timedelta(
+            hours=settings.YOUTUBE_WEBSUB_POLL_INTERVAL_HOURS + 1
+        )
+        await crud.websub_subscription.update(
+            db=db, id=CHANNEL_ID, obj_in=models.WebSubSubscriptionUpdate(verified_at=verified_at)
+        )
+        await fetch_all_sources(db=db)
+        await fetch_all_sources(db=db)
+        assert mocked_fetch_source.call_count == 2
@@ -0,0 +1,152 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from yt_dlp.utils import DownloadError
+
+from app.handlers.exceptions import InvalidSourceUrl
+from app.handlers.youtube import YoutubeHandler
+from app.services.youtube_handles import (
+    YoutubeHandleCache,
+    get_handle_from_url,
+    handle_cache,
+    remember_handle_from_info_dict,
+)
+
+CHANNEL_ID = "UCDRIjKy6eZOvKtOELtTdeUA"
+HANDLE_URL = "https://www.youtube.com/@Styx.Hexen-Hammer666/videos"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def build_cache(path: Path, clock: FakeClock) -> YoutubeHandleCache:
+    return YoutubeHandleCache(path=path, ttl_seconds=100, negative_ttl_seconds=10, clock=clock)
+
+
+def test_get_handle_from_url() -> None:
+    assert get_handle_from_url(url=HANDLE_URL) == "Styx.Hexen-Hammer666"
+    assert get_handle_from_url(url=f"https://www.youtube.com/channel/{CHANNEL_ID}") is None
+
+
+def test_handle_cache_ttl(tmp_path: Path) -> None:
+    """
+    Test that resolutions expire after their TTL, and that unresolved handles expire sooner.
+    """
+    clock = FakeClock()
+    cache = build_cache(path=tmp_path / "handles.json", clock=clock)
+    cache.set(handle="@Channel", channel_id=CHANNEL_ID)
+    cache.set(handle="invalid", channel_id=None)
+
+    resolution = cache.get(handle="channel")
+    assert resolution and resolution.channel_id == CHANNEL_ID
+    resolution = cache.get(handle="invalid")
+    assert resolution and resolution.channel_id is None
+
+    clock.now += 50
+    assert cache.get(handle="channel")
+    assert cache.get(handle="invalid") is None
+
+    clock.now += 51
+    assert cache.get(handle="channel") is None
+
+
+def test_handle_cache_persistence(tmp_path: Path) -> None:
+    """
+    Test that resolutions are reloaded by a new cache, and that confirming a recent resolution
+    does not rewrite the cache file.
+    """
+    clock = FakeClock()
+    path = tmp_path / "handles.json"
+    cache = build_cache(path=path, clock=clock)
+    cache.set(handle="channel", channel_id=CHANNEL_ID)
+
+    clock.now += 10
+    cache.set(handle="channel", channel_id=CHANNEL_ID)
+    resolution = build_cache(path=path, clock=clock).get(handle="channel")
+    assert resolution and resolution.resolved_at == 1_000_000.0
+
+    clock.now += 50
+    cache.set(handle="channel", channel_id=CHANNEL_ID)
+    resolution = build_cache(path=path, clock=clock).get(handle="channel")
+    assert resolution and resolution.resolved_at == clock.now
+
+    cache.clear()
+    assert not path.exists()
+    assert build_cache(path=path, clock=clock).get(handle="channel") is None
+
+    path.write_text("not json", encoding="utf8")
+    assert build_cache(path=path, clock=clock).get(handle="channel") is None
+
+
+def test_remember_handle_from_info_dict() -> None:
+    assert (
+        remember_handle_from_info_dict(
+            info_dict={"channel_id": CHANNEL_ID, "uploader_id": "@Channel"}
+        )
+        == "Channel"
+    )
+    assert (
+        remember_handle_from_info_dict(
+            info_dict={
+                "channel_id": CHANNEL_ID,
+                "uploader_id": "UCother",
+                "uploader_url": "https://www.youtube.com/@Other",
+            }
+        )
+        == "Other"
+    )
+    assert remember_handle_from_info_dict(info_dict={"uploader_id": "@Channel"}) is None
+    assert remember_handle_from_info_dict(info_dict={"channel_id": CHANNEL_ID}) is None
+
+    resolution = handle_cache.get(handle="other")
+    assert resolution and resolution.channel_id == CHANNEL_ID
+
+
+def test_sanitize_handle_url_from_cache() -> None:
+    """
+    Test that a cached handle is sanitized without a yt-dlp extraction.
+    """
+    handle_cache.set(handle="Styx.Hexen-Hammer666", channel_id=CHANNEL_ID)
+
+    with patch("app.handlers.youtube.YoutubeDL", side_effect=AssertionError("network call")):
+        url = YoutubeHandler().sanitize_source_url(url=HANDLE_URL)
+
+    assert url == f"https://www.youtube.com/channel/{CHANNEL_ID}"
+
+
+def test_sanitize_handle_url_negative_cache() -> None:
+    """
+    Test that a handle that could not be resolved is not extracted again until it expires.
+    """
+    with patch("app.handlers.youtube.YoutubeDL") as mocked_youtube_dl:
+        mocked_youtube_dl.return_value.__enter__.return_value.extract_info.side_effect = (
+            DownloadError("This channel does not exist.")
+        )
+        with pytest.raises(DownloadError):
+            YoutubeHandler().sanitize_source_url(url=HANDLE_URL)
+        with pytest.raises(InvalidSourceUrl):
+            YoutubeHandler().sanitize_source_url(url=HANDLE_URL)
+
+    assert mocked_youtube_dl.call_count == 1
+
+
+def test_sanitize_handle_url_transient_error() -> None:
+    """
+    Test that a handle is not negative cached after a transient error, ie. throttling.
+    """
+    with patch("app.handlers.youtube.YoutubeDL") as mocked_youtube_dl:
+        mocked_youtube_dl.return_value.__enter__.return_value.extract_info.side_effect = (
+            DownloadError("HTTP Error 429: Too Many Requests")
+        )
+        for _ in range(2):
+            with pytest.raises(DownloadError):
+                YoutubeHandler().sanitize_source_url(url=HANDLE_URL)
+
+    assert mocked_youtube_dl.call_count == 2
+    assert handle_cache.get(handle="Styx.Hexen-Hammer666") is None
@@ -0,0 +1,198 @@
+from typing import Any
+
+import threading
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import Session
+
+from app import crud
+from app.models import Source, User
+from app.services import youtube_rss
+from app.services.fetch import FetchCanceledError, fetch_source
+from tests.mock_objects import MOCKED_YOUTUBE_SOURCE_1
+
+CHANNEL_ID = "UCDRIjKy6eZOvKtOELtTdeUA"
+KNOWN_VIDEO_ID = "SLM_E-N9qts"
+NEW_VIDEO_ID = "NEW_VIDEO_1"
+
+
+class FakeYoutubeFeedServer:
+    """
+    Local stand-in for `https://www.youtube.com/feeds/videos.xml` with ETag support.
+    """
+
+    def __init__(self) -> None:
+        self.video_ids: list[str] = [KNOWN_VIDEO_ID]
+        self.status_code = 200
+        self.requests: list[dict[str, Any]] = []
+        server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                server.requests.append({"path": self.path, "headers": dict(self.headers)})
+                etag = f'"{"-".join(server.video_ids)}"'
+                if server.status_code != 200:
+                    self.send_response(server.status_code)
+                    self.end_headers()
+                    return
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+
+                body = server.build_feed().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/atom+xml")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), RequestHandler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/feeds/videos.xml"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def build_feed(self) -> str:
+        entries = "".join(
+            f"<entry><id>yt:video:{video_id}</id><yt:videoId>{video_id}</yt:videoId></entry>"
+            for video_id in self.video_ids
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" '
+            'xmlns="http://www.w3.org/2005/Atom">'
+            f"<yt:channelId>{CHANNEL_ID}</yt:channelId>{entries}</feed>"
+        )
+
+
+@pytest.fixture(name="feed_server")
+def fixture_feed_server() -> Generator[FakeYoutubeFeedServer, None, None]:
+    server = FakeYoutubeFeedServer()
+    server.thread.start()
+    youtube_rss.clear_feed_validators()
+    with patch("app.services.youtube_rss.settings.YOUTUBE_FEED_URL", server.url):
+        yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
+    youtube_rss.clear_feed_validators()
+
+
+def test_parse_feed_video_ids(feed_server: FakeYoutubeFeedServer) -> None:
+    """
+    Test parsing video ids from a `videos.xml` feed.
+    """
+    feed_server.video_ids = ["a" * 11, "b-c_d"]
+    assert youtube_rss.parse_feed_video_ids(feed_xml=feed_server.build_feed()) == [
+        "a" * 11,
+        "b-c_d",
+    ]
+
+
+def test_get_channel_id_and_video_ids() -> None:
+    """
+    Test extracting channel_ids and video ids from URLs.
+    """
+    assert youtube_rss.get_channel_id_from_channel_url(url=MOCKED_YOUTUBE_SOURCE_1["url"]) == (
+        CHANNEL_ID
+    )
+    assert youtube_rss.get_channel_id_from_channel_url(url="https://youtube.com/@handle") is None
+    assert youtube_rss.get_video_ids_from_video_urls(
+        urls=[f"https://www.youtube.com/watch?v={KNOWN_VIDEO_ID}", "https://rumble.com/v1.html"]
+    ) == {KNOWN_VIDEO_ID}
+
+
+async def test_probe_channel_feed_conditional_get(feed_server: FakeYoutubeFeedServer) -> None:
+    """
+    Test that an unchanged feed stores validators and is re-probed with a conditional GET.
+    """
+    result = await youtube_rss.probe_channel_feed(
+        channel_id=CHANNEL_ID, known_video_ids={KNOWN_VIDEO_ID}
+    )
+    assert result.has_changes is False
+    assert result.video_ids == [KNOWN_VIDEO_ID]
+    assert feed_server.requests[0]["path"] == f"/feeds/videos.xml?channel_id={CHANNEL_ID}"
+
+    result = await youtube_rss.probe_channel_feed(
+        channel_id=CHANNEL_ID, known_video_ids={KNOWN_VIDEO_ID}
+    )
+    assert result.not_modified is True
+    assert result.has_changes is False
+    assert feed_server.requests[1]["headers"]["If-None-Match"] == f'"{KNOWN_VIDEO_ID}"'
+
+
+async def test_probe_channel_feed_new_video(feed_server: FakeYoutubeFeedServer) -> None:
+    """
+    Test that a new video in the feed is reported and no validators are stored.
+    """
+    feed_server.video_ids = [NEW_VIDEO_ID, KNOWN_VIDEO_ID]
+    result = await youtube_rss.probe_channel_feed(
+        channel_id=CHANNEL_ID, known_video_ids={KNOWN_VIDEO_ID}
+    )
+    assert result.has_changes is True
+
+    await youtube_rss.probe_channel_feed(channel_id=CHANNEL_ID, known_video_ids={KNOWN_VIDEO_ID})
+    assert "If-None-Match" not in feed_server.requests[1]["headers"]
+
+
+async def test_channel_has_new_videos(feed_server: FakeYoutubeFeedServer) -> None:
+    """
+    Test `channel_has_new_videos` falls back to fetching when the probe is inconclusive.
+    """
+    url = MOCKED_YOUTUBE_SOURCE_1["url"]
+    known_video_urls = [f"https://www.youtube.com/watch?v={KNOWN_VIDEO_ID}"]
+
+    assert await youtube_rss.channel_has_new_videos(url=url, known_video_urls=known_video_urls) is (
+        False
+    )
+
+    # No known videos
+    assert await youtube_rss.channel_has_new_videos(url=url, known_video_urls=[]) is True
+    assert len(feed_server.requests) == 1
+
+    # Feed error
+    youtube_rss.clear_feed_validators()
+    feed_server.status_code = 404
+    assert await youtube_rss.channel_has_new_videos(url=url, known_video_urls=known_video_urls)
+
+
+async def test_fetch_source_skip_unchanged(
+    db: Session, normal_user: User, feed_server: FakeYoutubeFeedServer
+) -> None:
+    """
+    Test that `fetch_source(skip_unchanged=True)` skips yt-dlp when the feed has no new videos.
+    """
+    source: Source = await crud.source.create_source_from_url(
+        db=db, url=MOCKED_YOUTUBE_SOURCE_1["url"], user_id=normal_user.id
+    )
+    await fetch_source(db=db, id=source.id)
+    feed_server.video_ids = [KNOWN_VIDEO_ID]
+
+    with (
+        patch("app.handlers.youtube.settings.YOUTUBE_FEED_PROBE_ENABLED", True),
+        patch("app.services.fetch.get_source_info_dict") as mocked_get_source_info_dict,
+    ):
+        results = await fetch_source(db=db, id=source.id, skip_unchanged=True)
+        mocked_get_source_info_dict.assert_not_called()
+        assert results.sources == 1
+        assert results.added_videos == 0
+
+        # Incomplete metadata
+        logo, source.logo = source.logo, ""
+        mocked_get_source_info_dict.side_effect = Exception("yt-dlp called")
+        with pytest.raises(FetchCanceledError):
+            await fetch_source(db=db, id=source.id, skip_unchanged=True)
+        mocked_get_source_info_dict.assert_called()
+        mocked_get_source_info_dict.reset_mock()
+        source.logo = logo
+
+        feed_server.video_ids = [NEW_VIDEO_ID, KNOWN_VIDEO_ID]
+        mocked_get_source_info_dict.side_effect = Exception("yt-dlp called")
+        with pytest.raises(FetchCanceledError):
+            await fetch_source(db=db, id=source.id, skip_unchanged=True)
+        mocked_get_source_info_dict.assert_called()
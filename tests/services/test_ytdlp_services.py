@@ -1,6 +1,7 @@
 from unittest.mock import patch
 
 import pytest
+from yt_dlp import YoutubeDL
 from yt_dlp.extractor.common import InfoExtractor
 from yt_dlp.utils import DownloadError, YoutubeDLError
 
@@ -15,7 +16,9 @@ from app.services.ytdlp import (
     NoUploadsError,
     PlaylistNotFoundError,
     VideoUnavailableError,
+    YoutubeDLPool,
     get_info_dict,
+    ydl_pool,
 )
 from tests.mock_objects import MOCKED_RUMBLE_VIDEO_3, get_mocked_video_info_dict
 
@@ -184,3 +187,78 @@ async def test_get_info_dict_requested_format_not_found() -> None:
         mocked_extract_info.side_effect = YoutubeDLError("Requested format is not available.")
         with pytest.raises(FormatNotFoundError):
             await get_info_dict("https://test.com", ydl_opts=YDL_OPTS_BASE)
+
+
+class CustomTestIE(InfoExtractor):
+    _VALID_URL = r"https?://custom-test\.com/.*"
+
+
+def test_ydl_pool_reuses_instances() -> None:
+    """
+    Test that the pool reuses instances per option set and resets them between uses.
+    """
+    pool = YoutubeDLPool(max_idle_per_key=1)
+    ydl_opts = {**YDL_OPTS_BASE, "playlistend": 5}
+
+    with pool.acquire(ydl_opts=ydl_opts, custom_extractors=[CustomTestIE]) as ydl_1:
+        ydl_1.params["playlistend"] = 99
+        ydl_1._num_downloads = 3  # pylint: disable=protected-access
+    with pool.acquire(ydl_opts=ydl_opts, custom_extractors=[CustomTestIE]) as ydl_2:
+        assert ydl_2 is ydl_1
+        assert ydl_2.params["playlistend"] == 5
+        assert ydl_2._num_downloads == 0  # pylint: disable=protected-access
+        ies_names = list(ydl_2._ies_instances)  # pylint: disable=protected-access
+        assert ies_names.count("CustomTest") == 1
+        with pool.acquire(ydl_opts=ydl_opts, custom_extractors=[CustomTestIE]) as ydl_3:
+            assert ydl_3 is not ydl_2
+
+    # Different options get a different instance
+    with pool.acquire(ydl_opts={**ydl_opts, "playlistend": 6}) as ydl_4:
+        assert ydl_4 is not ydl_1
+
+    assert pool.created == 3
+    assert pool.reused == 1
+    pool.clear()
+
+
+def test_ydl_pool_discards_instance_on_unexpected_error() -> None:
+    """
+    Test that an instance is only returned to the pool after a `YoutubeDLError`.
+    """
+    pool = YoutubeDLPool(max_idle_per_key=2)
+
+    with pytest.raises(YoutubeDLError):
+        with pool.acquire(ydl_opts=YDL_OPTS_BASE) as ydl_1:
+            raise YoutubeDLError("error")
+    with pytest.raises(ValueError):
+        with pool.acquire(ydl_opts=YDL_OPTS_BASE) as ydl_2:
+            assert ydl_2 is ydl_1
+            raise ValueError("error")
+    with pool.acquire(ydl_opts=YDL_OPTS_BASE) as ydl_3:
+        assert ydl_3 is not ydl_1
+    pool.clear()
+
+
+async def test_get_info_dict_uses_pool() -> None:
+    """
+    Test that `get_info_dict` reuses a pooled YoutubeDL instance, instead of constructing one
+    per extraction.
+    """
+    url = MOCKED_RUMBLE_VIDEO_3["url"]
+    ydl_opts = {**YDL_OPTS_BASE, "benchmark": True}
+    extractions = 20
+    ydl_pool.clear()
+
+    with patch("yt_dlp.YoutubeDL.YoutubeDL.extract_info") as mocked_extract_info, patch(
+        "app.services.ytdlp.YoutubeDL", wraps=YoutubeDL
+    ) as mocked_youtube_dl:
+        mocked_extract_info.return_value = await get_mocked_video_info_dict(url=url)
+        for pool_enabled, constructions in ((False, extractions), (True, 1)):
+            mocked_youtube_dl.reset_mock()
+            with patch("app.services.ytdlp.settings.YTDLP_POOL_ENABLED", pool_enabled):
+                for _ in range(extractions):
+                    await get_info_dict(url=url, ydl_opts=ydl_opts)
+            assert mocked_youtube_dl.call_count == constructions
+
+    assert mocked_extract_info.call_count == extractions * 2
+    ydl_pool.clear()
@@ -446,6 +446,7 @@ def test_criteria_is_within_duration_longer_than_value() -> None:
     assert result is False
 
 
+@pytest.mark.sync_db
 def test_criteria_matches_contains_must_contain(source_1_w_videos: Source) -> None:
     video = source_1_w_videos.videos[0]
     keyword = str(video.title).split(" ")[0]
@@ -466,6 +467,7 @@ def test_criteria_matches_contains_must_contain(source_1_w_videos: Source) -> No
         c.matches_contains(video=video, keyword=keyword)
 
 
+@pytest.mark.sync_db
 def test_criteria_matches_contains_must_not_contain(source_1_w_videos: Source) -> None:
     video = source_1_w_videos.videos[0]
     keyword = "cats"
@@ -481,6 +483,7 @@ def test_criteria_matches_contains_must_not_contain(source_1_w_videos: Source) -
     assert result is True
 
 
+@pytest.mark.sync_db
 def test_criteria_filter_videos(source_1_w_videos: Source) -> None:
     # Create criteria to filter videos released within the last month
     c = Criteria(
@@ -7,7 +7,7 @@ from httpx import Cookies
 from sqlmodel import Session
 
 from app import crud, paths
-from app.models import Filter, Source, User
+from app.models import Filter, FilterUpdate, Source, User
 from app.services.fetch import FetchCanceledError
 from tests.mock_objects import MOCK_FILTER_1
 
@@ -40,6 +40,31 @@ def test_view_filter(
     assert response.context["alerts"].danger[0] == "Filter not found"  # type: ignore
 
 
+@pytest.mark.sync_db
+async def test_view_filter_caches_videos(
+    db: Session,
+    client: TestClient,
+    normal_user_cookies: Cookies,
+    filter_1: Filter,
+) -> None:
+    """
+    Test that the filter's videos are rendered from the fragment cache, until the filter changes.
+    """
+    client.cookies = normal_user_cookies
+    response = client.get(f"/filter/{filter_1.id}")
+    videos_fragment = response.context["videos_fragment"]  # type: ignore
+
+    with patch.object(crud.source, "load_videos", wraps=crud.source.load_videos) as load_videos:
+        response = client.get(f"/filter/{filter_1.id}")
+        assert response.context["videos_fragment"] == videos_fragment  # type: ignore
+        load_videos.assert_not_called()
+
+        # A changed filter has a new fingerprint
+        await crud.filter.update(db=db, id=filter_1.id, obj_in=FilterUpdate(ordered_by="title"))
+        response = client.get(f"/filter/{filter_1.id}")
+        load_videos.assert_called_once()
+
+
 def test_handle_create_filter(
     db: Session,
     client: TestClient,
@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session
 
 from app import crud, models, settings
+from app.services.archive import archive_videos
 from tests.mock_objects import MOCKED_RUMBLE_SOURCE_1, MOCKED_YOUTUBE_SOURCE_1
 
 
@@ -86,7 +87,7 @@ async def test_html_view_users_sources_no_media_url(
 
 
 async def test_handle_media_video_no_media_url(
-    db: Session,
+    sync_session: Session,
     source_1_w_videos: models.Source,
     client: TestClient,
     superuser_token_headers: dict[str, str],
@@ -94,7 +95,7 @@ async def test_handle_media_video_no_media_url(
     """
     Test that the handle_media function returns a response with the correct status code.
     """
-    test_video = source_1_w_videos.videos[0]
+    test_video = (await crud.source.get_videos(db=sync_session, source_id=source_1_w_videos.id))[0]
     test_video.media_url = None
 
     with patch("app.crud.video.VideoCRUD.get") as mock_get:
@@ -110,3 +111,21 @@ async def test_handle_media_video_no_media_url(
 
     assert response.status_code == status.HTTP_202_ACCEPTED
     assert "The server has not able to fetch a media_url from yt-dlp." in response.text
+
+
+async def test_handle_media_restores_archived_video(
+    sync_session: Session, client: TestClient, source_1_w_videos: models.Source
+) -> None:
+    source = await crud.source.get(db=sync_session, id=source_1_w_videos.id)
+    video = source.videos[0]
+    await archive_videos(db=sync_session, video_ids=[video.id])
+    assert await crud.video.get_or_none(db=sync_session, id=video.id) is None
+
+    with patch("app.services.media.RedirectResponse") as mock_redirect:
+        mock_redirect.return_value = RedirectResponse(url="http://example.com")
+        response = client.get(f"/media/{video.id}")
+        assert response.status_code == 200
+
+    restored_video = await crud.video.get(db=sync_session, id=video.id)
+    assert restored_video.last_played_at is not None
+    assert await crud.archived_video.get_or_none(db=sync_session, id=video.id) is None
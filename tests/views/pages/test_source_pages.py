@@ -7,7 +7,8 @@ from httpx import Cookies
 from sqlmodel import Session
 
 from app import crud, models
-from app.services.fetch import FetchCanceledError
+from app.core import metrics
+from app.services.fetch import FetchCanceledError, fetch_source
 from tests.mock_objects import MOCKED_RUMBLE_SOURCE_1, MOCKED_SOURCES, MOCKED_YOUTUBE_SOURCE_1
 
 
@@ -444,3 +445,103 @@ def test_get_source_rss_feed(
         )
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.json()["detail"] == "Source 'wrongs_source_id' not found."
+
+
+async def test_list_source_fetch_costs(
+    db: Session,
+    source_1: models.Source,
+    client: TestClient,
+    normal_user_cookies: Cookies,
+    superuser_cookies: Cookies,
+) -> None:
+    """
+    Test the page ranking sources by fetch cost.
+    """
+    await fetch_source(db=db, id=source_1.id)
+
+    client.cookies = superuser_cookies
+    response = client.get("/sources/costs?days=30")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.template.name == "source/costs.html"  # type: ignore
+    assert response.context["source_costs"][0].source_id == source_1.id  # type: ignore
+    assert source_1.name in response.text
+
+    client.cookies = normal_user_cookies
+    response = client.get("/sources/costs")
+    assert response.template.name != "source/costs.html"  # type: ignore
+
+
+async def test_list_sources_queries(
+    db: Session,
+    superuser: models.User,
+    client: TestClient,
+    superuser_cookies: Cookies,
+) -> None:
+    """
+    Test that listing sources makes the same number of queries, however many sources and
+    videos there are.
+    """
+
+    async def get_list_all_sources_queries() -> float:
+        queries = metrics.DB_QUERIES_PER_REQUEST.get_sum(endpoint="list_all_sources")
+        response = client.get("/sources/all")
+        assert response.status_code == status.HTTP_200_OK
+        return metrics.DB_QUERIES_PER_REQUEST.get_sum(endpoint="list_all_sources") - queries
+
+    client.cookies = superuser_cookies
+    source = await crud.source.create_source_from_url(
+        db=db, url=MOCKED_SOURCES[0]["url"], user_id=superuser.id
+    )
+    queries = await get_list_all_sources_queries()
+
+    for mocked_source in MOCKED_SOURCES[1:]:
+        source = await crud.source.create_source_from_url(
+            db=db, url=mocked_source["url"], user_id=superuser.id
+        )
+        await fetch_source(db=db, id=source.id)
+    assert await get_list_all_sources_queries() == queries
+
+    response = client.get("/sources/all")
+    videos_count = len(await crud.source.get_video_ids(db=db, source_id=source.id))
+    assert videos_count > 0
+    assert response.context["stats"][source.id].videos_count == videos_count  # type: ignore
+
+
+@pytest.mark.sync_db
+async def test_view_source_caches_fragments(
+    db: Session,
+    superuser: models.User,
+    client: TestClient,
+    superuser_cookies: Cookies,
+) -> None:
+    """
+    Test that the source page caches its videos, until the source is fetched again.
+    """
+
+    async def get_view_source_queries() -> tuple[float, str]:
+        queries = metrics.DB_QUERIES_PER_REQUEST.get_sum(endpoint="view_source")
+        response = client.get(f"/source/{source.id}")
+        assert response.status_code == status.HTTP_200_OK
+        queries = metrics.DB_QUERIES_PER_REQUEST.get_sum(endpoint="view_source") - queries
+        return queries, response.text
+
+    client.cookies = superuser_cookies
+    source = await crud.source.create_source_from_url(
+        db=db, url=MOCKED_RUMBLE_SOURCE_1["url"], user_id=superuser.id
+    )
+    await fetch_source(db=db, id=source.id)
+    video_id = next(iter(await crud.source.get_video_ids(db=db, source_id=source.id)))
+
+    uncached_queries, _ = await get_view_source_queries()
+    cached_queries, _ = await get_view_source_queries()
+    assert cached_queries < uncached_queries
+
+    # Changes made outside of the fetch pipeline are not shown until the fragment expires
+    await crud.video.update(db=db, id=video_id, obj_in=models.VideoUpdate(title="Renamed Video"))
+    _, text = await get_view_source_queries()
+    assert "Renamed Video" not in text
+
+    # Fetching the source invalidates its fragments
+    await fetch_source(db=db, id=source.id)
+    _, text = await get_view_source_queries()
+    assert "Renamed Video" in text
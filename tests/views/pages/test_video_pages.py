@@ -10,6 +10,7 @@ from app import crud, models
 from app.services.fetch import FetchCanceledError
 
 
+@pytest.mark.sync_db
 def test_view_video(
     source_1_w_videos: models.Source,
     client: TestClient,
@@ -31,6 +32,7 @@ def test_view_video(
     assert response.context["alerts"].danger[0] == "Video not found"  # type: ignore
 
 
+@pytest.mark.sync_db
 def test_fetch_video_page(
     source_1_w_videos: models.Source,
     client: TestClient,